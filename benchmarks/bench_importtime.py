@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_importtime.py
+───────────────────
+bm20_daily.py 시작 비용 측정 (python -X importtime 기반)
+
+  시나리오        내용
+  ──────────────  ───────────────────────────────────────────────────────────
+  dashboard_only  bm20_daily.py 모듈 상단 import (BM20_DASHBOARD_ONLY=1 에서 로드되는 전부)
+  full_render     dashboard_only + 렌더 단계에서 지연 로드되는 yfinance / matplotlib /
+                  reportlab / jinja2 + 한글 폰트 등록 (= 지연 import 도입 전 시작 비용)
+
+- 시나리오마다 새 인터프리터를 --repeat 회 띄워 프로세스 wall time 과
+  importtime 최상위 누적(us)의 중앙값을 잰다
+- 결과: benchmarks/results/importtime.json, importtime.md (커밋 대상)
+
+실행:
+    python benchmarks/bench_importtime.py
+    python benchmarks/bench_importtime.py --repeat 9 --top 20
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+KST = timezone(timedelta(hours=9))
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+DASHBOARD_ONLY = f"""
+import os, json, time, csv
+import datetime as dt
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import requests
+import pandas as pd
+import numpy as np
+import sys
+sys.path.insert(0, {str(ROOT / "scripts")!r})
+import bm20_store
+from functools import lru_cache
+"""
+
+FULL_RENDER = DASHBOARD_ONLY + """
+import yfinance as yf
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import matplotlib.font_manager as fm
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from jinja2 import Template
+NANUM_PATH = "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"
+if os.path.exists(NANUM_PATH):
+    pdfmetrics.registerFont(TTFont("NanumGothic", NANUM_PATH))
+    fm.fontManager.addfont(NANUM_PATH); plt.rcParams["font.family"] = "NanumGothic"
+else:
+    pdfmetrics.registerFont(UnicodeCIDFont("HYSMyeongJo-Medium"))
+plt.rcParams["axes.unicode_minus"] = False
+"""
+
+SCENARIOS = {"dashboard_only": DASHBOARD_ONLY, "full_render": FULL_RENDER}
+
+# "import time:       self [us] | cumulative | imported package"
+LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """최상위 import 만 → [(모듈, self_us, cumulative_us)]"""
+    out = []
+    for line in stderr.splitlines():
+        m = LINE_RE.match(line)
+        if m and len(m.group(3)) == 1:
+            out.append((m.group(4), int(m.group(1)), int(m.group(2))))
+    return out
+
+def run_once(code: str) -> tuple[float, list[tuple[str, int, int]]]:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "0"}
+    t0 = time.perf_counter()
+    p = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                       cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - t0
+    if p.returncode != 0:
+        raise RuntimeError(p.stderr.strip().splitlines()[-1])
+    return wall, parse_importtime(p.stderr)
+
+def bench(code: str, repeat: int) -> dict:
+    run_once(code)  # .pyc / 폰트 캐시 워밍업
+    walls, totals, per_mod = [], [], {}
+    for _ in range(repeat):
+        wall, mods = run_once(code)
+        walls.append(wall)
+        totals.append(sum(c for _, _, c in mods))
+        for name, _, cum in mods:
+            per_mod.setdefault(name, []).append(cum)
+    return {
+        "wall_ms": round(statistics.median(walls) * 1000, 1),
+        "import_ms": round(statistics.median(totals) / 1000, 1),
+        "modules": {k: round(statistics.median(v) / 1000, 1) for k, v in per_mod.items()},
+    }
+
+def write_results(res: dict, top: int):
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    (RESULTS_DIR / "importtime.json").write_text(json.dumps(res, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    d, f = res["scenarios"]["dashboard_only"], res["scenarios"]["full_render"]
+    lines = [
+        "# bm20_daily.py import-time benchmark",
+        "",
+        f"- measured: {res['measured_at']} · Python {res['python']} · {res['platform']}",
+        f"- repeat: {res['repeat']} (median), `python -X importtime`",
+        "",
+        "| scenario | process wall (ms) | top-level import (ms) |",
+        "|---|---:|---:|",
+        f"| dashboard_only | {d['wall_ms']} | {d['import_ms']} |",
+        f"| full_render (eager, before) | {f['wall_ms']} | {f['import_ms']} |",
+        "",
+        f"dashboard_only / full_render = **{d['wall_ms'] / f['wall_ms']:.0%}** of process wall time.",
+        "",
+        f"## Heaviest top-level imports (full_render, top {top})",
+        "",
+        "| module | cumulative (ms) | loaded in dashboard_only |",
+        "|---|---:|:---:|",
+    ]
+    heavy = sorted(f["modules"].items(), key=lambda kv: -kv[1])[:top]
+    for name, ms in heavy:
+        lines.append(f"| `{name}` | {ms} | {'yes' if name in d['modules'] else 'no'} |")
+    (RESULTS_DIR / "importtime.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(f"[SAVED] {RESULTS_DIR / 'importtime.md'}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="bm20_daily.py import-time benchmark")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=15)
+    args = ap.parse_args()
+
+    res = {
+        "measured_at": datetime.now(KST).strftime("%Y-%m-%d %H:%M KST"),
+        "python": platform.python_version(),
+        "platform": platform.platform(terse=True),
+        "repeat": args.repeat,
+        "scenarios": {},
+    }
+    for name, code in SCENARIOS.items():
+        r = bench(code, args.repeat)
+        res["scenarios"][name] = r
+        print(f"[{name}] wall={r['wall_ms']}ms import={r['import_ms']}ms")
+    write_results(res, args.top)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_pdf.py
+────────────
+데일리 PDF 빌드 비교: current (bm20_render.render_pdf — 삽입 크기로 줄인 32색 차트,
+KS X 1001 폰트 서브셋 캐시, 공유 스타일) vs legacy (이전 구현: 180dpi PNG 원본 삽입,
+원본 TTF 등록, 매번 스타일 생성)
+
+- 차트 PNG 는 한 번만 그려 두 시나리오가 같은 입력을 쓴다 (trend 는 고정 시계열, 네트워크 없음)
+- 시나리오마다 새 프로세스를 --repeat 회 띄워 PDF 빌드 시간(프로세스 내부, 폰트 등록 포함) /
+  프로세스 wall time / PDF 바이트 중앙값을 잰다
+- current 는 빈 캐시에서 한 번 돌려 서브셋 생성 비용(cold)도 따로 기록
+- 결과: benchmarks/results/pdf.json, pdf.md (커밋 대상)
+
+실행:
+    python benchmarks/bench_pdf.py
+    python benchmarks/bench_pdf.py --repeat 7 --keep /tmp/bm20_pdf
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+KST = timezone(timedelta(hours=9))
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+NANUM_PATH = "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"   # bm20_render.NANUM_PATH
+
+# 고정 입력 (DailyRender 필드, 경로는 실행 시 채움)
+SYMS = ["BTC", "ETH", "XRP", "BNB", "SOL", "DOGE", "ADA", "TRX", "LINK", "AVAX",
+        "XLM", "SUI", "HBAR", "BCH", "TON", "DOT", "LTC", "SHIB", "UNI", "APT"]
+PCTS = [5.12, 3.8, 2.95, 2.1, 1.77, 1.2, 0.84, 0.5, 0.31, 0.02,
+        -0.14, -0.48, -0.9, -1.35, -1.8, -2.2, -2.75, -3.1, -4.02, -5.6]
+NEWS = ("BM20 지수는 전일 대비 상승 마감했다. 비트코인은 현물 ETF 순유입이 이어지며 강세를 보였고, "
+        "이더리움과 솔라나도 동반 상승했다.\n"
+        "김치 프리미엄은 소폭 축소됐으며 업비트 거래대금은 전일 수준을 유지했다.\n") * 3
+
+CASE = {
+    "ymd": "2026-10-19", "ts": "1", "html_path": "",
+    "perf": list(zip(SYMS, PCTS)),
+    "best": [[s, f"{p:+.2f}%"] for s, p in zip(SYMS[:3], PCTS[:3])],
+    "worst": [[s, f"{p:+.2f}%"] for s, p in zip(SYMS[-3:], PCTS[-3:])],
+    "bm20_now": 1234.56, "bm20_chg": 1.23, "num_up": 10, "num_down": 10,
+    "ret_texts": ["+1.23%", "+4.56%", "-2.10%", "+0.80%", "+35.2%"],
+    "kp_text": "+1.12%", "news": NEWS,
+}
+
+# 차트 준비 (render_bar + 고정 시계열 render_trend)
+CHARTS = """
+import json, sys
+import bm20_render as br
+case = json.loads(sys.argv[1])
+r = br.DailyRender(**{k: tuple(map(tuple, v)) if k in ("perf", "best", "worst") else
+                      tuple(v) if isinstance(v, list) else v for k, v in case.items()})
+br.get_pct_series_yf = lambda t, days=8: [0.0, 0.8, 1.5, 0.9, 2.2, 1.7, 2.9, 3.4] if t.startswith("BTC") \\
+    else [0.0, 1.1, 0.4, -0.6, 0.9, 2.0, 1.2, 2.6]
+br.render_bar(r); br.render_trend(r)
+"""
+
+# 현재 구현: PDF 빌드만 재고 바이트를 보고
+CURRENT = """
+import json, os, sys, time
+import bm20_render as br   # requests 등 PDF 와 무관한 import 는 빼고 잰다
+t0 = time.perf_counter()
+case = json.loads(sys.argv[1])
+r = br.DailyRender(**{k: tuple(map(tuple, v)) if k in ("perf", "best", "worst") else
+                      tuple(v) if isinstance(v, list) else v for k, v in case.items()})
+br.render_pdf(r)
+print(json.dumps({"build": time.perf_counter() - t0, "bytes": os.path.getsize(r.pdf_path)}))
+"""
+
+# 이전 render_pdf (비교 기준)
+LEGACY = """
+import json, os, sys, time
+t0 = time.perf_counter()
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+r = json.loads(sys.argv[1])
+NANUM = "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"
+if os.path.exists(NANUM):
+    pdfmetrics.registerFont(TTFont("NanumGothic", NANUM)); font = "NanumGothic"
+else:
+    font = "HYSMyeongJo-Medium"; pdfmetrics.registerFont(UnicodeCIDFont(font))
+title_style    = ParagraphStyle("Title",    fontName=font, fontSize=18, alignment=1, spaceAfter=6)
+subtitle_style = ParagraphStyle("Subtitle", fontName=font, fontSize=12.5, alignment=1,
+                                textColor=colors.HexColor("#546E7A"), spaceAfter=12)
+section_h      = ParagraphStyle("SectionH", fontName=font, fontSize=13, alignment=0,
+                                textColor=colors.HexColor("#1A237E"), spaceBefore=4, spaceAfter=8)
+body_style     = ParagraphStyle("Body",     fontName=font, fontSize=11, alignment=0, leading=16)
+small_style    = ParagraphStyle("Small",    fontName=font, fontSize=9, alignment=1, textColor=colors.HexColor("#78909C"))
+def card(flowables, pad=10, bg="#FFFFFF", border="#E5E9F0"):
+    tbl = Table([[flowables]], colWidths=[16.4*cm])
+    tbl.setStyle(TableStyle([
+        ("FONTNAME", (0,0), (-1,-1), font),
+        ("LEFTPADDING",(0,0),(-1,-1), pad), ("RIGHTPADDING",(0,0),(-1,-1), pad),
+        ("TOPPADDING",(0,0),(-1,-1), pad),  ("BOTTOMPADDING",(0,0),(-1,-1), pad),
+        ("BACKGROUND",(0,0),(-1,-1), colors.HexColor(bg)),
+        ("BOX",(0,0),(-1,-1),0.75, colors.HexColor(border)),
+        ("VALIGN",(0,0),(-1,-1),"TOP"),
+    ]))
+    return tbl
+def style_table_basic(t, header_bg="#EEF4FF", box="#CFD8DC", grid="#E5E9F0", fs=10.5):
+    t.setStyle(TableStyle([
+        ("FONTNAME",(0,0),(-1,-1), font), ("FONTSIZE",(0,0),(-1,-1), fs),
+        ("BACKGROUND",(0,0),(-1,0), colors.HexColor(header_bg)),
+        ("BOX",(0,0),(-1,-1),0.5, colors.HexColor(box)),
+        ("INNERGRID",(0,0),(-1,-1),0.25, colors.HexColor(grid)),
+        ("ALIGN",(0,0),(-1,-1),"LEFT"), ("VALIGN",(0,0),(-1,-1),"MIDDLE"),
+    ]))
+doc = SimpleDocTemplate(r["pdf_path"], pagesize=A4, leftMargin=1.8*cm, rightMargin=1.8*cm,
+                        topMargin=1.6*cm, bottomMargin=1.6*cm)
+story = [Paragraph("BM20 데일리 리포트 (Yahoo Finance / Custom Weights)", title_style),
+         Paragraph(r["ymd"], subtitle_style)]
+metrics = [["지수", f"{r['bm20_now']:,.2f} pt"], ["일간 변동", f"{r['bm20_chg']:+.2f}%"],
+           ["상승/하락", f"{r['num_up']} / {r['num_down']}"],
+           ["수익률(1D/7D/30D/MTD/YTD)", " / ".join(r["ret_texts"])], ["김치 프리미엄", r["kp_text"]]]
+mt = Table(metrics, colWidths=[5.0*cm, 11.0*cm]); style_table_basic(mt)
+story += [card([mt]), Spacer(1, 0.45*cm)]
+t_best = Table([["Best 3","등락률"], *r["best"]], colWidths=[8.0*cm, 3.5*cm])
+t_worst = Table([["Worst 3","등락률"], *r["worst"]], colWidths=[8.0*cm, 3.5*cm])
+style_table_basic(t_best); style_table_basic(t_worst)
+story += [card([Paragraph("Best/Worst (1D, USD)", section_h), Spacer(1,4), t_best, Spacer(1,6), t_worst]),
+          Spacer(1, 0.45*cm)]
+story += [card([Paragraph("코인별 퍼포먼스 (1D, USD)", section_h),
+                Image(r["bar_png"], width=16.0*cm, height=6.6*cm)]), Spacer(1, 0.45*cm)]
+story += [card([Paragraph("BTC & ETH 7일 가격 추세", section_h),
+                Image(r["trend_png"], width=16.0*cm, height=5.2*cm)]), Spacer(1, 0.45*cm)]
+story += [card([Paragraph("BM20 데일리 뉴스", section_h), Spacer(1,2),
+                Paragraph(r["news"].replace("\\n","<br/>"), body_style)]), Spacer(1, 0.45*cm)]
+story += [Paragraph("© Blockmedia · Data: Yahoo Finance, Upbit · Funding: Binance & Bybit", small_style)]
+doc.build(story)
+print(json.dumps({"build": time.perf_counter() - t0, "bytes": os.path.getsize(r["pdf_path"])}))
+"""
+
+
+def run(code: str, case: dict, env: dict) -> dict:
+    t0 = time.perf_counter()
+    p = subprocess.run([sys.executable, "-c", code, json.dumps(case, ensure_ascii=False)],
+                       cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - t0
+    if p.returncode != 0:
+        err = p.stderr.strip().splitlines()[-1:]
+        raise RuntimeError(err[0] if err else f"exit {p.returncode}")
+    r = json.loads(p.stdout.strip().splitlines()[-1])
+    r["wall"] = wall
+    return r
+
+def bench(code: str, case: dict, env: dict, repeat: int) -> dict:
+    run(code, case, env)  # .pyc / 폰트 서브셋 캐시 워밍업
+    runs = [run(code, case, env) for _ in range(repeat)]
+    return {
+        "build_ms": round(statistics.median(r["build"] for r in runs) * 1000, 1),
+        "wall_ms": round(statistics.median(r["wall"] for r in runs) * 1000, 1),
+        "bytes": int(statistics.median(r["bytes"] for r in runs)),
+    }
+
+def write_results(res: dict):
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    (RESULTS_DIR / "pdf.json").write_text(json.dumps(res, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    sc = res["scenarios"]
+    lines = [
+        "# Daily PDF build benchmark",
+        "",
+        f"- measured: {res['measured_at']} · Python {res['python']} · {res['platform']}",
+        f"- repeat: {res['repeat']} (median), fresh process per run, font: {res['font']}",
+        f"- chart PNGs (input, 180 dpi): bar {res['png_bytes']['bar']:,} B · trend {res['png_bytes']['trend']:,} B",
+        "",
+        "| build | PDF build incl. reportlab import + font registration (ms) | process wall (ms) | PDF size (bytes) |",
+        "|---|---:|---:|---:|",
+    ]
+    for name, label in (("current", "current (right-sized 32-colour charts, font subset cache)"),
+                        ("legacy", "legacy (full-size PNGs, full TTF, before)")):
+        r = sc[name]
+        lines.append(f"| {label} | {r['build_ms']} | {r['wall_ms']} | {r['bytes']:,} |")
+    c, l = sc["current"], sc["legacy"]
+    lines += ["", f"current / legacy = **{c['bytes'] / l['bytes']:.0%}** PDF size, "
+                  f"**{c['build_ms'] / l['build_ms']:.0%}** build time."]
+    if res.get("cold_subset_ms") is not None:
+        lines += ["", f"Cold run with an empty font cache (builds the subset once): {res['cold_subset_ms']} ms."]
+    (RESULTS_DIR / "pdf.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(f"[SAVED] {RESULTS_DIR / 'pdf.md'}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="daily PDF build benchmark")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--keep", type=Path, default=None, help="PNG/PDF 결과를 남길 디렉터리")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = args.keep or Path(tmp)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        font_dir = Path(tmp) / "fonts"
+        env = {**os.environ, "BM20_FONT_CACHE_DIR": str(font_dir), "BM20_CHART_FORMAT": "png"}
+        env.pop("BM20_PDF_DPI", None)
+        case = {**CASE, "bar_png": str(out_dir / "bar.png"), "trend_png": str(out_dir / "trend.png")}
+        subprocess.run([sys.executable, "-c", CHARTS, json.dumps({**case, "pdf_path": ""}, ensure_ascii=False)],
+                       cwd=ROOT, env=env, check=True, capture_output=True)
+
+        res = {
+            "measured_at": datetime.now(KST).strftime("%Y-%m-%d %H:%M KST"),
+            "python": platform.python_version(),
+            "platform": platform.platform(terse=True),
+            "repeat": args.repeat,
+            "font": "NanumGothic" if os.path.exists(NANUM_PATH) else "HYSMyeongJo-Medium (CID, Nanum 없음)",
+            "png_bytes": {"bar": os.path.getsize(case["bar_png"]), "trend": os.path.getsize(case["trend_png"])},
+            "scenarios": {},
+        }
+        cold = run(CURRENT, {**case, "pdf_path": str(out_dir / "current.pdf")}, env)
+        res["cold_subset_ms"] = round(cold["build"] * 1000, 1) if os.path.exists(NANUM_PATH) else None
+        for name, code in (("current", CURRENT), ("legacy", LEGACY)):
+            r = bench(code, {**case, "pdf_path": str(out_dir / f"{name}.pdf")}, env, args.repeat)
+            res["scenarios"][name] = r
+            print(f"[{name}] build={r['build_ms']}ms wall={r['wall_ms']}ms bytes={r['bytes']:,}")
+    write_results(res)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_treemap.py
+────────────────
+트리맵 PNG 렌더러 비교: native (scripts/render_treemap_png.py, squarify + matplotlib Agg)
+vs kaleido (이전 구현: plotly.express.treemap + fig.write_image → headless Chromium)
+
+- 두 경로 모두 같은 CSV 로 900×520 @2x PNG 를 만든다
+- 시나리오마다 새 프로세스를 --repeat 회 띄워 wall time / 최대 RSS 중앙값을 잰다
+  (RSS: getrusage(RUSAGE_CHILDREN) → 자식·손자 프로세스 중 가장 큰 하나, Chromium 포함)
+- 두 PNG 가 모두 있으면 픽셀 차이(평균 절대 오차, 0-255)도 기록
+- plotly/kaleido 가 없으면 kaleido 시나리오는 skipped 로 남긴다
+- 결과: benchmarks/results/treemap.json, treemap.md (커밋 대상)
+
+실행:
+    python benchmarks/bench_treemap.py
+    python benchmarks/bench_treemap.py --repeat 7 --csv bm20_daily_data_latest.csv
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+KST = timezone(timedelta(hours=9))
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+CSV = ROOT / "bm20_daily_data_latest.csv"
+
+# 이전 render_treemap_png.py 의 렌더 부분 (비교 기준)
+KALEIDO = """
+import sys
+import pandas as pd
+import plotly.express as px
+csv, out = sys.argv[1], sys.argv[2]
+df = pd.read_csv(csv)
+df["symbol"] = df["symbol"].astype(str).str.upper()
+df["weight_ratio"] = pd.to_numeric(df["weight_ratio"], errors="coerce").fillna(0.0)
+df["price_change_pct"] = pd.to_numeric(df["price_change_pct"], errors="coerce").fillna(0.0)
+df = df.sort_values("weight_ratio", ascending=False).head(20).copy()
+df["label_text"] = df.apply(lambda r: f"{r['symbol']}<br>{r['price_change_pct']:+.2f}%", axis=1)
+fig = px.treemap(df, path=["symbol"], values="weight_ratio", color="price_change_pct",
+                 color_continuous_scale="RdYlGn", color_continuous_midpoint=0)
+fig.update_traces(text=df["label_text"], textinfo="text", textfont_size=18)
+fig.update_layout(margin=dict(l=10, r=10, t=10, b=10), paper_bgcolor="white",
+                  coloraxis_colorbar_title="1D %")
+fig.write_image(out, width=900, height=520, scale=2)
+"""
+
+# 자식 프로세스 하나를 띄워 wall / 최대 RSS 를 재는 래퍼 (RUSAGE_CHILDREN 을 깨끗하게 시작)
+PROBE = """
+import json, resource, subprocess, sys, time
+t0 = time.perf_counter()
+p = subprocess.run(sys.argv[1:], capture_output=True, text=True)
+wall = time.perf_counter() - t0
+ru = resource.getrusage(resource.RUSAGE_CHILDREN)
+print(json.dumps({"rc": p.returncode, "wall": wall, "maxrss_kb": ru.ru_maxrss,
+                  "err": p.stderr.strip().splitlines()[-1:] }))
+"""
+
+
+def scenario_cmds(csv: Path, out_dir: Path) -> dict:
+    return {
+        "native": [sys.executable, str(ROOT / "scripts" / "render_treemap_png.py"),
+                   "--csv", str(csv), "--out", str(out_dir / "native.png")],
+        "kaleido": [sys.executable, "-c", KALEIDO, str(csv), str(out_dir / "kaleido.png")],
+    }
+
+def available(name: str) -> bool:
+    if name != "kaleido":
+        return True
+    p = subprocess.run([sys.executable, "-c", "import plotly, kaleido"], capture_output=True)
+    return p.returncode == 0
+
+def probe(cmd: list) -> dict:
+    p = subprocess.run([sys.executable, "-c", PROBE, *cmd], cwd=ROOT, capture_output=True, text=True)
+    r = json.loads(p.stdout)
+    if r["rc"] != 0:
+        raise RuntimeError(r["err"][0] if r["err"] else f"exit {r['rc']}")
+    return r
+
+def bench(cmd: list, repeat: int) -> dict:
+    probe(cmd)  # 폰트 캐시 / .pyc 워밍업
+    runs = [probe(cmd) for _ in range(repeat)]
+    return {
+        "wall_ms": round(statistics.median(r["wall"] for r in runs) * 1000, 1),
+        "max_rss_mb": round(statistics.median(r["maxrss_kb"] for r in runs) / 1024, 1),
+    }
+
+def pixel_diff(a: Path, b: Path) -> dict | None:
+    try:
+        import numpy as np
+        from PIL import Image
+    except ImportError:
+        return None
+    if not (a.exists() and b.exists()):
+        return None
+    ia, ib = Image.open(a).convert("RGB"), Image.open(b).convert("RGB")
+    if ia.size != ib.size:
+        return {"size_a": ia.size, "size_b": ib.size}
+    d = np.abs(np.asarray(ia, dtype=np.int16) - np.asarray(ib, dtype=np.int16))
+    return {"size": list(ia.size), "mean_abs": round(float(d.mean()), 2),
+            "pct_pixels_gt_32": round(float((d.max(axis=2) > 32).mean() * 100), 2)}
+
+def write_results(res: dict):
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    (RESULTS_DIR / "treemap.json").write_text(json.dumps(res, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    sc = res["scenarios"]
+    lines = [
+        "# Treemap PNG renderer benchmark",
+        "",
+        f"- measured: {res['measured_at']} · Python {res['python']} · {res['platform']}",
+        f"- repeat: {res['repeat']} (median), fresh process per run, 900×520 @2x",
+        "",
+        "| renderer | process wall (ms) | max RSS (MB) |",
+        "|---|---:|---:|",
+    ]
+    for name, label in (("native", "native (squarify + matplotlib Agg)"),
+                        ("kaleido", "kaleido (plotly + headless Chromium, before)")):
+        r = sc.get(name, {})
+        if "skipped" in r:
+            lines.append(f"| {label} | skipped: {r['skipped']} | |")
+        else:
+            lines.append(f"| {label} | {r['wall_ms']} | {r['max_rss_mb']} |")
+    n, k = sc.get("native", {}), sc.get("kaleido", {})
+    if "wall_ms" in n and "wall_ms" in k:
+        lines += ["", f"native / kaleido = **{n['wall_ms'] / k['wall_ms']:.0%}** wall time, "
+                      f"**{n['max_rss_mb'] / k['max_rss_mb']:.0%}** peak RSS."]
+    if res.get("pixel_diff"):
+        d = res["pixel_diff"]
+        lines += ["", f"Pixel difference (native vs kaleido): mean |Δ| = {d.get('mean_abs')} / 255, "
+                      f"{d.get('pct_pixels_gt_32')}% of pixels differ by more than 32. "
+                      "Besides fonts, most of it is labels: the old path passed text= in CSV row "
+                      "order while plotly reorders tiles, so labels landed on the wrong tiles."]
+    (RESULTS_DIR / "treemap.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(f"[SAVED] {RESULTS_DIR / 'treemap.md'}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="treemap PNG renderer benchmark")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--csv", type=Path, default=CSV)
+    ap.add_argument("--keep", type=Path, default=None, help="PNG 결과를 남길 디렉터리")
+    args = ap.parse_args()
+
+    res = {
+        "measured_at": datetime.now(KST).strftime("%Y-%m-%d %H:%M KST"),
+        "python": platform.python_version(),
+        "platform": platform.platform(terse=True),
+        "repeat": args.repeat,
+        "scenarios": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = args.keep or Path(tmp)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for name, cmd in scenario_cmds(args.csv.resolve(), out_dir).items():
+            if not available(name):
+                res["scenarios"][name] = {"skipped": "plotly/kaleido not installed"}
+                print(f"[{name}] skipped")
+                continue
+            try:
+                r = bench(cmd, args.repeat)
+            except Exception as e:
+                res["scenarios"][name] = {"skipped": str(e)}
+                print(f"[{name}] WARN: {e}")
+                continue
+            res["scenarios"][name] = r
+            print(f"[{name}] wall={r['wall_ms']}ms rss={r['max_rss_mb']}MB")
+        res["pixel_diff"] = pixel_diff(out_dir / "native.png", out_dir / "kaleido.png")
+    write_results(res)
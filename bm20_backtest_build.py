@@ -13,6 +13,7 @@ out/backfill_current_basket.csv 를 2018-01-01 부터 재생성합니다.
     python bm20_backtest_build.py                      # 2018-01-01 ~ 오늘
     python bm20_backtest_build.py --dry-run            # 저장 없이 결과만 출력
     python bm20_backtest_build.py --start 2020-01-01  # 시작일 지정
+    python bm20_backtest_build.py --matrix            # 가격 매트릭스(memmap) 캐시 사용/생성
 """
 
 import argparse, csv, json, os, time, sys
@@ -287,11 +288,26 @@ def download_prices(start: str, end: str) -> pd.DataFrame:
 # 4. 백테스트 실행
 # ══════════════════════════════════════════════════════════════
 
-def run(start_date: str, end_date: str, dry_run: bool = False):
+def load_prices(start: str, end: str, use_matrix: bool = False) -> pd.DataFrame:
+    """use_matrix: bm20_price_matrix 캐시(close.npy memmap)가 구간을 덮으면 그대로 사용, 아니면 빌드"""
+    if not use_matrix:
+        return download_prices(start, end)
+    import bm20_price_matrix as pm
+    try:
+        m = pm.load_price_matrix()
+        if m.dates and m.dates[0] <= start and m.dates[-1] >= min(end, (datetime.today() - timedelta(days=1)).strftime("%Y-%m-%d")):
+            print(f"[INFO] 가격 매트릭스 사용: {m.dir} ({m.shape[0]}일 × {m.shape[1]}종목)")
+            return m.to_frame()
+    except FileNotFoundError:
+        pass
+    pm.build(start, end)
+    return pm.load_price_matrix().to_frame()
+
+def run(start_date: str, end_date: str, dry_run: bool = False, use_matrix: bool = False):
     out_dir = Path("backtest_output")
     out_dir.mkdir(exist_ok=True)
 
-    prices = download_prices(start_date, end_date)
+    prices = load_prices(start_date, end_date, use_matrix)
 
     start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
     end_dt   = datetime.strptime(end_date,   "%Y-%m-%d").date()
@@ -438,6 +454,7 @@ if __name__ == "__main__":
     p.add_argument("--start",   default="2018-01-01")
     p.add_argument("--end",     default=datetime.today().strftime("%Y-%m-%d"))
     p.add_argument("--dry-run", action="store_true", help="파일 저장 없이 결과만 출력")
+    p.add_argument("--matrix",  action="store_true", help="가격 매트릭스(out/cache/price_matrix) 사용/생성")
     args = p.parse_args()
 
     print("=" * 60)
@@ -446,4 +463,4 @@ if __name__ == "__main__":
     print(f"dry-run: {args.dry_run}")
     print("=" * 60)
 
-    run(args.start, args.end, dry_run=args.dry_run)
+    run(args.start, args.end, dry_run=args.dry_run, use_matrix=args.matrix)
@@ -10,8 +10,9 @@
 # 의존: pandas, numpy, requests, matplotlib, reportlab, jinja2, yfinance
 # 환경: OUT_DIR(옵션), TZ=Asia/Seoul(권장)
 
-import os, json, time, csv
+import os, json, time
 import datetime as dt
+from bisect import bisect_right
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import requests
@@ -21,26 +22,15 @@ import numpy as np
 ROOT = Path(__file__).resolve().parent
 OUT = ROOT / "out"
 
-import yfinance as yf
+import sys
+sys.path.insert(0, str(ROOT / "scripts"))
+import bm20_store
+from series_index import SeriesIndex
 
-# ---- Matplotlib ----
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-
-# ---- ReportLab ----
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.cidfonts import UnicodeCIDFont
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-
-# ---- HTML ---
-from jinja2 import Template
+# ---- 무거운 의존성(yfinance / matplotlib / reportlab / jinja2)은 사용 시점에 import ----
+# BM20_DASHBOARD_ONLY=1 (장중 대시보드 갱신)은 PNG/PDF/HTML 을 만들지 않으므로 전혀 로드하지 않는다.
+# 렌더(PNG/PDF/HTML)는 bm20_render.py 에서 수행
+# import 비용: python benchmarks/bench_importtime.py (결과: benchmarks/results/importtime.md)
 
 # ================================
 # Runtime Flags (Dashboard Mode)
@@ -75,25 +65,6 @@ pdf_path  = OUT_DIR_DATE / f"bm20_daily_{YMD}.pdf"
 html_path = OUT_DIR_DATE / f"bm20_daily_{YMD}.html"
 kp_path   = OUT_DIR_DATE / f"kimchi_{YMD}.json"
 
-# ================== Fonts (Nanum 우선, 실패 시 CID) ==================
-NANUM_PATH = "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"
-KOREAN_FONT = "HYSMyeongJo-Medium"
-try:
-    if os.path.exists(NANUM_PATH):
-        pdfmetrics.registerFont(TTFont("NanumGothic", NANUM_PATH))
-        KOREAN_FONT = "NanumGothic"
-    else:
-        pdfmetrics.registerFont(UnicodeCIDFont(KOREAN_FONT))
-except Exception:
-    pdfmetrics.registerFont(UnicodeCIDFont("HYSMyeongJo-Medium"))
-    KOREAN_FONT = "HYSMyeongJo-Medium"
-try:
-    if os.path.exists(NANUM_PATH):
-        fm.fontManager.addfont(NANUM_PATH); plt.rcParams["font.family"] = "NanumGothic"
-    plt.rcParams["axes.unicode_minus"] = False
-except Exception:
-    plt.rcParams["axes.unicode_minus"] = False
-
 # ================== Helper ==================
 def fmt_pct(v, digits=2):
     try:
@@ -124,9 +95,71 @@ def read_json(path: Path):
         return None
 
 # ================== Market Indices Helper (BTC, NASDAQ, KOSPI) ==================
-def update_market_indices():
-    """Yahoo Finance API 직접 호출로 나스닥/코스피/BTC 시리즈 업데이트 (yfinance 라이브러리 우회)"""
+MARKET_INDEX_START = "2018-01-01"   # 시리즈 파일이 없을 때만 전체 구간 요청
+MARKET_INDEX_OVERLAP_DAYS = 7       # 마지막 저장일 이전 N일 재요청 (야후 종가 정정 반영)
+
+def _fetch_yahoo_daily_closes(symbol: str, start_ymd: str) -> dict:
+    """Yahoo chart API에서 start_ymd ~ 오늘(+2일) 일봉 종가를 {date: price}로 반환"""
     import datetime as _dt
+    period1 = int(_dt.datetime.strptime(start_ymd, "%Y-%m-%d").replace(tzinfo=_dt.timezone.utc).timestamp())
+    period2 = int((_dt.datetime.utcnow() + _dt.timedelta(days=2)).timestamp())
+    r = requests.get(
+        f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}",
+        headers={"User-Agent": "Mozilla/5.0"},
+        params={"interval": "1d", "period1": period1, "period2": period2},
+        timeout=20,
+    )
+    r.raise_for_status()
+    result = r.json()["chart"]["result"][0]
+    timestamps = result.get("timestamp") or []
+    closes = result["indicators"]["quote"][0].get("close") or []
+
+    out = {}
+    for ts, price in zip(timestamps, closes):
+        if price is None:
+            continue
+        date_str = _dt.datetime.utcfromtimestamp(ts).strftime("%Y-%m-%d")
+        out[date_str] = int(round(price))
+    return out
+
+def _update_one_market_series(name: str, symbol: str) -> str:
+    """{name}_series.json의 마지막 날짜부터(오버랩 포함) 꼬리 구간만 받아 병합"""
+    path = Path(f"{name}_series.json")
+    existing = read_json(path) if path.exists() else None
+    stored = {}
+    if isinstance(existing, list):
+        for it in existing:
+            if isinstance(it, dict) and it.get("date") and it.get("price") is not None:
+                stored[str(it["date"])[:10]] = it["price"]
+
+    if stored:
+        last_date = max(stored)
+        start = (datetime.strptime(last_date, "%Y-%m-%d") - timedelta(days=MARKET_INDEX_OVERLAP_DAYS)).strftime("%Y-%m-%d")
+    else:
+        start = MARKET_INDEX_START
+
+    fresh = _fetch_yahoo_daily_closes(symbol, start)
+    if not fresh and not stored:
+        raise RuntimeError("empty data")
+
+    merged = {**stored, **fresh}  # 오버랩 구간은 새 값으로 덮어씀
+    output_list = [{"date": d, "price": merged[d]} for d in sorted(merged)]
+    if not fresh:
+        return f"[OK] {name}_series.json unchanged (no new rows since {start})"
+    if stored and all(stored.get(d) == p for d, p in fresh.items()):
+        return f"[OK] {name}_series.json unchanged ({output_list[-1]['date']}, {len(output_list)}개)"
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(output_list, f, ensure_ascii=False, indent=2)
+    return (f"[OK] {name}_series.json updated. ({output_list[-1]['date']}, {len(output_list)}개, "
+            f"fetched {len(fresh)} rows from {start})")
+
+def update_market_indices():
+    """Yahoo Finance API 직접 호출로 나스닥/코스피/BTC 시리즈 업데이트 (yfinance 라이브러리 우회)
+    - 각 시리즈의 마지막 저장일 - MARKET_INDEX_OVERLAP_DAYS 부터만 요청해서 병합 (파일 없으면 2018-01-01부터)
+    - 세 심볼은 동시에 요청
+    """
+    from concurrent.futures import ThreadPoolExecutor
 
     indices = {
         "btc_usd": "BTC-USD",
@@ -135,38 +168,11 @@ def update_market_indices():
     }
 
     print("\n--- 시장 지수 및 비트코인 데이터 업데이트 시작 ---")
-    import datetime as _dt2
-    period1 = int(_dt2.datetime(2018, 1, 1).timestamp())
-    period2 = int((_dt2.datetime.utcnow() + _dt2.timedelta(days=2)).timestamp())
-
-    for name, symbol in indices.items():
+    with ThreadPoolExecutor(max_workers=len(indices)) as ex:
+        futures = {name: ex.submit(_update_one_market_series, name, symbol) for name, symbol in indices.items()}
+    for name, fut in futures.items():
         try:
-            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
-            r = requests.get(
-                url,
-                headers={"User-Agent": "Mozilla/5.0"},
-                params={"interval": "1d", "period1": period1, "period2": period2},
-                timeout=20,
-            )
-            r.raise_for_status()
-            result = r.json()["chart"]["result"][0]
-            timestamps = result["timestamp"]
-            closes = result["indicators"]["quote"][0]["close"]
-
-            output_list = []
-            for ts, price in zip(timestamps, closes):
-                if price is None:
-                    continue
-                date_str = _dt.datetime.utcfromtimestamp(ts).strftime("%Y-%m-%d")
-                output_list.append({"date": date_str, "price": int(round(price))})
-
-            if not output_list:
-                print(f"[ERR] {name} update failed: empty data")
-                continue
-
-            with open(f"{name}_series.json", "w", encoding="utf-8") as f:
-                json.dump(output_list, f, ensure_ascii=False, indent=2)
-            print(f"[OK] {name}_series.json updated. ({output_list[-1]['date']}, {len(output_list)}개)")
+            print(fut.result())
         except Exception as e:
             print(f"[ERR] {name} update failed: {e}")
 
@@ -236,16 +242,8 @@ def load_yesterday_prices() -> dict:
      매일 독립된 스냅샷이 되어 여러 날을 이어붙인 누적 수익률이 실제 저장된 가격과 어긋날 수 있었음.
      이제는 어제 실제로 저장했던 가격을 그대로 갖다 써서, price/weight/contribution/지수 계산이
      항상 같은 가격 기준으로 정합되게 한다.)"""
-    path = OUT_DIR / "history" / "components_history.csv"
-    if not path.exists():
-        return {}
     try:
-        with open(path, encoding="utf-8") as f:
-            rows = list(csv.DictReader(f))
-        if not rows:
-            return {}
-        last_date = max(r["date"] for r in rows)
-        return {r["symbol"]: float(r["price"]) for r in rows if r["date"] == last_date and r.get("price")}
+        return bm20_store.last_component_prices()
     except Exception as e:
         print(f"[WARN] load_yesterday_prices failed: {e}")
         return {}
@@ -359,6 +357,7 @@ def get_kimchi(df):
     if btc_usd is None:
         # 바이낸스 실패 시 yfinance 폴백
         try:
+            import yfinance as yf
             y = yf.Ticker("BTC-USD").history(period="2d")["Close"]
             btc_usd = float(y.iloc[-1]); glb = "yfinance"
         except Exception:
@@ -491,6 +490,7 @@ BASE_DATE_TARGET = "2018-01-01"
 BASE_INDEX_START = 100.0
 
 def _fetch_close_matrix(tickers: list[str], start: str, end: str) -> pd.DataFrame:
+    import yfinance as yf  # 기준값 캐시(base/bm20_base.json)가 없을 때만 필요
     raw = yf.download(tickers=tickers, start=start, end=end, interval="1d",
                       auto_adjust=True, progress=False, group_by="ticker")
     def _pick(df):
@@ -594,12 +594,6 @@ def _load_series_ssot():
             continue
     return None, None
 
-def _level_on_or_before(rows, target_ymd: str):
-    for r in reversed(rows):
-        if r["date"] <= target_ymd:
-            return float(r["level"])
-    return None
-
 # 오늘 1D 포트폴리오 수익률(%) 계산: yesterday -> now (weights_map 기준)
 # NOTE: 과거엔 CMC의 percent_change_24h(그 API 호출 시점 기준 자체 롤링 윈도우)를 그대로 합산했는데,
 # 이 값은 GitHub Actions 실행 시각이 매일 조금씩 어긋나거나 실행이 하루 이상 밀리면 실제
@@ -622,8 +616,10 @@ if rows_ssot:
     last_level = float(rows_ssot[-1]["level"])
     if last_date == today_ymd:
         # 같은 날 재실행(intraday)인 경우: 전일 레벨을 찾고, 오늘 레벨을 재계산해서 덮어씀
+        # (rows_ssot 는 날짜 정렬 상태 → bisect 한 번. SeriesIndex 는 rows_ssot 가 확정된 뒤 아래에서 한 번만 생성)
         prev_dt = (dt.datetime.strptime(today_ymd, "%Y-%m-%d") - dt.timedelta(days=1)).strftime("%Y-%m-%d")
-        prev_level = _level_on_or_before(rows_ssot, prev_dt) or last_level
+        i_prev = bisect_right(rows_ssot, prev_dt, key=lambda r: r["date"])
+        prev_level = (float(rows_ssot[i_prev - 1]["level"]) if i_prev else None) or last_level
         bm20_now = prev_level * (1.0 + port_ret_1d) if denom_ok else last_level
         bm20_prev_level = prev_level
         rows_ssot[-1]["level"] = float(bm20_now)
@@ -722,113 +718,23 @@ df_out = df[["sym","id","current_price","previous_price","price_change_pct","wei
 df_out.to_csv(csv_path, index=False, encoding="utf-8")
 write_json(kp_path, {"date":YMD, **(kp_meta or {}), "kimchi_pct": (None if kimchi_pct is None else round(float(kimchi_pct),4))})
 
-# ================== Charts ==================
-# A) 퍼포먼스 바 (Best/Worst와 일관성)
-perf = df.sort_values("price_change_pct", ascending=False)[["sym","price_change_pct"]].reset_index(drop=True)
-plt.figure(figsize=(10.6, 4.6))
-x = range(len(perf)); y = perf["price_change_pct"].values
-colors_v = ["#2E7D32" if (isinstance(v,(int,float)) and v >= 0) else "#C62828" for v in y]
-y_plot = [0.0 if (isinstance(v,float) and np.isnan(v)) else v for v in y]
-plt.bar(x, y_plot, color=colors_v, width=0.82, edgecolor="#263238", linewidth=0.2)
-plt.xticks(x, perf["sym"], rotation=0, fontsize=10)
-plt.axhline(0, linewidth=1, color="#90A4AE")
-if len(y_plot)>0:
-    y_max = max(y_plot); y_min = min(y_plot)
-else:
-    y_max = y_min = 0
-for i, v in enumerate(y):
-    if isinstance(v,float) and np.isnan(v): continue
-    off = (max(y_max,0)*0.03 if v>=0 else -abs(min(y_min,0))*0.03) or (0.25 if v>=0 else -0.25)
-    va  = "bottom" if v>=0 else "top"
-    plt.text(i, v + off, f"{v:+.2f}%", ha="center", va=va, fontsize=10, fontweight="600")
-plt.title("코인별 퍼포먼스 (1D, USD)", fontsize=13, loc="left", pad=10)
-plt.ylabel("%"); plt.tight_layout(); plt.savefig(bar_png, dpi=180); plt.close()
-
-# B) BTC/ETH 7일 추세 (Yahoo Finance API 직접 호출)
-def get_pct_series_yf(ticker, days=8):
-    try:
-        import datetime as _dt3
-        period1 = int((_dt3.datetime.utcnow() - _dt3.timedelta(days=days+2)).timestamp())
-        period2 = int((_dt3.datetime.utcnow() + _dt3.timedelta(days=1)).timestamp())
-        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
-        r = requests.get(
-            url,
-            headers={"User-Agent": "Mozilla/5.0"},
-            params={"interval": "1d", "period1": period1, "period2": period2},
-            timeout=10,
-        )
-        r.raise_for_status()
-        result = r.json()["chart"]["result"][0]
-        closes = [c for c in result["indicators"]["quote"][0]["close"] if c is not None]
-        if not closes: return []
-        base = closes[0]
-        return [(v / base - 1.0) * 100.0 for v in closes]
-    except Exception as e:
-        print(f"[WARN] trend fetch failed for {ticker}: {e}")
-        return []
-
-btc7=get_pct_series_yf("BTC-USD", 8); time.sleep(0.2)
-eth7=get_pct_series_yf("ETH-USD", 8)
-plt.figure(figsize=(10.6, 3.8))
-if btc7: plt.plot(range(len(btc7)), btc7, label="BTC")
-if eth7: plt.plot(range(len(eth7)), eth7, label="ETH")
-if btc7 or eth7: plt.legend(loc="upper left")
-plt.title("BTC & ETH 7일 가격 추세", fontsize=13, loc="left", pad=8)
-plt.ylabel("% (from start)"); plt.tight_layout(); plt.savefig(trend_png, dpi=180); plt.close()
-
 # ================== Returns (backfill_current_basket.csv SSOT 기반) ==================
 HIST_DIR = OUT_DIR / "history"; HIST_DIR.mkdir(parents=True, exist_ok=True)
 
 # 수익률 계산: rows_ssot (backfill_current_basket.csv) 기반
-def period_return_ssot(days: int):
-    if not rows_ssot or len(rows_ssot) < 2:
-        return None
-    try:
-        ref_date = (datetime.strptime(YMD, "%Y-%m-%d") - timedelta(days=days)).strftime("%Y-%m-%d")
-        candidates = [r for r in rows_ssot if r["date"] <= ref_date]
-        if not candidates:
-            return None
-        ref_idx = float(candidates[-1]["level"])
-        cur_idx = float(bm20_now)
-        if ref_idx == 0:
-            return None
-        return (cur_idx / ref_idx - 1.0) * 100.0
-    except Exception:
-        return None
+# SeriesIndex 한 번 생성 → 모든 기간 기준일을 한 번의 searchsorted 로 (비율, 기준: YMD / bm20_now)
+ssot_idx = SeriesIndex.from_rows(rows_ssot if rows_ssot and len(rows_ssot) >= 2 else [])
+RETURNS = ssot_idx.returns(asof=YMD, level=float(bm20_now))
 
-def level_on_or_before_ssot(yyyymmdd: str):
-    candidates = [r for r in (rows_ssot or []) if r["date"] <= yyyymmdd]
-    return float(candidates[-1]["level"]) if candidates else None
+def _ret_pct(h: str):
+    v = RETURNS.get(h)
+    return None if v is None else v * 100.0
 
-RET_1D  = period_return_ssot(1)
-RET_7D  = period_return_ssot(7)
-RET_30D = period_return_ssot(30)
-
-today_dt = datetime.strptime(YMD, "%Y-%m-%d")
-month_start = today_dt.replace(day=1).strftime("%Y-%m-%d")
-year_start  = today_dt.replace(month=1, day=1).strftime("%Y-%m-%d")
-
-lvl_month = level_on_or_before_ssot(month_start)
-lvl_year  = level_on_or_before_ssot(year_start)
-lvl_now   = float(bm20_now)
-RET_MTD = None if not lvl_month or lvl_month==0 else (lvl_now/lvl_month - 1)*100
-RET_YTD = None if not lvl_year  or lvl_year==0  else (lvl_now/lvl_year  - 1)*100
-
-def _to_ratio(x):
-    """Accept percent(12.3), ratio(0.123), string '12.3%' and normalize to ratio(0.123)."""
-    if x is None:
-        return None
-    try:
-        if isinstance(x, str):
-            s = x.strip().replace("%", "")
-            v = float(s)
-            # 문자열이 %였다고 가정
-            return v / 100.0
-        v = float(x)
-        # 2 이상이면 %일 확률이 매우 높음 (예: 82.8 = 82.8%)
-        return v / 100.0 if abs(v) >= 2.0 else v
-    except Exception:
-        return None
+RET_1D  = _ret_pct("1D")
+RET_7D  = _ret_pct("7D")
+RET_30D = _ret_pct("30D")
+RET_MTD = _ret_pct("MTD")
+RET_YTD = _ret_pct("YTD")
 
 
 
@@ -858,11 +764,8 @@ latest_obj = {
     "returns": {
         # ✅ 1D도 ratio로 고정 (레벨 기반이 SSOT)
         "1D": bm20ChangePct,
-        # ✅ 나머지는 들어오는 값이 %든 ratio든 자동으로 ratio로 정규화
-        "7D": _to_ratio(RET_7D),
-        "30D": _to_ratio(RET_30D),
-        "MTD": _to_ratio(RET_MTD),
-        "YTD": _to_ratio(RET_YTD),
+        # ✅ 나머지는 SeriesIndex.returns() 비율 그대로 (7D/30D/MTD/QTD/90D/YTD/1Y/3Y/SI)
+        **{h: v for h, v in RETURNS.items() if h != "1D"},
     },
 
     "breadth": breadth,
@@ -872,6 +775,25 @@ latest_obj = {
     "kimchi_premium_pct": kimchi_pct,
 }
 
+# BM20-KRW (30분 KRW 스냅샷으로 갱신되는 원화 지수) + 김치 조정 스프레드:
+# 같은 바스켓을 메모리의 USD 가격 × USDKRW 와 최근 원화 가격으로 평가 → 추가 요청 없음
+try:
+    from bm20_krw import basket_premium
+    _usdkrw = (kp_meta or {}).get("usdkrw")
+    _krw = basket_premium(
+        dict(zip(df["sym"].str.upper(), df["weight_ratio"].astype(float))),
+        {s: float(p) for s, p in zip(df["sym"].str.upper(), df["current_price"]) if p == p},
+        float(_usdkrw) if _usdkrw else 0.0,
+    )
+    if _krw:
+        latest_obj["bm20Krw"] = _krw
+        if _krw["stale"]:
+            print(f"[WARN] BM20-KRW 스냅샷 {_krw['ageH']}h 전 ({_krw['asOf']}) → basket premium 생략")
+        else:
+            print(f"[OK] BM20-KRW {_krw['level']} (basket premium {_krw['basketPremiumPct']}%)")
+except Exception as e:
+    print(f"[WARN] BM20-KRW spread 계산 실패: {e}")
+
 # series.json
 # bm20_series.json은 yaml의 별도 스텝에서 backfill 업데이트 후 생성 (여기서 저장 안 함)
 LATEST_JSON.write_text(json.dumps(latest_obj, ensure_ascii=False, indent=2), encoding="utf-8")
@@ -881,139 +803,31 @@ print(f"[OK] Written: {LATEST_JSON}")
 # Series JSON은 위에서 rows_ssot 기반으로 이미 저장됨 (중복 저장 제거)
 
 
-# ================== PDF ==================
-styles = getSampleStyleSheet()
-title_style    = ParagraphStyle("Title",    fontName=KOREAN_FONT, fontSize=18, alignment=1, spaceAfter=6)
-subtitle_style = ParagraphStyle("Subtitle", fontName=KOREAN_FONT, fontSize=12.5, alignment=1,
-                                textColor=colors.HexColor("#546E7A"), spaceAfter=12)
-section_h      = ParagraphStyle("SectionH", fontName=KOREAN_FONT, fontSize=13,  alignment=0,
-                                textColor=colors.HexColor("#1A237E"), spaceBefore=4, spaceAfter=8)
-body_style     = ParagraphStyle("Body",     fontName=KOREAN_FONT, fontSize=11,  alignment=0, leading=16)
-small_style    = ParagraphStyle("Small",    fontName=KOREAN_FONT, fontSize=9,   alignment=1, textColor=colors.HexColor("#78909C"))
-
-def card(flowables, pad=10, bg="#FFFFFF", border="#E5E9F0"):
-    tbl = Table([[flowables]], colWidths=[16.4*cm])
-    tbl.setStyle(TableStyle([
-        ("FONTNAME", (0,0), (-1,-1), KOREAN_FONT),
-        ("LEFTPADDING",(0,0),(-1,-1), pad), ("RIGHTPADDING",(0,0),(-1,-1), pad),
-        ("TOPPADDING",(0,0),(-1,-1), pad),  ("BOTTOMPADDING",(0,0),(-1,-1), pad),
-        ("BACKGROUND",(0,0),(-1,-1), colors.HexColor(bg)),
-        ("BOX",(0,0),(-1,-1),0.75, colors.HexColor(border)),
-        ("VALIGN",(0,0),(-1,-1),"TOP"),
-    ]))
-    return tbl
-
-def style_table_basic(t, header_bg="#EEF4FF", box="#CFD8DC", grid="#E5E9F0", fs=10.5):
-    t.setStyle(TableStyle([
-        ("FONTNAME",(0,0),(-1,-1), KOREAN_FONT),
-        ("FONTSIZE",(0,0),(-1,-1), fs),
-        ("BACKGROUND",(0,0),(-1,0), colors.HexColor(header_bg)),
-        ("BOX",(0,0),(-1,-1),0.5, colors.HexColor(box)),
-        ("INNERGRID",(0,0),(-1,-1),0.25, colors.HexColor(grid)),
-        ("ALIGN",(0,0),(-1,-1),"LEFT"),
-        ("VALIGN",(0,0),(-1,-1),"MIDDLE"),
-    ]))
-
-doc = SimpleDocTemplate(str(pdf_path), pagesize=A4,
-                        leftMargin=1.8*cm, rightMargin=1.8*cm,
-                        topMargin=1.6*cm, bottomMargin=1.6*cm)
-
-story = []
-story += [Paragraph("BM20 데일리 리포트 (Yahoo Finance / Custom Weights)", title_style),
-          Paragraph(f"{YMD}", subtitle_style)]
-
-metrics = [
-    ["지수",        f"{bm20_now:,.2f} pt"],
-    ["일간 변동",   f"{bm20_chg:+.2f}%"],
-    ["상승/하락",   f"{num_up} / {num_down}"],
-    ["수익률(1D/7D/30D/MTD/YTD)", f"{pct_fmt(RET_1D)} / {pct_fmt(RET_7D)} / {pct_fmt(RET_30D)} / {pct_fmt(RET_MTD)} / {pct_fmt(RET_YTD)}"],
-    ["김치 프리미엄", kp_text],
-]
-mt = Table(metrics, colWidths=[5.0*cm, 11.0*cm]); style_table_basic(mt)
-story += [card([mt]), Spacer(1, 0.45*cm)]
-
-best_tbl = [["Best 3","등락률"], *[[r["sym"], f"{r['price_change_pct']:+.2f}%"] for _,r in best.iterrows() if not np.isnan(r["price_change_pct"])]]
-worst_tbl= [["Worst 3","등락률"], *[[r["sym"], f"{r['price_change_pct']:+.2f}%"] for _,r in worst.iterrows() if not np.isnan(r["price_change_pct"])]]
-t_best = Table(best_tbl,  colWidths=[8.0*cm, 3.5*cm]); t_worst = Table(worst_tbl, colWidths=[8.0*cm, 3.5*cm])
-style_table_basic(t_best); style_table_basic(t_worst)
-story += [card([Paragraph("Best/Worst (1D, USD)", section_h), Spacer(1,4), t_best, Spacer(1,6), t_worst]),
-          Spacer(1, 0.45*cm)]
-
-perf_block = [Paragraph("코인별 퍼포먼스 (1D, USD)", section_h)]
-if bar_png.exists(): perf_block += [Image(str(bar_png), width=16.0*cm, height=6.6*cm)]
-story += [card(perf_block), Spacer(1, 0.45*cm)]
-
-trend_block = [Paragraph("BTC & ETH 7일 가격 추세", section_h)]
-if trend_png.exists(): trend_block += [Image(str(trend_png), width=16.0*cm, height=5.2*cm)]
-story += [card(trend_block), Spacer(1, 0.45*cm)]
-
-story += [card([Paragraph("BM20 데일리 뉴스", section_h), Spacer(1,2), Paragraph(news.replace("\n","<br/>"), body_style)]),
-          Spacer(1, 0.45*cm)]
-story += [Paragraph("© Blockmedia · Data: Yahoo Finance, Upbit · Funding: Binance & Bybit",
-                    small_style)]
-doc.build(story)
-
-# ================== HTML ==================
-html_tpl = Template(r"""
-<!doctype html><html lang="ko"><head>
-<meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1">
-<title>BM20 데일리 {{ ymd }}</title>
-<style>
-body{font-family:-apple-system,BlinkMacSystemFont,"NanumGothic","Noto Sans CJK","Malgun Gothic",Arial,sans-serif;background:#fafbfc;color:#111;margin:0}
-.wrap{max-width:760px;margin:0 auto;padding:20px}
-.card{background:#fff;border:1px solid #e5e9f0;border-radius:12px;padding:20px;margin-bottom:16px}
-h1{font-size:22px;margin:0 0 8px 0;text-align:center} h2{font-size:15px;margin:16px 0 8px 0;color:#1A237E}
-.muted{color:#555;text-align:center} .center{text-align:center}
-table{width:100%;border-collapse:collapse;font-size:14px} th,td{border:1px solid #e5e9f0;padding:8px} th{background:#eef4ff}
-.footer{font-size:12px;color:#666;text-align:center;margin-top:16px}
-img{max-width:100%}
-</style></head><body>
-<div class="wrap">
-  <div class="card">
-    <h1>BM20 데일리 리포트</h1>
-    <div class="muted">{{ ymd }}</div>
-    <table style="margin-top:10px">
-      <tr><th>지수</th><td>{{ bm20_now }} pt</td></tr>
-      <tr><th>일간 변동</th><td>{{ bm20_chg }}</td></tr>
-      <tr><th>상승/하락</th><td>{{ num_up }} / {{ num_down }}</td></tr>
-      <tr><th>수익률(1D/7D/30D/MTD/YTD)</th><td>{{ ret_1d }} / {{ ret_7d }} / {{ ret_30d }} / {{ ret_mtd }} / {{ ret_ytd }}</td></tr>
-      <tr><th>김치 프리미엄</th><td>{{ kp_text }}</td></tr>
-      <tr><th>펀딩비(Binance)</th><td>{{ bin_text }}</td></tr>
-      {% if byb_text %}<tr><th>펀딩비(Bybit)</th><td>{{ byb_text }}</td></tr>{% endif %}
-    </table>
-  </div>
-  <div class="card">
-    <h2>Best/Worst (1D, USD)</h2>
-    <table><tr><th>Best</th><th style="text-align:right">등락률</th></tr>
-      {% for r in best %}<tr><td>{{ r.sym }}</td><td style="text-align:right">{{ r.pct }}</td></tr>{% endfor %}
-    </table><br>
-    <table><tr><th>Worst</th><th style="text-align:right">등락률</th></tr>
-      {% for r in worst %}<tr><td>{{ r.sym }}</td><td style="text-align:right">{{ r.pct }}</td></tr>{% endfor %}
-    </table>
-  </div>
-  <div class="card">
-    <h2>코인별 퍼포먼스 (1D, USD)</h2>
-    {% if bar_png %}<p class="center"><img src="{{ bar_png }}?v={{ ts }}" alt="Performance"></p>{% endif %}
-    <h2>BTC & ETH 7일 가격 추세</h2>
-    {% if trend_png %}<p class="center"><img src="{{ trend_png }}?v={{ ts }}" alt="Trend"></p>{% endif %}
-  </div>
-  <div class="card"><h2>BM20 데일리 뉴스</h2><p>{{ news_html }}</p></div>
-  <div class="footer">© Blockmedia · Data: Yahoo Finance, Upbit · Funding: Binance & Bybit</div>
-</div></body></html>
-""")
-html = html_tpl.render(
-    ymd=YMD, bm20_now=f"{bm20_now:,.2f}", bm20_chg=f"{bm20_chg:+.2f}%",
-    num_up=num_up, num_down=num_down,
-    ret_1d=pct_fmt(RET_1D), ret_7d=pct_fmt(RET_7D), ret_30d=pct_fmt(RET_30D),
-    ret_mtd=pct_fmt(RET_MTD), ret_ytd=pct_fmt(RET_YTD),
-    kp_text=kp_text,
-    best=[{"sym":r["sym"], "pct": f"{r['price_change_pct']:+.2f}%"} for _,r in best.iterrows() if not np.isnan(r["price_change_pct"])],
-    worst=[{"sym":r["sym"], "pct": f"{r['price_change_pct']:+.2f}%"} for _,r in worst.iterrows() if not np.isnan(r["price_change_pct"])],
-    bar_png=os.path.basename(bar_png), trend_png=os.path.basename(trend_png),
-    news_html=news.replace("\n","<br/>"),
-    ts=TS
-)
-with open(html_path, "w", encoding="utf-8") as f: f.write(html)
+# ================== Render (bar/trend 차트 → PDF, HTML) ==================
+# 계산 결과를 DailyRender 로 고정한 뒤 bm20_render 에서 병렬 렌더
+# (BM20_DASHBOARD_ONLY=1 이면 전부 스킵, BM20_SKIP_ARTIFACTS 로 개별 스킵)
+def _rank_rows(frame):
+    return tuple((r["sym"], f"{r['price_change_pct']:+.2f}%") for _, r in frame.iterrows()
+                 if not np.isnan(r["price_change_pct"]))
+
+if DASHBOARD_ONLY:
+    print("[RENDER] skip: dashboard-only")
+else:
+    import bm20_render
+    perf = df.sort_values("price_change_pct", ascending=False)[["sym","price_change_pct"]]
+    daily_render = bm20_render.DailyRender(
+        ymd=YMD, ts=TS,
+        bar_png=str(bar_png), trend_png=str(trend_png),
+        pdf_path=str(pdf_path), html_path=str(html_path),
+        perf=tuple((s, float(v)) for s, v in zip(perf["sym"], perf["price_change_pct"])),
+        best=_rank_rows(best), worst=_rank_rows(worst),
+        bm20_now=float(bm20_now), bm20_chg=float(bm20_chg),
+        num_up=num_up, num_down=num_down,
+        ret_texts=tuple(pct_fmt(v) for v in (RET_1D, RET_7D, RET_30D, RET_MTD, RET_YTD)),
+        kp_text=kp_text, news=news,
+        chart_format=bm20_render.chart_format_from_env(),
+    )
+    bm20_render.render_artifacts(daily_render, skip=bm20_render.skip_from_env())
 
 # 마지막 단계: 나스닥 데이터 업데이트 실행
 update_market_indices()
@@ -1112,17 +926,9 @@ def _append_market_history():
     # ── cb_premium — kimchi_snapshots.json 당일 평균 ────────────────
     cb_premium = None
     try:
-        kimchi_snap_path = ROOT / "out" / "history" / "kimchi_snapshots.json"
-        if kimchi_snap_path.exists():
-            snaps = json.loads(kimchi_snap_path.read_text(encoding="utf-8"))
-            today_vals = [
-                float(s["cb_premium_pct"])
-                for s in snaps
-                if s.get("timestamp_kst", "")[:10] == YMD
-                and s.get("cb_premium_pct") is not None
-            ]
-            if today_vals:
-                cb_premium = round(sum(today_vals) / len(today_vals), 4)
+        cb_avg = bm20_store.snapshot_avg("kimchi", "$.cb_premium_pct", YMD)
+        if cb_avg is not None:
+            cb_premium = round(cb_avg, 4)
     except Exception as e:
         print(f"[WARN] cb_premium fetch failed: {e}")
 
@@ -1173,6 +979,7 @@ def _append_market_history():
     new_row_df = pd.DataFrame([row], columns=COLUMNS)
     hist_df = pd.concat([hist_df, new_row_df], ignore_index=True)
     hist_df.to_csv(MARKET_HIST_CSV, index=False, encoding="utf-8")
+    bm20_store.sync_table("market_history")
 
     print(
         f"[OK] market_history.csv → {len(hist_df)}행 "
@@ -1213,56 +1020,35 @@ def _append_components_history():
         hist_df = new_df
 
     hist_df.to_csv(COMPONENTS_HIST_CSV, index=False, encoding="utf-8")
+    bm20_store.sync_table("components")
     print(f"[OK] components_history.csv → {len(hist_df)}행 ({YMD}, {len(rows)}종목 추가)")
 
 
 _append_components_history()
 
-# ================== BM20 vs BTC Comparison JSON ==================
+# ================== Attribution JSON (components_history 누적합) ==================
+# market.html 섹터 히트맵 / 기여 코인 → 원본 CSV 대신 표준 구간(1D~SI) 사전계산 JSON
+# sector.html → 같은 날짜 × 심볼 행렬로 섹터 서브지수(동일가중 / BM20가중) 체인 연결 JSON
+_att = None
 try:
-    btc_series_path = ROOT / "btc_usd_series.json"
-    bm20_series_path = Path("bm20_series.json")
-    if btc_series_path.exists() and bm20_series_path.exists():
-        btc_raw  = json.loads(btc_series_path.read_text(encoding="utf-8"))
-        bm20_raw = json.loads(bm20_series_path.read_text(encoding="utf-8"))
-
-        # bm20_series.json 포맷 처리 (list 또는 dict)
-        if isinstance(bm20_raw, list):
-            bm20_d = {r["date"]: r["level"] for r in bm20_raw}
-        elif isinstance(bm20_raw, dict) and "series" in bm20_raw:
-            bm20_d = {r["date"]: r["level"] for r in bm20_raw["series"]}
-        else:
-            bm20_d = {}
+    from bm20_attribution import Attribution, write_windows as _write_attribution
+    _att = Attribution.from_csv(COMPONENTS_HIST_CSV)
+    _write_attribution(HIST_DIR / "attribution_latest.json", att=_att)
+except Exception as e:
+    print(f"[WARN] attribution_latest.json 생성 실패: {e}")
 
-        # btc_usd_series.json 포맷 처리
-        if isinstance(btc_raw, list):
-            btc_d = {r["date"]: r["price"] for r in btc_raw}
-        else:
-            btc_d = {}
-
-        if bm20_d and btc_d:
-            btc_base = btc_d.get("2018-01-01", 1.0)
-            comparison = []
-            last_btc = None
-            for d in sorted(bm20_d.keys()):
-                if d in btc_d:
-                    last_btc = round(btc_d[d] / btc_base * 100, 4)
-                if last_btc is not None:
-                    comparison.append({
-                        "date": d,
-                        "bm20": round(bm20_d[d], 4),
-                        "btc":  last_btc
-                    })
-            comp_path = OUT / "bm20_comparison.json"
-            comp_path.write_text(
-                json.dumps(comparison, separators=(",", ":")),
-                encoding="utf-8"
-            )
-            print(f"[OK] bm20_comparison.json → {len(comparison)}개 ({comparison[-1]['date']})")
-        else:
-            print("[WARN] bm20_comparison.json: 데이터 부족으로 스킵")
-    else:
-        print("[WARN] bm20_comparison.json: btc_usd_series.json 또는 bm20_series.json 없음")
+if _att is not None:
+    try:
+        from bm20_sectors import write_sectors
+        write_sectors(HIST_DIR / "sector_indices.json", att=_att)
+    except Exception as e:
+        print(f"[WARN] sector_indices.json 생성 실패: {e}")
+
+# ================== BM20 vs Benchmarks Comparison JSON ==================
+# BTC · ETH · NASDAQ · KOSPI as-of 조인 + base 재기준 → out/bm20_comparison.json (열 지향)
+try:
+    from bm20_comparison import write_comparison
+    write_comparison(OUT / "bm20_comparison.json")
 except Exception as _ce:
     print(f"[WARN] bm20_comparison.json 생성 실패: {_ce}")
 
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+bm20_price_matrix.py
+====================
+BM20 분석용 일별 종가 매트릭스(날짜 × 코인)를 float64 .npy 로 빌드하고,
+여러 프로세스가 같은 파일을 읽기 전용 memmap 으로 공유하게 한다.
+
+  out/cache/price_matrix/
+    ├─ close.npy      float64 [n_dates × n_tickers], 행=날짜, 열=티커 (NaN = 가격 없음)
+    ├─ dates.json     ["2018-01-01", ...]                         (행 인덱스)
+    ├─ tickers.json   [{"ticker": "BTC-USD", "id": "bitcoin"}, ...] (열 인덱스)
+    └─ meta.json      빌드 구간 / shape / 빌드 시각
+
+- 유니버스: bm20_backtest_build.Q 에 한 번이라도 들어간 모든 코인 (YF 매핑 있는 것)
+- 정제: ffill → COIN_VALID_UNTIL 이후 NaN → 0 이하 가격 NaN (백테스트 필터와 동일 기준)
+- 워커는 경로만 넘겨받아 np.load(mmap_mode="r") → 프레임 피클/복사 없음 (page cache 공유)
+- 파일은 임시 파일에 쓴 뒤 os.replace 로 교체 → 이미 매핑 중인 프로세스는 이전 파일을 계속 본다
+
+실행:
+    python bm20_price_matrix.py build                       # 2018-01-01 ~ 오늘
+    python bm20_price_matrix.py build --start 2020-01-01
+    python bm20_price_matrix.py info
+"""
+
+import argparse, json, os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent
+MATRIX_DIR = Path(os.getenv("BM20_PRICE_MATRIX_DIR", str(ROOT / "out" / "cache" / "price_matrix")))
+
+CLOSE_NPY    = "close.npy"
+DATES_JSON   = "dates.json"
+TICKERS_JSON = "tickers.json"
+META_JSON    = "meta.json"
+
+
+# ══════════════════════════════════════════════════════════════
+# 1. 빌드
+# ══════════════════════════════════════════════════════════════
+
+def universe() -> list[tuple[str, str]]:
+    """Q 전체 기간 유니버스 → [(yf_ticker, coin_id)] (티커 정렬)"""
+    from bm20_backtest_build import Q, YF
+    coins = set()
+    for w in Q.values():
+        coins.update(w.keys())
+    by_ticker = {}
+    for c in sorted(coins):
+        if c in YF:
+            by_ticker.setdefault(YF[c], c)
+    return sorted(by_ticker.items())
+
+def clean_close_frame(prices, ticker_ids: dict):
+    """ffill 된 종가 프레임 정제: 유효기간 이후 / 0 이하 가격은 NaN"""
+    from bm20_backtest_build import COIN_VALID_UNTIL
+    prices = prices.sort_index().ffill()
+    for tkr, cid in ticker_ids.items():
+        until = COIN_VALID_UNTIL.get(cid)
+        if until and tkr in prices.columns:
+            prices.loc[prices.index > until, tkr] = np.nan
+    return prices.where(prices > 0)
+
+def _write_atomic(path: Path, write):
+    tmp = path.with_name(f".{path.name}.tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+def write_matrix(prices, ticker_ids: dict, out_dir: Path = MATRIX_DIR, meta: dict | None = None) -> Path:
+    """pandas 종가 프레임(index=날짜, columns=티커) → close.npy + 인덱스 JSON"""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tickers = [t for t in prices.columns if t in ticker_ids]
+    frame = prices[tickers]
+    close = np.ascontiguousarray(frame.to_numpy(dtype=np.float64))
+    dates = [d.strftime("%Y-%m-%d") for d in frame.index]
+
+    def _save_npy(p: Path):
+        with p.open("wb") as f:
+            np.save(f, close)
+
+    _write_atomic(out_dir / CLOSE_NPY, _save_npy)
+    _write_atomic(out_dir / DATES_JSON,
+                  lambda p: p.write_text(json.dumps(dates), encoding="utf-8"))
+    _write_atomic(out_dir / TICKERS_JSON,
+                  lambda p: p.write_text(json.dumps([{"ticker": t, "id": ticker_ids[t]} for t in tickers],
+                                                    ensure_ascii=False), encoding="utf-8"))
+    meta = {
+        **(meta or {}),
+        "shape": list(close.shape),
+        "dtype": "float64",
+        "first_date": dates[0] if dates else None,
+        "last_date": dates[-1] if dates else None,
+        "built_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    _write_atomic(out_dir / META_JSON,
+                  lambda p: p.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8"))
+    print(f"[SAVED] {out_dir / CLOSE_NPY}  ({close.shape[0]}일 × {close.shape[1]}종목, {close.nbytes:,} bytes)")
+    return out_dir
+
+def build(start: str, end: str, out_dir: Path = MATRIX_DIR) -> Path:
+    from bm20_backtest_build import download_prices
+    pairs = universe()
+    ticker_ids = dict(pairs)
+    prices = download_prices(start, end)
+    prices = clean_close_frame(prices, ticker_ids)
+    return write_matrix(prices, ticker_ids, out_dir, meta={"start": start, "end": end})
+
+
+# ══════════════════════════════════════════════════════════════
+# 2. 읽기 (memmap, 읽기 전용)
+# ══════════════════════════════════════════════════════════════
+
+class PriceMatrix:
+    """close.npy 를 읽기 전용으로 매핑한 뷰. 프로세스 간에는 경로만 넘긴다."""
+
+    def __init__(self, out_dir: Path = MATRIX_DIR):
+        self.dir = Path(out_dir)
+        self.close = np.load(self.dir / CLOSE_NPY, mmap_mode="r")
+        self.dates = json.loads((self.dir / DATES_JSON).read_text(encoding="utf-8"))
+        cols = json.loads((self.dir / TICKERS_JSON).read_text(encoding="utf-8"))
+        self.tickers = [c["ticker"] for c in cols]
+        self.ids = [c["id"] for c in cols]
+        self._col = {t: i for i, t in enumerate(self.tickers)}
+        self._col.update({cid: i for i, cid in enumerate(self.ids)})
+        self._row = {d: i for i, d in enumerate(self.dates)}
+
+    def __reduce__(self):
+        # 워커로 보낼 때 배열이 아니라 경로만 피클
+        return (PriceMatrix, (self.dir,))
+
+    @property
+    def shape(self):
+        return self.close.shape
+
+    def col(self, key: str) -> np.ndarray:
+        """티커 또는 코인 id → 종가 열 (memmap 뷰)"""
+        return self.close[:, self._col[key]]
+
+    def row(self, ymd: str) -> np.ndarray:
+        return self.close[self._row[ymd]]
+
+    def row_index(self, ymd: str) -> int:
+        """ymd 이하 마지막 행 번호 (없으면 -1)"""
+        import bisect
+        return bisect.bisect_right(self.dates, ymd) - 1
+
+    def to_frame(self):
+        """pandas DataFrame 뷰 (index=DatetimeIndex, columns=YF 티커). 값 복사 없음."""
+        import pandas as pd
+        return pd.DataFrame(self.close, index=pd.DatetimeIndex(self.dates),
+                            columns=self.tickers, copy=False)
+
+def load_price_matrix(out_dir: Path = MATRIX_DIR) -> PriceMatrix:
+    return PriceMatrix(out_dir)
+
+
+# ══════════════════════════════════════════════════════════════
+# 3. 진입점
+# ══════════════════════════════════════════════════════════════
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="BM20 가격 매트릭스 (memmap)")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build")
+    b.add_argument("--start", default="2018-01-01")
+    b.add_argument("--end",   default=datetime.today().strftime("%Y-%m-%d"))
+    b.add_argument("--out",   default=str(MATRIX_DIR))
+    i = sub.add_parser("info")
+    i.add_argument("--out",   default=str(MATRIX_DIR))
+    args = p.parse_args()
+
+    if args.cmd == "build":
+        build(args.start, args.end, Path(args.out))
+    else:
+        m = load_price_matrix(Path(args.out))
+        meta = json.loads((m.dir / META_JSON).read_text(encoding="utf-8"))
+        print(json.dumps(meta, ensure_ascii=False, indent=2))
+        print(f"tickers: {', '.join(m.tickers)}")
@@ -0,0 +1,556 @@
+#!/usr/bin/env python3
+# ===================== BM20 Daily — 산출물 렌더 단계 =====================
+# bm20_daily.py 가 숫자 계산을 끝낸 뒤 만든 DailyRender(고정 결과)만 받아서
+# bar 차트 / trend 차트 / PDF / HTML 을 그린다.
+#
+#   bar 차트 ─┐
+#             ├─(둘 다 끝나면)─ PDF       ← 두 차트는 프로세스 풀에서 병렬
+#  trend 차트 ┘                           (trend 는 Yahoo 7일 시세 2건 fetch 포함)
+#   HTML ──────────────────────────────── ← 차트 파일명만 참조 → 바로 시작
+#
+# - 산출물별 스킵: BM20_SKIP_ARTIFACTS="bar,trend,pdf,html" (쉼표 구분, 일부만 가능)
+# - 워커 수: BM20_RENDER_WORKERS (기본 2, 0 이면 프로세스 풀 없이 순차 실행)
+# - 차트 포맷: BM20_CHART_FORMAT=png(기본) | svg
+#     svg → HTML / latest.html 은 압축 SVG(시스템 폰트, 글자는 path 가 아닌 <text>)를 참조.
+#           PNG 는 PDF 삽입용으로만 (삽입 크기 해상도로) 그리고 PDF 를 만든 뒤 지운다 (PDF 스킵이면 아예 안 그림)
+# - PDF: 차트 PNG 는 삽입 크기 × BM20_PDF_DPI(기본 150, 0 이면 원본 그대로)로 줄여 32색 팔레트로 넣고,
+#        한글 폰트는 KS X 1001 글자만 남긴 서브셋을 out/cache/fonts/ 에 한 번 만들어 재사용
+#        (fontTools 가 없거나 본문에 서브셋 밖 글자가 있으면 원본 TTF)
+# - 무거운 의존성(matplotlib / reportlab / jinja2)은 각 렌더 함수 안에서만 import
+
+import hashlib, io, os, re, time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import lru_cache
+
+import requests
+
+ARTIFACTS = ("bar", "trend", "pdf", "html")
+CHART_FORMATS = ("png", "svg")
+
+
+@dataclass(frozen=True)
+class DailyRender:
+    """렌더에 필요한 계산 결과 스냅샷 (불변, 워커로 피클 가능한 값만)"""
+    ymd: str
+    ts: str
+    bar_png: str
+    trend_png: str
+    pdf_path: str
+    html_path: str
+    perf: tuple           # ((sym, 1D 등락률 %), ...) 등락률 내림차순, NaN 포함
+    best: tuple           # ((sym, "+1.23%"), ...) NaN 제외
+    worst: tuple
+    bm20_now: float
+    bm20_chg: float
+    num_up: int
+    num_down: int
+    ret_texts: tuple      # (1D, 7D, 30D, MTD, YTD) 표시 문자열 ("+0.12%" / "-")
+    kp_text: str
+    news: str
+    chart_format: str = "png"   # HTML 이 참조할 차트 포맷 ("png" | "svg")
+    raster: bool = True         # PNG 도 그릴지 (svg 모드에서는 PDF 를 만들 때만)
+
+
+def skip_from_env() -> frozenset:
+    raw = os.getenv("BM20_SKIP_ARTIFACTS", "")
+    skip = frozenset(s.strip().lower() for s in raw.split(",") if s.strip())
+    unknown = skip - set(ARTIFACTS)
+    if unknown:
+        print(f"[WARN] BM20_SKIP_ARTIFACTS: 알 수 없는 항목 무시 {sorted(unknown)}")
+    return skip & set(ARTIFACTS)
+
+def chart_format_from_env() -> str:
+    fmt = os.getenv("BM20_CHART_FORMAT", "png").strip().lower() or "png"
+    if fmt not in CHART_FORMATS:
+        print(f"[WARN] BM20_CHART_FORMAT: 알 수 없는 포맷 {fmt!r} → png")
+        return "png"
+    return fmt
+
+def svg_path(png_path: str) -> str:
+    return os.path.splitext(png_path)[0] + ".svg"
+
+
+# ================== Fonts (Nanum 우선, 실패 시 CID) — 첫 렌더 때 한 번만 등록 ==================
+NANUM_PATH = "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"
+FONT_CACHE_DIR = os.getenv("BM20_FONT_CACHE_DIR",
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), "out", "cache", "fonts"))
+FONT_SUBSET_VERSION = 1   # 글자 범위/옵션을 바꾸면 올린다 (캐시 파일명에 들어감)
+
+def _in_subset(cp: int) -> bool:
+    """서브셋에 남기는 글자인지: ASCII + Latin-1 + KS X 1001(EUC-KR) 전체 (한글 2,350자·한자·기호)"""
+    if 0x20 <= cp < 0x7F or 0xA0 <= cp < 0x100:
+        return True
+    try:
+        chr(cp).encode("euc-kr")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+@lru_cache(maxsize=None)
+def _font_subset(path: str) -> str | None:
+    """TTF → KS X 1001 서브셋 경로 (캐시, 원본 내용 해시로 구분). fontTools 가 없거나 실패하면 None"""
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:12]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    out = os.path.join(FONT_CACHE_DIR, f"{stem}-ksx1001-v{FONT_SUBSET_VERSION}-{digest}.ttf")
+    if os.path.exists(out):
+        return out
+    try:
+        from fontTools import subset
+        from fontTools.ttLib import TTFont as FTFont
+    except ImportError:
+        return None
+    try:
+        t0 = time.perf_counter()
+        opts = subset.Options()
+        opts.layout_features = []     # reportlab 은 GSUB/GPOS 를 쓰지 않는다
+        opts.hinting = False
+        opts.name_IDs = ["*"]
+        opts.notdef_outline = True
+        font = FTFont(path)
+        sub = subset.Subsetter(opts)
+        sub.populate(unicodes=[cp for cp in range(0x20, 0x10000) if _in_subset(cp)])
+        sub.subset(font)
+        os.makedirs(FONT_CACHE_DIR, exist_ok=True)
+        tmp = f"{out}.tmp"
+        font.save(tmp)
+        os.replace(tmp, out)
+    except Exception as e:
+        print(f"[WARN] 폰트 서브셋 생성 실패 → 원본 TTF 사용: {e}")
+        return None
+    print(f"[PDF] 폰트 서브셋 생성: {out} ({os.path.getsize(path):,} → {os.path.getsize(out):,} bytes, "
+          f"{time.perf_counter() - t0:.2f}s)")
+    return out
+
+@lru_cache(maxsize=None)
+def _register_font(name: str, path: str | None = None) -> str:
+    """reportlab 폰트 등록 (이름별 한 번) → 폰트 이름. path 가 없으면 CID 폰트"""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    from reportlab.pdfbase.ttfonts import TTFont
+    pdfmetrics.registerFont(TTFont(name, path) if path else UnicodeCIDFont(name))
+    return name
+
+def _pdf_font(text: str = "") -> str:
+    """reportlab 한글 폰트 등록 → 폰트 이름 (text 에 서브셋 밖 글자가 있으면 원본 TTF)"""
+    try:
+        if not os.path.exists(NANUM_PATH):
+            return _register_font("HYSMyeongJo-Medium")
+        sub = _font_subset(NANUM_PATH)
+        font = _register_font("NanumGothic", sub or NANUM_PATH)
+        if sub:
+            missing = sorted({c for c in text if ord(c) >= 0x20 and not _in_subset(ord(c))})
+            if missing:
+                print(f"INFO: PDF 본문에 서브셋 밖 글자 {len(missing)}개 ({''.join(missing[:10])}) → 원본 TTF")
+                font = _register_font("NanumGothicFull", NANUM_PATH)
+        return font
+    except Exception:
+        return _register_font("HYSMyeongJo-Medium")
+
+@lru_cache(maxsize=None)
+def _pyplot():
+    """matplotlib(Agg) + 한글 폰트 설정 → pyplot 모듈"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import matplotlib.font_manager as fm
+    try:
+        if os.path.exists(NANUM_PATH):
+            fm.fontManager.addfont(NANUM_PATH); plt.rcParams["font.family"] = "NanumGothic"
+        plt.rcParams["axes.unicode_minus"] = False
+    except Exception:
+        plt.rcParams["axes.unicode_minus"] = False
+    return plt
+
+
+# ================== Charts ==================
+# 시스템 폰트 스택: <text> 로 남긴 글자는 보는 쪽 브라우저 폰트로 그린다
+SVG_FONT_STACK = "NanumGothic,'Noto Sans CJK KR','Apple SD Gothic Neo','Malgun Gothic',Arial,sans-serif"
+_SVG_REF = re.compile(r'(?:url\(#|href="#)([^)"]+)')
+_SVG_NUM = re.compile(r"\d+\.\d+")
+
+def _svg_num(m) -> str:
+    return f"{float(m.group(0)):.2f}".rstrip("0").rstrip(".")
+
+def _unwrap_bare_groups(svg: str) -> str:
+    """속성 없는 <g>…</g> 는 렌더에 영향이 없으므로 태그만 벗긴다 (id 제거 후 대부분이 이렇다)"""
+    out, stack, pos = [], [], 0
+    for m in re.finditer(r"<g>|<g\s[^>]*>|</g>", svg):
+        out.append(svg[pos:m.start()]); pos = m.end()
+        tag = m.group(0)
+        if tag == "</g>":
+            if stack.pop(): out.append(tag)
+        else:
+            stack.append(tag != "<g>")
+            if tag != "<g>": out.append(tag)
+    out.append(svg[pos:])
+    return "".join(out)
+
+def minify_svg(svg: str) -> str:
+    """matplotlib SVG → 압축 SVG (메타데이터/주석/미참조 id 제거, 좌표 소수 2자리, 공백 축약,
+    요소별 font-family 대신 <style> 한 줄)"""
+    svg = re.sub(r"<\?xml[^>]*\?>|<!DOCTYPE[^>]*>|<!--.*?-->|<metadata>.*?</metadata>", "", svg, flags=re.S)
+    refs = set(_SVG_REF.findall(svg))
+    svg = re.sub(r' id="([^"]+)"', lambda m: m.group(0) if m.group(1) in refs else "", svg)
+    svg = re.sub(r'="[^"]*"', lambda m: _SVG_NUM.sub(_svg_num, m.group(0)), svg)  # 라벨 글자는 건드리지 않음
+    svg = re.sub(r'font-family:[^;"]*;? ?', "", svg)
+    svg = re.sub(r' transform="rotate\(-?0 [^)]*\)"', "", svg)
+    svg = re.sub(r"\s+", " ", svg)
+    svg = re.sub(r">\s+<", "><", svg)
+    svg = re.sub(r' d="[^"]*"', lambda m: re.sub(r" ?([MLCQZz]) ?", r"\1", m.group(0)[4:-1]).join((' d="', '"')), svg)
+    svg = re.sub(r' style="[^"]*"', lambda m: re.sub(r'(?<=[:;]) | (?=[;"])|;(?=")', "", m.group(0)), svg)
+    svg = _unwrap_bare_groups(svg)
+    svg = svg.replace("*{stroke-linejoin: round; stroke-linecap: butt}",
+                      f"*{{stroke-linejoin:round;stroke-linecap:butt}}text{{font-family:{SVG_FONT_STACK}}}")
+    return svg.strip()
+
+def _save_chart(plt, png_path: str, r: DailyRender) -> str:
+    """현재 figure 저장 → HTML 이 참조할 경로 (svg 모드면 .svg)"""
+    out = png_path
+    if r.chart_format == "svg":
+        buf = io.StringIO()
+        with plt.rc_context({"svg.fonttype": "none", "svg.hashsalt": "bm20"}):
+            plt.savefig(buf, format="svg", metadata={"Date": None, "Creator": None})
+        out = svg_path(png_path)
+        with open(out, "w", encoding="utf-8") as f: f.write(minify_svg(buf.getvalue()))
+    if r.raster:
+        plt.savefig(png_path, dpi=_raster_dpi(plt, r))
+    plt.close()
+    return out
+
+def _raster_dpi(plt, r: DailyRender) -> float:
+    """PNG 저장 dpi. svg 모드의 PNG 는 PDF 삽입용뿐이라 삽입 폭 × BM20_PDF_DPI 에 맞춰 바로 그린다"""
+    pdf_dpi = pdf_dpi_from_env()
+    if r.chart_format != "svg" or pdf_dpi <= 0:
+        return 180
+    return pdf_dpi * PDF_CHART_WIDTH_CM / 2.54 / plt.gcf().get_size_inches()[0]
+
+# A) 퍼포먼스 바 (Best/Worst와 일관성)
+def render_bar(r: DailyRender) -> str:
+    plt = _pyplot()
+    syms = [s for s, _ in r.perf]
+    y = [v for _, v in r.perf]
+    plt.figure(figsize=(10.6, 4.6))
+    x = range(len(y))
+    colors_v = ["#2E7D32" if (isinstance(v,(int,float)) and v >= 0) else "#C62828" for v in y]
+    y_plot = [0.0 if (isinstance(v,float) and v != v) else v for v in y]
+    plt.bar(x, y_plot, color=colors_v, width=0.82, edgecolor="#263238", linewidth=0.2)
+    plt.xticks(x, syms, rotation=0, fontsize=10)
+    plt.axhline(0, linewidth=1, color="#90A4AE")
+    if len(y_plot)>0:
+        y_max = max(y_plot); y_min = min(y_plot)
+    else:
+        y_max = y_min = 0
+    for i, v in enumerate(y):
+        if isinstance(v,float) and v != v: continue
+        off = (max(y_max,0)*0.03 if v>=0 else -abs(min(y_min,0))*0.03) or (0.25 if v>=0 else -0.25)
+        va  = "bottom" if v>=0 else "top"
+        plt.text(i, v + off, f"{v:+.2f}%", ha="center", va=va, fontsize=10, fontweight="600")
+    plt.title("코인별 퍼포먼스 (1D, USD)", fontsize=13, loc="left", pad=10)
+    plt.ylabel("%"); plt.tight_layout()
+    return _save_chart(plt, r.bar_png, r)
+
+# B) BTC/ETH 7일 추세 (Yahoo Finance API 직접 호출)
+def get_pct_series_yf(ticker, days=8):
+    try:
+        import datetime as _dt3
+        period1 = int((_dt3.datetime.utcnow() - _dt3.timedelta(days=days+2)).timestamp())
+        period2 = int((_dt3.datetime.utcnow() + _dt3.timedelta(days=1)).timestamp())
+        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
+        r = requests.get(
+            url,
+            headers={"User-Agent": "Mozilla/5.0"},
+            params={"interval": "1d", "period1": period1, "period2": period2},
+            timeout=10,
+        )
+        r.raise_for_status()
+        result = r.json()["chart"]["result"][0]
+        closes = [c for c in result["indicators"]["quote"][0]["close"] if c is not None]
+        if not closes: return []
+        base = closes[0]
+        return [(v / base - 1.0) * 100.0 for v in closes]
+    except Exception as e:
+        print(f"[WARN] trend fetch failed for {ticker}: {e}")
+        return []
+
+def render_trend(r: DailyRender) -> str:
+    btc7=get_pct_series_yf("BTC-USD", 8); time.sleep(0.2)
+    eth7=get_pct_series_yf("ETH-USD", 8)
+    plt = _pyplot()
+    plt.figure(figsize=(10.6, 3.8))
+    if btc7: plt.plot(range(len(btc7)), btc7, label="BTC")
+    if eth7: plt.plot(range(len(eth7)), eth7, label="ETH")
+    if btc7 or eth7: plt.legend(loc="upper left")
+    plt.title("BTC & ETH 7일 가격 추세", fontsize=13, loc="left", pad=8)
+    plt.ylabel("% (from start)"); plt.tight_layout()
+    return _save_chart(plt, r.trend_png, r)
+
+
+# ================== PDF ==================
+PDF_DPI = 150        # 차트 삽입 해상도 (BM20_PDF_DPI 로 조정, 0 이면 PNG 원본 그대로)
+PDF_COLORS = 32      # 차트는 단색 면 + 글자라 32색 팔레트로 충분
+PDF_CHART_WIDTH_CM = 16.0
+
+def pdf_dpi_from_env() -> int:
+    raw = os.getenv("BM20_PDF_DPI", "").strip()
+    if not raw:
+        return PDF_DPI
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        print(f"[WARN] BM20_PDF_DPI: 정수가 아님 {raw!r} → {PDF_DPI}")
+        return PDF_DPI
+
+@lru_cache(maxsize=None)
+def _pdf_styles(font: str) -> dict:
+    """문단/표 스타일 (폰트별 한 번 생성해 모든 카드·표가 공유)"""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.platypus import TableStyle
+    pad = 10
+    return {
+        "title":    ParagraphStyle("Title",    fontName=font, fontSize=18, alignment=1, spaceAfter=6),
+        "subtitle": ParagraphStyle("Subtitle", fontName=font, fontSize=12.5, alignment=1,
+                                   textColor=colors.HexColor("#546E7A"), spaceAfter=12),
+        "section":  ParagraphStyle("SectionH", fontName=font, fontSize=13,  alignment=0,
+                                   textColor=colors.HexColor("#1A237E"), spaceBefore=4, spaceAfter=8),
+        "body":     ParagraphStyle("Body",     fontName=font, fontSize=11,  alignment=0, leading=16),
+        "small":    ParagraphStyle("Small",    fontName=font, fontSize=9,   alignment=1,
+                                   textColor=colors.HexColor("#78909C")),
+        "card": TableStyle([
+            ("FONTNAME", (0,0), (-1,-1), font),
+            ("LEFTPADDING",(0,0),(-1,-1), pad), ("RIGHTPADDING",(0,0),(-1,-1), pad),
+            ("TOPPADDING",(0,0),(-1,-1), pad),  ("BOTTOMPADDING",(0,0),(-1,-1), pad),
+            ("BACKGROUND",(0,0),(-1,-1), colors.HexColor("#FFFFFF")),
+            ("BOX",(0,0),(-1,-1),0.75, colors.HexColor("#E5E9F0")),
+            ("VALIGN",(0,0),(-1,-1),"TOP"),
+        ]),
+        "table": TableStyle([
+            ("FONTNAME",(0,0),(-1,-1), font),
+            ("FONTSIZE",(0,0),(-1,-1), 10.5),
+            ("BACKGROUND",(0,0),(-1,0), colors.HexColor("#EEF4FF")),
+            ("BOX",(0,0),(-1,-1),0.5, colors.HexColor("#CFD8DC")),
+            ("INNERGRID",(0,0),(-1,-1),0.25, colors.HexColor("#E5E9F0")),
+            ("ALIGN",(0,0),(-1,-1),"LEFT"),
+            ("VALIGN",(0,0),(-1,-1),"MIDDLE"),
+        ]),
+    }
+
+def _pdf_image(path: str, width: float, height: float, dpi: int):
+    """차트 PNG → 삽입 크기(pt) × dpi 로 줄인 팔레트 PNG Image. dpi=0 / PIL 없음이면 원본 그대로"""
+    from reportlab.platypus import Image
+    try:
+        from PIL import Image as PILImage
+    except ImportError:
+        dpi = 0
+    if dpi <= 0:
+        return Image(path, width=width, height=height)
+    size = (round(width / 72 * dpi), round(height / 72 * dpi))
+    with PILImage.open(path) as im:
+        im = im.convert("RGB")
+        if im.width > size[0]:
+            im = im.resize(size, PILImage.LANCZOS, reducing_gap=2.0)
+        im = im.quantize(PDF_COLORS, method=PILImage.Quantize.FASTOCTREE, dither=PILImage.Dither.NONE)
+    buf = io.BytesIO()   # reportlab 이 다시 압축하므로 PNG 인코딩은 가볍게
+    im.save(buf, format="PNG", compress_level=1)
+    buf.seek(0)
+    return Image(buf, width=width, height=height)
+
+def render_pdf(r: DailyRender) -> str:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+    t0 = time.perf_counter()
+    metrics = [
+        ["지수",        f"{r.bm20_now:,.2f} pt"],
+        ["일간 변동",   f"{r.bm20_chg:+.2f}%"],
+        ["상승/하락",   f"{r.num_up} / {r.num_down}"],
+        ["수익률(1D/7D/30D/MTD/YTD)", " / ".join(r.ret_texts)],
+        ["김치 프리미엄", r.kp_text],
+    ]
+    best_tbl = [["Best 3","등락률"], *[[s, p] for s, p in r.best]]
+    worst_tbl= [["Worst 3","등락률"], *[[s, p] for s, p in r.worst]]
+    # 본문 글자를 미리 모아 서브셋 폰트로 충분한지 확인
+    text = r.news + "".join(c for row in (*metrics, *best_tbl, *worst_tbl) for c in row)
+    font = _pdf_font(text)
+    st = _pdf_styles(font)
+    dpi = pdf_dpi_from_env()
+
+    def card(flowables):
+        tbl = Table([[flowables]], colWidths=[16.4*cm])
+        tbl.setStyle(st["card"])
+        return tbl
+
+    def table(rows, col_widths):
+        t = Table(rows, colWidths=col_widths)
+        t.setStyle(st["table"])
+        return t
+
+    doc = SimpleDocTemplate(r.pdf_path, pagesize=A4,
+                            leftMargin=1.8*cm, rightMargin=1.8*cm,
+                            topMargin=1.6*cm, bottomMargin=1.6*cm)
+
+    story = []
+    story += [Paragraph("BM20 데일리 리포트 (Yahoo Finance / Custom Weights)", st["title"]),
+              Paragraph(f"{r.ymd}", st["subtitle"])]
+
+    story += [card([table(metrics, [5.0*cm, 11.0*cm])]), Spacer(1, 0.45*cm)]
+
+    t_best = table(best_tbl, [8.0*cm, 3.5*cm]); t_worst = table(worst_tbl, [8.0*cm, 3.5*cm])
+    story += [card([Paragraph("Best/Worst (1D, USD)", st["section"]), Spacer(1,4), t_best, Spacer(1,6), t_worst]),
+              Spacer(1, 0.45*cm)]
+
+    perf_block = [Paragraph("코인별 퍼포먼스 (1D, USD)", st["section"])]
+    if os.path.exists(r.bar_png): perf_block += [_pdf_image(r.bar_png, PDF_CHART_WIDTH_CM*cm, 6.6*cm, dpi)]
+    story += [card(perf_block), Spacer(1, 0.45*cm)]
+
+    trend_block = [Paragraph("BTC & ETH 7일 가격 추세", st["section"])]
+    if os.path.exists(r.trend_png): trend_block += [_pdf_image(r.trend_png, PDF_CHART_WIDTH_CM*cm, 5.2*cm, dpi)]
+    story += [card(trend_block), Spacer(1, 0.45*cm)]
+
+    story += [card([Paragraph("BM20 데일리 뉴스", st["section"]), Spacer(1,2),
+                    Paragraph(r.news.replace("\n","<br/>"), st["body"])]),
+              Spacer(1, 0.45*cm)]
+    story += [Paragraph("© Blockmedia · Data: Yahoo Finance, Upbit · Funding: Binance & Bybit",
+                        st["small"])]
+    doc.build(story)
+    print(f"[PDF] {r.pdf_path}: {os.path.getsize(r.pdf_path):,} bytes in {time.perf_counter() - t0:.2f}s "
+          f"(font={font}, charts={'원본' if dpi <= 0 else f'{dpi}dpi/{PDF_COLORS}색'})")
+    return r.pdf_path
+
+
+# ================== HTML ==================
+HTML_TPL = r"""
+<!doctype html><html lang="ko"><head>
+<meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1">
+<title>BM20 데일리 {{ ymd }}</title>
+<style>
+body{font-family:-apple-system,BlinkMacSystemFont,"NanumGothic","Noto Sans CJK","Malgun Gothic",Arial,sans-serif;background:#fafbfc;color:#111;margin:0}
+.wrap{max-width:760px;margin:0 auto;padding:20px}
+.card{background:#fff;border:1px solid #e5e9f0;border-radius:12px;padding:20px;margin-bottom:16px}
+h1{font-size:22px;margin:0 0 8px 0;text-align:center} h2{font-size:15px;margin:16px 0 8px 0;color:#1A237E}
+.muted{color:#555;text-align:center} .center{text-align:center}
+table{width:100%;border-collapse:collapse;font-size:14px} th,td{border:1px solid #e5e9f0;padding:8px} th{background:#eef4ff}
+.footer{font-size:12px;color:#666;text-align:center;margin-top:16px}
+img{max-width:100%}
+</style></head><body>
+<div class="wrap">
+  <div class="card">
+    <h1>BM20 데일리 리포트</h1>
+    <div class="muted">{{ ymd }}</div>
+    <table style="margin-top:10px">
+      <tr><th>지수</th><td>{{ bm20_now }} pt</td></tr>
+      <tr><th>일간 변동</th><td>{{ bm20_chg }}</td></tr>
+      <tr><th>상승/하락</th><td>{{ num_up }} / {{ num_down }}</td></tr>
+      <tr><th>수익률(1D/7D/30D/MTD/YTD)</th><td>{{ ret_1d }} / {{ ret_7d }} / {{ ret_30d }} / {{ ret_mtd }} / {{ ret_ytd }}</td></tr>
+      <tr><th>김치 프리미엄</th><td>{{ kp_text }}</td></tr>
+      <tr><th>펀딩비(Binance)</th><td>{{ bin_text }}</td></tr>
+      {% if byb_text %}<tr><th>펀딩비(Bybit)</th><td>{{ byb_text }}</td></tr>{% endif %}
+    </table>
+  </div>
+  <div class="card">
+    <h2>Best/Worst (1D, USD)</h2>
+    <table><tr><th>Best</th><th style="text-align:right">등락률</th></tr>
+      {% for r in best %}<tr><td>{{ r.sym }}</td><td style="text-align:right">{{ r.pct }}</td></tr>{% endfor %}
+    </table><br>
+    <table><tr><th>Worst</th><th style="text-align:right">등락률</th></tr>
+      {% for r in worst %}<tr><td>{{ r.sym }}</td><td style="text-align:right">{{ r.pct }}</td></tr>{% endfor %}
+    </table>
+  </div>
+  <div class="card">
+    <h2>코인별 퍼포먼스 (1D, USD)</h2>
+    {% if bar_img %}<p class="center"><img src="{{ bar_img }}?v={{ ts }}" alt="Performance"></p>{% endif %}
+    <h2>BTC & ETH 7일 가격 추세</h2>
+    {% if trend_img %}<p class="center"><img src="{{ trend_img }}?v={{ ts }}" alt="Trend"></p>{% endif %}
+  </div>
+  <div class="card"><h2>BM20 데일리 뉴스</h2><p>{{ news_html }}</p></div>
+  <div class="footer">© Blockmedia · Data: Yahoo Finance, Upbit · Funding: Binance & Bybit</div>
+</div></body></html>
+"""
+
+def render_html(r: DailyRender) -> str:
+    from jinja2 import Template
+
+    ret_1d, ret_7d, ret_30d, ret_mtd, ret_ytd = r.ret_texts
+    chart = svg_path if r.chart_format == "svg" else (lambda p: p)
+    html = Template(HTML_TPL).render(
+        ymd=r.ymd, bm20_now=f"{r.bm20_now:,.2f}", bm20_chg=f"{r.bm20_chg:+.2f}%",
+        num_up=r.num_up, num_down=r.num_down,
+        ret_1d=ret_1d, ret_7d=ret_7d, ret_30d=ret_30d, ret_mtd=ret_mtd, ret_ytd=ret_ytd,
+        kp_text=r.kp_text,
+        best=[{"sym": s, "pct": p} for s, p in r.best],
+        worst=[{"sym": s, "pct": p} for s, p in r.worst],
+        bar_img=os.path.basename(chart(r.bar_png)), trend_img=os.path.basename(chart(r.trend_png)),
+        news_html=r.news.replace("\n","<br/>"),
+        ts=r.ts
+    )
+    with open(r.html_path, "w", encoding="utf-8") as f: f.write(html)
+    return r.html_path
+
+
+# ================== Stage ==================
+def _pool():
+    """차트 워커 풀. fork 로 띄워 bm20_daily.py 본문이 워커에서 다시 실행되지 않게 한다."""
+    import multiprocessing as mp
+    workers = int(os.getenv("BM20_RENDER_WORKERS", "2"))
+    if workers <= 0 or "fork" not in mp.get_all_start_methods():
+        return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("fork"))
+
+def render_artifacts(r: DailyRender, skip=frozenset()) -> dict:
+    """렌더 단계 실행 → {산출물: 경로}. 실패한 산출물은 경고 후 건너뛰고 나머지는 계속."""
+    todo = [a for a in ARTIFACTS if a not in skip]
+    if skip:
+        print(f"[RENDER] skip: {', '.join(a for a in ARTIFACTS if a in skip)}")
+    if not todo:
+        return {}
+
+    if r.chart_format == "svg":
+        r = replace(r, raster="pdf" in todo)
+
+    t0 = time.perf_counter()
+    done, timing = {}, {}
+    pool = _pool() if ("bar" in todo or "trend" in todo) else None
+    io_pool = ThreadPoolExecutor(max_workers=2)
+
+    def _submit(fn, *ex):
+        start = time.perf_counter()
+        fut = (ex[0] if ex else io_pool).submit(fn, r)
+        fut.add_done_callback(lambda _f, s=start, n=fn.__name__: timing.__setitem__(n, time.perf_counter() - s))
+        return fut
+
+    def _collect(name, fut):
+        try:
+            done[name] = fut.result()
+        except Exception as e:
+            print(f"[WARN] {name} 렌더 실패: {e}")
+
+    try:
+        charts = {}
+        for name, fn in (("bar", render_bar), ("trend", render_trend)):
+            if name in todo:
+                charts[name] = _submit(fn, pool) if pool else None
+        # HTML 은 차트 파일명만 쓰므로 차트를 기다리지 않는다
+        html_fut = _submit(render_html) if "html" in todo else None
+
+        for name, fut in charts.items():
+            if fut is None:  # 풀 없이 순차
+                fut = _submit(render_bar if name == "bar" else render_trend)
+            _collect(name, fut)
+        # PDF 는 두 PNG 를 삽입하므로 차트가 끝난 뒤
+        if "pdf" in todo:
+            _collect("pdf", _submit(render_pdf))
+            if r.chart_format == "svg":   # PDF 삽입용 PNG 는 게시하지 않는다
+                for p in (r.bar_png, r.trend_png):
+                    if os.path.exists(p): os.remove(p)
+        if html_fut is not None:
+            _collect("html", html_fut)
+    finally:
+        io_pool.shutdown(wait=True)
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    parts = " ".join(f"{k.replace('render_', '')}={v:.2f}s" for k, v in timing.items())
+    print(f"[RENDER] {len(done)}/{len(todo)} done in {time.perf_counter() - t0:.2f}s ({parts})")
+    return done
@@ -0,0 +1,506 @@
+/*
+ * coin.js — 코인 시세 페이지 공용 스크립트
+ * ─────────────────────────────────────────
+ * coins/*-chart.html (scripts/build_coin_pages.py 가 생성) 이 함께 불러간다.
+ * 코인별 값은 페이지의 window.COIN 한 곳에만 있다:
+ *
+ *   symbol / name / glyph        표시용
+ *   venue, pair                  가격·캔들 거래소 (binance | bybit) 와 USDT 페어
+ *   upbit                        업비트 마켓 (KRW-XXX) — 있으면 원화 가격 + 김치 프리미엄
+ *   listed                       '전체' 구간 시작일 (YYYY-MM-DD)
+ *   dp                           (선택) USD 가격 소수 자릿수 고정 — 없으면 가격 크기로 결정
+ *   paprika                      CoinPaprika ticker id (기본 정보 카드)
+ *   fdv                          (선택) 'mktcap' 이면 FDV 를 시가총액으로 표시 — 없으면 (최대|총) 공급량 × 가격
+ *   news.coin_tag / news.tags    블록미디어 WP 태그 id
+ *   etf                          (선택) data/etf_<etf>_{metrics,history}.json
+ *   volume                       (선택) 거래소별 24H 거래량 [binance|bybit|coinbase|upbit|hyperliquid]
+ *
+ * 코인 전용 위젯(coins/assets/extra/*.js)은 window.CoinPage 의 헬퍼를 쓴다.
+ */
+(function () {
+'use strict';
+
+const COIN = window.COIN;
+const isDark = window.matchMedia('(prefers-color-scheme: dark)').matches;
+
+const C = {
+  bg:      isDark ? '#111110' : '#ffffff',
+  grid:    isDark ? 'rgba(255,255,255,0.04)' : 'rgba(0,0,0,0.04)',
+  border:  isDark ? '#333331' : '#e0dfdb',
+  text:    isDark ? '#666564' : '#9a9894',
+  up:      '#3B6D11',
+  down:    '#A32D2D',
+  line:    isDark ? '#5ba3e8' : '#337abd',
+  fillTop: isDark ? 'rgba(29,158,117,0.18)' : 'rgba(15,110,86,0.10)',
+  fillBot: 'rgba(0,0,0,0)',
+};
+const FONT = 'Arial, sans-serif';
+const DAY = 86400000;
+
+const $ = id => document.getElementById(id);
+function setText(id, text, cls) {
+  const el = $(id);
+  if (!el) return null;
+  el.textContent = text;
+  if (cls !== undefined) el.className = cls;
+  return el;
+}
+async function getJSON(url, opts) {
+  const r = await fetch(url, opts);
+  if (!r.ok) throw new Error(r.status + ' ' + url);
+  return r.json();
+}
+const signPct = v => (v >= 0 ? '+' : '') + v.toFixed(2) + '%';
+const upDown = v => (v >= 0 ? 'up' : 'down');
+
+// ── 숫자 포맷 ────────────────────────────────────────────────
+function priceDp(v) {
+  if (COIN.dp != null) return COIN.dp;
+  const a = Math.abs(v);
+  return a >= 1000 ? 0 : a >= 10 ? 2 : a >= 1 ? 3 : a >= 0.01 ? 4 : a >= 0.0001 ? 6 : 8;
+}
+function fmtNum(v) {
+  const dp = priceDp(v);
+  return dp === 0 ? Math.round(v).toLocaleString() : v.toFixed(dp);
+}
+function fmtUsd(v) {
+  if (!v || isNaN(v)) return '—';
+  return '$' + fmtNum(v);
+}
+function fmtKrw(v) {
+  if (!v || isNaN(v)) return '—';
+  if (v >= 100) return Math.round(v).toLocaleString() + ' 원';
+  return v.toFixed(v < 1 ? 4 : 2) + ' 원';
+}
+function fmtVol(usd) {
+  if (!usd || isNaN(usd)) return '—';
+  return usd >= 1e9 ? '$' + (usd/1e9).toFixed(2) + 'B' : '$' + (usd/1e6).toFixed(0) + 'M';
+}
+function fmtCap(v) {
+  if (!v) return '-';
+  if (v >= 1e12) return '$' + (v/1e12).toFixed(2) + 'T';
+  if (v >= 1e9)  return '$' + (v/1e9).toFixed(2) + 'B';
+  if (v >= 1e6)  return '$' + (v/1e6).toFixed(0) + 'M';
+  return '$' + Math.round(v).toLocaleString();
+}
+function fmtSupply(v) {
+  if (!v) return '-';
+  if (v >= 1e9) return (v/1e9).toFixed(2) + 'B ' + COIN.symbol;
+  if (v >= 1e6) return (v/1e6).toFixed(2) + 'M ' + COIN.symbol;
+  return Math.round(v).toLocaleString() + ' ' + COIN.symbol;
+}
+function fmtFlow(val) {
+  if (val == null || isNaN(val)) return '—';
+  const m = val / 1e6;
+  const abs = Math.abs(m);
+  const sign = m >= 0 ? '+' : '-';
+  return abs >= 1000 ? sign + '$' + (abs/1000).toFixed(2) + 'B' : sign + '$' + abs.toFixed(0) + 'M';
+}
+function fmtB(val) {
+  if (val == null || isNaN(val)) return '—';
+  return (val >= 0 ? '' : '-') + '$' + (Math.abs(val)/1e9).toFixed(2) + 'B';
+}
+function fmtDate(s) {
+  const dt = new Date(s);
+  return isNaN(dt) ? '' : dt.toLocaleDateString('ko-KR', {year:'numeric', month:'long', day:'numeric'});
+}
+
+// ── 거래소 어댑터: ticker → {last, chgPct, high, low, vol}, klines → [[ms, o, h, l, c]] (오래된 순) ──
+const INTERVAL_MS = { '1m': 60000, '1h': 3600000, '4h': 14400000, '1d': DAY, '1w': 7*DAY };
+const BYBIT_INTERVAL = { '1m': '1', '1h': '60', '4h': '240', '1d': 'D', '1w': 'W' };
+const VENUES = {
+  binance: {
+    label: 'Binance',
+    async ticker(pair) {
+      const d = await getJSON(`https://api.binance.com/api/v3/ticker/24hr?symbol=${pair}`);
+      return { last: +d.lastPrice, chgPct: +d.priceChangePercent, high: +d.highPrice, low: +d.lowPrice, vol: +d.quoteVolume };
+    },
+    async klines(pair, interval, startMs, limit) {
+      const raw = await getJSON(`https://api.binance.com/api/v3/klines?symbol=${pair}&interval=${interval}&startTime=${startMs}&limit=${limit}`);
+      return raw.map(k => [k[0], +k[1], +k[2], +k[3], +k[4]]);
+    },
+  },
+  bybit: {
+    label: 'Bybit',
+    async ticker(pair) {
+      const d = await getJSON(`https://api.bybit.com/v5/market/tickers?category=spot&symbol=${pair}`);
+      const t = d?.result?.list?.[0];
+      if (!t) throw new Error('bybit ticker');
+      const last = +t.lastPrice, prev = +t.prevPrice24h;
+      return { last, chgPct: prev > 0 ? (last - prev) / prev * 100 : 0, high: +t.highPrice24h, low: +t.lowPrice24h, vol: +t.turnover24h };
+    },
+    async klines(pair, interval, startMs, limit) {
+      // Bybit 는 [start, end] 구간의 최신 봉부터 돌려준다 → end 를 잡아야 start 부터 limit 개
+      const end = Math.min(Date.now(), startMs + limit * INTERVAL_MS[interval]);
+      const d = await getJSON(`https://api.bybit.com/v5/market/kline?category=spot&symbol=${pair}&interval=${BYBIT_INTERVAL[interval]}&start=${startMs}&end=${end}&limit=${limit}`);
+      return (d?.result?.list || []).map(k => [+k[0], +k[1], +k[2], +k[3], +k[4]]).reverse();
+    },
+  },
+};
+const venue = VENUES[COIN.venue] || VENUES.binance;
+const listedMs = new Date(COIN.listed).getTime();
+
+// ── 환율 ─────────────────────────────────────────────────────
+let cachedUsdKrw = 1400;
+async function fetchUsdKrw() {
+  // 1순위: open.er-api.com (1시간 주기), 2순위: fawazahmed0
+  try {
+    const d = await getJSON('https://open.er-api.com/v6/latest/USD');
+    if (d?.rates?.KRW) return (cachedUsdKrw = d.rates.KRW);
+  } catch(e) {}
+  try {
+    const d = await getJSON('https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/usd.json');
+    if (d?.usd?.krw) return (cachedUsdKrw = d.usd.krw);
+  } catch(e) {}
+  return cachedUsdKrw;
+}
+
+// ── 가격 ─────────────────────────────────────────────────────
+let currentPrice = 0;
+let upbitTicker = null;
+async function fetchPrice() {
+  const [tR, uR] = await Promise.allSettled([
+    venue.ticker(COIN.pair),
+    COIN.upbit ? getJSON(`https://api.upbit.com/v1/ticker?markets=${COIN.upbit}`) : Promise.resolve(null),
+  ]);
+  if (tR.status !== 'fulfilled') { console.error(tR.reason); return; }
+  const t = tR.value;
+  currentPrice = t.last;
+  setText('coinPrice', fmtUsd(t.last));
+  const chgEl = setText('coinChange', signPct(t.chgPct), 'coin-change ' + upDown(t.chgPct));
+  if (chgEl) chgEl.style.display = 'inline-block';
+  setText('kpiUsd', fmtUsd(t.last));
+  setText('kpiHigh', fmtUsd(t.high));
+  setText('kpiLow', fmtUsd(t.low));
+  setText('kpiVol', t.vol >= 1e9 ? (t.vol/1e9).toFixed(1) + 'B' : (t.vol/1e6).toFixed(0) + 'M');
+  if (!COIN.upbit) return;
+
+  upbitTicker = uR.status === 'fulfilled' && uR.value ? (Array.isArray(uR.value) ? uR.value[0] : uR.value) : null;
+  // 업비트 실패 시 USD × 환율로 표시 (김치 프리미엄은 계산하지 않음)
+  const krw = +upbitTicker?.trade_price || 0;
+  setText('kpiKrw', fmtKrw(krw || t.last * cachedUsdKrw));
+  if (krw && t.last > 0) {
+    const kimchi = (krw / (t.last * cachedUsdKrw) - 1) * 100;
+    setText('kpiKimchi', signPct(kimchi), 'kpi-value ' + upDown(kimchi));
+  }
+}
+
+// ── 퍼포먼스 ─────────────────────────────────────────────────
+async function fetchPerformance() {
+  if (!currentPrice) return;
+  const now = Date.now();
+  const ytd = new Date(new Date().getFullYear(), 0, 1).getTime();
+  const PERF = [
+    ['perf1d',   '1h', now - DAY],
+    ['perf7d',   '1d', now - 7*DAY],
+    ['perf30d',  '1d', now - 30*DAY],
+    ['perf180d', '1d', now - 180*DAY],
+    ['perfYtd',  '1d', ytd],
+    ['perf1y',   '1w', now - 365*DAY],
+    ['perf5y',   '1w', now - 5*365*DAY],
+    ['perfAll',  '1w', listedMs],
+  ];
+  await Promise.all(PERF.map(async ([id, interval, start]) => {
+    try {
+      const k = await venue.klines(COIN.pair, interval, Math.max(start, listedMs), 1);
+      const open = k[0]?.[1];
+      if (!open) return;
+      const pct = (currentPrice - open) / open * 100;
+      setText(id, signPct(pct), 'perf-cell-val ' + upDown(pct));
+    } catch(e) {}
+  }));
+}
+
+// ── 차트 ─────────────────────────────────────────────────────
+let lwChart = null, mainSeries = null;
+function initChart() {
+  const wrap = $('lwChart');
+  lwChart = LightweightCharts.createChart(wrap, {
+    width: wrap.clientWidth, height: wrap.clientHeight || 360,
+    layout: { background: { color: C.bg }, textColor: C.text, fontFamily: FONT, fontSize: 11 },
+    grid: { vertLines: { color: C.grid }, horzLines: { color: C.grid } },
+    crosshair: { mode: LightweightCharts.CrosshairMode.Normal },
+    rightPriceScale: { borderColor: C.border },
+    timeScale: { borderColor: C.border, timeVisible: true },
+    localization: { priceFormatter: fmtNum },
+    handleScroll: true, handleScale: true,
+  });
+  lwChart.subscribeCrosshairMove(p => {
+    const bar = $('ohlcBar');
+    if (!p || !p.time || !mainSeries) { bar.innerHTML = ''; return; }
+    const sd = p.seriesData?.get(mainSeries);
+    if (!sd) return;
+    const dt = new Date(p.time * 1000);
+    const pad = n => String(n).padStart(2, '0');
+    const dateStr = `${dt.getFullYear()}-${pad(dt.getMonth()+1)}-${pad(dt.getDate())} ${pad(dt.getHours())}:${pad(dt.getMinutes())}`;
+    const head = `<span style="color:var(--text3)">${dateStr}</span>&nbsp; `;
+    bar.innerHTML = sd.open !== undefined
+      ? head + `O&nbsp;<b>${fmtUsd(sd.open)}</b>&nbsp;H&nbsp;<b style="color:${C.up}">${fmtUsd(sd.high)}</b>&nbsp;L&nbsp;<b style="color:${C.down}">${fmtUsd(sd.low)}</b>&nbsp;C&nbsp;<b>${fmtUsd(sd.close)}</b>`
+      : head + `<b>${fmtUsd(sd.value)}</b>`;
+  });
+  window.addEventListener('resize', () => { lwChart.applyOptions({ width: wrap.clientWidth, height: wrap.clientHeight }); });
+}
+
+async function loadChart(interval, limit, days) {
+  const loading = $('chartLoading');
+  loading.style.display = 'flex';
+  try {
+    const start = days === 'max' ? listedMs : Date.now() - days * DAY;
+    const raw = await venue.klines(COIN.pair, interval, start, days === 'max' ? 1000 : limit);
+    const data = raw.map(k => ({ time: Math.floor(k[0]/1000), open: k[1], high: k[2], low: k[3], close: k[4] }))
+                    .sort((a, b) => a.time - b.time);
+    if (!lwChart) initChart();
+    if (mainSeries) { try { lwChart.removeSeries(mainSeries); } catch(e) {} }
+    if (interval === '1m') {
+      mainSeries = lwChart.addAreaSeries({ lineColor: C.line, topColor: C.fillTop, bottomColor: C.fillBot, lineWidth: 1.5, priceLineVisible: false });
+      mainSeries.setData(data.map(d => ({ time: d.time, value: d.close })));
+    } else {
+      mainSeries = lwChart.addCandlestickSeries({ upColor: C.up, downColor: C.down, borderUpColor: C.up, borderDownColor: C.down, wickUpColor: C.up, wickDownColor: C.down, priceLineVisible: false });
+      mainSeries.setData(data);
+    }
+    lwChart.timeScale().fitContent();
+    loading.style.display = 'none';
+  } catch(e) {
+    loading.textContent = '데이터를 불러올 수 없습니다.';
+  }
+}
+
+// ── 뉴스 ─────────────────────────────────────────────────────
+function timeAgo(dateStr) {
+  const diff = (Date.now() - new Date(dateStr)) / 1000;
+  if (diff < 3600)  return Math.floor(diff/60) + '분 전';
+  if (diff < 86400) return Math.floor(diff/3600) + '시간 전';
+  return Math.floor(diff/86400) + '일 전';
+}
+
+async function fetchNews() {
+  const list = $('newsList');
+  const WP = 'https://www.blockmedia.co.kr/wp-json/wp/v2/posts?per_page=10&orderby=date&_fields=id,title,link,date,featured_media,_links&_embed=wp:featuredmedia';
+  const queries = [];
+  if (COIN.news.coin_tag) queries.push(getJSON(`${WP}&coin_tag=${COIN.news.coin_tag}`));
+  if (COIN.news.tags)     queries.push(getJSON(`${WP}&tags=${COIN.news.tags}`));
+  const res = await Promise.allSettled(queries);
+  const seen = new Set();
+  const posts = res.flatMap(r => r.status === 'fulfilled' && Array.isArray(r.value) ? r.value : [])
+    .filter(p => { if (seen.has(p.id)) return false; seen.add(p.id); return true; })
+    .sort((a, b) => new Date(b.date) - new Date(a.date))
+    .slice(0, 10);
+  if (!posts.length) {
+    list.innerHTML = res.every(r => r.status === 'rejected')
+      ? '<div class="news-loading">뉴스를 불러올 수 없습니다.</div>'
+      : '<div class="news-loading">뉴스가 없습니다.</div>';
+    return;
+  }
+  list.innerHTML = '';
+  posts.forEach(post => {
+    const item = document.createElement('a');
+    item.className = 'news-item';
+    item.href = post.link;
+    item.target = '_blank';
+    item.rel = 'noopener';
+    const thumb = post._embedded?.['wp:featuredmedia']?.[0]?.source_url;
+    const imgEl = thumb
+      ? `<img class="news-thumb" src="${thumb}" alt="" loading="lazy" onerror="this.style.display='none'">`
+      : `<div class="news-thumb-placeholder">${COIN.glyph}</div>`;
+    const titleText = post.title?.rendered?.replace(/&#\d+;/g, c => String.fromCharCode(c.match(/\d+/)[0])) || '';
+    item.innerHTML = `${imgEl}<div class="news-body"><div class="news-title">${titleText}</div><div class="news-date">${timeAgo(post.date)}</div></div>`;
+    list.appendChild(item);
+  });
+}
+
+// ── 기본 정보 (CoinPaprika) ──────────────────────────────────
+async function loadCoinProfile() {
+  try {
+    const d = await getJSON(`https://api.coinpaprika.com/v1/tickers/${COIN.paprika}`);
+    const q = d.quotes?.USD || {};
+    const cap = q.market_cap, vol = q.volume_24h;
+    const fdvSupply = d.max_supply || d.total_supply;
+    setText('cg-mktcap', fmtCap(cap));
+    setText('cg-rank', '#' + (d.rank || '-'));
+    setText('cg-fdv', COIN.fdv === 'mktcap' ? fmtCap(cap) : fdvSupply && q.price ? fmtCap(fdvSupply * q.price) : '-');
+    setText('cg-vol', fmtCap(vol));
+    setText('cg-vol-mktcap', cap && vol ? (vol / cap * 100).toFixed(2) + '%' : '-');
+    setText('cg-supply', fmtSupply(d.circulating_supply));
+    if (q.ath_price) {
+      const fromAth = q.percent_from_price_ath != null ? ` (현재 ${q.percent_from_price_ath.toFixed(1)}%)` : '';
+      setText('cg-ath', fmtUsd(q.ath_price));
+      const athEl = setText('cg-ath-price', fmtUsd(q.ath_price) + fromAth);
+      if (athEl) athEl.style.color = 'var(--up)';
+    }
+    if (q.ath_date) setText('cg-ath-date', fmtDate(q.ath_date));
+    setText('cg-source', 'CoinPaprika · ' + new Date().toLocaleString('ko-KR', {month:'numeric', day:'numeric', hour:'numeric', minute:'numeric'}));
+  } catch(e) {
+    setText('cg-source', '데이터 로드 실패');
+  }
+}
+
+// ── Chart.js 막대 차트 ───────────────────────────────────────
+const charts = {};
+function barChart(canvasId, config) {
+  if (charts[canvasId]) charts[canvasId].destroy();
+  return (charts[canvasId] = new Chart($(canvasId).getContext('2d'), config));
+}
+const tickFont = size => ({ font: { family: FONT, size }, color: C.text });
+
+// ── ETF 자금 흐름 (data/etf_<coin>_*.json) ───────────────────
+async function loadEtfFlow() {
+  const loading = $('etfChartLoading');
+  const fail = () => { loading.style.display = 'flex'; loading.textContent = 'ETF 데이터를 불러올 수 없습니다.'; };
+  const [mR, hR] = await Promise.allSettled([
+    getJSON(`../data/etf_${COIN.etf}_metrics.json`),
+    getJSON(`../data/etf_${COIN.etf}_history.json`),
+  ]);
+  if (mR.status === 'fulfilled') {
+    const m = mR.value;
+    const daily = m.dailyNetInflow?.value;
+    if (daily != null) setText('etfDaily', fmtFlow(+daily), 'etf-kpi-value ' + upDown(+daily));
+    setText('etfDailyDate', m.dailyNetInflow?.lastUpdateDate || '');
+    setText('etfCum', fmtB(+m.cumNetInflow?.value));
+    setText('etfAum', fmtB(+m.totalNetAssets?.value));
+    setText('etfAumDate', m.totalNetAssets?.lastUpdateDate || '');
+  }
+  if (hR.status !== 'fulfilled') { fail(); return; }
+  try {
+    const recent = [...(hR.value.data || [])].sort((a, b) => a.date.localeCompare(b.date)).slice(-30);
+    const flows = recent.map(d => +(d.totalNetInflow / 1e6).toFixed(2));
+    loading.style.display = 'none';
+    barChart('etfFlowChart', {
+      type: 'bar',
+      data: {
+        labels: recent.map(d => d.date.slice(5)),
+        datasets: [{
+          label: '일별 순유입 ($M)',
+          data: flows,
+          backgroundColor: flows.map(v => v >= 0 ? 'rgba(59,109,17,0.5)' : 'rgba(163,45,45,0.5)'),
+          borderColor:     flows.map(v => v >= 0 ? C.up : C.down),
+          borderWidth: 1, borderRadius: 2,
+        }],
+      },
+      options: {
+        responsive: true, maintainAspectRatio: false,
+        interaction: { mode: 'index', intersect: false },
+        plugins: {
+          legend: { display: false },
+          tooltip: { callbacks: { label: ctx => { const v = ctx.parsed.y; return ` ${v >= 0 ? '+' : ''}$${v.toFixed(0)}M`; } } },
+        },
+        scales: {
+          x: { grid: { color: C.grid }, ticks: { ...tickFont(10), maxRotation: 0, maxTicksLimit: 10 } },
+          y: { grid: { color: C.grid }, ticks: { ...tickFont(10), callback: v => (v >= 0 ? '+' : '') + '$' + v + 'M' } },
+        },
+      },
+    });
+  } catch(e) {
+    console.error('ETF flow error:', e);
+    fail();
+  }
+}
+
+// ── 거래소별 24H 거래량 ──────────────────────────────────────
+const base = COIN.pair.replace(/USDT$/, '');
+const hyperliquidCtx = () => getJSON('https://api.hyperliquid.xyz/info', {
+  method: 'POST',
+  headers: { 'Content-Type': 'application/json' },
+  body: JSON.stringify({ type: 'metaAndAssetCtxs' }),
+});
+const VOLUME = {
+  binance:     { label: 'Binance', color: '#F0B90B', bg: 'rgba(240,185,11,0.6)',
+                 fetch: async () => (await VENUES.binance.ticker(COIN.pair)).vol },
+  bybit:       { label: 'Bybit', color: '#FF6400', bg: 'rgba(255,100,0,0.5)',
+                 fetch: async () => (await VENUES.bybit.ticker(COIN.pair)).vol },
+  coinbase:    { label: 'Coinbase', color: '#0052FF', bg: 'rgba(0,82,255,0.4)',
+                 fetch: async () => { const d = await getJSON(`https://api.exchange.coinbase.com/products/${base}-USD/stats`); return (+d.volume || 0) * (+d.last || 0); } },
+  upbit:       { label: 'Upbit', color: '#1763FF', bg: 'rgba(23,99,255,0.45)',
+                 fetch: async () => {
+                   const t = upbitTicker || (await getJSON(`https://api.upbit.com/v1/ticker?markets=${COIN.upbit}`))[0];
+                   return (+t?.acc_trade_price_24h || 0) / cachedUsdKrw;
+                 } },
+  hyperliquid: { label: 'Hyperliquid DEX', color: '#00C4A0', bg: 'rgba(0,196,160,0.5)',
+                 fetch: async () => {
+                   const [meta, ctxs] = await hyperliquidCtx();
+                   const i = meta.universe.findIndex(a => a.name === COIN.symbol);
+                   return i >= 0 ? +ctxs[i].dayNtlVlm || 0 : 0;
+                 } },
+};
+
+async function loadVolume() {
+  const venues = COIN.volume.filter(v => VOLUME[v]);
+  const vols = (await Promise.allSettled(venues.map(v => VOLUME[v].fetch())))
+    .map(r => r.status === 'fulfilled' ? r.value || 0 : 0);
+  const total = vols.reduce((a, b) => a + b, 0);
+  venues.forEach((v, i) => {
+    setText('vol-' + v, fmtVol(vols[i]));
+    setText('vol-' + v + '-pct', total > 0 ? (vols[i] / total * 100).toFixed(1) + '%' : '—');
+  });
+  const loading = $('volChartLoading');
+  if (!total) { loading.textContent = '데이터를 불러올 수 없습니다.'; return; }
+  loading.style.display = 'none';
+  barChart('volBarChart', {
+    type: 'bar',
+    data: {
+      labels: venues.map(v => VOLUME[v].label),
+      datasets: [{
+        label: '24H 거래량 (USD)',
+        data: vols,
+        backgroundColor: venues.map(v => VOLUME[v].bg),
+        borderColor:     venues.map(v => VOLUME[v].color),
+        borderWidth: 1, borderRadius: 4,
+      }],
+    },
+    options: {
+      indexAxis: 'y', responsive: true, maintainAspectRatio: false,
+      plugins: { legend: { display: false }, tooltip: { callbacks: { label: ctx => ' ' + fmtVol(ctx.parsed.x) } } },
+      scales: {
+        x: { grid: { color: C.grid }, ticks: { ...tickFont(10), callback: v => fmtVol(v) } },
+        y: { grid: { color: 'transparent' }, ticks: tickFont(11) },
+      },
+    },
+  });
+}
+
+// ── 컨트롤 ───────────────────────────────────────────────────
+document.querySelectorAll('.period-btn').forEach(btn => {
+  btn.addEventListener('click', function () {
+    document.querySelectorAll('.period-btn').forEach(b => b.classList.remove('active'));
+    this.classList.add('active');
+    loadChart(this.dataset.interval, parseInt(this.dataset.limit), this.dataset.days === 'max' ? 'max' : parseInt(this.dataset.days));
+  });
+});
+document.querySelectorAll('.faq-q').forEach(q => {
+  q.addEventListener('click', () => q.parentElement.classList.toggle('open'));
+});
+
+// ETF / 거래량은 하루 2회 갱신 — 14:00 (1차), 15:10 (지연 대비 2차)
+function dailyAt(times, fn) {
+  times.forEach(([h, m]) => {
+    (function schedule() {
+      const next = new Date();
+      next.setHours(h, m, 0, 0);
+      if (next <= new Date()) next.setDate(next.getDate() + 1);
+      setTimeout(() => { fn(); schedule(); }, next - new Date());
+    })();
+  });
+}
+
+window.CoinPage = { C, FONT, $, setText, getJSON, fmtUsd, fmtVol, fmtDate, tickFont, barChart, hyperliquidCtx, dailyAt };
+
+// ── INIT ─────────────────────────────────────────────────────
+const ready = fetchUsdKrw().then(fetchPrice);
+ready.then(fetchPerformance);
+loadChart('1m', 360, 1);
+fetchNews();
+loadCoinProfile();
+
+setInterval(fetchUsdKrw,  3600000);  // 1시간마다 환율
+setInterval(fetchPrice,     30000);  // 30초마다 가격
+setInterval(fetchNews,     300000);  // 5분마다 뉴스
+setInterval(loadCoinProfile, 600000);
+
+if (COIN.etf) {
+  loadEtfFlow();
+  dailyAt([[14, 0], [15, 10]], loadEtfFlow);
+}
+if (COIN.volume) {
+  ready.then(loadVolume);
+  dailyAt([[14, 0], [15, 10]], loadVolume);
+}
+})();
@@ -0,0 +1,36 @@
+/* hype.js — 하이퍼리퀴드 DEX 프로토콜 통계 (coin.js 의 window.CoinPage 사용) */
+(function () {
+'use strict';
+const { setText, fmtVol, hyperliquidCtx, dailyAt } = window.CoinPage;
+
+async function loadHypeDexStats() {
+  try {
+    const [meta, ctxs] = await hyperliquidCtx();
+    const i = meta.universe.findIndex(a => a.name === 'HYPE');
+    const ctx = i >= 0 ? ctxs[i] : null;
+    if (ctx) {
+      const markPx  = parseFloat(ctx.markPx) || 0;
+      const funding = parseFloat(ctx.funding) * 100;
+      setText('hlPerpVol', fmtVol(parseFloat(ctx.dayNtlVlm) || 0));
+      setText('hlOI', fmtVol((parseFloat(ctx.openInterest) || 0) * markPx));
+      setText('hlFunding', (funding >= 0 ? '+' : '') + funding.toFixed(4) + '%', 'etf-kpi-value ' + (funding >= 0 ? 'up' : 'down'));
+      setText('hlFundingDate', funding >= 0 ? '롱 우세' : '숏 우세');
+      setText('hlMarkPx', '$' + markPx.toFixed(2));
+    }
+    // 전체 DEX 합산
+    let totalVol = 0, totalOI = 0;
+    ctxs.forEach(c => {
+      totalVol += parseFloat(c.dayNtlVlm) || 0;
+      totalOI  += (parseFloat(c.openInterest) || 0) * (parseFloat(c.markPx) || 0);
+    });
+    setText('hlTotalVol', fmtVol(totalVol));
+    setText('hlTotalOI', fmtVol(totalOI));
+    setText('hlAssetCount', meta.universe.length + '개');
+  } catch(e) {
+    console.error('Hyperliquid DEX stats error:', e);
+  }
+}
+
+loadHypeDexStats();
+dailyAt([[14, 0], [15, 10]], loadHypeDexStats);
+})();
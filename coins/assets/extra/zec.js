@@ -0,0 +1,41 @@
+/* zec.js — ZEC 반감기 카운트다운 (Blockchair, coin.js 의 window.CoinPage 사용) */
+(function () {
+'use strict';
+const { $, setText, getJSON, fmtDate } = window.CoinPage;
+
+// Blossom(블록 653,600) 이후 블록 간격 75초 → 첫 반감기 1,046,400, 이후 1,680,000 블록마다
+const ZEC_FIRST_HALVING    = 1046400;
+const ZEC_HALVING_INTERVAL = 1680000;
+const ZEC_BLOCK_SEC        = 75;
+const ZEC_REWARD_0         = 3.125;  // 첫 반감기 직전 블록 보상 (Blossom 이후)
+
+async function loadZecHalving() {
+  try {
+    const s = (await getJSON('https://api.blockchair.com/zcash/stats'))?.data;
+    if (!s) return;
+    const block = s.blocks - 1;
+    const done  = block < ZEC_FIRST_HALVING ? 0 : Math.floor((block - ZEC_FIRST_HALVING) / ZEC_HALVING_INTERVAL) + 1;
+    const next  = ZEC_FIRST_HALVING + done * ZEC_HALVING_INTERVAL;
+    const prev  = done ? next - ZEC_HALVING_INTERVAL : 0;
+    const remaining = next - block;
+    const progress  = (block - prev) / (next - prev) * 100;
+    const etaSec    = remaining * ZEC_BLOCK_SEC;
+    const reward    = ZEC_REWARD_0 / Math.pow(2, done);
+
+    setText('halvingCurrentBlock', block.toLocaleString());
+    setText('halvingTargetBlock', next.toLocaleString());
+    setText('halvingRemaining', remaining.toLocaleString() + ' 블록');
+    setText('halvingEta', `약 ${Math.floor(etaSec / 86400)}일 후 · ${fmtDate(Date.now() + etaSec * 1000)}`);
+    setText('halvingReward', reward.toFixed(4) + ' ZEC');
+    setText('halvingRewardNext', `반감 후 → ${(reward / 2).toFixed(4)} ZEC`);
+    $('halvingProgressBar').style.width = Math.min(progress, 100).toFixed(1) + '%';
+    setText('halvingProgressPct', progress.toFixed(1) + '%');
+    setText('halvingProgressLabel', prev.toLocaleString() + ' 블록');
+  } catch(e) {
+    console.error('ZEC halving error:', e);
+  }
+}
+
+loadZecHalving();
+setInterval(loadZecHalving, 600000);
+})();
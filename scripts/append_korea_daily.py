@@ -5,21 +5,21 @@ append_korea_daily.py
 ─────────────────────
 krw_24h_snapshots.json + kimchi_snapshots.json 에서
 오늘 날짜 데이터를 추출해 korea_daily.csv 에 1줄 append
+(스냅샷은 bm20_store 의 date 인덱스로 오늘 것만 조회)
 
 krw_rolling24h_8h.yml 마지막 단계에서 실행
 (krw_rolling24h_8h.py → update_fx_8h.py → smart_kimchi_8h.py → 이 스크립트)
 """
 
-import json
 import pandas as pd
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import bm20_store
+
 # ── 경로 ──────────────────────────────────────────────────────
 ROOT        = Path(__file__).resolve().parent.parent
 HIST_DIR    = ROOT / "out" / "history"
-KRW_JSON    = HIST_DIR / "krw_24h_snapshots.json"
-KIMCHI_JSON = HIST_DIR / "kimchi_snapshots.json"
 OUT_CSV     = HIST_DIR / "korea_daily.csv"
 
 KST = timezone(timedelta(hours=9))
@@ -36,24 +36,12 @@ COLUMNS = [
 ]
 
 
-def safe_read_json(path: Path):
-    if not path.exists():
-        return []
-    try:
-        with open(path, encoding="utf-8") as f:
-            data = json.load(f)
-            return data if isinstance(data, list) else []
-    except Exception:
-        return []
-
-
 def main():
     today = datetime.now(KST).strftime("%Y-%m-%d")
     print(f"[INFO] korea_daily.csv append: {today}")
 
     # ── KRW: 오늘 마지막 스냅샷 ──────────────────────────────
-    krw_snaps = safe_read_json(KRW_JSON)
-    today_krw = [s for s in krw_snaps if s.get("timestamp_kst", "")[:10] == today]
+    today_krw = bm20_store.snapshots("krw_24h", today, today)
 
     if today_krw:
         s = today_krw[-1]  # 가장 최신 스냅샷
@@ -81,8 +69,7 @@ def main():
         ]}
 
     # ── 김치: 오늘 스냅샷 평균 ───────────────────────────────
-    kimchi_snaps = safe_read_json(KIMCHI_JSON)
-    today_kimchi = [s for s in kimchi_snaps if s.get("timestamp_kst", "")[:10] == today]
+    today_kimchi = bm20_store.snapshots("kimchi", today, today)
 
     if today_kimchi:
         btc_vals = [s["kimchi_premium_pct"]["BTC"] for s in today_kimchi]
@@ -129,6 +116,7 @@ def main():
     new_row = pd.DataFrame([row], columns=COLUMNS)
     df = pd.concat([df, new_row], ignore_index=True)
     df.to_csv(OUT_CSV, index=False, encoding="utf-8")
+    bm20_store.sync_table("korea_daily")
 
     print(f"[OK] korea_daily.csv → {len(df)}행 ({today} 추가)")
 
@@ -18,15 +18,14 @@ market_history.csv 의 빈 구간(03-26~04-06)을 채웁니다.
 """
 
 import csv
-import json
 import time
 import requests
 from pathlib import Path
 from datetime import datetime, timedelta
 
+import bm20_store
+
 ROOT     = Path(__file__).resolve().parent.parent  # scripts/ 의 상위 = 레포 루트
-BACKFILL = ROOT / "out" / "backfill_current_basket.csv"
-KIMCHI   = ROOT / "out" / "history" / "kimchi_snapshots.json"
 MARKET   = ROOT / "out" / "history" / "market_history.csv"
 
 COLUMNS = [
@@ -39,55 +38,26 @@ COLUMNS = [
 ]
 
 
-def load_backfill() -> dict:
-    """date → {index, ret}"""
+def load_backfill(start: str | None = None, end: str | None = None) -> dict:
+    """date → {index, ret} (bm20_store 인덱스 조회)"""
     result = {}
-    with BACKFILL.open(encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        if reader.fieldnames and "date" in reader.fieldnames:
-            for row in reader:
-                d = row.get("date", "").strip()
-                if d:
-                    result[d] = {
-                        "index": float(row.get("index", 0) or 0),
-                        "ret":   float(row.get("ret", 0) or 0),
-                    }
-        else:
-            # 헤더 없는 경우
-            f.seek(0)
-            for line in f:
-                parts = line.strip().split(",")
-                if len(parts) >= 3:
-                    result[parts[0]] = {
-                        "index": float(parts[1]),
-                        "ret":   float(parts[2]),
-                    }
+    for row in bm20_store.rows("bm20_level", start, end, ("date", "index", "ret")):
+        result[row["date"]] = {
+            "index": float(row["index"] or 0),
+            "ret":   float(row["ret"] or 0),
+        }
     return result
 
 
-def load_kimchi_by_date() -> dict:
-    """date → {kimchi_pct 평균, usdkrw 평균}"""
-    if not KIMCHI.exists():
-        return {}
-    snaps = json.loads(KIMCHI.read_text(encoding="utf-8"))
-    by_date = {}
-    for s in snaps:
-        date = s.get("timestamp_kst", "")[:10]
-        if not date:
-            continue
-        btc_pct = s.get("kimchi_premium_pct", {}).get("BTC")
-        usdkrw  = s.get("prices", {}).get("fx", {}).get("USDKRW")
-        if btc_pct is None or usdkrw is None:
-            continue
-        by_date.setdefault(date, {"kimchi": [], "usdkrw": []})
-        by_date[date]["kimchi"].append(float(btc_pct))
-        by_date[date]["usdkrw"].append(float(usdkrw))
-
+def load_kimchi_by_date(start: str | None = None, end: str | None = None) -> dict:
+    """date → {kimchi_pct 평균, usdkrw 평균} (bm20_store 날짜별 집계)"""
+    kimchi = bm20_store.snapshot_daily("kimchi", "$.kimchi_premium_pct.BTC", start, end)
+    usdkrw = bm20_store.snapshot_daily("kimchi", "$.prices.fx.USDKRW", start, end)
     result = {}
-    for date, vals in by_date.items():
+    for date in kimchi.keys() & usdkrw.keys():
         result[date] = {
-            "kimchi_pct": round(sum(vals["kimchi"]) / len(vals["kimchi"]), 4),
-            "usdkrw":     round(sum(vals["usdkrw"]) / len(vals["usdkrw"]), 2),
+            "kimchi_pct": round(kimchi[date], 4),
+            "usdkrw":     round(usdkrw[date], 2),
         }
     return result
 
@@ -149,8 +119,8 @@ def main():
         return
 
     # 3. 데이터 소스 로드
-    backfill = load_backfill()
-    kimchi   = load_kimchi_by_date()
+    backfill = load_backfill(missing[0], missing[-1])
+    kimchi   = load_kimchi_by_date(missing[0], missing[-1])
     sentiment = fetch_sentiment_history(missing[0], missing[-1])
 
     # 4. 빈 날짜 채우기
@@ -189,6 +159,7 @@ def main():
         writer.writeheader()
         for row in sorted_rows:
             writer.writerow({col: row.get(col, "") for col in COLUMNS})
+    bm20_store.sync_table("market_history")
 
     print(f"\n[OK] {added}개 날짜 추가 → market_history.csv 총 {len(sorted_rows)}행")
 
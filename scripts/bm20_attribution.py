@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bm20_attribution.py
+───────────────────
+BM20 기여도 분석 엔진 — out/history/components_history.csv 기반 누적합(prefix sum).
+
+"어떤 기간에 어떤 코인이 BM20 을 움직였나" 를 질의마다 CSV 를 다시 훑지 않고 답한다.
+날짜 인덱스(T) × 심볼(N) 행렬을 한 번 만들고, 심볼별 누적 배열을 들고 있다:
+  PL[t]   Σ ln(1 + r)                 심볼 누적 로그수익률
+  PC[t]   Σ w·r · k_t                 심볼 누적 (로그 연결) 기여도
+  PI[t]   Σ ln(1 + R_t)               지수 누적 로그수익률 (R_t = Σ_i w·r)
+  PD[t]   관측일 수
+→ 임의 구간 [start, end] 의 수익률·기여도·비중 변화가 심볼당 O(1) (누적합 두 점의 차).
+
+일간 기여도 = weight × return_1d (비율). 하루 합계가 BM20 1D 수익률과 같다.
+(CSV 의 contribution 열은 가격차 × 비중(달러 단위)이라 기여도 계산에 쓰지 않는다.)
+여러 날 연결은 Carino 로그 연결: k_t = ln(1+R_t)/R_t, K = ln(1+R)/R,
+  기여도_i = Σ_t w·r·k_t / K  → 심볼 기여도 합 = 구간 지수 수익률 (정확히)
+비중 변화: weightImplied = 시작 비중 × (1+r_i) / (1+R) (리밸런싱 없이 보유했을 때의 끝 비중),
+  weightDrift = weightImplied − weightStart
+
+표준 구간 (series_index.ref_day 와 같은 규칙: 기준일 < 날짜 ≤ asof):
+  1D, 7D, 30D, MTD, QTD, YTD, SI(전체)
+출력: out/history/attribution_latest.json (market.html 섹터 히트맵 / 기여 코인 입력, 열 지향)
+
+사용:
+  python scripts/bm20_attribution.py                                   # 표준 구간 JSON 생성
+  python scripts/bm20_attribution.py --start 2026-06-01 --end 2026-06-30   # 임의 구간 표 출력
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from series_index import ref_day
+
+ROOT = Path(os.getenv("BM20_DATA_ROOT") or Path(__file__).resolve().parent.parent)
+
+COMPONENTS_CSV = ROOT / "out/history/components_history.csv"
+OUT_JSON       = ROOT / "out/history/attribution_latest.json"
+
+WINDOWS = ("1D", "7D", "30D", "MTD", "QTD", "YTD", "SI")
+
+
+class Attribution:
+    """날짜 × 심볼 누적합 — window() 는 심볼당 O(1)"""
+
+    def __init__(self, dates: list[str], symbols: list[str], weight: np.ndarray, ret: np.ndarray,
+                 present: np.ndarray, price: np.ndarray | None = None):
+        self.dates = dates
+        self.symbols = symbols
+        self.days = np.array(dates, dtype="datetime64[D]").astype(np.int64)
+        self.weight = weight                       # (T, N) 그날 비중 (없으면 0)
+        self.ret = ret                             # (T, N) 일간 수익률 (비율, 없으면 0)
+        self.present = present                     # (T, N) 그날 구성종목 여부
+        self.price = np.full_like(weight, np.nan) if price is None else price   # (T, N) 종가 (USD)
+
+        contrib = weight * ret                     # (T, N) 일간 기여도
+        idx_ret = contrib.sum(axis=1)              # (T,)   지수 일간 수익률
+        idx_log = np.log1p(idx_ret)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k = np.where(np.abs(idx_ret) > 1e-12, idx_log / idx_ret, 1.0)
+
+        def _prefix(a: np.ndarray) -> np.ndarray:
+            return np.concatenate([np.zeros((1,) + a.shape[1:]), np.cumsum(a, axis=0)])
+
+        self.PL = _prefix(np.log1p(ret))
+        self.PC = _prefix(contrib * k[:, None])
+        self.PI = _prefix(idx_log)
+        self.PD = _prefix(present.astype(np.float64))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "Attribution":
+        df = df.dropna(subset=["date", "symbol"]).copy()
+        df["date"] = df["date"].astype(str).str[:10]
+        df["symbol"] = df["symbol"].astype(str).str.upper()
+        df = df.drop_duplicates(["date", "symbol"], keep="last")
+        w = df.pivot(index="date", columns="symbol", values="weight").sort_index()
+        r = df.pivot(index="date", columns="symbol", values="return_1d").reindex_like(w)
+        p = df.pivot(index="date", columns="symbol", values="price").reindex_like(w)
+        present = r.notna().to_numpy()
+        return cls(
+            dates=list(w.index), symbols=list(w.columns),
+            weight=w.fillna(0.0).to_numpy(dtype=np.float64),
+            ret=(r.fillna(0.0).to_numpy(dtype=np.float64) / 100.0),   # return_1d 는 % 단위
+            present=present,
+            price=p.to_numpy(dtype=np.float64),
+        )
+
+    @classmethod
+    def from_csv(cls, path: Path = COMPONENTS_CSV) -> "Attribution":
+        if not path.exists():
+            raise FileNotFoundError(f"Missing {path}")
+        return cls.from_frame(pd.read_csv(path, dtype={"date": str}))
+
+    # ── 구간 ────────────────────────────────────────────────
+    def span(self, start: str | None, end: str | None) -> tuple[int, int] | None:
+        """[start, end] (날짜 포함) → 행 인덱스 [i0, i1]. 구간에 날짜가 없으면 None."""
+        lo = 0 if start is None else int(np.searchsorted(self.days, _day(start), side="left"))
+        hi = len(self.days) - 1 if end is None else int(np.searchsorted(self.days, _day(end), side="right")) - 1
+        return (lo, hi) if lo <= hi else None
+
+    def standard_span(self, horizon: str, asof: str | None = None) -> tuple[int, int] | None:
+        """series_index 규칙: 기준일 < 날짜 ≤ asof (SI = 전체)"""
+        end = self.dates[-1] if asof is None else asof
+        hi = int(np.searchsorted(self.days, _day(end), side="right")) - 1
+        if hi < 0:
+            return None
+        ref = ref_day(horizon, date.fromisoformat(self.dates[hi]))
+        lo = 0 if ref is None else int(np.searchsorted(self.days, ref, side="right"))
+        return (lo, hi) if lo <= hi else None
+
+    def window(self, i0: int, i1: int) -> dict:
+        """행 [i0, i1] 구간 — 심볼별 배열 (self.symbols 순서)"""
+        a, b = i0, i1 + 1
+        idx_log = self.PI[b] - self.PI[a]
+        idx_ret = float(np.expm1(idx_log))
+        K = idx_log / idx_ret if abs(idx_ret) > 1e-12 else 1.0
+        sym_log = self.PL[b] - self.PL[a]
+        w0 = self.weight[i0]
+        implied = w0 * np.exp(sym_log - idx_log)
+        return {
+            "start":         self.dates[i0],
+            "end":           self.dates[i1],
+            "days":          i1 - i0 + 1,
+            "indexReturn":   idx_ret,
+            "return":        np.expm1(sym_log),
+            "contribution":  (self.PC[b] - self.PC[a]) / K,
+            "weightStart":   w0,
+            "weightEnd":     self.weight[i1],
+            "weightImplied": implied,
+            "weightDrift":   implied - w0,
+            "daysPresent":   self.PD[b] - self.PD[a],
+        }
+
+    def query(self, start: str | None, end: str | None) -> dict | None:
+        sp = self.span(start, end)
+        return None if sp is None else self.window(*sp)
+
+
+def _day(d: str) -> int:
+    return int(np.datetime64(str(d)[:10], "D").astype(np.int64))
+
+
+def _columnar(win: dict, nd: int = 8) -> dict:
+    out = {}
+    for k, v in win.items():
+        if isinstance(v, np.ndarray):
+            out[k] = [round(float(x), nd) for x in v]
+        elif isinstance(v, float):
+            out[k] = round(v, nd)
+        else:
+            out[k] = v
+    return out
+
+
+def build_windows(att: Attribution, windows=WINDOWS) -> dict:
+    res = {"asOf": att.dates[-1], "symbols": att.symbols, "windows": {}}
+    for h in windows:
+        sp = att.standard_span(h)
+        if sp is not None:
+            res["windows"][h] = _columnar(att.window(*sp))
+    return res
+
+
+def write_windows(path: Path = OUT_JSON, csv_path: Path = COMPONENTS_CSV,
+                  att: Attribution | None = None) -> dict:
+    att = att or Attribution.from_csv(csv_path)
+    res = build_windows(att)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(res, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+    print(f"[OK] {path.name} → asOf={res['asOf']} windows={','.join(res['windows'])} "
+          f"({len(att.symbols)} symbols × {len(att.dates)} days)")
+    return res
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="BM20 contribution attribution (prefix sums)")
+    ap.add_argument("--start", default=None, help="YYYY-MM-DD (포함)")
+    ap.add_argument("--end", default=None, help="YYYY-MM-DD (포함)")
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--out", default=str(OUT_JSON))
+    args = ap.parse_args()
+
+    if args.start is None and args.end is None:
+        write_windows(Path(args.out))
+        return 0
+
+    att = Attribution.from_csv()
+    win = att.query(args.start, args.end)
+    if win is None:
+        print(f"[WARN] {args.start} ~ {args.end} 구간에 데이터 없음")
+        return 1
+    print(f"BM20 {win['start']} ~ {win['end']} ({win['days']}일) 지수 {win['indexReturn']*100:+.2f}%")
+    print(f"{'symbol':<8}{'contrib(%p)':>12}{'return':>10}{'w_start':>9}{'w_end':>8}{'drift':>9}")
+    order = np.argsort(-np.abs(win["contribution"]))[:args.top]
+    for i in order:
+        print(f"{att.symbols[i]:<8}{win['contribution'][i]*100:>+12.3f}{win['return'][i]*100:>+9.2f}%"
+              f"{win['weightStart'][i]:>9.3f}{win['weightEnd'][i]:>8.3f}{win['weightDrift'][i]:>+9.4f}")
+    print(f"{'합계':<8}{win['contribution'].sum()*100:>+12.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
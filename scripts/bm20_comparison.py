@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bm20_comparison.py
+──────────────────
+BM20 vs 벤치마크(BTC · ETH · NASDAQ · KOSPI) 비교 시리즈 → out/bm20_comparison.json (열 지향)
+
+  {"base": "2018-01-01", "asOf": "2026-08-23", "maxStaleDays": 7,
+   "dates":  ["2018-01-01", ...],
+   "series": {"bm20": [100.0, ...], "btc": [...], "eth": [...], "nasdaq": [...], "kospi": [...]},
+   "baseValues": {"btc": 13657.2, ...},                               # 재기준 시점 원 단위 값
+   "last":   {"btc": {"date", "value", "prevDate", "prev"}, ...}}     # 원 단위 마지막 두 관측 (KPI 타일)
+
+- 기준 달력 = BM20 날짜 (매일). 벤치마크는 as-of 조인 — 그날 이전(포함) 마지막 값
+  (np.searchsorted 한 번, 벤치마크당 O(n log m)). 주말·휴장일은 직전 종가, maxStaleDays 를
+  넘게 비면 null (상장 전 / 데이터 끊김).
+- 모든 시리즈는 base 날짜 값 = 100 으로 재기준 (base 에 값이 없으면 base 이후 첫 값).
+  원 단위가 필요하면 값 × baseValues[이름] / 100 (메인 차트 BTC 의 USD 축).
+- 벤치마크 추가 = BENCHMARKS 에 (이름, 파일, 값 키) 한 줄. 파일이 없으면 WARN 후 제외.
+- 행 객체 배열 대신 날짜 배열 + 시리즈별 숫자 배열 → 대시보드(bm20_index.html) 한 번 로드.
+
+사용:
+  python scripts/bm20_comparison.py                     # base=2018-01-01
+  python scripts/bm20_comparison.py --base 2024-01-01
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(os.getenv("BM20_DATA_ROOT") or Path(__file__).resolve().parent.parent)
+
+BM20_SERIES = ROOT / "bm20_series.json"
+OUT_JSON    = ROOT / "out/bm20_comparison.json"
+
+BASE_DATE      = "2018-01-01"
+MAX_STALE_DAYS = 7      # 연휴 포함 주식 휴장 허용 폭
+DECIMALS       = 2      # 100 기준 지수 → 소수 2자리면 충분
+
+# (이름, 파일, 값 키) — 파일 포맷: [{"date": "YYYY-MM-DD", <값 키>: float}, ...]
+BENCHMARKS = (
+    ("btc",    ROOT / "btc_usd_series.json", "price"),
+    ("eth",    ROOT / "eth_usd_series.json", "price"),
+    ("nasdaq", ROOT / "nasdaq_series.json",  "price"),
+    ("kospi",  ROOT / "kospi_series.json",   "price"),
+)
+
+
+def load_points(path: Path, key: str) -> tuple[np.ndarray, np.ndarray]:
+    """[{"date", key}] (또는 {"series": [...]}) → (일수 int64, 값 float64), 날짜 정렬 · 같은 날짜는 마지막 값"""
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    rows = raw.get("series", []) if isinstance(raw, dict) else raw
+    rows = [r for r in rows if r.get("date") and r.get(key) is not None]
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    days = np.array([str(r["date"])[:10] for r in rows], dtype="datetime64[D]").astype(np.int64)
+    vals = np.array([r[key] for r in rows], dtype=np.float64)
+    order = np.argsort(days, kind="stable")
+    days, vals = days[order], vals[order]
+    last = np.append(days[1:] != days[:-1], True)        # 같은 날짜 → 마지막 값
+    return days[last], vals[last]
+
+
+def asof_align(target: np.ndarray, days: np.ndarray, vals: np.ndarray,
+               max_stale: int = MAX_STALE_DAYS) -> np.ndarray:
+    """target 날짜마다 그날 이전(포함) 마지막 값. 없거나 max_stale 일 넘게 오래되면 NaN."""
+    if not len(days):
+        return np.full(len(target), np.nan)
+    pos = np.searchsorted(days, target, side="right") - 1
+    p = np.clip(pos, 0, None)
+    ok = (pos >= 0) & (target - days[p] <= max_stale) & (vals[p] > 0)
+    return np.where(ok, vals[p], np.nan)
+
+
+def last_points(days: np.ndarray, vals: np.ndarray) -> dict | None:
+    """원 시리즈 마지막 두 관측 (재기준 전 값, 휴장일 채움 없음)"""
+    if not len(days):
+        return None
+    d = days.astype("datetime64[D]").astype(str)
+    return {"date": d[-1], "value": float(vals[-1]),
+            "prevDate": d[-2] if len(d) > 1 else None, "prev": float(vals[-2]) if len(d) > 1 else None}
+
+
+def rebase(vals: np.ndarray, base: float = 100.0) -> tuple[np.ndarray, float | None]:
+    """첫 유효값 = base (그리드가 이미 base 날짜부터 시작) → (재기준 시리즈, 그 첫 유효값)"""
+    finite = np.flatnonzero(np.isfinite(vals))
+    if not len(finite):
+        return vals, None
+    first = float(vals[finite[0]])
+    return vals / first * base, first
+
+
+def build_comparison(base_date: str = BASE_DATE, benchmarks=BENCHMARKS,
+                     bm20_path: Path = BM20_SERIES, max_stale: int = MAX_STALE_DAYS) -> dict:
+    b_days, b_vals = load_points(bm20_path, "level")
+    keep = b_days >= np.datetime64(base_date, "D").astype(np.int64)
+    grid, bm20 = b_days[keep], b_vals[keep]
+    if not len(grid):
+        raise ValueError(f"{bm20_path.name}: {base_date} 이후 데이터 없음")
+
+    series, base_values = {}, {}
+    series["bm20"], base_values["bm20"] = rebase(bm20)
+    last = {"bm20": last_points(b_days, b_vals)}
+    for name, path, key in benchmarks:
+        if not path.exists():
+            print(f"[WARN] bm20_comparison: {path.name} 없음 → {name} 제외")
+            continue
+        days, vals = load_points(path, key)
+        series[name], base_values[name] = rebase(asof_align(grid, days, vals, max_stale=max_stale))
+        last[name] = last_points(days, vals)
+
+    dates = grid.astype("datetime64[D]").astype(str).tolist()
+    return {
+        "base": dates[0],
+        "asOf": dates[-1],
+        "maxStaleDays": max_stale,
+        "dates": dates,
+        "series": {k: [None if not np.isfinite(x) else round(x, DECIMALS) for x in v.tolist()]
+                   for k, v in series.items()},
+        "baseValues": base_values,
+        "last": last,
+    }
+
+
+def write_comparison(path: Path = OUT_JSON, base_date: str = BASE_DATE) -> dict:
+    res = build_comparison(base_date)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(res, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+    print(f"[OK] {path.name} → {len(res['dates'])}일 × {len(res['series'])}시리즈 "
+          f"({','.join(res['series'])}, base={res['base']}, asOf={res['asOf']})")
+    return res
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="BM20 vs benchmarks comparison (columnar JSON)")
+    ap.add_argument("--base", default=BASE_DATE, help="재기준 날짜 (값 = 100)")
+    ap.add_argument("--out", default=str(OUT_JSON))
+    args = ap.parse_args()
+    write_comparison(Path(args.out), args.base)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bm20_krw.py
+───────────
+BM20-KRW — 같은 BM20 비중, 국내 거래소 원화 가격으로 계산한 원화 표시 지수.
+
+krw_rolling24h_8h.py (30분 주기) 가 이미 받아 온 4개 거래소 KRW 티커에서 가격을 같이 넘겨받아
+추가 요청 없이 계산한다.
+  가격   자산별 거래소 가격을 24h 거래대금으로 가중 평균 (자산 × 거래소 행렬 한 번)
+  비중   out/history/components_history.csv 마지막 날짜 (bm20_daily.py 가 그날 쓴 비중)
+  수익률 Σ w·P_now / Σ w·P_ref − 1 (bm20_daily.py 의 today_value / prev_value 와 같은 식,
+         두 시점 모두 원화 가격이 있는 종목만)
+
+체인 연결:
+  일간   KST 날짜가 바뀐 첫 실행에서 직전 스냅샷을 전일 종가로 확정 → daily 에 추가, 기준(anchor) 교체
+  장중   레벨 = 전일 종가 레벨 × 바스켓 비율(지금 / 전일 종가 가격) → intraday 에 30분마다 추가
+  첫 실행 레벨 = 100 (baseDate)
+
+김치 조정 스프레드: bm20_daily.py 가 메모리에 든 USD 가격·비중·USDKRW 로 basket_premium() 호출
+  → 같은 바스켓의 원화 가치 / (USDKRW × USD 가치) − 1 (최근 KRW 스냅샷 기준, 추가 요청 없음)
+  스냅샷이 MAX_SNAPSHOT_AGE_H 보다 오래되면 (30분 수집 중단) 스프레드는 null + stale=true
+
+출력: out/history/bm20_krw_series.json (열 지향)
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(os.getenv("BM20_DATA_ROOT") or Path(__file__).resolve().parent.parent)
+
+COMPONENTS_CSV = ROOT / "out/history/components_history.csv"
+OUT_JSON       = ROOT / "out/history/bm20_krw_series.json"
+
+BASE = 100.0
+MAX_INTRADAY = 384            # 8일치 @ 30min (krw_24h_snapshots.json 과 같은 보존 기간)
+DECIMALS = 4
+MAX_SNAPSHOT_AGE_H = 1.0      # basket_premium: USD 가격과 비교할 KRW 스냅샷 최대 나이 (30분 주기 × 2)
+
+
+# ══════════════════════════════════════════════════════════════
+# 1. 입력
+# ══════════════════════════════════════════════════════════════
+
+def venue_prices(quotes: dict[str, dict[str, tuple[float, float]]]) -> dict[str, float]:
+    """{거래소: {자산: (가격, 24h 거래대금)}} → {자산: 거래대금 가중 가격}
+
+    거래대금이 전부 0 이면 가격 있는 거래소의 단순 평균.
+    """
+    exchanges = list(quotes)
+    assets = sorted({a for q in quotes.values() for a in q})
+    idx = {a: i for i, a in enumerate(assets)}
+    P = np.zeros((len(assets), len(exchanges)))
+    V = np.zeros_like(P)
+    for j, ex in enumerate(exchanges):
+        for a, (p, v) in quotes[ex].items():
+            P[idx[a], j], V[idx[a], j] = p or 0.0, v or 0.0
+    has = P > 0
+    V = np.where(has, V, 0.0)
+    vsum = V.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vw = (P * V).sum(axis=1) / vsum
+        eq = (P * has).sum(axis=1) / has.sum(axis=1)
+    px = np.where(vsum > 0, vw, eq)
+    return {a: float(px[i]) for i, a in enumerate(assets) if np.isfinite(px[i]) and px[i] > 0}
+
+
+def current_weights(csv_path: Path = COMPONENTS_CSV) -> tuple[str, dict[str, float]]:
+    """components_history.csv 마지막 날짜 → (날짜, {심볼: 비중})"""
+    last, w = "", {}
+    if not csv_path.exists():
+        return last, w
+    with open(csv_path, encoding="utf-8") as f:
+        for r in csv.DictReader(f):
+            d = r.get("date") or ""
+            if d > last:
+                last, w = d, {}
+            if d == last and r.get("symbol") and r.get("weight"):
+                w[r["symbol"].strip().upper()] = float(r["weight"])
+    return last, w
+
+
+# ══════════════════════════════════════════════════════════════
+# 2. 바스켓
+# ══════════════════════════════════════════════════════════════
+
+def basket_ratio(weights: dict[str, float], now: dict[str, float], ref: dict[str, float]) -> float | None:
+    """Σ w·P_now / Σ w·P_ref — 두 시점 모두 가격이 있는 종목만"""
+    syms = [s for s, w in weights.items() if w > 0 and now.get(s) and ref.get(s)]
+    if not syms:
+        return None
+    w = np.array([weights[s] for s in syms])
+    num = float(w @ np.array([now[s] for s in syms]))
+    den = float(w @ np.array([ref[s] for s in syms]))
+    return num / den if den > 0 else None
+
+
+def _age_h(ts: str, now: datetime) -> float | None:
+    try:
+        return (now - datetime.strptime(ts, "%Y-%m-%dT%H:%M:%S%z")).total_seconds() / 3600
+    except (TypeError, ValueError):
+        return None
+
+
+def basket_premium(weights: dict[str, float], usd_prices: dict[str, float], usdkrw: float,
+                   path: Path = OUT_JSON, now: datetime | None = None) -> dict | None:
+    """같은 바스켓의 원화 가치 / (USDKRW × USD 가치) − 1 — 최근 KRW 스냅샷(last.prices) 기준
+
+    스냅샷이 MAX_SNAPSHOT_AGE_H 보다 오래됐거나 시각을 알 수 없으면 스프레드는 None, stale=True
+    (레벨·변화율은 asOf 기준 값 그대로).
+    """
+    st = _load(path)
+    if not st or not usdkrw:
+        return None
+    age = _age_h(st["last"].get("ts"), now or datetime.now(timezone.utc))
+    stale = age is None or age > MAX_SNAPSHOT_AGE_H
+    krw = st["last"]["prices"]
+    syms = [s for s, w in weights.items() if w > 0 and krw.get(s) and usd_prices.get(s)]
+    if not syms:
+        return None
+    w = np.array([weights[s] for s in syms])
+    v_krw = float(w @ np.array([krw[s] for s in syms]))
+    v_usd = float(w @ np.array([usd_prices[s] for s in syms]))
+    return {
+        "asOf": st["last"]["ts"],
+        "level": st["last"]["level"],
+        "changePct": st["last"].get("chgPct"),
+        "basketPremiumPct": None if stale or v_usd <= 0 else round((v_krw / (usdkrw * v_usd) - 1.0) * 100.0, DECIMALS),
+        "coverage": len(syms),
+        "stale": stale,
+        "ageH": None if age is None else round(age, 2),
+    }
+
+
+# ══════════════════════════════════════════════════════════════
+# 3. 체인 연결 시리즈 (일간 + 장중)
+# ══════════════════════════════════════════════════════════════
+
+def _load(path: Path) -> dict | None:
+    try:
+        st = json.loads(path.read_text(encoding="utf-8"))
+        return st if st.get("last") else None
+    except Exception:
+        return None
+
+
+def update(prices: dict[str, float], ts: datetime, path: Path = OUT_JSON,
+           csv_path: Path = COMPONENTS_CSV) -> dict | None:
+    """30분 스냅샷 한 번 → 레벨 계산 후 시리즈 저장. 비중이나 가격이 없으면 None."""
+    w_date, weights = current_weights(csv_path)
+    if not weights or not prices:
+        print("[WARN] BM20-KRW: 비중 또는 원화 가격 없음 → skip")
+        return None
+
+    ts_iso = ts.strftime("%Y-%m-%dT%H:%M:%S%z")
+    day = ts.strftime("%Y-%m-%d")
+    basket = {s: prices[s] for s in weights if s in prices}
+    st = _load(path) or {
+        "base": BASE, "baseDate": day,
+        "daily": {"dates": [], "levels": []},
+        "intraday": {"ts": [], "levels": []},
+        "anchor": {"date": day, "level": BASE, "prices": basket},
+        "last": None,
+    }
+
+    last = st["last"]
+    if last and last["date"] < day:
+        # 날짜가 바뀜 → 직전 스냅샷이 전일 종가
+        st["daily"]["dates"].append(last["date"])
+        st["daily"]["levels"].append(last["level"])
+        st["anchor"] = {"date": last["date"], "level": last["level"], "prices": last["prices"]}
+
+    anchor = st["anchor"]
+    ratio = basket_ratio(weights, basket, anchor["prices"])
+    level = anchor["level"] * ratio if ratio is not None else (last or anchor)["level"]
+    chg = (level / anchor["level"] - 1.0) * 100.0 if anchor["level"] else None
+
+    intra = st["intraday"]
+    if intra["ts"] and intra["ts"][-1] == ts_iso:
+        intra["ts"].pop(); intra["levels"].pop()
+    intra["ts"].append(ts_iso)
+    intra["levels"].append(round(level, DECIMALS))
+    intra["ts"], intra["levels"] = intra["ts"][-MAX_INTRADAY:], intra["levels"][-MAX_INTRADAY:]
+
+    st["weightsAsOf"] = w_date
+    st["last"] = {
+        "ts": ts_iso, "date": day, "level": round(level, DECIMALS),
+        "chgPct": None if chg is None else round(chg, DECIMALS),
+        "coverage": len(basket), "prices": basket,
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(st, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+    print(f"[OK] BM20-KRW {level:,.2f} ({'—' if chg is None else f'{chg:+.2f}%'} vs {anchor['date']} 기준, "
+          f"{len(basket)}/{len(weights)}종목)")
+    return st
@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bm20_risk.py
+────────────
+BM20 롤링 리스크 지표 (변동성 / 최대낙폭 / Sharpe·Sortino / BTC 대비 베타·상관) — 증분 갱신.
+
+입력:
+  bm20_series.json        [{"date", "level"}]   (backfill_current_basket.csv 에서 재생성된 SSOT)
+  btc_usd_series.json     [{"date", "price"}]   (UTC 종가 날짜)
+
+날짜 규칙 정렬 (BM20 ↔ BTC 페어):
+  - LIVE_FROM 이전 BM20 행 (2018–2026-02 백필) 은 UTC 종가 날짜 → 같은 날짜 BTC 와 페어
+  - LIVE_FROM 부터 BM20 행은 KST 발행일 (08:45 KST ≈ 전날 UTC 23:45 기준 24h 수익률) → BTC d−1 과 페어
+  - 경계에서 같은 BTC 날짜가 두 번 나오면 뒤 행은 버린다 (BTC 수익률 0 인 가짜 페어 방지)
+상태 (실행 사이 유지, 일일 워크플로우가 커밋):
+  out/state/bm20_risk_state.json
+출력:
+  bm20_risk_latest.json
+
+증분 (기본):
+  - 윈도우(관측치 30 / 90 / 365개)마다 슬라이딩 Welford 상태 (n, mean, M2, 하방 제곱합) +
+    BTC 와의 공동 모멘트 (mean_x, mean_y, C, M2x, M2y) 를 들고 있다가
+    새 일간 수익률 하나가 들어오면 가장 오래된 값을 빼고 새 값을 더한다 → 하루 O(1)
+  - 낙폭: 누적 고점 + 최대낙폭 (running peak)
+  - 상태는 "끝에서 두 번째 행"까지만 확정 저장하고, 마지막 행은 복사본에 임시로 반영해 출력
+    → 장중 재실행(마지막 행 덮어쓰기)에도 상태가 오염되지 않는다
+  - 상태의 마지막 날짜·레벨이 시리즈와 다르면 (backfill 수정 등) 자동으로 전체 재계산
+전체 재계산 (--full): pandas 벡터 연산 (rolling / cummax) 으로 지표 + 상태를 새로 만든다.
+검증 (--validate): 증분 결과와 전체 재계산 결과를 비교 (상대 오차 1e-9 초과 시 exit 1).
+                  + 상관 상식 검사 — 90D/365D corr 가 MIN_CORR 미만이면 exit 1 (날짜 어긋남 의심).
+
+지표 (비율, 연율화 365일, 무위험수익률 0):
+  vol      = std(r) · √365
+  sharpe   = mean(r) / std(r) · √365
+  sortino  = mean(r) / √(mean(min(r,0)²)) · √365
+  beta     = cov(r_bm20, r_btc) / var(r_btc)
+  corr     = cov / (std_bm20 · std_btc)
+  drawdown = level / 누적고점 − 1 (current), 그 최솟값 (max)
+
+사용:
+  python scripts/bm20_risk.py              # 증분 갱신 → bm20_risk_latest.json
+  python scripts/bm20_risk.py --full       # 전체 재계산 (상태 재생성)
+  python scripts/bm20_risk.py --validate   # 증분 vs 전체 비교
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import math
+import os
+from bisect import bisect_left
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(os.getenv("BM20_DATA_ROOT") or Path(__file__).resolve().parent.parent)
+
+BM20_SERIES = ROOT / "bm20_series.json"
+BTC_SERIES  = ROOT / "btc_usd_series.json"
+STATE_JSON  = ROOT / "out/state/bm20_risk_state.json"
+OUT_JSON    = ROOT / "bm20_risk_latest.json"
+
+WINDOWS     = (30, 90, 365)
+ANNUALIZE   = 365
+STATE_VER   = 2              # 2: LIVE_FROM 이후 BTC d−1 페어
+REL_TOL     = 1e-9
+LIVE_FROM   = "2026-02-25"   # BM20 행이 KST 발행일 규칙으로 바뀐 날 (scripts/backfill_repair.py REPAIR_FROM)
+MIN_CORR    = 0.3            # BM20(BTC 비중 최대) vs BTC — 이보다 낮으면 날짜 정렬이 틀린 것
+CORR_CHECK  = (90, 365)      # 30D 는 짧아 실제로 낮아질 수 있어 제외
+KST         = timezone(timedelta(hours=9))
+
+
+# ════════════════════════════════════════════════════════════
+# 슬라이딩 윈도우 상태
+# ════════════════════════════════════════════════════════════
+class RollingStats:
+    """윈도우 w 의 평균 / M2 / 하방 제곱합 (슬라이딩 Welford)"""
+
+    def __init__(self, w: int):
+        self.w = w
+        self.buf: deque[float] = deque()
+        self.mean = self.m2 = self.neg_sq = 0.0
+
+    def push(self, x: float):
+        if len(self.buf) == self.w:
+            self._remove(self.buf.popleft())
+        self.buf.append(x)
+        n = len(self.buf)
+        d = x - self.mean
+        self.mean += d / n
+        self.m2 += d * (x - self.mean)
+        self.neg_sq += min(x, 0.0) ** 2
+
+    def _remove(self, x: float):
+        n = len(self.buf)        # 제거 후 개수 (popleft 이후)
+        if n == 0:
+            self.mean = self.m2 = self.neg_sq = 0.0
+            return
+        d = x - self.mean
+        self.mean -= d / n
+        self.m2 -= d * (x - self.mean)
+        self.neg_sq -= min(x, 0.0) ** 2
+
+    def metrics(self) -> dict:
+        n = len(self.buf)
+        if n < 2:
+            return {"n": n, "mean": None, "vol": None, "sharpe": None, "sortino": None}
+        sd = math.sqrt(max(self.m2, 0.0) / (n - 1))
+        dd = math.sqrt(max(self.neg_sq, 0.0) / n)
+        k = math.sqrt(ANNUALIZE)
+        return {
+            "n":       n,
+            "mean":    self.mean,
+            "vol":     sd * k,
+            "sharpe":  self.mean / sd * k if sd > 0 else None,
+            "sortino": self.mean / dd * k if dd > 0 else None,
+        }
+
+    def to_dict(self) -> dict:
+        return {"w": self.w, "buf": list(self.buf), "mean": self.mean, "m2": self.m2, "neg_sq": self.neg_sq}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RollingStats":
+        s = cls(int(d["w"]))
+        s.buf = deque(float(x) for x in d["buf"])
+        s.mean, s.m2, s.neg_sq = float(d["mean"]), float(d["m2"]), float(d["neg_sq"])
+        return s
+
+    @classmethod
+    def from_values(cls, w: int, xs) -> "RollingStats":
+        """마지막 w 개 값으로 바로 상태 생성 (전체 재계산용 — 두 패스, 누적 오차 없음)"""
+        s = cls(w)
+        s.buf = deque(float(x) for x in list(xs)[-w:])
+        n = len(s.buf)
+        if n:
+            s.mean = sum(s.buf) / n
+            s.m2 = sum((x - s.mean) ** 2 for x in s.buf)
+            s.neg_sq = sum(min(x, 0.0) ** 2 for x in s.buf)
+        return s
+
+
+class RollingCov:
+    """윈도우 w 의 (x, y) 공동 모멘트 — BM20 vs BTC 베타 / 상관"""
+
+    def __init__(self, w: int):
+        self.w = w
+        self.buf: deque[tuple[float, float]] = deque()
+        self.mx = self.my = self.c = self.m2x = self.m2y = 0.0
+
+    def push(self, x: float, y: float):
+        if len(self.buf) == self.w:
+            self._remove(*self.buf.popleft())
+        self.buf.append((x, y))
+        n = len(self.buf)
+        dx, dy = x - self.mx, y - self.my
+        self.mx += dx / n
+        self.my += dy / n
+        self.c += dx * (y - self.my)
+        self.m2x += dx * (x - self.mx)
+        self.m2y += dy * (y - self.my)
+
+    def _remove(self, x: float, y: float):
+        n = len(self.buf)
+        if n == 0:
+            self.mx = self.my = self.c = self.m2x = self.m2y = 0.0
+            return
+        dx, dy = x - self.mx, y - self.my
+        self.mx -= dx / n
+        self.my -= dy / n
+        self.c -= dx * (y - self.my)
+        self.m2x -= dx * (x - self.mx)
+        self.m2y -= dy * (y - self.my)
+
+    def metrics(self) -> dict:
+        n = len(self.buf)
+        if n < 2 or self.m2y <= 0:
+            return {"n": n, "beta": None, "corr": None, "btcVol": None}
+        denom = math.sqrt(max(self.m2x, 0.0) * self.m2y)
+        return {
+            "n":      n,
+            "beta":   self.c / self.m2y,
+            "corr":   self.c / denom if denom > 0 else None,
+            "btcVol": math.sqrt(self.m2y / (n - 1)) * math.sqrt(ANNUALIZE),
+        }
+
+    def to_dict(self) -> dict:
+        return {"w": self.w, "buf": [list(p) for p in self.buf], "mx": self.mx, "my": self.my,
+                "c": self.c, "m2x": self.m2x, "m2y": self.m2y}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RollingCov":
+        s = cls(int(d["w"]))
+        s.buf = deque((float(x), float(y)) for x, y in d["buf"])
+        s.mx, s.my, s.c = float(d["mx"]), float(d["my"]), float(d["c"])
+        s.m2x, s.m2y = float(d["m2x"]), float(d["m2y"])
+        return s
+
+    @classmethod
+    def from_values(cls, w: int, pairs) -> "RollingCov":
+        s = cls(w)
+        s.buf = deque((float(x), float(y)) for x, y in list(pairs)[-w:])
+        n = len(s.buf)
+        if n:
+            s.mx = sum(p[0] for p in s.buf) / n
+            s.my = sum(p[1] for p in s.buf) / n
+            s.c = sum((x - s.mx) * (y - s.my) for x, y in s.buf)
+            s.m2x = sum((x - s.mx) ** 2 for x, _ in s.buf)
+            s.m2y = sum((y - s.my) ** 2 for _, y in s.buf)
+        return s
+
+
+# ════════════════════════════════════════════════════════════
+# 전체 상태 (BM20 스트림 + BM20·BTC 페어 스트림 + 낙폭)
+# ════════════════════════════════════════════════════════════
+class RiskState:
+    def __init__(self):
+        self.last_date: str | None = None        # BM20 확정 마지막 날짜
+        self.last_level: float | None = None
+        self.btc_date: str | None = None         # 페어(공통 날짜) 확정 마지막 날짜
+        self.btc_price: float | None = None      # 그 날짜 BTC 가격
+        self.btc_prev: dict[str, float] = {}     # 페어 수익률용: 공통 날짜 직전 레벨/가격
+        self.peak = None
+        self.peak_date = None
+        self.max_dd = 0.0
+        self.max_dd_date = None
+        self.stats = {w: RollingStats(w) for w in WINDOWS}
+        self.cov = {w: RollingCov(w) for w in WINDOWS}
+
+    # ── BM20 한 행 ──────────────────────────────────────────
+    def step_level(self, d: str, level: float):
+        if self.last_level:
+            r = level / self.last_level - 1.0
+            for s in self.stats.values():
+                s.push(r)
+        if self.peak is None or level > self.peak:
+            self.peak, self.peak_date = level, d
+        dd = level / self.peak - 1.0 if self.peak else 0.0
+        if dd < self.max_dd:
+            self.max_dd, self.max_dd_date = dd, d
+        self.last_date, self.last_level = d, level
+
+    # ── 공통 날짜 한 개 (BM20 레벨, BTC 가격) ────────────────
+    def step_pair(self, d: str, level: float, price: float):
+        prev = self.btc_prev
+        if prev.get("level") and prev.get("price"):
+            x = level / prev["level"] - 1.0
+            y = price / prev["price"] - 1.0
+            for c in self.cov.values():
+                c.push(x, y)
+        self.btc_prev = {"level": level, "price": price}
+        self.btc_date, self.btc_price = d, price
+
+    def output(self) -> dict:
+        windows = {}
+        for w in WINDOWS:
+            m = self.stats[w].metrics()
+            cm = self.cov[w].metrics()
+            windows[f"{w}D"] = {
+                "n": m["n"], "vol": m["vol"], "sharpe": m["sharpe"], "sortino": m["sortino"],
+                "beta": cm["beta"], "corr": cm["corr"], "btcVol": cm["btcVol"], "nPairs": cm["n"],
+            }
+        return {
+            "asOf": self.last_date,
+            "btcAsOf": self.btc_date,
+            "bm20Level": self.last_level,
+            "annualization": ANNUALIZE,
+            "riskFree": 0.0,
+            "windows": windows,
+            "drawdown": {
+                "current": (self.last_level / self.peak - 1.0) if self.peak else None,
+                "max": self.max_dd,
+                "peak": self.peak,
+                "peakDate": self.peak_date,
+                "maxDate": self.max_dd_date,
+            },
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "version": STATE_VER, "windows": list(WINDOWS),
+            "last_date": self.last_date, "last_level": self.last_level,
+            "btc_date": self.btc_date, "btc_price": self.btc_price, "btc_prev": self.btc_prev,
+            "peak": self.peak, "peak_date": self.peak_date,
+            "max_dd": self.max_dd, "max_dd_date": self.max_dd_date,
+            "stats": {str(w): s.to_dict() for w, s in self.stats.items()},
+            "cov": {str(w): c.to_dict() for w, c in self.cov.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RiskState":
+        if d.get("version") != STATE_VER or list(d.get("windows", [])) != list(WINDOWS):
+            raise ValueError("state version/windows mismatch")
+        s = cls()
+        s.last_date, s.last_level = d["last_date"], d["last_level"]
+        s.btc_date, s.btc_price, s.btc_prev = d["btc_date"], d["btc_price"], d["btc_prev"] or {}
+        s.peak, s.peak_date = d["peak"], d["peak_date"]
+        s.max_dd, s.max_dd_date = d["max_dd"], d["max_dd_date"]
+        s.stats = {w: RollingStats.from_dict(d["stats"][str(w)]) for w in WINDOWS}
+        s.cov = {w: RollingCov.from_dict(d["cov"][str(w)]) for w in WINDOWS}
+        return s
+
+
+# ════════════════════════════════════════════════════════════
+# 입력
+# ════════════════════════════════════════════════════════════
+def _load_series(path: Path, value_key: str) -> list[tuple[str, float]]:
+    """[(date, value)] 날짜 오름차순, 같은 날짜는 마지막 값"""
+    if not path.exists():
+        raise FileNotFoundError(f"Missing {path}")
+    by_date: dict[str, float] = {}
+    for it in json.loads(path.read_text(encoding="utf-8")):
+        d, v = str(it.get("date", ""))[:10], it.get(value_key)
+        if d and v is not None and float(v) > 0:
+            by_date[d] = float(v)
+    return sorted(by_date.items())
+
+
+def _btc_date(d: str) -> str:
+    """BM20 날짜 → 같은 종가 구간의 BTC(UTC) 날짜"""
+    if d < LIVE_FROM:
+        return d
+    return (date.fromisoformat(d) - timedelta(days=1)).isoformat()
+
+
+def _pairs(bm20: list[tuple[str, float]], btc: list[tuple[str, float]]) -> list[tuple[str, float, float]]:
+    """[(BM20 날짜, 레벨, 같은 종가 구간 BTC 가격)] — BTC 날짜가 겹치면 앞 행만"""
+    px = dict(btc)
+    out, seen = [], None
+    for d, lv in bm20:
+        bd = _btc_date(d)
+        if bd in px and bd != seen:
+            out.append((d, lv, px[bd]))
+            seen = bd
+    return out
+
+
+def _same(a: float | None, b: float | None) -> bool:
+    return a is not None and b is not None and abs(a - b) <= REL_TOL * max(abs(a), abs(b), 1.0)
+
+
+# ════════════════════════════════════════════════════════════
+# 전체 재계산 (벡터)
+# ════════════════════════════════════════════════════════════
+def full_recompute(bm20, btc) -> tuple[RiskState, dict, dict]:
+    """Returns (끝에서 두 번째 행까지 확정한 상태, 마지막 행까지의 출력, 검증용 벡터 결과)"""
+    import numpy as np
+    import pandas as pd
+
+    lv = pd.Series([v for _, v in bm20], index=[d for d, _ in bm20], dtype="float64")
+    r = lv.pct_change().dropna()
+    pairs = _pairs(bm20, btc)
+    pdf = pd.DataFrame(pairs, columns=["date", "level", "price"]).set_index("date")
+    pr = pdf.pct_change().dropna()
+
+    k = math.sqrt(ANNUALIZE)
+    vec: dict = {}
+    for w in WINDOWS:
+        rw = r.rolling(w, min_periods=2)
+        sd = rw.std()
+        mean = rw.mean()
+        down = (r.clip(upper=0.0) ** 2).rolling(w, min_periods=2).mean() ** 0.5
+        cov = pr["level"].rolling(w, min_periods=2).cov(pr["price"])
+        var_y = pr["price"].rolling(w, min_periods=2).var()
+        corr = pr["level"].rolling(w, min_periods=2).corr(pr["price"])
+        vec[f"{w}D"] = {
+            "vol": float(sd.iloc[-1] * k) if len(sd) else None,
+            "sharpe": float(mean.iloc[-1] / sd.iloc[-1] * k) if len(sd) and sd.iloc[-1] > 0 else None,
+            "sortino": float(mean.iloc[-1] / down.iloc[-1] * k) if len(down) and down.iloc[-1] > 0 else None,
+            "beta": float(cov.iloc[-1] / var_y.iloc[-1]) if len(cov) and var_y.iloc[-1] > 0 else None,
+            "corr": float(corr.iloc[-1]) if len(corr) and np.isfinite(corr.iloc[-1]) else None,
+        }
+    dd = lv / lv.cummax() - 1.0
+    vec["drawdown"] = {"current": float(dd.iloc[-1]), "max": float(dd.min())}
+
+    # 상태: 끝에서 두 번째 행까지 (마지막 행은 출력에만 임시 반영)
+    def _state(upto_bm20: int, upto_pairs: int) -> RiskState:
+        st = RiskState()
+        head = lv.iloc[:upto_bm20]
+        if len(head):
+            cm = head.cummax()
+            dds = head / cm - 1.0
+            st.last_date, st.last_level = head.index[-1], float(head.iloc[-1])
+            st.peak = float(cm.iloc[-1])
+            st.peak_date = head.idxmax()
+            st.max_dd = min(float(dds.min()), 0.0)
+            st.max_dd_date = dds.idxmin() if st.max_dd < 0 else None
+            rets = head.pct_change().dropna().tolist()
+            st.stats = {w: RollingStats.from_values(w, rets) for w in WINDOWS}
+        ph = pdf.iloc[:upto_pairs]
+        if len(ph):
+            prets = ph.pct_change().dropna()
+            plist = list(zip(prets["level"].tolist(), prets["price"].tolist()))
+            st.cov = {w: RollingCov.from_values(w, plist) for w in WINDOWS}
+            st.btc_date, st.btc_price = ph.index[-1], float(ph["price"].iloc[-1])
+            st.btc_prev = {"level": float(ph["level"].iloc[-1]), "price": float(ph["price"].iloc[-1])}
+        return st
+
+    committed = _state(len(lv) - 1, len(pdf) - 1)
+    out = _state(len(lv), len(pdf)).output()
+    return committed, out, vec
+
+
+# ════════════════════════════════════════════════════════════
+# 증분 갱신
+# ════════════════════════════════════════════════════════════
+def incremental(bm20, btc, state: RiskState) -> tuple[RiskState, dict, int]:
+    """확정 상태 + 새 행 → (새 확정 상태, 마지막 행까지의 출력, 새로 확정한 행 수).
+    상태가 시리즈와 안 맞으면 ValueError (→ 호출부에서 전체 재계산)."""
+    dates = [d for d, _ in bm20]
+    pairs = _pairs(bm20, btc)
+    pdates = [p[0] for p in pairs]
+
+    def _resume(ds: list[str], d: str | None, ok) -> int:
+        if d is None:
+            return 0
+        i = bisect_left(ds, d)
+        if i >= len(ds) or ds[i] != d or not ok(i):
+            raise ValueError(f"state date {d} no longer matches the series")
+        return i + 1
+
+    i0 = _resume(dates, state.last_date, lambda i: _same(bm20[i][1], state.last_level))
+    j0 = _resume(pdates, state.btc_date,
+                 lambda j: _same(pairs[j][1], state.btc_prev.get("level"))
+                 and _same(pairs[j][2], state.btc_price))
+
+    # 윈도우 안쪽 backfill 수정 감지: 가장 긴 윈도우 버퍼 = 시리즈 꼬리 수익률이어야 한다 (O(W))
+    buf = list(state.stats[WINDOWS[-1]].buf)
+    lv = [v for _, v in bm20[max(i0 - len(buf) - 1, 0):i0]]
+    tail = [b / a - 1.0 for a, b in zip(lv, lv[1:])]
+    if len(tail) != len(buf) or not all(_same(x, y) or abs(x - y) < 1e-12 for x, y in zip(tail, buf)):
+        raise ValueError("window buffer no longer matches the series (backfill changed)")
+
+    new = 0
+    for d, v in bm20[i0:len(bm20) - 1]:
+        state.step_level(d, v)
+        new += 1
+    for d, v, p in pairs[j0:len(pairs) - 1]:
+        state.step_pair(d, v, p)
+
+    tip = copy.deepcopy(state)   # 마지막 행은 임시 반영 (장중 덮어쓰기 대비)
+    if len(bm20) > i0 and bm20[-1][0] != state.last_date:
+        tip.step_level(*bm20[-1])
+    if len(pairs) > j0 and pairs[-1][0] != state.btc_date:
+        tip.step_pair(*pairs[-1])
+    return state, tip.output(), new
+
+
+# ════════════════════════════════════════════════════════════
+# 저장 / main
+# ════════════════════════════════════════════════════════════
+def _write_json(path: Path, obj: dict, indent: int | None = 2):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(obj, ensure_ascii=False, indent=indent), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _round(obj, nd: int = 8):
+    if isinstance(obj, float):
+        return round(obj, nd) if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _round(v, nd) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_round(v, nd) for v in obj]
+    return obj
+
+
+def _compare(a: dict, vec: dict) -> list[str]:
+    bad = []
+    for w in WINDOWS:
+        key = f"{w}D"
+        for m in ("vol", "sharpe", "sortino", "beta", "corr"):
+            x, y = a["windows"][key][m], vec[key][m]
+            if (x is None) != (y is None) or (x is not None and not _same(x, y)):
+                bad.append(f"{key}.{m}: incremental={x} full={y}")
+    for m in ("current", "max"):
+        x, y = a["drawdown"][m], vec["drawdown"][m]
+        if not _same(x, y) and not (x == 0 and y == 0):
+            bad.append(f"drawdown.{m}: incremental={x} full={y}")
+    return bad
+
+
+def _sanity(out: dict) -> list[str]:
+    bad = []
+    for w in CORR_CHECK:
+        m = out["windows"][f"{w}D"]
+        if m["nPairs"] >= w // 2 and m["corr"] is not None and m["corr"] < MIN_CORR:
+            bad.append(f"{w}D.corr={m['corr']:.3f} < {MIN_CORR} (BM20/BTC 날짜 정렬 확인)")
+    return bad
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="BM20 rolling risk metrics (incremental)")
+    ap.add_argument("--full", action="store_true", help="전체 재계산 (상태 재생성)")
+    ap.add_argument("--validate", action="store_true", help="증분 결과를 전체 재계산과 비교")
+    args = ap.parse_args()
+
+    bm20 = _load_series(BM20_SERIES, "level")
+    btc = _load_series(BTC_SERIES, "price")
+    if len(bm20) < 2:
+        print(f"[WARN] {BM20_SERIES} 행이 부족함 → skip")
+        return 0
+
+    mode, new = "full", len(bm20) - 1
+    state = None
+    if not args.full and STATE_JSON.exists():
+        try:
+            state, out, new = incremental(bm20, btc, RiskState.from_dict(
+                json.loads(STATE_JSON.read_text(encoding="utf-8"))))
+            mode = "incremental"
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"[INFO] 상태 재사용 불가 ({e}) → 전체 재계산")
+            state = None
+    vec = None
+    if state is None:
+        state, out, vec = full_recompute(bm20, btc)
+
+    if args.validate:
+        if vec is None:
+            _, _, vec = full_recompute(bm20, btc)
+        bad = _compare(out, vec) + _sanity(out)
+        for b in bad:
+            print(f"[VALIDATE] mismatch {b}")
+        print(f"[VALIDATE] {'OK' if not bad else 'FAIL'} ({mode} vs full, rel tol {REL_TOL:g})")
+        if bad:
+            return 1
+
+    out.update(mode=mode, updatedAt=datetime.now(KST).strftime("%Y-%m-%dT%H:%M:%S+09:00"))
+    _write_json(OUT_JSON, _round(out))
+    _write_json(STATE_JSON, state.to_dict(), indent=None)
+    w1 = out["windows"][f"{WINDOWS[-1]}D"]
+    print(f"[OK] {OUT_JSON.name} ({mode}, +{new} rows) asOf={out['asOf']} "
+          f"vol{WINDOWS[-1]}={w1['vol'] if w1['vol'] is None else round(w1['vol'], 4)} "
+          f"beta={w1['beta'] if w1['beta'] is None else round(w1['beta'], 3)} "
+          f"maxDD={out['drawdown']['max']:.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bm20_sectors.py
+───────────────
+BM20 섹터 서브지수 — data/coin_sectors.json 섹터 태그 × components_history.csv 구성종목 수익률.
+
+bm20_attribution.Attribution 과 같은 날짜(T) × 심볼(N) 행렬을 그대로 쓴다.
+섹터 소속 행렬 M (N × S, 0/1) 하나로 하루 한 번의 행렬곱:
+  동일가중(ew)  r_s = (R ⊙ P) · M / (P · M)        P = 그날 구성종목 여부
+  BM20가중(bw)  r_s = (W ⊙ R) · M / ((W ⊙ P) · M)   W = 그날 BM20 비중
+→ 레벨 = 직전 레벨 × (1 + r_s) 체인 연결 (첫 날 종가 = 100). 한 코인이 여러 섹터면 각 섹터에 모두 포함.
+  그날 섹터에 구성종목이 없으면 레벨 유지.
+
+히스토리는 out/history/sector_indices.json 에 누적한다 — 다음 실행은 마지막 날짜 이후만 이어 붙임
+(저장된 마지막 날은 당일 재실행 대비로 다시 계산).
+섹터 태그가 바뀌면(mapHash 불일치) 또는 --rebuild 면 처음부터 다시 계산.
+sector.html 은 이 JSON 하나만 읽는다 (레벨 히스토리 + 1D/7D/30D/YTD 변화 + 섹터 코인 카드 가격).
+카드 가격: BM20 구성종목은 그날 일간 종가, 그 밖의 coin_sectors.json 코인은
+k_share.py 가 같은 CMC 묶음 호출로 받아 둔 시세 (quotesAsOf 시각 기준).
+
+사용:
+  python scripts/bm20_sectors.py              # 증분 갱신
+  python scripts/bm20_sectors.py --rebuild    # 전체 재계산
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from bm20_attribution import COMPONENTS_CSV, Attribution
+from series_index import ref_day
+
+ROOT = Path(os.getenv("BM20_DATA_ROOT") or Path(__file__).resolve().parent.parent)
+
+SECTORS_JSON = ROOT / "data/coin_sectors.json"
+KSHARE_JSON  = ROOT / "out/global/k_share_24h_latest.json"
+OUT_JSON     = ROOT / "out/history/sector_indices.json"
+
+BASE = 100.0
+WEIGHTINGS = ("ew", "bw")
+CHANGES = ("1D", "7D", "30D", "YTD")
+DECIMALS = 4
+
+
+# ══════════════════════════════════════════════════════════════
+# 1. 섹터 소속 행렬
+# ══════════════════════════════════════════════════════════════
+
+def load_sector_map(path: Path = SECTORS_JSON) -> dict[str, list[str]]:
+    d = json.loads(path.read_text(encoding="utf-8"))
+    return {sym.upper(): list(v.get("sectors") or []) for sym, v in d.items()}
+
+
+def map_hash(sector_map: dict[str, list[str]]) -> str:
+    blob = json.dumps(sector_map, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()[:12]
+
+
+def membership(symbols: list[str], sector_map: dict[str, list[str]]) -> tuple[list[str], np.ndarray]:
+    """→ (섹터 목록, M[N, S]) — BM20 에 한 번도 편입된 적 없는 섹터(구성종목 0개)는 제외"""
+    sectors = sorted({s for sym in symbols for s in sector_map.get(sym, ())})
+    col = {s: j for j, s in enumerate(sectors)}
+    M = np.zeros((len(symbols), len(sectors)))
+    for i, sym in enumerate(symbols):
+        for s in sector_map.get(sym, ()):
+            M[i, col[s]] = 1.0
+    return sectors, M
+
+
+# ══════════════════════════════════════════════════════════════
+# 2. 일간 섹터 수익률 → 체인 연결 레벨
+# ══════════════════════════════════════════════════════════════
+
+def sector_returns(att: Attribution, M: np.ndarray) -> dict[str, np.ndarray]:
+    """→ {"ew": (T, S), "bw": (T, S)} 일간 수익률 (섹터에 구성종목 없는 날은 NaN)"""
+    P = att.present.astype(np.float64)
+    W = att.weight * P
+    R = att.ret
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "ew": ((R * P) @ M) / (P @ M),
+            "bw": ((W * R) @ M) / (W @ M),
+        }
+
+
+def chain(rets: np.ndarray, start: np.ndarray) -> np.ndarray:
+    """start 레벨에서 일간 수익률 (T, S) 을 이어 붙인 레벨 (T, S). NaN 인 날은 레벨 유지."""
+    return start * np.cumprod(1.0 + np.nan_to_num(rets, nan=0.0), axis=0)
+
+
+def _change(days: np.ndarray, levels: np.ndarray, horizon: str) -> np.ndarray:
+    """series_index 규칙 (기준일 ≤ ref 의 마지막 레벨 대비) — 기준일이 없으면 첫 레벨 대비"""
+    asof = date.fromordinal(date(1970, 1, 1).toordinal() + int(days[-1]))
+    ref = ref_day(horizon, asof)
+    i = 0 if ref is None else max(int(np.searchsorted(days, ref, side="right")) - 1, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return levels[-1] / levels[i] - 1.0
+
+
+# ══════════════════════════════════════════════════════════════
+# 3. 증분 갱신 / 저장
+# ══════════════════════════════════════════════════════════════
+
+def _load_prev(path: Path, sectors: list[str], mhash: str) -> dict | None:
+    try:
+        prev = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if prev.get("mapHash") != mhash or prev.get("sectors") != sectors or not prev.get("dates"):
+        return None
+    return prev
+
+
+def _anchor(prev: dict | None, att: Attribution) -> str | None:
+    """증분 기준일 — 저장된 마지막 날은 당일 재실행으로 바뀌었을 수 있어 그 전날 레벨에서 다시 이어 붙인다"""
+    if prev is None or len(prev["dates"]) < 2 or prev["dates"][-2] not in att.dates:
+        return None
+    return prev["dates"][-2]
+
+
+def _load_quotes(path: Path = KSHARE_JSON) -> tuple[str | None, dict[str, dict]]:
+    """k_share_24h_latest.json → (시각, {심볼: {price, chg24h, vol24h}})"""
+    try:
+        ks = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None, {}
+    q = ks.get("quotes") or {}
+    cols = ("price", "chg24h", "vol24h")
+    quotes = {s: dict(zip(cols, row)) for s, *row in zip(q.get("symbols") or [], *(q.get(c) or [] for c in cols))}
+    # quotes 없는 이전 파일: 구성종목 거래량만
+    for s, v in zip(ks.get("symbols") or [], ks.get("global_usd_24h") or []):
+        quotes.setdefault(s, {"price": None, "chg24h": None, "vol24h": v})
+    return ks.get("as_of"), quotes
+
+
+def _coins(att: Attribution, sector_map: dict[str, list[str]], quotes: dict[str, dict]) -> dict:
+    """섹터 코인 카드 데이터 — 구성종목: 일간 종가·1D (src=close), 비구성: k_share CMC 시세 (src=cmc)"""
+    t = len(att.dates) - 1
+    out = {}
+    for i, sym in enumerate(att.symbols):
+        if not att.present[t, i]:
+            continue
+        out[sym] = {
+            "src": "close",
+            "price": None if np.isnan(att.price[t, i]) else round(float(att.price[t, i]), 8),
+            "chg1d": round(float(att.ret[t, i]) * 100.0, 4),
+            "weight": round(float(att.weight[t, i]), 6),
+            "vol24h": (quotes.get(sym) or {}).get("vol24h"),
+        }
+    for sym in sector_map:
+        q = quotes.get(sym)
+        if sym in out or not q or q.get("price") is None:
+            continue
+        out[sym] = {"src": "cmc", "price": q["price"], "chg1d": q.get("chg24h"), "weight": None,
+                    "vol24h": q.get("vol24h")}
+    return out
+
+
+def build_sectors(att: Attribution, sector_map: dict[str, list[str]], prev: dict | None = None) -> dict:
+    sectors, M = membership(att.symbols, sector_map)
+    rets = sector_returns(att, M)
+
+    anchor = _anchor(prev, att)
+    if anchor is not None:
+        k = att.dates.index(anchor) + 1
+        keep = len(prev["dates"]) - 1
+        dates = prev["dates"][:keep] + att.dates[k:]
+        levels = {}
+        for wt in WEIGHTINGS:
+            old = np.array([prev[wt][s][:keep] for s in sectors], dtype=np.float64).T
+            levels[wt] = np.vstack([old, chain(rets[wt][k:], old[-1])])
+    else:
+        # 전체: 첫 날 종가 = 100
+        dates = list(att.dates)
+        levels = {}
+        for wt in WEIGHTINGS:
+            r = rets[wt].copy()
+            r[0] = 0.0
+            levels[wt] = chain(r, np.full(len(sectors), BASE))
+
+    days = np.array(dates, dtype="datetime64[D]").astype(np.int64)
+    t = len(att.dates) - 1
+    members = {s: [att.symbols[i] for i in np.flatnonzero(M[:, j] * att.present[t])]
+               for j, s in enumerate(sectors)}
+
+    quotes_as_of, quotes = _load_quotes()
+
+    def rnd(a):
+        return [None if not np.isfinite(x) else round(float(x), DECIMALS) for x in a]
+
+    return {
+        "asOf": dates[-1],
+        "base": BASE,
+        "baseDate": dates[0],
+        "mapHash": map_hash(sector_map),
+        "sectors": sectors,
+        "members": members,
+        "dates": dates,
+        **{wt: {s: rnd(levels[wt][:, j]) for j, s in enumerate(sectors)} for wt in WEIGHTINGS},
+        "changes": {wt: {h: dict(zip(sectors, rnd(_change(days, levels[wt], h)))) for h in CHANGES}
+                    for wt in WEIGHTINGS},
+        "quotesAsOf": quotes_as_of,
+        "coins": _coins(att, sector_map, quotes),
+    }
+
+
+def write_sectors(path: Path = OUT_JSON, att: Attribution | None = None, csv_path: Path = COMPONENTS_CSV,
+                  rebuild: bool = False) -> dict:
+    att = att or Attribution.from_csv(csv_path)
+    sector_map = load_sector_map()
+    sectors, _ = membership(att.symbols, sector_map)
+    prev = None if rebuild else _load_prev(path, sectors, map_hash(sector_map))
+    res = build_sectors(att, sector_map, prev)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(res, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+    mode = "증분" if _anchor(prev, att) is not None else "전체"
+    print(f"[OK] {path.name} → asOf={res['asOf']} ({mode}, {len(res['sectors'])} sectors × {len(res['dates'])} days)")
+    return res
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="BM20 sector sub-indices (equal / BM20 weight, chain-linked)")
+    ap.add_argument("--rebuild", action="store_true", help="저장된 히스토리 무시하고 전체 재계산")
+    ap.add_argument("--out", default=str(OUT_JSON))
+    args = ap.parse_args()
+
+    res = write_sectors(Path(args.out), rebuild=args.rebuild)
+    print(f"{'sector':<16}{'members':>8}" + "".join(f"{'ew ' + h:>10}{'bw ' + h:>10}" for h in ("1D", "30D")))
+    for s in res["sectors"]:
+        row = f"{s:<16}{len(res['members'][s]):>8}"
+        for h in ("1D", "30D"):
+            for wt in WEIGHTINGS:
+                v = res["changes"][wt][h][s]
+                row += f"{'—' if v is None else f'{v * 100:+.2f}%':>10}"
+        print(row)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bm20_store.py
+─────────────
+히스토리 테이블 전체를 하나의 로컬 SQLite(WAL) DB로 모은 분석 스토어.
+
+  테이블                 원본 파일(=export 뷰)
+  ─────────────────────  ─────────────────────────────────────────
+  bm20_level             out/backfill_current_basket.csv
+  market_history         out/history/market_history.csv
+  korea_daily            out/history/korea_daily.csv
+  components             out/history/components_history.csv
+  snapshots(kimchi)      out/history/kimchi_snapshots.json
+  snapshots(krw_24h)     out/history/krw_24h_snapshots.json
+  snapshots(bm20_history) data/bm20_history.json
+  etf_history            data/etf_*_history.json
+
+- 모든 테이블은 date 인덱스를 가진다 → 포인트 조회/구간 집계가 인덱스 쿼리
+- 각 원본 파일의 (mtime, size) 서명을 sources 테이블에 기록하고, 서명이 바뀐
+  테이블만 다시 적재한다 (writer가 파일을 쓴 뒤 sync_table() 호출 = 적재 경로)
+- DB는 파생 캐시라서 out/store/ 는 git에 올리지 않는다. 없으면 첫 조회 때 자동 생성
+- CSV/JSON 원본은 export 명령으로 DB에서 다시 만들 수 있다
+
+사용:
+    python scripts/bm20_store.py sync            # 바뀐 원본만 적재
+    python scripts/bm20_store.py sync --full     # 전체 재적재
+    python scripts/bm20_store.py export [DIR]    # DB → CSV/JSON 뷰 (기본: 원래 경로)
+    python scripts/bm20_store.py stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable
+
+ROOT = Path(os.getenv("BM20_DATA_ROOT") or Path(__file__).resolve().parent.parent)
+OUT_DIR = ROOT / os.getenv("OUT_DIR", "out")
+HIST_DIR = OUT_DIR / "history"
+DATA_DIR = ROOT / "data"
+
+DB_PATH = Path(os.getenv("BM20_DB", str(OUT_DIR / "store" / "bm20.sqlite")))
+
+# ── 원본 매핑 ─────────────────────────────────────────────────
+# CSV 테이블: 컬럼은 원본 헤더를 그대로 사용 (새 컬럼은 적재 시 ALTER TABLE로 추가)
+CSV_TABLES = {
+    "bm20_level":     {"path": OUT_DIR / "backfill_current_basket.csv", "key": ("date",)},
+    "market_history": {"path": HIST_DIR / "market_history.csv",         "key": ("date",)},
+    "korea_daily":    {"path": HIST_DIR / "korea_daily.csv",            "key": ("date",)},
+    "components":     {"path": HIST_DIR / "components_history.csv",     "key": ("date", "symbol")},
+}
+
+# 스냅샷(JSON 리스트): kind → (경로, 타임스탬프 키)
+SNAPSHOT_SOURCES = {
+    "kimchi":       (HIST_DIR / "kimchi_snapshots.json", "timestamp_kst"),
+    "krw_24h":      (HIST_DIR / "krw_24h_snapshots.json", "timestamp_kst"),
+    "bm20_history": (DATA_DIR / "bm20_history.json", "timestamp"),
+}
+
+ETF_GLOB = "etf_*_history.json"
+
+_NUM_RE = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+_INT_RE = re.compile(r"^[+-]?\d+$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    name TEXT PRIMARY KEY, path TEXT, mtime_ns INTEGER, size INTEGER, rows INTEGER
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    kind TEXT NOT NULL, ts TEXT NOT NULL, date TEXT NOT NULL, payload TEXT NOT NULL,
+    PRIMARY KEY (kind, ts)
+);
+CREATE INDEX IF NOT EXISTS ix_snapshots_kind_date ON snapshots(kind, date);
+CREATE TABLE IF NOT EXISTS etf_history (
+    asset TEXT NOT NULL, date TEXT NOT NULL, payload TEXT NOT NULL,
+    PRIMARY KEY (asset, date)
+);
+CREATE INDEX IF NOT EXISTS ix_etf_history_date ON etf_history(date);
+"""
+
+_CONN: sqlite3.Connection | None = None
+
+
+# ─────────────────────────────────────────────────────────
+# 연결 / 스키마
+# ─────────────────────────────────────────────────────────
+
+def _q(name: str) -> str:
+    """SQL 식별자 인용 (index 같은 예약어 컬럼 대비)"""
+    return '"' + name.replace('"', '""') + '"'
+
+def connect(path: Path | None = None) -> sqlite3.Connection:
+    """WAL 모드 연결. 같은 프로세스에서는 하나를 재사용한다."""
+    global _CONN
+    if _CONN is not None and path is None:
+        return _CONN
+    db = Path(path or DB_PATH)
+    db.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db), timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    if path is None:
+        _CONN = conn
+    return conn
+
+def _columns(conn: sqlite3.Connection, table: str) -> list[str]:
+    return [r["name"] for r in conn.execute(f"PRAGMA table_info({_q(table)})")]
+
+def _ensure_table(conn: sqlite3.Connection, table: str, columns: Iterable[str]):
+    """CSV 헤더 기준으로 테이블 생성 + 없는 컬럼 추가 (하위 호환)"""
+    key = CSV_TABLES[table]["key"]
+    columns = list(dict.fromkeys([*key, *columns]))
+    existing = _columns(conn, table)
+    if not existing:
+        cols_sql = ", ".join(_q(c) + (" TEXT NOT NULL" if c in key else "") for c in columns)
+        pk_sql = ", ".join(_q(c) for c in key)
+        conn.execute(f"CREATE TABLE {_q(table)} ({cols_sql}, PRIMARY KEY ({pk_sql}))")
+        if key != ("date",):
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {_q('ix_' + table + '_date')} ON {_q(table)}(date)")
+        return
+    for c in columns:
+        if c not in existing:
+            conn.execute(f"ALTER TABLE {_q(table)} ADD COLUMN {_q(c)}")
+
+def _coerce(v: Any) -> Any:
+    """CSV 문자열 → int/float/str/None (빈 칸은 NULL)"""
+    if v is None:
+        return None
+    if not isinstance(v, str):
+        return v
+    s = v.strip()
+    if s == "" or s.lower() == "nan":
+        return None
+    if _INT_RE.match(s):
+        return int(s)
+    if _NUM_RE.match(s):
+        return float(s)
+    return s
+
+def _signature(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def _is_fresh(conn: sqlite3.Connection, name: str, path: Path) -> bool:
+    sig = _signature(path)
+    row = conn.execute("SELECT mtime_ns, size FROM sources WHERE name=?", (name,)).fetchone()
+    if sig is None:
+        return row is not None  # 원본이 없으면 있던 데이터를 그대로 둔다
+    return row is not None and (row["mtime_ns"], row["size"]) == sig
+
+def _mark(conn: sqlite3.Connection, name: str, path: Path, rows: int):
+    sig = _signature(path) or (None, None)
+    conn.execute(
+        "INSERT OR REPLACE INTO sources(name, path, mtime_ns, size, rows) VALUES (?,?,?,?,?)",
+        (name, str(path), sig[0], sig[1], rows),
+    )
+
+
+# ─────────────────────────────────────────────────────────
+# 적재 (ingest)
+# ─────────────────────────────────────────────────────────
+
+def upsert_rows(table: str, rows: list[dict], conn: sqlite3.Connection | None = None) -> int:
+    """dict 행들을 CSV 테이블에 upsert (키 충돌 시 덮어씀)"""
+    if not rows:
+        return 0
+    conn = conn or connect()
+    cols = list(dict.fromkeys(c for r in rows for c in r))
+    _ensure_table(conn, table, cols)
+    sql = (f"INSERT OR REPLACE INTO {_q(table)} ({', '.join(_q(c) for c in cols)}) "
+           f"VALUES ({', '.join('?' for _ in cols)})")
+    conn.executemany(sql, [tuple(_coerce(r.get(c)) for c in cols) for r in rows])
+    return len(rows)
+
+def ingest_csv(table: str, path: Path | None = None, conn: sqlite3.Connection | None = None) -> int:
+    """CSV 원본 전체를 테이블로 다시 적재"""
+    conn = conn or connect()
+    path = Path(path or CSV_TABLES[table]["path"])
+    if not path.exists():
+        return 0
+    with path.open(encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        header = [h for h in (reader.fieldnames or []) if h]
+        rows = [r for r in reader if (r.get("date") or "").strip()]
+    with conn:
+        _ensure_table(conn, table, header)
+        conn.execute(f"DELETE FROM {_q(table)}")
+        n = upsert_rows(table, rows, conn)
+        _mark(conn, table, path, n)
+    return n
+
+def upsert_snapshots(kind: str, items: list[dict], ts_key: str | None = None,
+                     conn: sqlite3.Connection | None = None) -> int:
+    conn = conn or connect()
+    ts_key = ts_key or SNAPSHOT_SOURCES[kind][1]
+    params = []
+    for it in items:
+        if not isinstance(it, dict):
+            continue
+        ts = str(it.get(ts_key) or "")
+        if not ts:
+            continue
+        params.append((kind, ts, ts[:10], json.dumps(it, ensure_ascii=False, separators=(",", ":"))))
+    conn.executemany("INSERT OR REPLACE INTO snapshots(kind, ts, date, payload) VALUES (?,?,?,?)", params)
+    return len(params)
+
+def ingest_snapshot_file(kind: str, conn: sqlite3.Connection | None = None) -> int:
+    conn = conn or connect()
+    path, ts_key = SNAPSHOT_SOURCES[kind]
+    if not path.exists():
+        return 0
+    try:
+        items = json.loads(path.read_text(encoding="utf-8"))
+    except Exception as e:
+        print(f"[WARN] store: {path.name} parse failed: {e}")
+        return 0
+    if not isinstance(items, list):
+        return 0
+    # 라이브 JSON은 최근 구간만 유지하므로, 이미 적재된 과거 스냅샷은 지우지 않고 upsert만 한다
+    with conn:
+        n = upsert_snapshots(kind, items, ts_key, conn)
+        _mark(conn, f"snapshots:{kind}", path, n)
+    return n
+
+def ingest_etf_history(path: Path, conn: sqlite3.Connection | None = None) -> int:
+    conn = conn or connect()
+    asset = path.name[len("etf_"):-len("_history.json")]
+    try:
+        obj = json.loads(path.read_text(encoding="utf-8"))
+    except Exception as e:
+        print(f"[WARN] store: {path.name} parse failed: {e}")
+        return 0
+    records = obj.get("data", []) if isinstance(obj, dict) else (obj or [])
+    params = [
+        (asset, str(r["date"])[:10], json.dumps(r, ensure_ascii=False, separators=(",", ":")))
+        for r in records if isinstance(r, dict) and r.get("date")
+    ]
+    meta = {k: v for k, v in obj.items() if k != "data"} if isinstance(obj, dict) else {}
+    with conn:
+        conn.execute("DELETE FROM etf_history WHERE asset=?", (asset,))
+        conn.executemany("INSERT OR REPLACE INTO etf_history(asset, date, payload) VALUES (?,?,?)", params)
+        # 최상위 메타(updatedAt, type)는 export 때 복원하려고 date='' 행에 보관
+        conn.execute("INSERT OR REPLACE INTO etf_history(asset, date, payload) VALUES (?,?,?)",
+                     (asset, "", json.dumps(meta, ensure_ascii=False)))
+        _mark(conn, f"etf:{asset}", path, len(params))
+    return len(params)
+
+def sync_table(name: str, force: bool = False, conn: sqlite3.Connection | None = None) -> bool:
+    """원본 서명이 바뀐 경우에만 다시 적재. writer는 파일을 쓴 뒤 이걸 호출한다.
+    name: CSV 테이블명 | 'snapshots:<kind>' | 'etf:<asset>'"""
+    conn = conn or connect()
+    if name in CSV_TABLES:
+        path = CSV_TABLES[name]["path"]
+        if force or not _is_fresh(conn, name, path):
+            ingest_csv(name, path, conn)
+            return True
+        return False
+    if name.startswith("snapshots:"):
+        kind = name.split(":", 1)[1]
+        path = SNAPSHOT_SOURCES[kind][0]
+        if force or not _is_fresh(conn, name, path):
+            ingest_snapshot_file(kind, conn)
+            return True
+        return False
+    if name.startswith("etf:"):
+        path = DATA_DIR / f"etf_{name.split(':', 1)[1]}_history.json"
+        if path.exists() and (force or not _is_fresh(conn, name, path)):
+            ingest_etf_history(path, conn)
+            return True
+        return False
+    raise KeyError(name)
+
+def sync_all(force: bool = False, conn: sqlite3.Connection | None = None) -> list[str]:
+    conn = conn or connect()
+    names = [*CSV_TABLES, *(f"snapshots:{k}" for k in SNAPSHOT_SOURCES)]
+    names += [f"etf:{p.name[len('etf_'):-len('_history.json')]}" for p in sorted(DATA_DIR.glob(ETF_GLOB))]
+    return [n for n in names if sync_table(n, force, conn)]
+
+
+# ─────────────────────────────────────────────────────────
+# 조회 API
+# ─────────────────────────────────────────────────────────
+
+def _ready(name: str) -> sqlite3.Connection:
+    conn = connect()
+    sync_table(name, conn=conn)
+    return conn
+
+def _where_range(start: str | None, end: str | None, col: str = "date") -> tuple[str, list]:
+    cond, args = [], []
+    if start:
+        cond.append(f"{col} >= ?"); args.append(start)
+    if end:
+        cond.append(f"{col} <= ?"); args.append(end)
+    return (" AND ".join(cond) or "1=1"), args
+
+def rows(table: str, start: str | None = None, end: str | None = None,
+         columns: Iterable[str] | None = None) -> list[dict]:
+    """date 구간 [start, end] 행들 (날짜 오름차순)"""
+    conn = _ready(table)
+    if not _columns(conn, table):
+        return []
+    cols = ", ".join(_q(c) for c in columns) if columns else "*"
+    where, args = _where_range(start, end)
+    return [dict(r) for r in conn.execute(f"SELECT {cols} FROM {_q(table)} WHERE {where} ORDER BY date, rowid", args)]
+
+def row_on(table: str, date: str) -> dict | None:
+    conn = _ready(table)
+    if not _columns(conn, table):
+        return None
+    r = conn.execute(f"SELECT * FROM {_q(table)} WHERE date = ?", (date,)).fetchone()
+    return dict(r) if r else None
+
+def last_date(table: str, before: str | None = None) -> str | None:
+    conn = _ready(table)
+    if not _columns(conn, table):
+        return None
+    if before:
+        r = conn.execute(f"SELECT MAX(date) FROM {_q(table)} WHERE date < ?", (before,)).fetchone()
+    else:
+        r = conn.execute(f"SELECT MAX(date) FROM {_q(table)}").fetchone()
+    return r[0] if r else None
+
+def aggregate(table: str, column: str, start: str | None = None, end: str | None = None,
+              fn: str = "avg") -> float | None:
+    """구간 집계 (avg/sum/min/max/count)"""
+    fn = fn.lower()
+    if fn not in ("avg", "sum", "min", "max", "count"):
+        raise ValueError(f"unsupported aggregate: {fn}")
+    conn = _ready(table)
+    if column not in _columns(conn, table):
+        return None
+    where, args = _where_range(start, end)
+    r = conn.execute(f"SELECT {fn}({_q(column)}) FROM {_q(table)} WHERE {where}", args).fetchone()
+    return r[0] if r else None
+
+def levels(start: str | None = None, end: str | None = None) -> list[dict]:
+    """BM20 연속지수 [{date, level}] (backfill_current_basket.csv SSOT)"""
+    return [{"date": r["date"], "level": float(r["index"])}
+            for r in rows("bm20_level", start, end, ("date", "index")) if r["index"] is not None]
+
+def level_on_or_before(ymd: str) -> float | None:
+    conn = _ready("bm20_level")
+    if not _columns(conn, "bm20_level"):
+        return None
+    r = conn.execute('SELECT "index" FROM bm20_level WHERE date <= ? AND "index" IS NOT NULL '
+                     'ORDER BY date DESC LIMIT 1', (ymd,)).fetchone()
+    return float(r[0]) if r else None
+
+def components_on(date: str | None = None) -> list[dict]:
+    """해당 날짜(없으면 가장 최근 날짜)의 구성종목 행들"""
+    date = date or last_date("components")
+    if not date:
+        return []
+    return rows("components", date, date)
+
+def last_component_prices() -> dict[str, float]:
+    """가장 최근 날짜의 심볼 → 저장 가격"""
+    return {r["symbol"]: float(r["price"]) for r in components_on() if r.get("price") is not None}
+
+def snapshots(kind: str, start: str | None = None, end: str | None = None) -> list[dict]:
+    conn = _ready(f"snapshots:{kind}")
+    where, args = _where_range(start, end)
+    q = f"SELECT payload FROM snapshots WHERE kind = ? AND {where} ORDER BY ts"
+    return [json.loads(r[0]) for r in conn.execute(q, [kind, *args])]
+
+def latest_snapshot(kind: str) -> dict | None:
+    conn = _ready(f"snapshots:{kind}")
+    r = conn.execute("SELECT payload FROM snapshots WHERE kind = ? ORDER BY ts DESC LIMIT 1", (kind,)).fetchone()
+    return json.loads(r[0]) if r else None
+
+def snapshot_daily(kind: str, json_path: str, start: str | None = None, end: str | None = None,
+                   fn: str = "avg") -> dict[str, float]:
+    """스냅샷 JSON 필드의 날짜별 집계. 예) snapshot_daily('kimchi', '$.cb_premium_pct')"""
+    fn = fn.lower()
+    if fn not in ("avg", "sum", "min", "max", "count"):
+        raise ValueError(f"unsupported aggregate: {fn}")
+    conn = _ready(f"snapshots:{kind}")
+    where, args = _where_range(start, end)
+    q = (f"SELECT date, {fn}(json_extract(payload, ?)) AS v FROM snapshots "
+         f"WHERE kind = ? AND {where} AND json_extract(payload, ?) IS NOT NULL GROUP BY date ORDER BY date")
+    return {r["date"]: r["v"] for r in conn.execute(q, [json_path, kind, *args, json_path])}
+
+def snapshot_avg(kind: str, json_path: str, date: str) -> float | None:
+    return snapshot_daily(kind, json_path, date, date).get(date)
+
+def etf_history(asset: str, start: str | None = None, end: str | None = None) -> list[dict]:
+    conn = _ready(f"etf:{asset}")
+    where, args = _where_range(start, end)
+    q = f"SELECT payload FROM etf_history WHERE asset = ? AND date <> '' AND {where} ORDER BY date"
+    return [json.loads(r[0]) for r in conn.execute(q, [asset, *args])]
+
+
+# ─────────────────────────────────────────────────────────
+# Export (DB → CSV/JSON 뷰)
+# ─────────────────────────────────────────────────────────
+
+def _fmt_cell(v: Any) -> str:
+    return "" if v is None else str(v)
+
+def export_csv(table: str, path: Path | None = None) -> int:
+    conn = connect()
+    path = Path(path or CSV_TABLES[table]["path"])
+    cols = _columns(conn, table)
+    if not cols:
+        return 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    n = 0
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f, lineterminator="\n")
+        w.writerow(cols)
+        for r in conn.execute(f"SELECT * FROM {_q(table)} ORDER BY date, rowid"):
+            w.writerow([_fmt_cell(v) for v in r]); n += 1
+    return n
+
+def export_snapshots(kind: str, path: Path | None = None, limit: int | None = None) -> int:
+    conn = connect()
+    path = Path(path or SNAPSHOT_SOURCES[kind][0])
+    q = "SELECT payload FROM snapshots WHERE kind = ? ORDER BY ts"
+    items = [json.loads(r[0]) for r in conn.execute(q, (kind,))]
+    if limit:
+        items = items[-limit:]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(items, ensure_ascii=False, indent=2), encoding="utf-8")
+    return len(items)
+
+def export_etf(asset: str, path: Path | None = None) -> int:
+    conn = connect()
+    path = Path(path or DATA_DIR / f"etf_{asset}_history.json")
+    meta = conn.execute("SELECT payload FROM etf_history WHERE asset=? AND date=''", (asset,)).fetchone()
+    obj = json.loads(meta[0]) if meta else {}
+    obj["data"] = [json.loads(r[0]) for r in conn.execute(
+        "SELECT payload FROM etf_history WHERE asset=? AND date<>'' ORDER BY date", (asset,))]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+    return len(obj["data"])
+
+def export_all(out_dir: Path | None = None) -> None:
+    """out_dir 지정 시 ROOT 기준 상대 경로를 그대로 out_dir 아래에 재현"""
+    def _dst(p: Path) -> Path:
+        return (Path(out_dir) / p.relative_to(ROOT)) if out_dir else p
+    for t, spec in CSV_TABLES.items():
+        print(f"[export] {t}: {export_csv(t, _dst(spec['path']))} rows")
+    for kind, (p, _) in SNAPSHOT_SOURCES.items():
+        print(f"[export] snapshots:{kind}: {export_snapshots(kind, _dst(p))} items")
+    for (asset,) in connect().execute("SELECT DISTINCT asset FROM etf_history ORDER BY asset"):
+        p = DATA_DIR / f"etf_{asset}_history.json"
+        print(f"[export] etf:{asset}: {export_etf(asset, _dst(p))} rows")
+
+
+# ─────────────────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────────────────
+
+def main():
+    ap = argparse.ArgumentParser(description="BM20 SQLite analytics store")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_sync = sub.add_parser("sync"); p_sync.add_argument("--full", action="store_true")
+    p_exp = sub.add_parser("export"); p_exp.add_argument("out_dir", nargs="?", default=None)
+    sub.add_parser("stats")
+    args = ap.parse_args()
+
+    if args.cmd == "sync":
+        changed = sync_all(force=args.full)
+        print(f"[OK] store synced → {DB_PATH} (reloaded: {', '.join(changed) or 'none'})")
+    elif args.cmd == "export":
+        sync_all()
+        export_all(Path(args.out_dir) if args.out_dir else None)
+    else:
+        sync_all()
+        for r in connect().execute("SELECT name, rows, path FROM sources ORDER BY name"):
+            print(f"{r['name']:<24} {r['rows']:>7}  {r['path']}")
+        print(f"db size: {DB_PATH.stat().st_size:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+build_coin_pages.py
+───────────────────
+coins/<sym>-chart.html 23개를 템플릿 하나 + 코인별 데이터로 생성한다.
+
+입력:
+  coins/_template/coin.html           페이지 골격 ({{NAME}} 플레이스홀더, letter_template 엔진)
+  coins/_template/extra/<x>.html      코인 전용 위젯 조각 (HYPE DEX, ZEC 반감기)
+  data/coin_pages.json                코인별 SEO 문구 / 기본 정보 / FAQ / 링크 / 거래소 설정
+                                      (seo.faq = 검색엔진용 FAQ 문구, 화면 FAQ 와 따로 관리 — 없으면 화면 FAQ 에서 만든다)
+  data/coin_sectors.json              이름·슬러그·섹터·내러티브·컬러 (sector.html 과 공용)
+  data/etf_<sym>_history.json         있으면 ETF 자금 흐름 섹션을 켠다
+  data/etf_<sym>_metrics.json         ETF 상품 표 (티커/운용사/수수료 — 매일 바뀌는 값은 쓰지 않음)
+공용 자산 (페이지마다 인라인하지 않고 캐시):
+  coins/assets/coin.css, coin.js, tv-logo.svg, extra/<x>.js
+  URL 에 ?v=<내용 해시 8자리> 를 붙여 자산이 바뀌면 브라우저 캐시가 자동으로 갱신된다.
+  Chart.js 는 막대 차트 섹션(거래소 거래량 / ETF 자금 흐름)이 있는 페이지만 불러온다.
+
+증분 빌드:
+  페이지별 입력(템플릿, 위젯 조각, 자산 버전, 코인 레코드, 관련 코인 섹터 레코드,
+  ETF 상품 표)을 해시해 coins/.build_manifest.json 에 기록한다.
+  입력 해시가 같고 출력 파일도 기록된 해시 그대로면 렌더하지 않고 건너뛴다.
+  쓰기는 임시 파일 + os.replace.
+
+실행:
+    python scripts/build_coin_pages.py
+    python scripts/build_coin_pages.py --only BTC ETH
+    python scripts/build_coin_pages.py --force
+    python scripts/build_coin_pages.py --check     # 다시 만들어야 할 페이지가 있으면 exit 1
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from letter_template import load_template
+
+ROOT = Path(__file__).resolve().parent.parent
+COINS = ROOT / "coins"
+TEMPLATE = COINS / "_template" / "coin.html"
+EXTRA_DIR = COINS / "_template" / "extra"
+ASSETS = COINS / "assets"
+PAGES_JSON = ROOT / "data" / "coin_pages.json"
+SECTORS_JSON = ROOT / "data" / "coin_sectors.json"
+DATA = ROOT / "data"
+MANIFEST = COINS / ".build_manifest.json"
+
+SITE = "https://www.blockmedia.co.kr"
+DATA_SITE = "https://data.blockmedia.co.kr"
+LOGO = "https://cdn.blockmedia.co.kr/wp-content/uploads/2018/08/블록미디어로고_세로.png"
+CHARTJS = '<script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>\n'
+
+# 생성 규칙(마크업 조각)이 바뀌면 올린다 → 전 페이지 재생성
+BUILD_VERSION = 3
+
+# data/coin_sectors.json 섹터 → 배지 (아이콘, CSS 클래스). 이름은 sector.html ?sector= 와 동일
+SECTOR_BADGE = {
+    "Layer1":         ("⛓", "sb-layer1"),
+    "Smart Contract": ("📜", "sb-smart"),
+    "Store of Value": ("🪙", "sb-store"),
+    "Payments":       ("💸", "sb-payments"),
+    "Meme":           ("🐕", "sb-meme"),
+    "Enterprise":     ("🏢", "sb-enterprise"),
+    "Infrastructure": ("🏗️", "sb-infra"),
+    "Privacy":        ("🔒", "sb-privacy"),
+    "RWA":            ("🏦", "sb-rwa"),
+    "Social":         ("💬", "sb-social"),
+    "Stablecoin":     ("💵", "sb-stable"),
+    "AI":             ("🤖", "sb-ai"),
+    "DeFi":           ("🏦", "sb-defi"),
+}
+
+# 거래소별 거래량 KPI 라벨 / 출처 표기 (coin.js 의 VOLUME 키와 같은 이름)
+VOLUME_LABEL = {
+    "binance":     ("Binance (USDT)", "Binance"),
+    "bybit":       ("Bybit (USDT)", "Bybit"),
+    "coinbase":    ("Coinbase (USD)", "Coinbase"),
+    "upbit":       ("Upbit (KRW)", "Upbit"),
+    "hyperliquid": ("Hyperliquid (퍼프)", "Hyperliquid"),
+}
+VENUE_LABEL = {"binance": "Binance", "bybit": "Bybit"}
+EXTRA_SOURCE = {"hype": "Hyperliquid", "zec": "Blockchair"}
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def _canon(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+def _esc(s: str) -> str:
+    return html.escape(s, quote=True)
+
+def _script_json(obj, **kw) -> str:
+    # <script> 안에 들어가므로 "</" 를 끊어 둔다
+    return json.dumps(obj, ensure_ascii=False, **kw).replace("</", "<\\/")
+
+def _text(fragment: str) -> str:
+    """FAQ 답변 HTML → JSON-LD 용 평문"""
+    return html.unescape(re.sub(r"\s+", " ", re.sub(r"<[^>]+>", "", fragment))).strip()
+
+def write_atomic(path: Path, text: str):
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ════════════════════════════════════════════════════════════
+# 입력
+# ════════════════════════════════════════════════════════════
+def asset_versions() -> dict:
+    """coins/assets 아래 파일 → 내용 해시 8자리 (URL ?v= 와 페이지 입력 해시에 사용)"""
+    return {p.relative_to(COINS).as_posix(): _sha256(p.read_bytes())[:8]
+            for p in sorted(ASSETS.rglob("*")) if p.is_file()}
+
+def etf_funds(sym: str) -> list:
+    """ETF 상품 표: 티커 / 운용사 / 수수료 (티커 순). 순자산·유입액처럼 매일 바뀌는 값은 빼서
+    ETF 데이터가 갱신돼도 상품 구성이 같으면 페이지를 다시 쓰지 않는다."""
+    p = DATA / f"etf_{sym.lower()}_metrics.json"
+    if not p.exists():
+        return []
+    try:
+        rows = json.loads(p.read_text(encoding="utf-8")).get("list") or []
+    except (json.JSONDecodeError, AttributeError):
+        print(f"[WARN] {p.name} 파싱 실패 → ETF 상품 표 생략")
+        return []
+    funds = []
+    for r in rows:
+        if not r.get("ticker"):
+            continue
+        fee = (r.get("fee") or {}).get("value")
+        funds.append({
+            "ticker": str(r["ticker"]).strip(),
+            "institute": str(r.get("institute") or "").strip(),
+            "fee": None if fee in (None, "") else round(float(fee), 6),
+        })
+    return sorted(funds, key=lambda f: f["ticker"])
+
+def page_inputs(sym: str, rec: dict, sectors: dict, assets: dict, tpl_sha: str) -> dict:
+    """이 페이지 출력에 영향을 주는 모든 입력 (→ 입력 해시)"""
+    extra = rec.get("extra")
+    refs = {sym, *rec.get("related", [])}
+    return {
+        "build": BUILD_VERSION,
+        "template": tpl_sha,
+        "extra": _sha256((EXTRA_DIR / f"{extra}.html").read_bytes()) if extra else None,
+        "assets": assets,
+        "coin": rec,
+        "sectors": {s: sectors.get(s) for s in sorted(refs)},
+        "etf": (DATA / f"etf_{sym.lower()}_history.json").exists(),
+        "etf_funds": etf_funds(sym),
+    }
+
+
+# ════════════════════════════════════════════════════════════
+# 마크업 조각
+# ════════════════════════════════════════════════════════════
+def kpi_cells(has_krw: bool) -> str:
+    cells = [("var(--up)", "24H 고가", "kpiHigh", " up"),
+             ("var(--down)", "24H 저가", "kpiLow", " down"),
+             ("var(--text3)", "24H 거래량", "kpiVol", "")]
+    if has_krw:
+        cells = [("#1763ff", "KRW 환산", "kpiKrw", "")] + cells + [("#f59e0b", "김치 프리미엄", "kpiKimchi", "")]
+    else:
+        cells = [("var(--main)", "USD 가격", "kpiUsd", "")] + cells
+    return "\n".join(
+        f'    <div class="kpi-cell">\n'
+        f'      <div class="kpi-label"><span class="kpi-dot" style="background:{dot}"></span>{label}</div>\n'
+        f'      <div class="kpi-value{cls}" id="{id_}">—</div>\n'
+        f'    </div>'
+        for dot, label, id_, cls in cells)
+
+def volume_section(sym: str, venues: list) -> str:
+    cells = "\n".join(
+        f'          <div class="etf-kpi-cell">\n'
+        f'            <div class="etf-kpi-label">{VOLUME_LABEL[v][0]}</div>\n'
+        f'            <div class="etf-kpi-value" id="vol-{v}">—</div>\n'
+        f'            <div class="etf-kpi-date" id="vol-{v}-pct"></div>\n'
+        f'          </div>'
+        for v in venues)
+    return f"""
+      <!-- ── 거래소 거래량 섹션 ── -->
+      <div class="etf-section">
+        <div class="etf-header">
+          <span class="etf-title">📊 거래소별 {sym} 24H 거래량</span>
+          <span class="etf-source">DATA: {" · ".join(VOLUME_LABEL[v][1] for v in venues)}</span>
+        </div>
+        <div class="etf-kpi-row">
+{cells}
+        </div>
+        <div class="etf-chart-wrap">
+          <div class="etf-chart-loading" id="volChartLoading">거래량 데이터 불러오는 중...</div>
+          <canvas id="volBarChart"></canvas>
+        </div>
+      </div>
+"""
+
+def etf_flow_section(sym: str) -> str:
+    return f"""
+      <!-- ── ETF FLOW SECTION ── -->
+      <div class="etf-section">
+        <div class="etf-header">
+          <span class="etf-title">🏦 현물 {sym} ETF 자금 흐름 (최근 30일)</span>
+          <span class="etf-source">DATA: SoSoValue</span>
+        </div>
+        <div class="etf-kpi-row">
+          <div class="etf-kpi-cell">
+            <div class="etf-kpi-label">당일 순유입</div>
+            <div class="etf-kpi-value" id="etfDaily">—</div>
+            <div class="etf-kpi-date" id="etfDailyDate"></div>
+          </div>
+          <div class="etf-kpi-cell">
+            <div class="etf-kpi-label">누적 순유입</div>
+            <div class="etf-kpi-value" id="etfCum">—</div>
+            <div class="etf-kpi-date">출시 이후</div>
+          </div>
+          <div class="etf-kpi-cell">
+            <div class="etf-kpi-label">총 AUM</div>
+            <div class="etf-kpi-value" id="etfAum">—</div>
+            <div class="etf-kpi-date" id="etfAumDate"></div>
+          </div>
+        </div>
+        <div class="etf-chart-wrap">
+          <div class="etf-chart-loading" id="etfChartLoading">ETF 데이터 불러오는 중...</div>
+          <canvas id="etfFlowChart"></canvas>
+        </div>
+      </div>
+"""
+
+def etf_fund_table(sym: str, funds: list) -> str:
+    if not funds:
+        return ""
+    fee = lambda v: "—" if v is None else f"{v * 100:.2f}%"
+    rows = "\n".join(
+        f'        <div class="etf-fund-row">'
+        f'<span class="ticker">{_esc(f["ticker"])}</span><span>{_esc(f["institute"]) or "—"}</span>'
+        f'<span>{fee(f["fee"])}</span></div>'
+        for f in funds)
+    return f"""
+    <!-- ETF 상품 현황 -->
+    <div class="etf-fund-card">
+      <h2>미국 현물 {sym} ETF 현황</h2>
+      <div class="etf-fund-grid">
+        <div class="etf-fund-row etf-fund-header-row"><span>티커</span><span>운용사</span><span>수수료</span></div>
+{rows}
+      </div>
+    </div>
+"""
+
+def info_rows(info: list) -> str:
+    out = []
+    for r in info:
+        if "id" in r:
+            val = f'<span class="profile-val" id="{r["id"]}">-</span>'
+        else:
+            style = f' style="{r["style"]}"' if r.get("style") else ""
+            val = f'<span class="profile-val"{style}>{r["v"]}</span>'
+        out.append(f'        <div class="profile-row"><span class="profile-key">{r["k"]}</span>{val}</div>')
+    return "\n".join(out)
+
+def exchanges(groups: list) -> str:
+    out = []
+    for title, items in groups:
+        badges = "\n".join(f'          <a class="exchange-badge" href="{_esc(url)}" target="_blank" rel="noopener">{name}</a>'
+                           for name, url in items)
+        out.append(
+            '      <div style="margin-top:0.75rem; padding-top:0.75rem; border-top:0.5px solid var(--border);">\n'
+            f'        <div style="font-size:11px; color:var(--text3); font-family:Arial, sans-serif; margin-bottom:6px;">{title}</div>\n'
+            f'        <div class="exchange-badges">\n{badges}\n        </div>\n'
+            '      </div>')
+    return "\n".join(out)
+
+def faq_items(faq: list) -> str:
+    return "\n".join(
+        '      <div class="faq-item">\n'
+        f'        <div class="faq-q"><span>{q}</span><span class="faq-icon">+</span></div>\n'
+        f'        <div class="faq-a"><div class="faq-a-inner">{a}</div></div>\n'
+        '      </div>'
+        for q, a in faq)
+
+def json_ld(sym: str, name: str, rec: dict, url: str) -> str:
+    seo = rec["seo"]
+    crumb_name, crumb_url = seo.get("breadcrumb") or ("마켓랩", DATA_SITE)
+    faq = seo.get("faq") or [(_text(q), _text(a)) for q, a in rec["faq"]]
+    graph = [
+        {
+            "@type": "WebPage", "@id": url, "url": url,
+            "name": seo.get("page_name") or seo["title"], "description": seo["page_description"], "inLanguage": "ko-KR",
+            "publisher": {"@type": "Organization", "name": "블록미디어", "url": SITE,
+                          "logo": {"@type": "ImageObject", "url": LOGO}},
+        },
+        {
+            "@type": "FinancialProduct", "name": name, "alternateName": seo["alternate_names"],
+            "description": seo["product_description"], "tickerSymbol": seo.get("ticker", sym), "url": url,
+            "provider": {"@type": "Organization", "name": "블록미디어", "url": SITE},
+        },
+        {
+            "@type": "FAQPage",
+            "mainEntity": [{"@type": "Question", "name": q,
+                            "acceptedAnswer": {"@type": "Answer", "text": a}}
+                           for q, a in faq],
+        },
+        {
+            "@type": "BreadcrumbList",
+            "itemListElement": [
+                {"@type": "ListItem", "position": 1, "name": "블록미디어", "item": SITE},
+                {"@type": "ListItem", "position": 2, "name": crumb_name, "item": crumb_url},
+                {"@type": "ListItem", "position": 3, "name": f"{name}({sym}) 시세", "item": url},
+            ],
+        },
+    ]
+    return _script_json({"@context": "https://schema.org", "@graph": graph}, indent=2)
+
+
+# ════════════════════════════════════════════════════════════
+# 페이지
+# ════════════════════════════════════════════════════════════
+def render_page(tpl, sym: str, rec: dict, sectors: dict, inputs: dict) -> str:
+    sec = sectors[sym]
+    name = rec.get("name") or sec["name"]
+    stem = sym.lower()
+    url = f"{SITE}/coins/{stem}"
+    seo = rec["seo"]
+    assets = inputs["assets"]
+    asset = lambda rel: f"{rel}?v={assets[rel]}"
+    extra = rec.get("extra")
+    has_etf = inputs["etf"]
+
+    badges = "\n".join(
+        f'    <a href="../sector.html?sector={_esc(s)}" class="sector-badge {SECTOR_BADGE.get(s, ("", "sb-infra"))[1]}">'
+        f'{SECTOR_BADGE.get(s, ("📊",))[0]} {_esc(s)}</a>'
+        for s in sec["sectors"])
+
+    chart_sections = ""
+    if rec.get("volume"):
+        chart_sections += volume_section(sym, rec["volume"])
+    if has_etf:
+        chart_sections += etf_flow_section(sym)
+    if extra:
+        chart_sections += "\n" + (EXTRA_DIR / f"{extra}.html").read_text(encoding="utf-8")
+
+    meta = [("섹터", " · ".join(sec["sectors"]))] + [tuple(m) for m in rec.get("profile_meta", [])]
+
+    related = [(r, sectors[r]) for r in rec["related"] if r in sectors]
+    sources = [f'{VENUE_LABEL[rec["venue"]]} API'] + (["Upbit API"] if rec.get("upbit") else [])
+    sources += [VOLUME_LABEL[v][1] for v in rec.get("volume") or []
+                if not any(src.startswith(VOLUME_LABEL[v][1]) for src in sources)]
+    sources += (["SoSoValue"] if has_etf else []) + ([EXTRA_SOURCE[extra]] if extra else []) + ["CoinPaprika"]
+    sources = list(dict.fromkeys(sources))
+    footer_links = [(f"{DATA_SITE}/etf.html", "ETF 대시보드")] if has_etf else []
+    footer_links += [(f"{DATA_SITE}/sector.html?sector={s}", f"{s} 섹터") for s in sec["sectors"]]
+    footer_links += [(f"{DATA_SITE}/coins/{r.lower()}-chart.html", f"{s['name']} 시세") for r, s in related]
+
+    coin = {
+        "symbol": sym, "name": name, "glyph": rec["glyph"],
+        "venue": rec["venue"], "pair": rec["pair"], "upbit": rec.get("upbit"),
+        "listed": rec["listed"], "paprika": rec["paprika"],
+        "news": {"coin_tag": rec["news"].get("coin_tag"), "tags": rec["news"].get("tags")},
+        "etf": stem if has_etf else None,
+        "volume": rec.get("volume"),
+    }
+    if rec.get("dp") is not None:
+        coin["dp"] = rec["dp"]
+    if rec.get("fdv"):
+        coin["fdv"] = rec["fdv"]
+
+    values = {
+        "TITLE": _esc(seo["title"]),
+        "DESCRIPTION": _esc(seo["description"]),
+        "KEYWORDS": _esc(seo["keywords"]),
+        "CANONICAL": url,
+        "OG_TITLE": _esc(seo["og_title"]),
+        "OG_DESCRIPTION": _esc(seo["og_description"]),
+        "TWITTER_TITLE": _esc(seo["twitter_title"]),
+        "TWITTER_DESCRIPTION": _esc(seo["twitter_description"]),
+        "JSONLD": json_ld(sym, name, rec, url),
+        "CHARTJS": CHARTJS if rec.get("volume") or has_etf else "",
+        "CSS_URL": asset("assets/coin.css"),
+        "JS_URL": asset("assets/coin.js"),
+        "TV_LOGO_URL": asset("assets/tv-logo.svg") + "#tv",
+        "ICON_STYLE": f' style="--coin-color:{rec.get("icon_bg") or sec["color"]}"',
+        "ICON": rec["icon"],
+        "NAME": name,
+        "SYMBOL": sym,
+        "SECTOR_BADGES": badges,
+        "NARRATIVE": _esc(sec.get("narrative", "")),
+        "KPI_CLASS": "" if rec.get("upbit") else " kpi-4",
+        "KPI_CELLS": kpi_cells(bool(rec.get("upbit"))),
+        "CHART_SECTIONS": chart_sections,
+        "NEWS_MORE": _esc(rec["news"].get("more") or SITE),
+        "INFO_ROWS": info_rows(rec["info"]),
+        "PROFILE_LINKS": "\n".join(f'        <a class="profile-link" href="{_esc(u)}" target="_blank" rel="noopener">{label}</a>'
+                                   for label, u in rec["links"]),
+        "EXCHANGES": exchanges(rec["exchanges"]),
+        "ETF_FUNDS": etf_fund_table(sym, inputs["etf_funds"]),
+        "FAQ_ITEMS": faq_items(rec["faq"]),
+        "PROFILE_PARAS": "\n".join(f"        <p>{p}</p>" for p in rec["profile"]),
+        "PROFILE_META": " &nbsp;|&nbsp;\n          ".join(f"{k}: <strong>{v}</strong>" for k, v in meta),
+        "RELATED": "\n".join(f'        <a href="{r.lower()}-chart.html" class="related-coin">'
+                             f'<span class="related-dot" style="background:{s["color"]}"></span>{r}</a>'
+                             for r, s in related),
+        "DATA_SOURCES": " · ".join(sources),
+        "FOOTER_LINKS": " &nbsp;·&nbsp;\n      ".join(
+            [f'<a href="{SITE}" target="_blank">블록미디어</a>']
+            + [f'<a href="{_esc(u)}">{_esc(t)}</a>' for u, t in footer_links]),
+        "COIN_JSON": _script_json(coin, separators=(",", ":")),
+        "EXTRA_SCRIPT": f'<script src="{asset(f"assets/extra/{extra}.js")}"></script>' if extra else "",
+    }
+    out, left = tpl.render(values)
+    if left:
+        raise ValueError(f"{sym}: 채우지 못한 플레이스홀더 {left}")
+    return out
+
+
+def load_manifest() -> dict:
+    try:
+        obj = json.loads(MANIFEST.read_text(encoding="utf-8"))
+        return obj.get("pages", {}) if isinstance(obj, dict) else {}
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def main():
+    ap = argparse.ArgumentParser(description="coins/*-chart.html 생성 (증분)")
+    ap.add_argument("--only", nargs="*", default=None, help="심볼만 (예: BTC ETH)")
+    ap.add_argument("--force", action="store_true", help="입력 해시와 무관하게 다시 생성")
+    ap.add_argument("--check", action="store_true", help="쓰지 않고 다시 만들 페이지만 보고 (있으면 exit 1)")
+    args = ap.parse_args()
+
+    pages = json.loads(PAGES_JSON.read_text(encoding="utf-8"))
+    sectors = json.loads(SECTORS_JSON.read_text(encoding="utf-8"))
+    tpl = load_template(TEMPLATE)
+    assets = asset_versions()
+    manifest = load_manifest()
+
+    only = {s.upper() for s in args.only} if args.only else None
+    stats = {"written": 0, "skipped": 0, "bytes": 0}
+    stale = []
+    for sym, rec in pages.items():
+        if only and sym not in only:
+            continue
+        if sym not in sectors:
+            print(f"[WARN] {sym}: data/coin_sectors.json 에 없음 → skip")
+            continue
+        out = COINS / f"{sym.lower()}-chart.html"
+        inputs = page_inputs(sym, rec, sectors, assets, tpl.sha256)
+        digest = _sha256(_canon(inputs))
+        prev = manifest.get(out.name, {})
+        if (not args.force and prev.get("inputs") == digest and out.exists()
+                and _sha256(out.read_bytes()) == prev.get("sha256")):
+            stats["skipped"] += 1
+            continue
+        stale.append(out.name)
+        if args.check:
+            continue
+        text = render_page(tpl, sym, rec, sectors, inputs)
+        write_atomic(out, text)
+        data = text.encode("utf-8")
+        manifest[out.name] = {"inputs": digest, "sha256": _sha256(data), "bytes": len(data)}
+        stats["written"] += 1
+        stats["bytes"] += len(data)
+        print(f"[OK] {out.relative_to(ROOT)} ({len(data):,} bytes)")
+
+    if args.check:
+        print(f"INFO: stale={len(stale)} up-to-date={stats['skipped']}" + (f" → {', '.join(stale)}" if stale else ""))
+        sys.exit(1 if stale else 0)
+
+    if stats["written"]:
+        body = {"build": BUILD_VERSION, "assets": assets, "pages": dict(sorted(manifest.items()))}
+        write_atomic(MANIFEST, json.dumps(body, ensure_ascii=False, indent=1) + "\n")
+    print(f"INFO: coin pages written={stats['written']} skipped={stats['skipped']} "
+          f"bytes_written={stats['bytes']:,}")
+
+
+if __name__ == "__main__":
+    main()
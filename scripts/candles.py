@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+candles.py
+──────────
+국내 거래소(Upbit · Bithumb v1) 분봉 수집 공용 모듈 — 이벤트 스터디 등 연구 스크립트용.
+
+  get_candles("upbit", "KRW-SPK", "2026-04-20 00:00", "2026-04-27 00:00")   # 60분봉 DataFrame
+
+- 두 거래소 v1 캔들 API 는 같은 스펙 (market / to / count ≤ 200, 최신→과거 순)
+- 거래소별 RateLimiter: 여러 스레드가 같은 거래소를 불러도 초당 요청 수를 넘지 않는다
+- 페이지 커서는 구간만으로 정해지므로(고정 간격 × 200개) 미리 계산해 동시에 요청 →
+  몇 주 구간도 왕복 한 번 수준. 이어 붙이기가 어긋나면(상장 전 공백 등) 순차 커서 발견으로 전환
+- 디스크 캐시: out/cache/candles/<거래소>/<마켓>_m<단위>.parquet + 수집 완료 구간(.json)
+  → 같은 마켓·구간을 다시 요청하면 네트워크를 타지 않고, 구간이 넓어지면 모자란 쪽만 받는다
+- 시각은 전부 KST naive (datetime_kst 열), to 커서는 UTC 'Z' 표기로 보낸다
+
+출력 열: datetime_kst, open, high, low, close, trade_value_krw, trade_volume
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from http_session import SESSION
+
+ROOT = Path(os.getenv("BM20_DATA_ROOT") or Path(__file__).resolve().parent.parent)
+CACHE_DIR = ROOT / "out/cache/candles"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+}
+
+# 초당 요청 수는 공개 한도(캔들 API 초당 10회)보다 약간 낮게
+EXCHANGES = {
+    "upbit":   {"base_url": "https://api.upbit.com/v1/candles",   "rps": 8},
+    "bithumb": {"base_url": "https://api.bithumb.com/v1/candles", "rps": 8},
+}
+
+PAGE = 200
+PAGE_WORKERS = 8          # 한 구간의 페이지 동시 요청 수 (실제 속도는 거래소 리미터가 정한다)
+MAX_PAGES = 200            # 이상 감지용 상한 (60분봉 기준 ~4.5년)
+KST_OFFSET = timedelta(hours=9)
+COLUMNS = ["datetime_kst", "open", "high", "low", "close", "trade_value_krw", "trade_volume"]
+_RENAME = {
+    "candle_date_time_kst": "datetime_kst",
+    "opening_price": "open",
+    "high_price": "high",
+    "low_price": "low",
+    "trade_price": "close",
+    "candle_acc_trade_price": "trade_value_krw",
+    "candle_acc_trade_volume": "trade_volume",
+}
+
+
+# ══════════════════════════════════════════════════════════════
+# 1. 요청 한도
+# ══════════════════════════════════════════════════════════════
+
+class RateLimiter:
+    """스레드 공유 최소 간격 리미터 (요청 시작 시각을 1/rps 간격으로 예약)"""
+
+    def __init__(self, rps: float):
+        self.interval = 1.0 / rps
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+LIMITERS = {ex: RateLimiter(spec["rps"]) for ex, spec in EXCHANGES.items()}
+
+
+# ══════════════════════════════════════════════════════════════
+# 2. 페이지 / 구간 수집
+# ══════════════════════════════════════════════════════════════
+
+def _parse_kst(s) -> datetime:
+    return s if isinstance(s, datetime) else datetime.strptime(str(s)[:16], "%Y-%m-%d %H:%M")
+
+def _to_param(kst: datetime) -> str:
+    return (kst - KST_OFFSET).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def fetch_candle_page(exchange: str, market: str, unit: int = 60, to: datetime | None = None,
+                      count: int = PAGE, tries: int = 3) -> list[dict]:
+    """캔들 한 페이지 (to 는 KST, exclusive). 최신→과거 순 원본 레코드."""
+    url = f"{EXCHANGES[exchange]['base_url']}/minutes/{unit}"
+    params = {"market": market, "count": count}
+    if to is not None:
+        params["to"] = _to_param(to)
+    last_err = None
+    for attempt in range(tries):
+        LIMITERS[exchange].wait()
+        try:
+            r = SESSION.get(url, params=params, headers=HEADERS, timeout=(5, 15))
+        except Exception as e:
+            last_err = e
+            time.sleep(0.5 * (attempt + 1))
+            continue
+        if r.status_code == 429:
+            last_err = RuntimeError("429 Too Many Requests")
+            time.sleep(1.0 + attempt)
+            continue
+        r.raise_for_status()
+        data = r.json()
+        return data if isinstance(data, list) else []
+    raise RuntimeError(f"{exchange} {market} 캔들 요청 실패: {last_err}")
+
+def to_frame(rows: list[dict]) -> pd.DataFrame:
+    """원본 레코드 → COLUMNS 프레임 (시각 정렬, 중복 제거)"""
+    if not rows:
+        return pd.DataFrame(columns=COLUMNS)
+    df = pd.DataFrame(rows).rename(columns=_RENAME)
+    df["datetime_kst"] = pd.to_datetime(df["datetime_kst"])
+    df = df[COLUMNS].drop_duplicates(subset=["datetime_kst"], keep="last")
+    return df.sort_values("datetime_kst").reset_index(drop=True)
+
+def _oldest(page: list[dict]) -> datetime:
+    return datetime.strptime(page[-1]["candle_date_time_kst"], "%Y-%m-%dT%H:%M:%S")
+
+def _newest(page: list[dict]) -> datetime:
+    return datetime.strptime(page[0]["candle_date_time_kst"], "%Y-%m-%dT%H:%M:%S")
+
+def _serial_pages(exchange: str, market: str, start: datetime, cursor: datetime, unit: int,
+                  label: str) -> list[dict]:
+    """직전 페이지의 가장 오래된 캔들을 다음 to 커서로 삼아 과거로 내려간다 (커서 발견식)"""
+    rows: list[dict] = []
+    for _ in range(MAX_PAGES):
+        data = fetch_candle_page(exchange, market, unit, to=cursor)
+        if not data:
+            break
+        rows.extend(data)
+        oldest = _oldest(data)
+        if oldest <= start:
+            break
+        if oldest >= cursor or len(data) < PAGE:
+            print(f"  [{label}] {oldest} 이전 데이터 없음 (상장/집계 시작 이전)", flush=True)
+            break
+        cursor = oldest
+    else:
+        print(f"  [WARN] [{label}] 페이지 {MAX_PAGES}개 초과 - 이상 감지, 중단", flush=True)
+    return rows
+
+def page_cursors(start: datetime, end: datetime, unit: int = 60, count: int = PAGE) -> list[datetime]:
+    """[start, end] 를 덮는 to 커서 (최신 → 과거). 고정 간격 캔들이라 구간만으로 전부 정해진다."""
+    to = end + timedelta(minutes=unit)              # to 는 exclusive → end 캔들 포함
+    n = -(-((to - start) // timedelta(minutes=unit)) // count)
+    return [to - timedelta(minutes=unit * count * i) for i in range(max(n, 1))]
+
+def _first_gap(pages: list[list[dict]], cursors: list[datetime]) -> int | None:
+    """페이지 이어 붙이기 검증 → 어긋난 첫 페이지 번호 (없으면 None)
+
+    page i 는 cursors[i] 직전 캔들 최대 PAGE 개. 체결 없는 분은 캔들이 없어서 꽉 찬 페이지는
+    cursors[i+1] 보다 더 과거까지 내려갈 수 있다(겹침 → 중복 제거). 어긋남:
+      - 꽉 찬 페이지가 cursors[i+1] 까지 닿지 않음 / 커서 이후 캔들이 섞임 (to 무시 응답)
+      - 덜 찬 페이지(= 그 이전 데이터 없음, 상장 전) 뒤에 더 과거 데이터가 또 있음
+    """
+    short = None                                    # 처음으로 덜 찬 페이지
+    for i, (page, cur) in enumerate(zip(pages, cursors)):
+        if short is not None:
+            if page:
+                return short
+            continue
+        if page and _newest(page) >= cur:
+            return i
+        if len(page) < PAGE:
+            short = i
+        elif i + 1 < len(cursors) and _oldest(page) > cursors[i + 1]:
+            return i
+    return None
+
+def fetch_candle_range(exchange: str, market: str, start, end, unit: int = 60,
+                       label: str = "", parallel: bool = True) -> pd.DataFrame:
+    """[start, end] (KST) 분봉.
+
+    parallel=True: 커서를 미리 계산해 모든 페이지를 동시에 요청 (거래소 리미터가 속도 제한) →
+    몇 주 구간도 왕복 한 번 수준. 이어 붙이기가 어긋나면 그 지점부터 커서 발견식으로 다시 내려간다.
+    """
+    start, end = _parse_kst(start), _parse_kst(end)
+    label = label or f"{market}-{exchange}"
+    cursors = page_cursors(start, end, unit)
+    if not parallel or len(cursors) == 1:
+        rows = _serial_pages(exchange, market, start, cursors[0], unit, label)
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(cursors), PAGE_WORKERS)) as pool:
+            pages = list(pool.map(lambda cur: fetch_candle_page(exchange, market, unit, to=cur), cursors))
+        gap = _first_gap(pages, cursors)
+        rows = [r for page in pages[:gap] for r in page]
+        short = next((p for p in pages if len(p) < PAGE), None)
+        if gap is None and short:
+            print(f"  [{label}] {_oldest(short)} 이전 데이터 없음 (상장/집계 시작 이전)", flush=True)
+        if gap is not None:
+            # gap 앞 페이지들은 꽉 차서 cursors[gap] 까지 닿는다 → 거기서부터 발견식으로
+            print(f"  [{label}] 페이지 {gap + 1}/{len(cursors)} 이어 붙이기 어긋남 → {cursors[gap]} 부터 순차 수집",
+                  flush=True)
+            rows += _serial_pages(exchange, market, start, cursors[gap], unit, label)
+    df = to_frame(rows)
+    return df[(df["datetime_kst"] >= start) & (df["datetime_kst"] <= end)].reset_index(drop=True)
+
+
+# ══════════════════════════════════════════════════════════════
+# 3. 디스크 캐시
+# ══════════════════════════════════════════════════════════════
+
+_KEY_LOCKS: dict[tuple, threading.Lock] = {}
+_KEY_LOCKS_GUARD = threading.Lock()
+
+def _key_lock(key: tuple) -> threading.Lock:
+    with _KEY_LOCKS_GUARD:
+        return _KEY_LOCKS.setdefault(key, threading.Lock())
+
+def _cache_paths(exchange: str, market: str, unit: int) -> tuple[Path, Path]:
+    base = CACHE_DIR / exchange / f"{market}_m{unit}"
+    return base.with_suffix(".parquet"), base.with_suffix(".json")
+
+def _last_closed(unit: int) -> datetime:
+    """지금 진행 중인 캔들 바로 앞 캔들 시작 시각 (KST) — 이후 구간은 캐시 완료로 치지 않는다"""
+    now = datetime.now(timezone.utc).replace(tzinfo=None) + KST_OFFSET
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    m = (now.hour * 60 + now.minute) // unit * unit
+    return midnight + timedelta(minutes=m - unit)
+
+def get_candles(exchange: str, market: str, start, end, unit: int = 60,
+                use_cache: bool = True, label: str = "") -> pd.DataFrame:
+    """캐시 우선 [start, end] 분봉. 캐시가 덮지 못하는 앞/뒤 구간만 새로 받는다."""
+    start, end = _parse_kst(start), _parse_kst(end)
+    if not use_cache:
+        return fetch_candle_range(exchange, market, start, end, unit, label)
+
+    pq, meta = _cache_paths(exchange, market, unit)
+    with _key_lock((exchange, market, unit)):
+        cached = pd.read_parquet(pq) if pq.exists() else pd.DataFrame(columns=COLUMNS)
+        cov = json.loads(meta.read_text(encoding="utf-8")) if meta.exists() else None
+        c0, c1 = (_parse_kst(cov["start"]), _parse_kst(cov["end"])) if cov else (None, None)
+
+        if cov is None:
+            gaps = [(start, end)]
+        else:
+            gaps = []
+            if start < c0:
+                gaps.append((start, c0 - timedelta(minutes=unit)))
+            if end > c1:
+                gaps.append((c1 + timedelta(minutes=unit), end))   # 떨어진 구간도 사이를 채워 연속 유지
+        frames = [cached]
+        for g0, g1 in gaps:
+            frames.append(fetch_candle_range(exchange, market, g0, g1, unit, label))
+
+        if gaps:
+            merged = to_frame([]) if all(f.empty for f in frames) else (
+                pd.concat([f for f in frames if not f.empty], ignore_index=True)
+                .drop_duplicates(subset=["datetime_kst"], keep="last")
+                .sort_values("datetime_kst").reset_index(drop=True))
+            new_c0 = min(start, c0) if c0 else start
+            new_c1 = min(max(end, c1) if c1 else end, _last_closed(unit))
+            pq.parent.mkdir(parents=True, exist_ok=True)
+            tmp = pq.with_name(f".{pq.name}.tmp")
+            merged.to_parquet(tmp, index=False)
+            os.replace(tmp, pq)
+            meta.write_text(json.dumps({"start": f"{new_c0:%Y-%m-%d %H:%M}", "end": f"{new_c1:%Y-%m-%d %H:%M}"}),
+                            encoding="utf-8")
+            cached = merged
+
+    out = cached[(cached["datetime_kst"] >= start) & (cached["datetime_kst"] <= end)]
+    return out.reset_index(drop=True)
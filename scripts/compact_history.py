@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+compact_history.py
+──────────────────
+30분 스냅샷 JSON 의 월별 롤업 + 보존기간 정리 (스케줄: compact_history.yml, 매일 1회)
+
+  원본 (git 추적, 30분마다 통째로 재작성)       →  롤업 (zstd Parquet, 월 1회 생성 후 불변)
+  ─────────────────────────────────────────────     ──────────────────────────────────────────
+  out/archive/krw_YYYY_MM.json      (마감된 달)  →  out/archive/parquet/krw/YYYY_MM.{raw,hourly,daily}.parquet
+  out/history/kimchi_snapshots.json (롤링 270개) →  out/archive/parquet/kimchi/YYYY_MM.{raw,hourly,daily}.parquet
+
+- raw    : 스냅샷 1건 = 1행. 스칼라 필드는 "totals.upbit_24h" 식 평탄 컬럼,
+           리스트 필드(top5, winners 등)는 "<필드>:json" 컬럼에 compact JSON 문자열로 보관
+           → frame_to_records() 로 원본 레코드를 그대로 복원 (삭제 전 왕복 검증)
+- hourly : KST 시(hour) 단위 수치 컬럼 평균 + 스냅샷 수(n)
+- daily  : KST 일 단위 수치 컬럼 평균/최소/최대 + 스냅샷 수(n)
+- krw 월별 JSON 아카이브는 마감된 달만 롤업하고, 왕복 검증이 끝나면 JSON 을 삭제한다
+- kimchi 는 라이브 파일이 ~5.6일치만 남기 때문에 매일 실행 때 진행 중인 달까지 병합해 둔다
+- 라이브 krw_24h_snapshots.json 은 --keep-days(기본 8일: 대시보드 최대 7D 범위 + 여유)로 자른다
+
+사용:
+    python scripts/compact_history.py                  # 롤업 + 정리
+    python scripts/compact_history.py --dry-run        # 무엇을 할지만 출력
+    python scripts/compact_history.py --measure        # 저장소 크기/체크아웃 시간 측정 리포트
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+
+KST = timezone(timedelta(hours=9))
+
+ROOT = Path(__file__).resolve().parent.parent
+OUT_DIR = ROOT / os.getenv("OUT_DIR", "out")
+HIST_DIR = OUT_DIR / "history"
+ARCHIVE_DIR = OUT_DIR / "archive"
+PARQUET_DIR = ARCHIVE_DIR / "parquet"
+REPORT_JSON = PARQUET_DIR / "compaction_report.json"
+
+KRW_SNAPSHOTS_JSON = HIST_DIR / "krw_24h_snapshots.json"
+KIMCHI_SNAPSHOTS_JSON = HIST_DIR / "kimchi_snapshots.json"
+
+KEEP_DAYS = 8
+COMPRESSION = "zstd"
+TS_KEY = "timestamp_kst"
+JSON_SUFFIX = ":json"
+
+
+# ══════════════════════════════════════════════════════════════
+# 1. 레코드 ↔ 컬럼
+# ══════════════════════════════════════════════════════════════
+
+def _flatten(rec: dict, prefix: str = "", out: dict | None = None) -> dict:
+    out = {} if out is None else out
+    for k, v in rec.items():
+        name = f"{prefix}{k}"
+        if isinstance(v, dict) and v:
+            _flatten(v, name + ".", out)
+        elif isinstance(v, (list, dict)):
+            out[name + JSON_SUFFIX] = json.dumps(v, ensure_ascii=False, separators=(",", ":"))
+        else:
+            out[name] = v
+    return out
+
+def records_to_frame(records: list[dict]) -> pd.DataFrame:
+    """스냅샷 레코드 → raw 프레임 (ts 정렬, 타임스탬프 중복 제거)"""
+    df = pd.DataFrame([_flatten(r) for r in records if r.get(TS_KEY)])
+    if df.empty:
+        return df
+    df.insert(0, "ts", pd.to_datetime(df[TS_KEY], format="%Y-%m-%dT%H:%M:%S%z"))
+    df = df.drop_duplicates(TS_KEY, keep="last").sort_values("ts", kind="stable")
+    return df.reset_index(drop=True)
+
+def frame_to_records(df: pd.DataFrame) -> list[dict]:
+    """raw 프레임 → 원본 레코드 (결측 컬럼 = 원래 없던 키)"""
+    cols = [c for c in df.columns if c != "ts"]
+    out = []
+    for row in df[cols].itertuples(index=False, name=None):
+        rec: dict = {}
+        for col, v in zip(cols, row):
+            if v is None or (isinstance(v, float) and v != v):
+                continue
+            if col.endswith(JSON_SUFFIX):
+                col, v = col[:-len(JSON_SUFFIX)], json.loads(v)
+            elif hasattr(v, "item"):
+                v = v.item()
+            node = rec
+            *parents, leaf = col.split(".")
+            for p in parents:
+                node = node.setdefault(p, {})
+            node[leaf] = v
+        out.append(rec)
+    return out
+
+def _numeric(df: pd.DataFrame) -> pd.DataFrame:
+    return df.select_dtypes("number").set_index(df["ts"].dt.tz_convert(KST))
+
+def rollup_hourly(df: pd.DataFrame) -> pd.DataFrame:
+    num = _numeric(df)
+    g = num.groupby(num.index.floor("h"))
+    out = g.mean()
+    out.insert(0, "n", g.size())
+    return out.rename_axis("hour").reset_index()
+
+def rollup_daily(df: pd.DataFrame) -> pd.DataFrame:
+    num = _numeric(df)
+    g = num.groupby(num.index.floor("D"))
+    out = pd.concat({"mean": g.mean(), "min": g.min(), "max": g.max()}, axis=1)
+    out.columns = [f"{col}.{stat}" for stat, col in out.columns]
+    out = out[sorted(out.columns)]
+    out.insert(0, "n", g.size())
+    return out.rename_axis("date").reset_index()
+
+
+# ══════════════════════════════════════════════════════════════
+# 2. 월 파티션 입출력
+# ══════════════════════════════════════════════════════════════
+
+def month_key(ts: datetime) -> str:
+    return ts.astimezone(KST).strftime("%Y_%m")
+
+def month_paths(dataset: str, ym: str) -> dict[str, Path]:
+    base = PARQUET_DIR / dataset
+    return {kind: base / f"{ym}.{kind}.parquet" for kind in ("raw", "hourly", "daily")}
+
+def read_month(dataset: str, ym: str) -> pd.DataFrame:
+    p = month_paths(dataset, ym)["raw"]
+    return pd.read_parquet(p) if p.exists() else pd.DataFrame()
+
+def write_month(dataset: str, ym: str, raw: pd.DataFrame) -> dict[str, Path]:
+    paths = month_paths(dataset, ym)
+    paths["raw"].parent.mkdir(parents=True, exist_ok=True)
+    frames = {"raw": raw, "hourly": rollup_hourly(raw), "daily": rollup_daily(raw)}
+    for kind, frame in frames.items():
+        tmp = paths[kind].with_name(f".{paths[kind].name}.tmp")
+        frame.to_parquet(tmp, index=False, compression=COMPRESSION)
+        os.replace(tmp, paths[kind])
+    return paths
+
+def merge_month(dataset: str, ym: str, records: list[dict], dry_run: bool = False) -> tuple[int, int]:
+    """월 raw 파티션에 레코드 병합 → (추가 행 수, 병합 후 행 수). 새 행이 없으면 쓰지 않는다."""
+    old = read_month(dataset, ym)
+    new = records_to_frame(records)
+    seen = set(old[TS_KEY]) if not old.empty else set()
+    added = int((~new[TS_KEY].isin(seen)).sum()) if not new.empty else 0
+    if added == 0:
+        return 0, len(old)
+    merged = records_to_frame(frame_to_records(old) + records) if not old.empty else new
+    if not dry_run:
+        write_month(dataset, ym, merged)
+    return added, len(merged)
+
+def _verify(dataset: str, ym: str, records: list[dict]) -> bool:
+    """Parquet 에서 복원한 레코드가 원본 JSON 레코드를 빠짐없이 포함하는지"""
+    by_ts = {r[TS_KEY]: r for r in frame_to_records(read_month(dataset, ym))}
+    return all(by_ts.get(r.get(TS_KEY)) == r for r in records if r.get(TS_KEY))
+
+def _read_list(path: Path) -> list[dict]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+    return data if isinstance(data, list) else []
+
+def _write_list(path: Path, items: list[dict]):
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(items, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+def _group_by_month(records: list[dict]) -> dict[str, list[dict]]:
+    out: dict[str, list[dict]] = {}
+    for r in records:
+        ts = r.get(TS_KEY)
+        if ts:
+            out.setdefault(month_key(datetime.strptime(ts, "%Y-%m-%dT%H:%M:%S%z")), []).append(r)
+    return out
+
+
+# ══════════════════════════════════════════════════════════════
+# 3. 작업
+# ══════════════════════════════════════════════════════════════
+
+def compact_krw_archives(now: datetime, dry_run: bool = False):
+    """마감된 달의 krw_YYYY_MM.json → Parquet, 검증 후 JSON 삭제"""
+    current = month_key(now)
+    for path in sorted(ARCHIVE_DIR.glob("krw_*.json")):
+        ym = path.stem[len("krw_"):]
+        if ym >= current:
+            continue
+        records = _read_list(path)
+        if not records:
+            print(f"[SKIP] {path.name}: 비어 있음")
+            continue
+        added, total = merge_month("krw", ym, records, dry_run)
+        if dry_run:
+            print(f"[DRY] {path.name} → krw/{ym}.*.parquet (+{added}행, {total}행) 후 JSON 삭제")
+            continue
+        if not _verify("krw", ym, records):
+            print(f"[WARN] {path.name}: Parquet 왕복 검증 실패 → JSON 유지")
+            continue
+        path.unlink()
+        print(f"[OK] {path.name} → krw/{ym}.*.parquet ({total}행), JSON 삭제")
+
+def compact_kimchi(dry_run: bool = False):
+    """라이브 김프 스냅샷 → 월 Parquet 병합 (라이브 파일은 writer 의 MAX_SNAPSHOTS 로 이미 짧음)"""
+    for ym, records in sorted(_group_by_month(_read_list(KIMCHI_SNAPSHOTS_JSON)).items()):
+        added, total = merge_month("kimchi", ym, records, dry_run)
+        tag = "[DRY]" if dry_run else "[OK]"
+        print(f"{tag} kimchi/{ym}.*.parquet +{added}행 (누적 {total}행)")
+
+def trim_live(path: Path, keep_days: int, now: datetime, dry_run: bool = False):
+    """라이브 스냅샷 JSON 을 최근 keep_days 일로 자르고 compact JSON 으로 다시 쓴다"""
+    items = _read_list(path)
+    if not items:
+        return
+    cutoff = (now - timedelta(days=keep_days)).strftime("%Y-%m-%dT%H:%M:%S%z")
+    kept = [x for x in items
+            if datetime.strptime(x.get(TS_KEY, cutoff), "%Y-%m-%dT%H:%M:%S%z")
+            >= datetime.strptime(cutoff, "%Y-%m-%dT%H:%M:%S%z")]
+    print(f"{'[DRY]' if dry_run else '[OK]'} {path.name}: {len(items)} → {len(kept)}개 (최근 {keep_days}일)")
+    if not dry_run:
+        _write_list(path, kept)
+
+
+# ══════════════════════════════════════════════════════════════
+# 4. 측정
+# ══════════════════════════════════════════════════════════════
+
+def _git(*args: str, cwd: Path = ROOT) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, check=True,
+                          capture_output=True, text=True).stdout
+
+def _history_blob_bytes(paths: list[str]) -> dict:
+    """paths 의 모든 과거 버전 blob 합계 (압축 전 / 디스크)"""
+    objs = _git("rev-list", "--objects", "--all", "--", *paths).split()
+    blobs = {o for o in objs if len(o) == 40}
+    if not blobs:
+        return {"blobs": 0, "bytes": 0, "disk_bytes": 0}
+    out = subprocess.run(["git", "cat-file", "--batch-check=%(objecttype) %(objectsize) %(objectsize:disk)"],
+                         cwd=ROOT, input="\n".join(sorted(blobs)), capture_output=True, text=True,
+                         check=True).stdout
+    n = size = disk = 0
+    for line in out.splitlines():
+        kind, s, d = line.split()
+        if kind == "blob":
+            n, size, disk = n + 1, size + int(s), disk + int(d)
+    return {"blobs": n, "bytes": size, "disk_bytes": disk}
+
+def _per_commit_growth(paths: list[Path]) -> int:
+    """30분 커밋 1회가 새로 만드는 blob 바이트 (zlib, loose object 기준)"""
+    return sum(len(zlib.compress(p.read_bytes())) for p in paths if p.exists())
+
+COMPACTED_PATHS = ("out/history", "out/archive")
+
+def _timed_checkout(with_worktree: bool = False, repeats: int = 3) -> dict:
+    """얕은 clone(--no-checkout) + HEAD 체크아웃 시간 (repeats 회 중앙값).
+    with_worktree=True 면 현재 작업트리의 out/history, out/archive 를 얹은 커밋으로
+    잰다 (= 이번 정리가 커밋된 뒤의 clone/체크아웃)."""
+    tmp = Path(tempfile.mkdtemp(prefix="bm20_checkout_"))
+    try:
+        # 전후 모두 같은 조건(새로 pack 된 로컬 저장소)에서 재도록 임시 저장소를 거친다
+        stage = tmp / "stage"
+        _git("clone", "--quiet", "--no-local", str(ROOT), str(stage), cwd=tmp)
+        if with_worktree:
+            for rel in COMPACTED_PATHS:
+                shutil.rmtree(stage / rel, ignore_errors=True)
+                if (ROOT / rel).exists():
+                    shutil.copytree(ROOT / rel, stage / rel)
+            _git("add", "-A", "--", *COMPACTED_PATHS, cwd=stage)
+        _git("-c", "user.name=compact", "-c", "user.email=compact@localhost",
+             "commit", "--quiet", "--allow-empty", "-m", "compact", cwd=stage)
+        clone, checkout = [], []
+        for i in range(repeats):
+            dst = tmp / f"repo{i}"
+            t0 = time.perf_counter()
+            # actions/checkout 기본값(fetch-depth: 1)과 같은 얕은 clone
+            _git("clone", "--quiet", "--depth", "1", "--no-checkout", f"file://{stage}", str(dst), cwd=tmp)
+            t1 = time.perf_counter()
+            _git("checkout", "--quiet", "HEAD", cwd=dst)
+            t2 = time.perf_counter()
+            clone.append(t1 - t0)
+            checkout.append(t2 - t1)
+            shutil.rmtree(dst, ignore_errors=True)
+        return {"clone_sec": round(statistics.median(clone), 3),
+                "checkout_sec": round(statistics.median(checkout), 3), "repeats": repeats}
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def measure(checkout: bool = True, with_worktree: bool = False) -> dict:
+    live = [KRW_SNAPSHOTS_JSON, KIMCHI_SNAPSHOTS_JSON,
+            HIST_DIR / "krw_24h_latest.json", HIST_DIR / "kimchi_latest.json"]
+    archives = sorted(ARCHIVE_DIR.glob("krw_*.json"))
+    parquet = sorted(PARQUET_DIR.rglob("*.parquet"))
+    rel = lambda ps: [str(p.relative_to(ROOT)) for p in ps]
+    report = {
+        "measured_at": datetime.now(KST).strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "worktree_bytes": {
+            "live_json": sum(p.stat().st_size for p in live if p.exists()),
+            "archive_json": sum(p.stat().st_size for p in archives),
+            "parquet": sum(p.stat().st_size for p in parquet),
+        },
+        # 현재 달 아카이브까지 포함: 30분 커밋마다 다시 쓰이는 파일 전부
+        "per_commit_new_blob_bytes": _per_commit_growth(live + archives[-1:]),
+        "git_history": _history_blob_bytes(["out/history/krw_24h_*.json", "out/history/kimchi_*.json",
+                                            "out/archive/"]),
+        "git_count_objects": dict(line.split(": ", 1) for line in
+                                  _git("count-objects", "-vH").strip().splitlines()),
+        "files": {"archive_json": rel(archives), "parquet": len(parquet)},
+    }
+    report["per_month_growth_bytes_est"] = report["per_commit_new_blob_bytes"] * 48 * 30
+    if checkout:
+        report["checkout"] = _timed_checkout(with_worktree)
+    return report
+
+def write_report(before: dict, after: dict):
+    """before/after 측정값 비교를 compaction_report.json 에 남긴다"""
+    def delta(key):
+        return {"before": before[key], "after": after[key]}
+    report = {
+        "before": before,
+        "after": after,
+        "summary": {
+            "per_commit_new_blob_bytes": delta("per_commit_new_blob_bytes"),
+            "per_month_growth_bytes_est": delta("per_month_growth_bytes_est"),
+            "worktree_json_bytes": {
+                "before": before["worktree_bytes"]["live_json"] + before["worktree_bytes"]["archive_json"],
+                "after": after["worktree_bytes"]["live_json"] + after["worktree_bytes"]["archive_json"]
+                         + after["worktree_bytes"]["parquet"],
+            },
+        },
+    }
+    if "checkout" in before and "checkout" in after:
+        report["summary"]["checkout"] = delta("checkout")
+    REPORT_JSON.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_JSON.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    s = report["summary"]
+    print(f"[REPORT] {REPORT_JSON.relative_to(ROOT)}")
+    print(f"  커밋당 새 blob : {s['per_commit_new_blob_bytes']['before']:,} → "
+          f"{s['per_commit_new_blob_bytes']['after']:,} bytes")
+    print(f"  월 증가 추정   : {s['per_month_growth_bytes_est']['before']:,} → "
+          f"{s['per_month_growth_bytes_est']['after']:,} bytes")
+    print(f"  작업트리       : {s['worktree_json_bytes']['before']:,} → "
+          f"{s['worktree_json_bytes']['after']:,} bytes")
+
+
+# ══════════════════════════════════════════════════════════════
+# 5. 진입점
+# ══════════════════════════════════════════════════════════════
+
+def run(keep_days: int = KEEP_DAYS, dry_run: bool = False, now: datetime | None = None):
+    now = now or datetime.now(KST)
+    compact_krw_archives(now, dry_run)
+    compact_kimchi(dry_run)
+    trim_live(KRW_SNAPSHOTS_JSON, keep_days, now, dry_run)
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="스냅샷 JSON 월별 Parquet 롤업 + 보존기간 정리")
+    p.add_argument("--keep-days", type=int, default=KEEP_DAYS, help="라이브 krw_24h_snapshots.json 보존 일수")
+    p.add_argument("--dry-run", action="store_true")
+    p.add_argument("--measure", action="store_true", help="작업 전후 저장소 크기/체크아웃 시간 리포트")
+    p.add_argument("--no-checkout", action="store_true", help="측정 시 clone/checkout 시간 측정 생략")
+    args = p.parse_args()
+
+    before = measure(not args.no_checkout) if args.measure else None
+    run(args.keep_days, args.dry_run)
+    if before is not None and not args.dry_run:
+        write_report(before, measure(not args.no_checkout, with_worktree=True))
@@ -20,6 +20,8 @@ import re
 import urllib3
 from datetime import datetime, timezone
 
+import bm20_store
+
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # ── 공식 API 설정 (BTC/ETH/SOL) ──────────────────────────────
@@ -149,6 +151,7 @@ def process_official_coin(coin, etf_type, updated_at, all_summary):
         merged_recs   = merge_history(existing_recs, new_records)
 
         save_json(hist_path, {"updatedAt": updated_at, "type": etf_type, "data": merged_recs})
+        bm20_store.sync_table(f"etf:{coin}")
 
         cum = merged_recs[-1].get("cumNetInflow") if merged_recs else None
         all_summary[coin]["cumNetInflow"] = cum
@@ -248,6 +251,7 @@ def process_next_coin(coin, slug, build_id, updated_at, all_summary):
         merged_recs   = merge_history(existing_recs, new_records)
 
         save_json(hist_path, {"updatedAt": updated_at, "type": slug, "data": merged_recs})
+        bm20_store.sync_table(f"etf:{coin}")
         save_json(f"data/etf_{coin}_metrics.json", metrics_out)
 
         daily = float(metrics_out["dailyNetInflow"]["value"] or 0)
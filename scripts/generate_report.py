@@ -1,19 +1,27 @@
 #!/usr/bin/env python3
 # Find latest out/YYYY-MM-DD, copy to archive/YYYY-MM-DD, and update index.html
-# + Publish latest: creates latest.html and bm20_bar_latest.png / bm20_btc_eth_line.png at repo root
+# + Publish latest: creates latest.html and bm20_bar_latest.{png,svg} / bm20_trend_latest.{png,svg} at repo root
+#   (BM20_CHART_FORMAT=svg 로 렌더한 날은 .svg, 그 외는 .png — 있는 쪽을 게시하고 다른 포맷 latest 는 삭제)
 # - Injects news preview (reads bm20_news_YYYY-MM-DD.txt)
 # - Creates .nojekyll to avoid Jekyll processing
 # - Robust when out/ has no dated folder (falls back to root files)
+# - Content-addressed publish: 파일은 sha256으로 식별, 변경 없는 파일은 건너뛰고
+#   같은 내용은 manifest 에 기록된 기존 경로로 하드링크 (디스크에는 blob 1개)
+#   manifest 는 out/cache/publish_manifest.json — mtime 이 들어 있는 로컬 캐시라 git 에 올리지 않는다
+#   (CI 는 actions/cache 로 이어 쓰고, 없으면 archive 를 한 번 해시해 다시 만든다)
 
-import os, re, shutil, html, csv, json
+import os, re, shutil, html, csv, json, hashlib
 from pathlib import Path
 import datetime as dt
 
+from series_index import SeriesIndex
+
 
 ROOT  = Path(__file__).resolve().parents[1]
 OUT   = ROOT / "out"
 ARCH  = ROOT / "archive"
 INDEX = ROOT / "index.html"
+MANIFEST = OUT / "cache" / "publish_manifest.json"
 
 def is_ymd(name: str) -> bool:
     try:
@@ -49,12 +57,147 @@ def ensure_latest_dir() -> Path:
     print(f"[fallback] created {tmp} from root files")
     return tmp
 
-def copy_dir(src: Path) -> Path:
+# --- content-addressed publisher --------------------------------------
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+class Publisher:
+    """
+    산출물을 내용 해시(sha256) 기준으로 게시한다.
+      - 대상 경로의 내용이 같으면 skip (파일을 건드리지 않음)
+      - 같은 해시의 파일이 이미 게시돼 있으면 그 경로로 하드링크 (blob 1개만 디스크에 존재)
+      - manifest 는 (sha256, size, mtime_ns) — 크기·mtime 이 기록과 같을 때만 해시를 믿고,
+        다르면 (제자리 수정, 새 checkout 등) 파일을 다시 해시해서 판단한다
+      - 하드링크 불가(다른 FS, 권한)면 복사로 폴백
+    대상은 항상 임시 경로에 만든 뒤 os.replace 로 교체하므로, 링크를 공유하는
+    다른 경로의 내용이 바뀌는 일은 없다. manifest 경로는 ROOT 기준 상대 경로.
+    """
+
+    def __init__(self, manifest: Path = MANIFEST):
+        self.manifest = manifest
+        obj = {}
+        if manifest.exists():
+            try:
+                obj = json.loads(manifest.read_text(encoding="utf-8"))
+            except Exception:
+                obj = {}
+        self.files: dict[str, dict] = obj.get("files", {}) if isinstance(obj, dict) else {}
+        if not self.files:
+            self._index_existing()
+        self.by_hash: dict[str, list[str]] = {}
+        for rel, meta in self.files.items():
+            self.by_hash.setdefault(meta.get("sha256"), []).append(rel)
+        self.stats = {"skipped": 0, "linked": 0, "copied": 0, "removed": 0, "bytes_written": 0}
+
+    def _rel(self, p: Path) -> str:
+        return p.resolve().relative_to(ROOT).as_posix()
+
+    def _index_existing(self):
+        """manifest가 없을 때 1회: 기존 archive 파일을 해시해서 dedupe 기준으로 삼는다"""
+        if not ARCH.exists():
+            return
+        for p in sorted(ARCH.rglob("*")):
+            if p.is_file() and p != self.manifest:
+                self.files[self._rel(p)] = self._meta(p, _sha256(p))
+        print(f"[publish] indexed {len(self.files)} existing archive files")
+
+    @staticmethod
+    def _meta(p: Path, digest: str) -> dict:
+        st = p.stat()
+        return {"sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    def _has(self, rel: str, digest: str) -> bool:
+        """ROOT/rel 의 현재 내용이 digest 인지 — stat 이 manifest 와 같으면 기록을 믿고, 아니면 다시 해시"""
+        p = ROOT / rel
+        if not p.is_file():
+            return False
+        st = p.stat()
+        meta = self.files.get(rel) or {}
+        if meta.get("size") == st.st_size and meta.get("mtime_ns") == st.st_mtime_ns:
+            return meta.get("sha256") == digest
+        actual = _sha256(p)
+        if meta.get("sha256") != actual:
+            stale = self.by_hash.get(meta.get("sha256"), [])
+            if rel in stale:
+                stale.remove(rel)
+            self.by_hash.setdefault(actual, []).append(rel)
+        self.files[rel] = self._meta(p, actual)
+        return actual == digest
+
+    def _blob_for(self, digest: str, exclude: str) -> Path | None:
+        for rel in list(self.by_hash.get(digest, [])):
+            if rel != exclude and self._has(rel, digest):
+                return ROOT / rel
+        return None
+
+    def publish(self, src: Path, dst: Path) -> str:
+        digest = _sha256(src)
+        size = src.stat().st_size
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        rel = self._rel(dst)
+
+        if self._has(rel, digest):
+            self.stats["skipped"] += 1
+            return "skip"
+
+        tmp = dst.with_name(f".{dst.name}.tmp")
+        if tmp.exists():
+            tmp.unlink()
+        blob = self._blob_for(digest, rel)
+        action = "copy"
+        if blob is not None:
+            try:
+                os.link(blob, tmp)
+                action = "link"
+            except OSError:
+                pass
+        if action == "copy":
+            shutil.copyfile(src, tmp)
+            self.stats["bytes_written"] += size
+        os.replace(tmp, dst)
+
+        self.files[rel] = self._meta(dst, digest)
+        if rel not in self.by_hash.setdefault(digest, []):
+            self.by_hash[digest].append(rel)
+        self.stats["linked" if action == "link" else "copied"] += 1
+        return action
+
+    def mirror_dir(self, src: Path, dst: Path):
+        """src 디렉토리를 dst로 미러링 (src에 없는 dst 파일은 삭제)"""
+        wanted = set()
+        for p in sorted(src.rglob("*")):
+            if p.is_file():
+                target = dst / p.relative_to(src)
+                wanted.add(target.resolve())
+                self.publish(p, target)
+        if dst.exists():
+            for p in sorted(dst.rglob("*")):
+                if p.is_file() and p.resolve() not in wanted:
+                    p.unlink()
+                    self.files.pop(self._rel(p), None)
+                    self.stats["removed"] += 1
+
+    def save(self):
+        # 사라진 파일은 manifest에서 제거
+        self.files = {k: v for k, v in sorted(self.files.items()) if (ROOT / k).is_file()}
+        self.manifest.parent.mkdir(parents=True, exist_ok=True)
+        self.manifest.write_text(
+            json.dumps({"version": 1, "files": self.files}, ensure_ascii=False, indent=1),
+            encoding="utf-8",
+        )
+        s = self.stats
+        print(f"[publish] skipped={s['skipped']} linked={s['linked']} copied={s['copied']} "
+              f"removed={s['removed']} bytes_written={s['bytes_written']:,}")
+
+def copy_dir(src: Path, pub: Publisher) -> Path:
     dst = ARCH / src.name
     dst.parent.mkdir(parents=True, exist_ok=True)
-    if dst.exists():
-        shutil.rmtree(dst)
-    shutil.copytree(src, dst)
+    pub.mirror_dir(src, dst)
     print("[copy]", src, "→", dst)
     return dst
 
@@ -89,9 +232,10 @@ def update_index(latest_dir: Path):
         links.append(f'<a href="archive/{ymd}/bm20_daily_{ymd}.pdf">PDF</a>')
 
     img_tag = ""
-    if f"bm20_bar_{ymd}.png" in files:
+    bar = next((f"bm20_bar_{ymd}.{ext}" for ext in ("svg", "png") if f"bm20_bar_{ymd}.{ext}" in files), None)
+    if bar:
         img_tag = (
-            f'<img src="archive/{ymd}/bm20_bar_{ymd}.png" alt="performance" '
+            f'<img src="archive/{ymd}/{bar}" alt="performance" '
             f'style="max-width:100%;border:1px solid #eee;border-radius:8px;margin-top:8px;" />'
         )
 
@@ -116,38 +260,47 @@ def update_index(latest_dir: Path):
 
 # --- publish latest (fixed assets) -----------------------------------
 
-def publish_latest(dst_daily_dir: Path):
+def publish_latest(dst_daily_dir: Path, pub: Publisher):
     """
-    고정 latest 파일 생성 (대시보드 안정용)
+    고정 latest 파일 생성 (대시보드 안정용) — archive 파일과 같은 blob으로 하드링크
     """
     ymd = dst_daily_dir.name
 
     html_src  = dst_daily_dir / f"bm20_daily_{ymd}.html"
-    bar_src   = dst_daily_dir / f"bm20_bar_{ymd}.png"
-    trd_src   = dst_daily_dir / f"bm20_trend_{ymd}.png"
     csv_src   = dst_daily_dir / f"bm20_daily_data_{ymd}.csv"
     news_src  = dst_daily_dir / f"bm20_news_{ymd}.txt"
     kimchi_src= dst_daily_dir / f"kimchi_{ymd}.json"
 
     if html_src.exists():
         html_txt = html_src.read_text(encoding="utf-8")
-        html_txt = html_txt.replace(f"bm20_bar_{ymd}.png", "bm20_bar_latest.png")
-        html_txt = html_txt.replace(f"bm20_trend_{ymd}.png", "bm20_trend_latest.png")
-        (ROOT / "latest.html").write_text(html_txt, encoding="utf-8")
-
-    if bar_src.exists():
-        shutil.copyfile(bar_src, ROOT / "bm20_bar_latest.png")
-
-    if trd_src.exists():
-        shutil.copyfile(trd_src, ROOT / "bm20_trend_latest.png")
+        for chart in ("bar", "trend"):
+            for ext in ("png", "svg"):
+                html_txt = html_txt.replace(f"bm20_{chart}_{ymd}.{ext}", f"bm20_{chart}_latest.{ext}")
+        latest_html = ROOT / "latest.html"
+        if not latest_html.exists() or latest_html.read_text(encoding="utf-8") != html_txt:
+            latest_html.write_text(html_txt, encoding="utf-8")
+
+    for chart in ("bar", "trend"):
+        published = set()
+        for ext in ("png", "svg"):
+            src = dst_daily_dir / f"bm20_{chart}_{ymd}.{ext}"
+            if src.exists():
+                pub.publish(src, ROOT / f"bm20_{chart}_latest.{ext}")
+                published.add(ext)
+        # 한 포맷만 게시한 날은 다른 포맷 latest 를 지운다 (남겨 두면 옛 차트로 굳는다)
+        for ext in ({"png", "svg"} - published if published else ()):
+            stale = ROOT / f"bm20_{chart}_latest.{ext}"
+            if stale.exists():
+                stale.unlink()
+                print(f"[publish_latest] removed stale {stale.name}")
 
     if csv_src.exists():
-        shutil.copyfile(csv_src, ROOT / "bm20_daily_data_latest.csv")
+        pub.publish(csv_src, ROOT / "bm20_daily_data_latest.csv")
 
     # NOTE: news latest disabled (market summary box removed)
 
     if kimchi_src.exists():
-        shutil.copyfile(kimchi_src, ROOT / "kimchi_latest.json")
+        pub.publish(kimchi_src, ROOT / "kimchi_latest.json")
 
     print(f"[publish_latest] latest alias files created for {ymd}")
 
@@ -308,35 +461,9 @@ def rebuild_json_from_backfill():
     # kimchi 주입 (latest에 없을 수 있으니 별도 파일에서)
     kimchi_ratio, kimchi_meta, kimchi_src = _load_kimchi_for_date(last["date"])
 
-    # ---- returns 계산 (backfill rows 기준) ----
-    def _level_on_or_before(target_ymd: str):
-        for r in reversed(rows):
-            if r["date"] <= target_ymd:
-                return float(r["level"])
-        return None
-
-    def _ret_from(target_ymd: str, cur_level: float):
-        base = _level_on_or_before(target_ymd)
-        if base is None or base == 0:
-            return None
-        return (cur_level / base) - 1.0   # ratio
-
-    asof = last["date"]
-    cur_level = float(last["level"])
-
-    asof_dt = dt.datetime.strptime(asof, "%Y-%m-%d")
-    ymd_7d  = (asof_dt - dt.timedelta(days=7)).strftime("%Y-%m-%d")
-    ymd_30d = (asof_dt - dt.timedelta(days=30)).strftime("%Y-%m-%d")
-    ymd_1y  = (asof_dt - dt.timedelta(days=365)).strftime("%Y-%m-%d")
-    ymd_ytd = asof_dt.replace(month=1, day=1).strftime("%Y-%m-%d")
-
-    returns = {
-        "1D": bm20ChangePct,
-        "7D": _ret_from(ymd_7d,  cur_level),
-        "30D": _ret_from(ymd_30d, cur_level),
-        "1Y": _ret_from(ymd_1y,  cur_level),
-        "YTD": _ret_from(ymd_ytd, cur_level),
-    }
+    # ---- returns 계산 (backfill rows 기준, SeriesIndex: 기간별 bisect, ratio) ----
+    returns = SeriesIndex.from_rows(rows).returns(asof=last["date"], level=float(last["level"]))
+    returns["1D"] = bm20ChangePct
 
     latest = {
         "asOf": last["date"],
@@ -369,10 +496,12 @@ def rebuild_json_from_backfill():
 
 def main():
     latest = ensure_latest_dir()
-    dst = copy_dir(latest)
+    pub = Publisher()
+    dst = copy_dir(latest, pub)
     update_index(dst)
 
-    publish_latest(dst)        # 🔥 이 줄 다시 살린다
+    publish_latest(dst, pub)        # 🔥 이 줄 다시 살린다
+    pub.save()
     rebuild_json_from_backfill()  # ★ 연속성 SSOT → 루트 JSON 재생성
     
     (ROOT / ".nojekyll").write_text("", encoding="utf-8")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+http_session.py
+───────────────
+렌더 스크립트 공용 HTTP 클라이언트 (requests.Session 하나 → 커넥션 풀 재사용).
+render_letter.py / render_letter_en.py / render_aas_brief.py / translation_memory.py 공용.
+
+- 일회성 실행: 같은 프로세스 안에서 호스트별 연결을 재사용 (Upbit 티커 여러 번, WP 여러 번)
+- render_daemon.py: 세션이 데몬 수명 동안 살아 있어 TLS 연결을 다시 맺지 않고,
+  GET 응답 TTL 캐시(set_cache_ttl)로 letter / letter_en 이 같은 API 를 다시 부르지 않는다
+  (200 응답만 캐시, 키 = URL + params + headers. 기본 TTL 0 = 캐시 안 함)
+- set_offline(True): 모든 요청을 즉시 ConnectionError 로 실패시킨다
+  → 대체 데이터 디렉터리로 로컬 실행할 때 각 스크립트의 "—" 폴백 경로를 탄다
+
+사용:
+    from http_session import SESSION
+    r = SESSION.get(url, params=..., timeout=10)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+POOL_SIZE = 16
+
+
+def _freeze(v) -> tuple:
+    if not v:
+        return ()
+    items = v.items() if hasattr(v, "items") else v
+    return tuple(sorted((str(k), str(x)) for k, x in items))
+
+
+class CachingSession(requests.Session):
+    def __init__(self):
+        super().__init__()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.ttl = 0.0
+        self.offline = False
+        self.hits = self.misses = 0
+        self._cache: dict[tuple, tuple[float, requests.Response]] = {}
+        self._lock = threading.Lock()
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        if self.offline:
+            raise requests.ConnectionError(f"offline: {method} {url}")
+        if method.upper() != "GET" or self.ttl <= 0:
+            return super().request(method, url, params=params, headers=headers, **kwargs)
+
+        key = (url, _freeze(params), _freeze(headers))
+        now = time.monotonic()
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None and now - hit[0] < self.ttl:
+                self.hits += 1
+                return hit[1]
+        resp = super().request(method, url, params=params, headers=headers, **kwargs)
+        with self._lock:
+            self.misses += 1
+            if resp.status_code == 200:
+                resp.content  # 본문을 읽어 둬야 여러 번 .json() 해도 된다
+                self._cache[key] = (now, resp)
+        return resp
+
+    def clear_cache(self) -> int:
+        with self._lock:
+            n = len(self._cache)
+            self._cache.clear()
+        return n
+
+    def stats(self) -> dict:
+        return {"ttl": self.ttl, "offline": self.offline, "entries": len(self._cache),
+                "hits": self.hits, "misses": self.misses}
+
+
+SESSION = CachingSession()
+
+
+def set_cache_ttl(seconds: float):
+    SESSION.ttl = max(0.0, float(seconds))
+
+def set_offline(offline: bool = True):
+    SESSION.offline = bool(offline)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+k_share.py
+──────────
+BM20 구성종목 전체 K-share (국내 4대 거래소 24h 거래대금 / 글로벌 24h 거래량) — 한 번에 계산.
+
+  입력 1) out/history/krw_24h_pairs_latest.json   krw_rolling24h_8h.py 가 저장한 자산 × 거래소 KRW 맵
+  입력 2) CMC /v1/cryptocurrency/quotes/latest   구성종목 + data/coin_sectors.json 코인을 심볼 묶음으로 한 번 호출
+  구성종목: out/history/components_history.csv 마지막 날짜 (없으면 data/constituents 최신 분기 CSV)
+
+  → out/global/k_share_24h_latest.json (열 지향, k_share 내림차순)
+     + quotes: 같은 호출의 가격·24h 등락·거래량 (bm20_sectors.py 가 비구성 섹터 코인 카드에 사용)
+  → xrp_record(): 기존 k_xrp_share_24h_latest.json 스키마 (XRP 는 표의 한 행)
+
+거래소별 XRP 티커 3회 + CMC 1회를 종목마다 부르던 방식 대신, 이미 받아 둔 스냅샷과 CMC 1회로 끝낸다.
+
+사용:
+    python scripts/k_share.py                  # CMC_API_KEY 환경변수, 환율은 out/history/fx_latest.json
+    python scripts/k_share.py --usdkrw 1385
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+from http_session import SESSION
+
+ROOT = Path(os.getenv("BM20_DATA_ROOT") or Path(__file__).resolve().parent.parent)
+
+PAIRS_JSON     = ROOT / "out/history/krw_24h_pairs_latest.json"
+COMPONENTS_CSV = ROOT / "out/history/components_history.csv"
+CONSTITUENTS   = ROOT / "data/constituents"
+SECTORS_JSON   = ROOT / "data/coin_sectors.json"
+FX_JSON        = ROOT / "out/history/fx_latest.json"
+OUT_JSON       = ROOT / "out/global/k_share_24h_latest.json"
+
+CMC_QUOTES = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
+KST = timezone(timedelta(hours=9))
+MAX_SNAPSHOT_AGE_H = 12        # KRW 스냅샷이 이보다 오래되면 errors 에 기록 (30분 주기 수집 기준)
+
+
+# ══════════════════════════════════════════════════════════════
+# 1. 입력
+# ══════════════════════════════════════════════════════════════
+
+def load_pairs(path: Path = PAIRS_JSON) -> tuple[str, list[str], dict[str, int], np.ndarray]:
+    """→ (스냅샷 시각, 거래소 목록, {자산: 행 번호}, values[자산, 거래소] KRW)"""
+    d = json.loads(path.read_text(encoding="utf-8"))
+    assets = d.get("assets") or []
+    vals = np.asarray(d.get("values") or np.zeros((0, len(d.get("exchanges") or []))), dtype=float)
+    return d.get("timestamp_kst", ""), list(d.get("exchanges") or []), \
+        {a: i for i, a in enumerate(assets)}, vals
+
+
+def current_constituents(csv_path: Path = COMPONENTS_CSV, cons_dir: Path = CONSTITUENTS) -> list[str]:
+    """components_history.csv 마지막 날짜의 종목 (bm20_daily.py 가 그날 실제로 쓴 구성)"""
+    if csv_path.exists():
+        last, syms = "", []
+        with open(csv_path, encoding="utf-8") as f:
+            for r in csv.DictReader(f):
+                d = r.get("date") or ""
+                if d > last:
+                    last, syms = d, []
+                if d == last and r.get("symbol"):
+                    syms.append(r["symbol"].strip().upper())
+        if syms:
+            return list(dict.fromkeys(syms))
+    files = sorted(cons_dir.glob("*bm20_constituents_*.csv"), key=lambda p: p.name.strip())
+    if not files:
+        return []
+    with open(files[-1], encoding="utf-8") as f:
+        return [r["symbol"].strip().upper() for r in csv.DictReader(f) if r.get("symbol")]
+
+
+def sector_symbols(path: Path = SECTORS_JSON) -> list[str]:
+    """sector.html 카드 대상 코인 (BM20 비구성 포함)"""
+    try:
+        return [s.upper() for s in json.loads(path.read_text(encoding="utf-8"))]
+    except Exception:
+        return []
+
+
+def fetch_cmc_quotes(api_key: str | None, symbols: list[str]) -> dict[str, dict]:
+    """심볼 묶음 시세 — CMC 1회 호출 → {심볼: {price, chg24h, vol24h}} (USD)"""
+    if not api_key:
+        raise ValueError("CMC_API_KEY missing")
+    r = SESSION.get(
+        CMC_QUOTES,
+        headers={"X-CMC_PRO_API_KEY": api_key},
+        params={"symbol": ",".join(symbols), "convert": "USD", "skip_invalid": "true"},
+        timeout=15,
+    )
+    r.raise_for_status()
+    out = {}
+    for sym, item in (r.json().get("data") or {}).items():
+        item = item[0] if isinstance(item, list) else item        # v2 형식 응답 대비
+        q = ((item or {}).get("quote") or {}).get("USD") or {}
+        out[sym.upper()] = {
+            "price": q.get("price"),
+            "chg24h": q.get("percent_change_24h"),
+            "vol24h": q.get("volume_24h"),
+        }
+    return out
+
+
+def usdkrw_from_fx(path: Path = FX_JSON) -> float | None:
+    try:
+        fx = json.loads(path.read_text(encoding="utf-8")).get("usdkrw") or {}
+        v = float(fx.get("market") or fx.get("official") or 0)
+        return v if v > 0 else None
+    except Exception:
+        return None
+
+
+# ══════════════════════════════════════════════════════════════
+# 2. 계산 (벡터)
+# ══════════════════════════════════════════════════════════════
+
+def k_share_table(symbols: list[str], pairs: tuple, global_usd: dict[str, float], usdkrw: float) -> dict:
+    """구성종목 × 거래소 KRW 행렬을 한 번에 뽑아 K-share 를 계산 → 열 지향 dict (k_share 내림차순)"""
+    ts, exchanges, index, vals = pairs
+    rows = np.array([index.get(s, -1) for s in symbols], dtype=int)
+    krw = np.zeros((len(symbols), len(exchanges)))
+    hit = rows >= 0
+    krw[hit] = vals[rows[hit]]
+
+    korea_usd = krw.sum(axis=1) / usdkrw
+    glob = np.array([global_usd.get(s, np.nan) for s in symbols], dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.where(glob > 0, korea_usd / glob * 100.0, np.nan)
+
+    order = np.argsort(np.where(np.isnan(share), -np.inf, share), kind="stable")[::-1]
+    ok = glob > 0
+    tot_k, tot_g = float(korea_usd[ok].sum()), float(glob[ok].sum())
+
+    def col(a, nd):
+        return [None if np.isnan(v) else round(float(v), nd) for v in a[order]]
+
+    return {
+        "krw_snapshot_kst": ts,
+        "usdkrw": usdkrw,
+        "exchanges": exchanges,
+        "symbols": [symbols[i] for i in order],
+        "krw_24h": {ex: col(krw[:, j], 0) for j, ex in enumerate(exchanges)},
+        "korea_usd_24h": col(korea_usd, 2),
+        "global_usd_24h": col(glob, 2),
+        "k_share_pct": col(share, 4),
+        "total": {
+            "korea_usd_24h": round(tot_k, 2),
+            "global_usd_24h": round(tot_g, 2),
+            "k_share_pct": round(tot_k / tot_g * 100.0, 4) if tot_g > 0 else None,
+        },
+        "missing_korea": [s for s, h in zip(symbols, hit) if not h],
+        "missing_global": [s for s, g in zip(symbols, glob) if not g > 0],
+    }
+
+
+def _snapshot_age_h(ts: str) -> float | None:
+    try:
+        t = datetime.strptime(ts, "%Y-%m-%dT%H:%M:%S%z")
+    except (TypeError, ValueError):
+        return None
+    return (datetime.now(KST) - t).total_seconds() / 3600
+
+
+def build_k_share(api_key: str | None, usdkrw: float, symbols: list[str] | None = None,
+                  pairs_path: Path = PAIRS_JSON) -> dict:
+    errors = []
+    symbols = symbols or current_constituents()
+    try:
+        pairs = load_pairs(pairs_path)
+    except Exception as e:
+        pairs = ("", [], {}, np.zeros((0, 0)))
+        errors.append(f"krw_pairs:{e}")
+    age = _snapshot_age_h(pairs[0])
+    if age is not None and age > MAX_SNAPSHOT_AGE_H:
+        errors.append(f"krw_pairs:stale {age:.1f}h")
+    try:
+        quotes = fetch_cmc_quotes(api_key, list(dict.fromkeys(symbols + sector_symbols())))
+    except Exception as e:
+        quotes = {}
+        errors.append(f"cmc:{e}")
+    global_usd = {s: float(q["vol24h"]) for s, q in quotes.items() if q.get("vol24h")}
+
+    table = k_share_table(symbols, pairs, global_usd, usdkrw)
+    table["as_of"] = datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds")
+    qs = sorted(quotes)
+    table["quotes"] = {
+        "symbols": qs,
+        **{k: [None if quotes[s].get(k) is None else round(float(quotes[s][k]), 8) for s in qs]
+           for k in ("price", "chg24h", "vol24h")},
+    }
+    table["errors"] = errors
+    table["notes"] = [
+        "Korea: " + "+".join(ex.capitalize() for ex in table["exchanges"])
+        + " KRW spot traded value(24h) from krw_24h_pairs_latest.json, converted to USD",
+        "Global: CMC volume_24h (USD), one bulk quotes call",
+        "quotes: same CMC call (constituents + coin_sectors.json), price / percent_change_24h / volume_24h",
+    ]
+    return table
+
+
+def write_k_share(table: dict, path: Path = OUT_JSON) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(table, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+    print(f"[OK] {path.name}: {len(table['symbols'])}종목, 합계 K-share={table['total']['k_share_pct']}%")
+
+
+def xrp_record(table: dict, symbol: str = "XRP") -> dict:
+    """표의 한 행 → 기존 k_xrp_share_24h_*.json 스키마 (index.html / 레터 호환)"""
+    try:
+        i = table["symbols"].index(symbol)
+        krw = {ex: table["krw_24h"][ex][i] or 0.0 for ex in table["exchanges"]}
+        korea_usd, glob, share = table["korea_usd_24h"][i], table["global_usd_24h"][i], table["k_share_pct"][i]
+    except ValueError:
+        krw, korea_usd, glob, share = {}, 0.0, None, None
+    key = symbol.lower()
+    return {
+        "as_of": table.get("as_of"),
+        "symbol": symbol,
+        "usdkrw": table["usdkrw"],
+        "korea": {
+            **{f"{ex}_krw_24h": round(v, 2) for ex, v in krw.items()},
+            "total_krw_24h": round(sum(krw.values()), 2),
+            "total_usd_24h": round(korea_usd or 0.0, 2),
+        },
+        "global": {f"cmc_{key}_volume_usd_24h": round(glob or 0.0, 2)},
+        f"k_{key}_share_pct_24h": round(share or 0.0, 4),
+        "errors": list(table.get("errors") or []),
+        "notes": list(table.get("notes") or []),
+    }
+
+
+# ══════════════════════════════════════════════════════════════
+# 3. CLI
+# ══════════════════════════════════════════════════════════════
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="BM20 구성종목 K-share (KRW 스냅샷 + CMC 1회)")
+    ap.add_argument("--usdkrw", type=float, default=None, help="기본: out/history/fx_latest.json")
+    ap.add_argument("--out", default=str(OUT_JSON))
+    args = ap.parse_args()
+
+    usdkrw = args.usdkrw or usdkrw_from_fx()
+    if not usdkrw:
+        print("[ERROR] USDKRW 없음 (--usdkrw 지정)")
+        return 1
+    table = build_k_share(os.environ.get("CMC_API_KEY"), usdkrw)
+    write_k_share(table, Path(args.out))
+    for s, k in zip(table["symbols"], table["k_share_pct"]):
+        print(f"  {s:<6} {'—' if k is None else f'{k:7.2f}%'}")
+    for e in table["errors"]:
+        print(f"[WARN] {e}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+kimchi_minute.py
+────────────────
+분 단위 김치 프리미엄 히스토리 (스케줄: kimchi_minute_daily.yml, 매일 1회 + 수동 백필)
+
+smart_kimchi_8h.py 는 30분마다 그 순간의 티커 1점만 남긴다 (샘플링 시점 노이즈 그대로).
+여기서는 거래소 1분봉을 받아 같은 분끼리 맞춘 뒤 프리미엄을 배열 연산 한 번으로 계산한다.
+
+  Upbit   KRW-BTC / KRW-ETH / KRW-XRP (+ KRW-USDT 진단용)   /v1/candles/minutes/1  (200개/요청)
+  Binance BTCUSDT / ETHUSDT / XRPUSDT                      /api/v3/klines 1m      (1000개/요청)
+  USDKRW  Yahoo USDKRW=X 1시간봉 → 분 그리드에 as-of (주말·휴장 최대 4일 유지)
+
+  premium = (KRW_domestic − USDT_global × USDKRW) / (USDT_global × USDKRW) × 100   (smart_kimchi 와 동일 정의)
+
+- 종가 = 그 분 마지막 체결가. 체결 없는 분은 원 가격 열에 NaN 그대로 두고,
+  프리미엄 계산 때만 직전 체결가를 최대 FFILL_MAX_MIN 분 유지한다.
+- 저장: out/archive/parquet/kimchi_minute/YYYY_MM_DD.parquet (KST 일 파티션, zstd, float32 열)
+  마감된 날은 한 번 쓰고 나면 바뀌지 않는다 → 매일 커밋해도 저장소 증가는 하루치 파일 하나.
+- 증분: 마지막 파티션에서 모든 가격 열이 채워진 마지막 분 다음부터만 요청한다.
+  처음 실행이면 BOOTSTRAP_DAYS 일 전부터. --since 로 임의 구간 백필(기존 값 위에 병합).
+
+사용:
+    python scripts/kimchi_minute.py update                       # 증분
+    python scripts/kimchi_minute.py update --since 2026-07-01    # 백필
+    python scripts/kimchi_minute.py stats --start 2026-10-01     # 일별 프리미엄 요약
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from http_session import SESSION
+
+KST = timezone(timedelta(hours=9))
+
+ROOT = Path(os.getenv("BM20_DATA_ROOT") or Path(__file__).resolve().parent.parent)
+MINUTE_DIR = ROOT / "out/archive/parquet/kimchi_minute"
+
+COINS = ("BTC", "ETH", "XRP")
+PRICE_COLS = [f"krw_{c}" for c in COINS] + ["krw_USDT"] + [f"usdt_{c}" for c in COINS]
+FX_COL = "usdkrw"
+PREM_COLS = [f"prem_{c}" for c in COINS]
+COLUMNS = PRICE_COLS + [FX_COL] + PREM_COLS
+
+DAY_MIN        = 1440
+KST_OFFSET_MIN = 9 * 60
+FFILL_MAX_MIN  = 5            # 체결 없는 분 → 직전 체결가 유지 한도 (프리미엄 계산용)
+FX_STALE_MIN   = 4 * DAY_MIN  # 주말·연휴 외환시장 휴장
+BOOTSTRAP_DAYS = 7
+COMPRESSION    = "zstd"
+
+UPBIT_CANDLES = "https://api.upbit.com/v1/candles/minutes/1"
+UPBIT_PAGE    = 200
+UPBIT_PAUSE   = 0.12          # 캔들 API 초당 10회 제한
+
+# api.binance.com 은 GitHub Actions 에서 451 → binance.vision 폴백 (smart_kimchi 와 동일)
+BINANCE_KLINES_URLS = [
+    "https://api.binance.com/api/v3/klines",
+    "https://data-api.binance.vision/api/v3/klines",
+]
+BINANCE_PAGE  = 1000
+BINANCE_PAUSE = 0.05
+
+YAHOO_FX = "https://query1.finance.yahoo.com/v8/finance/chart/USDKRW=X"
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+
+# ══════════════════════════════════════════════════════════════
+# 1. 분 인덱스 (1970-01-01 UTC 기준 분)
+# ══════════════════════════════════════════════════════════════
+
+def now_minute() -> int:
+    """지금 진행 중인 분 (이 분의 캔들은 아직 미완성 → 구간 끝으로만 쓴다)"""
+    return int(time.time() // 60)
+
+def kst_day(minute: int) -> date:
+    return date(1970, 1, 1) + timedelta(days=(minute + KST_OFFSET_MIN) // DAY_MIN)
+
+def day_start(d: date) -> int:
+    """KST 자정의 분 인덱스"""
+    return (d - date(1970, 1, 1)).days * DAY_MIN - KST_OFFSET_MIN
+
+def _iso_utc(minute: int) -> str:
+    return str(np.datetime64(minute, "m")) + ":00Z"
+
+def day_path(d: date) -> Path:
+    return MINUTE_DIR / f"{d:%Y_%m_%d}.parquet"
+
+
+# ══════════════════════════════════════════════════════════════
+# 2. 수집 (페이지네이션)
+# ══════════════════════════════════════════════════════════════
+
+def _get_json(url: str, params: dict, tries: int = 3):
+    last_err = None
+    for attempt in range(tries):
+        try:
+            r = SESSION.get(url, params=params, headers=HEADERS, timeout=20)
+            if r.status_code == 429:                       # 요청 한도 → 잠깐 쉬고 재시도
+                last_err = RuntimeError("429 Too Many Requests")
+                time.sleep(1.0 + attempt)
+                continue
+            if 200 <= r.status_code < 300:
+                return r.json()
+            last_err = RuntimeError(f"{r.status_code} {r.text[:200]}")
+        except Exception as e:
+            last_err = e
+        time.sleep(1)
+    raise RuntimeError(f"Failed request: {url} ({last_err})")
+
+def _collect(ts: list[np.ndarray], px: list[np.ndarray], start: int, end: int) -> tuple[np.ndarray, np.ndarray]:
+    if not ts:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    t, p = np.concatenate(ts), np.concatenate(px)
+    keep = (t >= start) & (t < end) & np.isfinite(p) & (p > 0)
+    return t[keep], p[keep]
+
+def fetch_upbit(market: str, start: int, end: int) -> tuple[np.ndarray, np.ndarray]:
+    """Upbit 1분봉 [start, end) → (분, 종가). to 는 exclusive, 최신→과거 순으로 200개씩."""
+    ts, px = [], []
+    to = end
+    while to > start:
+        rows = _get_json(UPBIT_CANDLES, {"market": market, "count": UPBIT_PAGE, "to": _iso_utc(to)})
+        if not rows:
+            break
+        t = np.array([r["candle_date_time_utc"] for r in rows], dtype="datetime64[m]").astype(np.int64)
+        ts.append(t)
+        px.append(np.array([r["trade_price"] for r in rows], dtype=np.float64))
+        oldest = int(t.min())
+        if oldest >= to:                                   # 진행 없음 방어
+            break
+        to = oldest
+        time.sleep(UPBIT_PAUSE)
+    return _collect(ts, px, start, end)
+
+def _binance_pages(url: str, symbol: str, start: int, end: int) -> tuple[np.ndarray, np.ndarray]:
+    ts, px = [], []
+    cur = start
+    while cur < end:
+        rows = _get_json(url, {"symbol": symbol, "interval": "1m", "limit": BINANCE_PAGE,
+                               "startTime": cur * 60_000, "endTime": end * 60_000 - 1})
+        if not rows:
+            break
+        t = np.array([r[0] for r in rows], dtype=np.int64) // 60_000
+        ts.append(t)
+        px.append(np.array([r[4] for r in rows], dtype=np.float64))
+        cur = int(t[-1]) + 1
+        time.sleep(BINANCE_PAUSE)
+    return _collect(ts, px, start, end)
+
+def fetch_binance(symbol: str, start: int, end: int) -> tuple[np.ndarray, np.ndarray]:
+    """Binance 1분봉 [start, end) → (분, 종가). 과거→최신 순으로 1000개씩."""
+    last_err = None
+    for url in BINANCE_KLINES_URLS:
+        try:
+            return _binance_pages(url, symbol, start, end)
+        except Exception as e:
+            last_err = e
+    raise RuntimeError(f"Binance klines failed for {symbol}: {last_err}")
+
+def fetch_fx(start: int, end: int) -> tuple[np.ndarray, np.ndarray]:
+    """Yahoo USDKRW=X 1시간봉 → (분, 환율). 구간 앞쪽 휴장 대비 FX_STALE_MIN 만큼 더 받는다."""
+    j = _get_json(YAHOO_FX, {"interval": "1h",
+                             "period1": (start - FX_STALE_MIN) * 60, "period2": end * 60})
+    res = j["chart"]["result"][0]
+    t = np.array(res.get("timestamp") or [], dtype=np.int64) // 60
+    close = np.array([np.nan if v is None else v for v in res["indicators"]["quote"][0].get("close") or []],
+                     dtype=np.float64)
+    keep = np.isfinite(close) & (close >= 900) & (close <= 2000)
+    return t[keep], close[keep]
+
+
+# ══════════════════════════════════════════════════════════════
+# 3. 벡터 연산
+# ══════════════════════════════════════════════════════════════
+
+def ffill_limited(a: np.ndarray, limit: int) -> np.ndarray:
+    """NaN 을 직전 유효값으로 채우되 limit 칸까지만"""
+    n = len(a)
+    pos = np.arange(n)
+    src = np.where(np.isfinite(a), pos, -1)
+    np.maximum.accumulate(src, out=src)
+    ok = (src >= 0) & (pos - src <= limit)
+    return np.where(ok, a[np.clip(src, 0, None)], np.nan)
+
+def asof_minutes(grid_start: int, n: int, t: np.ndarray, v: np.ndarray, max_stale: int) -> np.ndarray:
+    """분 그리드 [grid_start, grid_start+n) 에 (t, v) 를 as-of 정렬"""
+    if not len(t):
+        return np.full(n, np.nan)
+    order = np.argsort(t, kind="stable")
+    t, v = t[order], v[order]
+    grid = grid_start + np.arange(n)
+    pos = np.searchsorted(t, grid, side="right") - 1
+    p = np.clip(pos, 0, None)
+    ok = (pos >= 0) & (grid - t[p] <= max_stale)
+    return np.where(ok, v[p], np.nan)
+
+def compute_premium(cols: dict[str, np.ndarray]) -> None:
+    """cols 에 prem_* 열을 채운다 (전 구간 한 번에)"""
+    fx = cols[FX_COL]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for c in COINS:
+            krw = ffill_limited(cols[f"krw_{c}"], FFILL_MAX_MIN)
+            fair = ffill_limited(cols[f"usdt_{c}"], FFILL_MAX_MIN) * fx
+            cols[f"prem_{c}"] = (krw - fair) / fair * 100.0
+
+
+# ══════════════════════════════════════════════════════════════
+# 4. 파티션 입출력 (KST 일)
+# ══════════════════════════════════════════════════════════════
+
+def load_grid(d0: date, d1: date) -> tuple[int, dict[str, np.ndarray]]:
+    """KST d0 ~ d1 (포함) 분 그리드 + 저장된 값 → (시작 분, {열: float64 배열})"""
+    start = day_start(d0)
+    n = ((d1 - d0).days + 1) * DAY_MIN
+    cols = {c: np.full(n, np.nan) for c in COLUMNS}
+    d = d0
+    while d <= d1:
+        p = day_path(d)
+        if p.exists():
+            df = pd.read_parquet(p)
+            idx = (df["ts"].to_numpy(dtype="datetime64[m]").astype(np.int64) - start)
+            for c in COLUMNS:
+                if c in df.columns:
+                    cols[c][idx] = df[c].to_numpy(dtype=np.float64)
+        d += timedelta(days=1)
+    return start, cols
+
+def write_grid(start: int, cols: dict[str, np.ndarray], upto: int) -> list[Path]:
+    """그리드를 KST 일 파티션으로 저장 (upto 분 이전까지, 값이 하나도 없는 분은 행 생략)"""
+    n = len(cols[FX_COL])
+    written = []
+    MINUTE_DIR.mkdir(parents=True, exist_ok=True)
+    for off in range(0, n, DAY_MIN):
+        sl = slice(off, min(off + DAY_MIN, upto - start))
+        if sl.stop <= sl.start:
+            break
+        block = {c: cols[c][sl] for c in PRICE_COLS}
+        has = np.any(np.isfinite(np.vstack(list(block.values()))), axis=0)
+        if not has.any():
+            continue
+        minutes = start + np.arange(sl.start, sl.stop)[has]
+        df = pd.DataFrame({"ts": pd.to_datetime(minutes * 60, unit="s", utc=True).tz_convert("Asia/Seoul")})
+        for c in COLUMNS:
+            df[c] = cols[c][sl][has].astype(np.float32)
+        path = day_path(kst_day(start + off))
+        tmp = path.with_name(f".{path.name}.tmp")
+        df.to_parquet(tmp, index=False, compression=COMPRESSION)
+        os.replace(tmp, path)
+        written.append(path)
+    return written
+
+def resume_minute() -> int | None:
+    """마지막 파티션에서 모든 가격 열이 채워진 마지막 분 + 1 (없으면 None)"""
+    parts = sorted(MINUTE_DIR.glob("*.parquet"))
+    if not parts:
+        return None
+    df = pd.read_parquet(parts[-1])
+    t = df["ts"].to_numpy(dtype="datetime64[m]").astype(np.int64)
+    lasts = []
+    for c in PRICE_COLS:
+        ok = np.isfinite(df[c].to_numpy(dtype=np.float64)) if c in df.columns else np.zeros(len(t), bool)
+        lasts.append(int(t[ok].max()) if ok.any() else int(t.min()))
+    return min(lasts) + 1
+
+def load_range(start: date, end: date) -> pd.DataFrame:
+    """KST start ~ end (포함) 분 데이터 (연구용). 파티션이 없는 날은 건너뛴다."""
+    frames = []
+    d = start
+    while d <= end:
+        p = day_path(d)
+        if p.exists():
+            frames.append(pd.read_parquet(p))
+        d += timedelta(days=1)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["ts"] + COLUMNS)
+
+
+# ══════════════════════════════════════════════════════════════
+# 5. 작업
+# ══════════════════════════════════════════════════════════════
+
+def update(since: date | None = None) -> int:
+    end = now_minute()
+    if since is not None:
+        start = day_start(since)
+    else:
+        start = resume_minute() or day_start(kst_day(end) - timedelta(days=BOOTSTRAP_DAYS))
+    if start >= end:
+        print("[SKIP] kimchi_minute: 새 분 없음")
+        return 0
+
+    g0, cols = load_grid(kst_day(start), kst_day(end - 1))
+    n = len(cols[FX_COL])
+    print(f"INFO: kimchi_minute {_iso_utc(start)} ~ {_iso_utc(end)} ({end - start}분)")
+
+    jobs = [(f"krw_{c}", fetch_upbit, f"KRW-{c}") for c in COINS] + [("krw_USDT", fetch_upbit, "KRW-USDT")]
+    jobs += [(f"usdt_{c}", fetch_binance, f"{c}USDT") for c in COINS]
+    for col, fetch, market in jobs:
+        t0 = time.perf_counter()
+        try:
+            t, px = fetch(market, start, end)
+        except Exception as e:
+            print(f"[WARN] {market} 분봉 수집 실패: {e}")
+            continue
+        cols[col][t - g0] = px
+        print(f"  {market:<9} {len(t):>7}분 ({time.perf_counter() - t0:.1f}s)")
+
+    try:
+        ft, fv = fetch_fx(start, end)
+        fx = asof_minutes(g0, n, ft, fv, FX_STALE_MIN)
+        cols[FX_COL] = np.where(np.isfinite(fx), fx, cols[FX_COL])
+    except Exception as e:
+        print(f"[WARN] USDKRW 1시간봉 실패 ({e}) → 저장된 환율만 사용")
+    # 저장된 값과 새 값 사이 빈 분도 as-of 로 이어 붙인다
+    cols[FX_COL] = ffill_limited(cols[FX_COL], FX_STALE_MIN)
+
+    compute_premium(cols)
+    written = write_grid(g0, cols, end)
+    filled = np.isfinite(cols["prem_BTC"][start - g0:end - g0]).mean() * 100 if end > start else 0.0
+    print(f"[OK] kimchi_minute → {len(written)}개 파티션 갱신 (BTC 프리미엄 채움 {filled:.1f}%)")
+    return len(written)
+
+def stats(start: date, end: date):
+    df = load_range(start, end)
+    if df.empty:
+        print("[WARN] kimchi_minute: 해당 구간 파티션 없음")
+        return
+    g = df.set_index("ts")[PREM_COLS].groupby(lambda ts: ts.date())
+    out = pd.concat({"mean": g.mean(), "min": g.min(), "max": g.max(), "n": g.count()}, axis=1)
+    with pd.option_context("display.width", 200, "display.max_columns", 50, "display.float_format", "{:.3f}".format):
+        print(out)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="분 단위 김치 프리미엄 히스토리")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    u = sub.add_parser("update", help="증분 수집 (또는 --since 백필)")
+    u.add_argument("--since", type=date.fromisoformat, default=None, help="KST YYYY-MM-DD 부터 다시 수집")
+    s = sub.add_parser("stats", help="일별 프리미엄 요약")
+    s.add_argument("--start", type=date.fromisoformat, required=True)
+    s.add_argument("--end", type=date.fromisoformat, default=datetime.now(KST).date())
+    args = ap.parse_args()
+
+    if args.cmd == "update":
+        update(args.since)
+    else:
+        stats(args.start, args.end)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,7 +8,9 @@ KRW Rolling 24h Dashboard Pipeline (8h snapshots)
 - Outputs:
   out/history/
     ├─ krw_24h_latest.json
-    └─ krw_24h_snapshots.json
+    ├─ krw_24h_snapshots.json
+    ├─ krw_24h_pairs_latest.json   (자산 × 거래소 전체 맵 → k_share.py 가 종목별 K-share 계산에 사용)
+    └─ bm20_krw_series.json        (BM20-KRW 일간/장중 레벨, bm20_krw.py)
 
 Notes:
 - Exchange APIs typically provide rolling 24h traded value, not discrete 8h volume.
@@ -19,10 +21,13 @@ import json
 import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import requests
 
+import bm20_krw
+import bm20_store
+
 # -------------------------
 # Time / Paths
 # -------------------------
@@ -35,13 +40,14 @@ HIST_DIR.mkdir(parents=True, exist_ok=True)
 
 LATEST_JSON = HIST_DIR / "krw_24h_latest.json"
 SNAPSHOTS_JSON = HIST_DIR / "krw_24h_snapshots.json"
+PAIRS_JSON = HIST_DIR / "krw_24h_pairs_latest.json"
 
 # 월별 영구 아카이브 디렉토리
 ARCHIVE_DIR = OUT_DIR / "archive"
 ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
 
-# 대시보드 차트용: 최근 30일만 유지
-MAX_SNAPSHOTS = 1440  # 30일치 @ 30min
+# 대시보드 차트용: 최근 8일만 유지 (최대 7D 범위 + 여유, 이전 구간은 compact_history.py 가 Parquet 로 롤업)
+MAX_SNAPSHOTS = 384  # 8일치 @ 30min
 
 # -------------------------
 # API Endpoints
@@ -78,7 +84,7 @@ def now_kst() -> datetime:
 # returns List[(symbol, krw_24h_value)]
 # symbol format: KRW-XXX
 # -------------------------
-def fetch_upbit_pairs() -> List[Tuple[str, float]]:
+def fetch_upbit_pairs(prices: Optional[Dict[str, float]] = None) -> List[Tuple[str, float]]:
     markets = http_get(UPBIT_MARKETS, {"isDetails": "false"})
     krw_markets = [m["market"] for m in markets if m.get("market", "").startswith("KRW-")]
     out: List[Tuple[str, float]] = []
@@ -90,6 +96,8 @@ def fetch_upbit_pairs() -> List[Tuple[str, float]]:
             val = float(t.get("acc_trade_price_24h", 0) or 0)
             if sym:
                 out.append((sym, val))
+                if prices is not None:
+                    prices[sym] = float(t.get("trade_price", 0) or 0)
         time.sleep(0.1)
     return out
 
@@ -109,7 +117,7 @@ def fetch_upbit_change_rates() -> Dict[str, float]:
         time.sleep(0.1)
     return rates
 
-def fetch_bithumb_pairs() -> List[Tuple[str, float]]:
+def fetch_bithumb_pairs(prices: Optional[Dict[str, float]] = None) -> List[Tuple[str, float]]:
     j = http_get(BITHUMB_TICKER_ALL)
     data = j.get("data", {})
     out: List[Tuple[str, float]] = []
@@ -125,9 +133,11 @@ def fetch_bithumb_pairs() -> List[Tuple[str, float]]:
             or 0
         )
         out.append((f"KRW-{sym}", float(val or 0)))
+        if prices is not None:
+            prices[f"KRW-{sym}"] = float(vv.get("closing_price", 0) or 0)
     return out
 
-def fetch_coinone_pairs() -> List[Tuple[str, float]]:
+def fetch_coinone_pairs(prices: Optional[Dict[str, float]] = None) -> List[Tuple[str, float]]:
     j = http_get(COINONE_TICKER)
     out: List[Tuple[str, float]] = []
     for t in j.get("tickers", []):
@@ -136,9 +146,11 @@ def fetch_coinone_pairs() -> List[Tuple[str, float]]:
         val = float(t.get("quote_volume", 0) or 0)
         if sym:
             out.append((f"KRW-{sym}", val))
+            if prices is not None:
+                prices[f"KRW-{sym}"] = float(t.get("last", 0) or 0)
     return out
 
-def fetch_korbit_pairs() -> List[Tuple[str, float]]:
+def fetch_korbit_pairs(prices: Optional[Dict[str, float]] = None) -> List[Tuple[str, float]]:
     """코빗 전체 KRW 페어 24h 거래대금 (원화 환산).
     volume 필드는 기준통화(BTC 등) 단위이므로 last 가격을 곱해 KRW 환산.
     """
@@ -153,6 +165,8 @@ def fetch_korbit_pairs() -> List[Tuple[str, float]]:
             krw_vol = last * volume
             sym = "KRW-" + pair.replace("_krw", "").upper()
             out.append((sym, krw_vol))
+            if prices is not None:
+                prices[sym] = last
         except (TypeError, ValueError):
             continue
     return out
@@ -172,6 +186,18 @@ def merge_maps(*pairs_lists: List[Tuple[str, float]]) -> Dict[str, float]:
             m[sym] = m.get(sym, 0.0) + float(val or 0.0)
     return m
 
+def pairs_table(ts_iso: str, by_exchange: Dict[str, List[Tuple[str, float]]]) -> Dict:
+    """자산 × 거래소 24h 거래대금(KRW) 전체 맵 — 열 지향 (assets[i] 행 = values[i], 거래소 순서 = exchanges)"""
+    maps = {ex: merge_maps(pairs) for ex, pairs in by_exchange.items()}
+    assets = sorted({sym.split("-", 1)[1].upper() for m in maps.values() for sym in m if "-" in sym})
+    return {
+        "schema": "krw_pairs_v1",
+        "timestamp_kst": ts_iso,
+        "exchanges": list(maps),
+        "assets": assets,
+        "values": [[round(maps[ex].get(f"KRW-{a}", 0.0)) for ex in maps] for a in assets],
+    }
+
 def topn_from_map(m: Dict[str, float], n: int = 10) -> List[Tuple[str, float]]:
     items = sorted(m.items(), key=lambda x: x[1], reverse=True)
     return items[:n]
@@ -212,8 +238,13 @@ def safe_read_json(path: Path):
     except Exception:
         return None
 
-def write_json(path: Path, obj):
-    path.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+def write_json(path: Path, obj, compact: bool = False):
+    # 30분마다 통째로 다시 쓰는 누적 파일은 compact 로 → 커밋당 git blob 크기 감소
+    if compact:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(obj, ensure_ascii=False, indent=2)
+    path.write_text(text, encoding="utf-8")
 
 # -------------------------
 # Main pipeline
@@ -223,14 +254,16 @@ def run():
     ts_iso = ts.strftime("%Y-%m-%dT%H:%M:%S%z")  # e.g., 2026-01-24T09:05:00+0900
     ts_label = ts.strftime("%m/%d %H:%M KST")
 
-    up = fetch_upbit_pairs()
+    # 거래소별 원화 가격도 같은 응답에서 챙겨 둔다 (BM20-KRW 용, 추가 요청 없음)
+    px: Dict[str, Dict[str, float]] = {"upbit": {}, "bithumb": {}, "coinone": {}, "korbit": {}}
+    up = fetch_upbit_pairs(px["upbit"])
     up_change_rates = fetch_upbit_change_rates()
-    bt = fetch_bithumb_pairs()
-    co = fetch_coinone_pairs()
+    bt = fetch_bithumb_pairs(px["bithumb"])
+    co = fetch_coinone_pairs(px["coinone"])
 
     # 코빗 — 실패해도 파이프라인 중단 없이 빈 리스트로 처리
     try:
-        kb = fetch_korbit_pairs()
+        kb = fetch_korbit_pairs(px["korbit"])
         print(f"[OK] Korbit fetched: {len(kb)} pairs")
     except Exception as e:
         kb = []
@@ -335,9 +368,22 @@ def run():
     history = history[-MAX_SNAPSHOTS:]
 
     write_json(LATEST_JSON, latest)
-    write_json(SNAPSHOTS_JSON, history)
+    write_json(SNAPSHOTS_JSON, history, compact=True)
+    write_json(PAIRS_JSON, pairs_table(ts_iso, {"upbit": up, "bithumb": bt, "coinone": co, "korbit": kb}),
+               compact=True)
+
+    # ── BM20-KRW: 거래대금 가중 원화 가격 → 체인 연결 레벨 (일간 + 장중)
+    try:
+        values = {"upbit": dict(up), "bithumb": dict(bt), "coinone": dict(co), "korbit": dict(kb)}
+        quotes = {ex: {sym.split("-", 1)[1].upper(): (p, values[ex].get(sym, 0.0))
+                       for sym, p in px[ex].items() if "-" in sym}
+                  for ex in px}
+        bm20_krw.update(bm20_krw.venue_prices(quotes), ts)
+    except Exception as e:
+        print(f"[WARN] BM20-KRW 갱신 실패: {e}")
+    bm20_store.sync_table("snapshots:krw_24h")
 
-    # ── 월별 영구 아카이브 (삭제 없이 계속 누적)
+    # ── 월별 아카이브 (진행 중인 달만 JSON, 마감된 달은 compact_history.py 가 Parquet 로 롤업)
     archive_path = ARCHIVE_DIR / f"krw_{ts.strftime('%Y_%m')}.json"
     archive = safe_read_json(archive_path)
     if not isinstance(archive, list):
@@ -345,7 +391,7 @@ def run():
     # 같은 타임스탬프 중복 방지
     archive = [x for x in archive if x.get("timestamp_kst") != ts_iso]
     archive.append(latest)
-    write_json(archive_path, archive)
+    write_json(archive_path, archive, compact=True)
     print(f"[OK] Archive: {archive_path.name} ({len(archive)}개 누적)")
 
     print("[OK] Rolling 24h snapshot saved with Stablecoin data")
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+letter_context.py
+─────────────────
+뉴스레터 국문/영문판 공용 데이터 수집 (collect_letter_context → out/letter_context.json).
+
+render_letter.py / render_letter_en.py 는 외부 API 를 직접 부르지 않고 이 컨텍스트만 포맷한다.
+→ 외부 호출이 판마다 한 번씩이 아니라 한 번으로 줄고, 두 판의 숫자(BTC·프리미엄·업비트
+  등락·AAS)가 항상 같다.
+
+수집 항목 (네트워크 호출은 ThreadPoolExecutor 로 동시에, 모두 http_session.SESSION 경유):
+  btc        CMC → Yahoo 폴백            {"price", "chg_24h", "source"}
+  upbit      KRW 마켓 24h 등락 Top/Bottom {"top": [[sym, pct], ...], "bottom": [...]}
+  premium    Upbit KRW-BTC / Binance / Coinbase → 김치·코인베이스 프리미엄 (원시 숫자)
+  wp         카테고리별 최신 글 (마켓 / 디지털자산 / 금융·증권 / 국내정책 / 해외정책)
+             → 헤드라인·리스트 선택은 판별로 pick_news() 에서
+  aas        AAS-Bot Top3 (KST 오늘 → 어제)
+파일/스토어 (호출 스레드에서 읽음 — bm20_store 의 SQLite 연결은 스레드를 넘기지 않는다):
+  bm20       bm20_latest.json (필수)
+  sentiment  bm20_store latest_snapshot("bm20_history")["sentiment"]
+  krw_24h    bm20_store latest_snapshot("krw_24h") 의 totals / upbit_top5
+  nasdaq     nasdaq_series.json 마지막 2포인트
+  etf        data/etf_summary.json
+
+실패한 항목은 null → 각 렌더러가 "—" 폴백으로 채운다.
+USD/KRW 은 bm20_latest.json 의 kimchi_meta.usdkrw, 없으면 FX_FALLBACK 하나로 통일.
+
+재사용: load_letter_context() 는 파일이 MAX_AGE_MIN 분 이내에 수집됐고
+bm20_latest.json 보다 새로우면 그대로 쓰고, 아니면 다시 수집해 저장한다.
+
+사용:
+  python scripts/letter_context.py              # 수집 → out/letter_context.json
+  python scripts/letter_context.py --print      # 수집 결과를 stdout 으로도 출력
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import bm20_store
+from http_session import SESSION
+
+REPO = Path(__file__).resolve().parent.parent
+ROOT = Path(os.getenv("BM20_DATA_ROOT") or REPO)
+
+BM20_JSON    = ROOT / "bm20_latest.json"
+NASDAQ_JSON  = ROOT / "nasdaq_series.json"
+ETF_JSON     = ROOT / "data/etf_summary.json"
+OUT          = ROOT / "out/letter_context.json"
+
+SCHEMA      = 1
+MAX_AGE_MIN = 30
+FX_FALLBACK = 1450.0
+MAX_WORKERS = 8
+KST         = timezone(timedelta(hours=9))
+
+# 워드프레스 설정
+WP_BASE_URL               = "https://blockmedia.co.kr/wp-json/wp/v2"
+WP_CAT_ID_MARKET          = 10136   # 마켓
+WP_CAT_ID_DIGITAL_ASSET   = 24547   # 디지털 자산
+WP_CAT_ID_FINANCE         = 24548   # 금융·증권
+WP_CAT_ID_NATIONAL_POLICY = 78598   # 국내 정책
+WP_CAT_ID_GLOBAL_POLICY   = 16604   # 해외 정책
+WP_CATEGORIES = (WP_CAT_ID_MARKET, WP_CAT_ID_DIGITAL_ASSET, WP_CAT_ID_FINANCE,
+                 WP_CAT_ID_NATIONAL_POLICY, WP_CAT_ID_GLOBAL_POLICY)
+NEWS_N = 3   # 판마다 뉴스 리스트 3건 (+ 헤드라인 제외분 1건 여유로 카테고리당 NEWS_N+1 건 수집)
+
+
+def _strip_html(text: str) -> str:
+    return re.sub(r"<[^>]+>", "", text or "").strip()
+
+
+def _load_json_optional(p: Path) -> Any | None:
+    if not p.exists():
+        return None
+    return json.loads(p.read_text(encoding="utf-8"))
+
+
+# ─────────────────────────────────────────────────────────
+# 네트워크 수집 (각 함수는 실패 시 예외 → _safe 가 None 으로)
+# ─────────────────────────────────────────────────────────
+
+def fetch_btc() -> dict:
+    """BTC 가격 + 24h 변동률: CMC → Yahoo API fallback"""
+    cmc_key = os.getenv("CMC_API_KEY", "")
+    if cmc_key:
+        try:
+            r = SESSION.get(
+                "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest",
+                headers={"X-CMC_PRO_API_KEY": cmc_key},
+                params={"symbol": "BTC", "convert": "USD"},
+                timeout=10,
+            )
+            r.raise_for_status()
+            d = r.json()["data"]["BTC"]["quote"]["USD"]
+            price = float(d["price"])
+            chg   = float(d["percent_change_24h"])
+            print(f"INFO: BTC from CMC — ${price:,.0f} / {chg:+.2f}%")
+            return {"price": price, "chg_24h": chg, "source": "cmc"}
+        except Exception as e:
+            print(f"WARN: CMC BTC fetch failed: {e} → Yahoo API fallback")
+
+    r2 = SESSION.get(
+        "https://query1.finance.yahoo.com/v8/finance/chart/BTC-USD",
+        headers={"User-Agent": "Mozilla/5.0"},
+        params={"interval": "1d", "range": "5d"},
+        timeout=10,
+    )
+    r2.raise_for_status()
+    closes = r2.json()["chart"]["result"][0]["indicators"]["quote"][0]["close"]
+    closes = [x for x in closes if x is not None]
+    price  = float(closes[-1])
+    prev   = float(closes[-2]) if len(closes) >= 2 else 0.0
+    chg    = (price / prev - 1) * 100 if prev else 0.0
+    print(f"INFO: BTC from Yahoo API fallback — ${price:,.0f} / {chg:+.2f}%")
+    return {"price": price, "chg_24h": chg, "source": "yahoo"}
+
+
+def fetch_upbit_top_bottom(n: int = 3) -> dict:
+    """업비트 KRW 마켓 24h 등락률 Top/Bottom n (퍼센트)"""
+    mkts = [m["market"] for m in
+            SESSION.get("https://api.upbit.com/v1/market/all",
+                        params={"isDetails": "false"}, timeout=10).json()
+            if m["market"].startswith("KRW-")]
+    tickers = []
+    for i in range(0, len(mkts), 100):
+        tickers += SESSION.get("https://api.upbit.com/v1/ticker",
+                               params={"markets": ",".join(mkts[i:i+100])},
+                               timeout=10).json()
+    tickers.sort(key=lambda x: x.get("signed_change_rate", 0), reverse=True)
+
+    def _row(t: dict) -> list:
+        return [t["market"].replace("KRW-", ""), float(t.get("signed_change_rate", 0)) * 100]
+
+    return {"top":    [_row(t) for t in tickers[:n]],
+            "bottom": [_row(t) for t in reversed(tickers[-n:])]}
+
+
+def fetch_premium(usdkrw: float) -> dict:
+    """김치(업비트 vs 바이낸스)·코인베이스(vs 바이낸스) 프리미엄"""
+    upbit_krw = float(
+        SESSION.get("https://api.upbit.com/v1/ticker",
+                    params={"markets": "KRW-BTC"}, timeout=10).json()[0]["trade_price"])
+    # 글로벌 BTC 기준가: 바이낸스 (김치·코인베이스 프리미엄 공통 기준)
+    binance_usd = None
+    for base in ["https://api.binance.com", "https://data-api.binance.vision"]:
+        try:
+            br = SESSION.get(f"{base}/api/v3/ticker/price",
+                             params={"symbol": "BTCUSDT"}, timeout=10)
+            br.raise_for_status()
+            binance_usd = float(br.json()["price"])
+            print(f"INFO: Premium BTC global = ${binance_usd:,.0f} (Binance)")
+            break
+        except Exception as be:
+            print(f"WARN: Binance {base} failed: {be}")
+    if binance_usd is None:
+        raise RuntimeError("바이낸스 BTC 가격 조회 실패")
+    cb_usd = float(
+        SESSION.get("https://api.coinbase.com/v2/prices/BTC-USD/spot",
+                    timeout=10).json()["data"]["amount"])
+    return {
+        "upbit_krw":    upbit_krw,
+        "binance_usd":  binance_usd,
+        "coinbase_usd": cb_usd,
+        "usdkrw":       usdkrw,
+        "kimchi_pct":   (upbit_krw / usdkrw - binance_usd) / binance_usd * 100,
+        "cb_pct":       (cb_usd - binance_usd) / binance_usd * 100,
+        "asof":         datetime.now(KST).isoformat(timespec="seconds"),
+    }
+
+
+def fetch_wp_category(cat_id: int, per_page: int = NEWS_N + 1) -> list[dict]:
+    """카테고리 최신 글 → [{"id", "title", "excerpt", "summary", "link"}] (title/excerpt 는 태그 제거)"""
+    res = SESSION.get(
+        f"{WP_BASE_URL}/posts",
+        params={"categories": cat_id, "per_page": per_page,
+                "orderby": "date", "order": "desc", "status": "publish",
+                "_fields": "id,title,excerpt,link,meta"},
+        timeout=10,
+    )
+    res.raise_for_status()
+    return [{
+        "id":      post["id"],
+        "title":   _strip_html(post["title"]["rendered"]),
+        "excerpt": _strip_html(post["excerpt"]["rendered"]),
+        "summary": (post.get("meta", {}) or {}).get("bm_post_summary", "") or "",
+        "link":    post.get("link", "#"),
+    } for post in res.json()]
+
+
+def fetch_aas() -> dict | None:
+    """GitHub AAS-Bot 에서 Top3. KST 오늘 → 어제 순 시도."""
+    token   = os.getenv("AAS_BOT_TOKEN", "")
+    headers = {"Authorization": f"token {token}"} if token else {}
+    kst_now = datetime.now(KST)
+    for date_str in [kst_now.strftime("%Y-%m-%d"),
+                     (kst_now - timedelta(days=1)).strftime("%Y-%m-%d")]:
+        url = (f"https://raw.githubusercontent.com/Blockmedia-DataTeam/AAS-Bot"
+               f"/main/reports/daily/{date_str}/newsletter_aas_top3_{date_str}.json")
+        try:
+            r = SESSION.get(url, timeout=10, headers=headers)
+            r.raise_for_status()
+            data = r.json()
+            print(f"INFO: AAS data fetched for {date_str}")
+            return {"date": date_str, "items": data[:3]}
+        except Exception as e:
+            print(f"WARN: AAS fetch failed for {date_str}: {e}")
+    print("WARN: AAS data unavailable. Using defaults.")
+    return None
+
+
+def _safe(name: str, fn: Callable, *args) -> Any | None:
+    try:
+        return fn(*args)
+    except Exception as e:
+        print(f"WARN: letter context [{name}] failed: {e}")
+        return None
+
+
+# ─────────────────────────────────────────────────────────
+# 파일 / 스토어
+# ─────────────────────────────────────────────────────────
+
+def _usdkrw(bm20: dict) -> float | None:
+    v = (bm20.get("kimchi_meta", {}) or {}).get("usdkrw", None)
+    try:
+        v = float(str(v).replace(",", "")) if v else None
+    except ValueError:
+        return None
+    return v if (v and v > 100) else None
+
+
+def _load_local() -> dict:
+    if not BM20_JSON.exists():
+        raise FileNotFoundError(f"Missing {BM20_JSON}")
+    bm20 = json.loads(BM20_JSON.read_text(encoding="utf-8"))
+
+    sentiment = None
+    latest = bm20_store.latest_snapshot("bm20_history")
+    if latest:
+        sentiment = latest.get("sentiment") or None
+
+    krw_24h = None
+    snap = bm20_store.latest_snapshot("krw_24h")
+    if snap:
+        krw_24h = {"totals": snap.get("totals", {}),
+                   "upbit_top5": (snap.get("by_exchange_top", {}) or {}).get("upbit_top5", [])[:5]}
+
+    nasdaq = None
+    try:
+        series = _load_json_optional(NASDAQ_JSON) or []
+        if len(series) >= 2:
+            nasdaq = {"price": float(series[-1]["price"]), "prev": float(series[-2]["price"])}
+    except Exception as e:
+        print(f"WARN: NASDAQ load failed: {e}")
+
+    etf = None
+    if not ETF_JSON.exists():
+        print(f"WARN: ETF json not found: {ETF_JSON}")
+    else:
+        try:
+            etf = json.loads(ETF_JSON.read_text(encoding="utf-8"))
+        except Exception as e:
+            print(f"WARN: ETF json parse error: {e}")
+
+    return {"bm20": bm20, "sentiment": sentiment, "krw_24h": krw_24h,
+            "nasdaq": nasdaq, "etf": etf}
+
+
+# ─────────────────────────────────────────────────────────
+# 수집 / 저장 / 로드
+# ─────────────────────────────────────────────────────────
+
+def collect_letter_context() -> dict:
+    """국문·영문 뉴스레터가 쓰는 데이터를 한 번에 (네트워크는 동시에) 모은다."""
+    t0 = time.perf_counter()
+    now = datetime.now(KST)
+    local = _load_local()
+    usdkrw = _usdkrw(local["bm20"])
+    fx = usdkrw or FX_FALLBACK
+    if usdkrw is None:
+        print(f"WARN: bm20_latest.json 에 usdkrw 없음 → {FX_FALLBACK:g} 사용")
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="letter-ctx") as ex:
+        futs = {
+            "btc":     ex.submit(_safe, "btc", fetch_btc),
+            "upbit":   ex.submit(_safe, "upbit", fetch_upbit_top_bottom, NEWS_N),
+            "premium": ex.submit(_safe, "premium", fetch_premium, fx),
+            "aas":     ex.submit(_safe, "aas", fetch_aas),
+        }
+        wp_futs = {cat: ex.submit(_safe, f"wp {cat}", fetch_wp_category, cat)
+                   for cat in WP_CATEGORIES}
+        net = {k: f.result() for k, f in futs.items()}
+        wp = {str(cat): f.result() for cat, f in wp_futs.items()}
+
+    ctx = {
+        "schema":       SCHEMA,
+        "collected_at": now.isoformat(timespec="seconds"),
+        "letter_date":  now.strftime("%Y-%m-%d"),
+        "usdkrw":       fx,
+        **local,
+        **net,
+        "wp":           wp,
+    }
+    failed = [k for k in ("btc", "upbit", "premium", "aas") if ctx[k] is None]
+    failed += [f"wp {c}" for c, v in wp.items() if v is None]
+    print(f"INFO: letter context collected in {time.perf_counter() - t0:.2f}s"
+          + (f" (failed: {', '.join(failed)})" if failed else ""))
+    return ctx
+
+
+def write_letter_context(ctx: dict, path: Path = OUT) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(ctx, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+    print(f"[OK] wrote {path}")
+    return path
+
+
+def _is_fresh(ctx: dict, path: Path) -> bool:
+    if ctx.get("schema") != SCHEMA:
+        return False
+    try:
+        collected = datetime.fromisoformat(ctx["collected_at"]).timestamp()
+    except (KeyError, ValueError):
+        return False
+    if time.time() - collected > MAX_AGE_MIN * 60:
+        return False
+    # 수집 이후 bm20_latest.json 이 갱신됐으면 (update_bm20_latest.py) 다시 모은다
+    return not (BM20_JSON.exists() and BM20_JSON.stat().st_mtime > collected)
+
+
+def load_letter_context(path: Path = OUT, refresh: bool = False) -> dict:
+    """신선한 컨텍스트 파일이 있으면 그대로, 없으면 수집 → 저장 후 반환."""
+    if not refresh and path.exists():
+        try:
+            ctx = json.loads(path.read_text(encoding="utf-8"))
+            if _is_fresh(ctx, path):
+                print(f"INFO: letter context reused ({path}, collected {ctx['collected_at']})")
+                return ctx
+        except Exception as e:
+            print(f"WARN: letter context unreadable ({path}): {e}")
+    ctx = collect_letter_context()
+    write_letter_context(ctx, path)
+    return ctx
+
+
+def pick_news(ctx: dict, lead_cats: list[int], list_cats: list[int],
+              n: int = NEWS_N) -> tuple[dict | None, list[tuple[int, dict]]]:
+    """헤드라인: lead_cats 순서로 첫 글. 리스트: list_cats 순서로 채우되 헤드라인 글은 제외.
+    Returns (lead_post | None, [(cat_id, post), ...] 최대 n 건)."""
+    wp = ctx.get("wp") or {}
+    lead = None
+    for cat in lead_cats:
+        posts = wp.get(str(cat)) or []
+        if posts:
+            lead = posts[0]
+            print(f"INFO: news lead from category {cat} (id={lead['id']})")
+            break
+    lead_id = lead["id"] if lead else None
+    picked: list[tuple[int, dict]] = []
+    for cat in list_cats:
+        for post in wp.get(str(cat)) or []:
+            if len(picked) >= n:
+                break
+            if post["id"] != lead_id:
+                picked.append((cat, post))
+    return lead, picked
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="collect shared newsletter context (KR/EN)")
+    ap.add_argument("--out", default=str(OUT))
+    ap.add_argument("--print", action="store_true", help="수집 결과를 stdout 으로도 출력")
+    args = ap.parse_args()
+    ctx = collect_letter_context()
+    write_letter_context(ctx, Path(args.out))
+    if args.print:
+        print(json.dumps(ctx, ensure_ascii=False, indent=1))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+letter_template.py
+──────────────────
+뉴스레터/브리프 HTML 템플릿의 {{PLACEHOLDER}} 치환 엔진.
+render_letter.py / render_letter_en.py / render_aas_brief.py 공용.
+
+- 템플릿을 한 번 토큰화: [리터럴, 이름, 리터럴, 이름, ..., 리터럴]
+- 렌더는 한 번의 join (키 개수 × 템플릿 크기 만큼의 replace 반복 없음)
+- 값 안에 들어 있는 {{...}} 는 다시 치환하지 않는다 → 비슷한 이름의 키끼리 충돌 없음
+  (예: "{{UNSUB_URL}}" → "{{UNSUB_URL}}" 그대로 두면 Stibee 가 발송 시 치환)
+- 값이 없는 플레이스홀더는 원문 그대로 남기고, 토큰 목록에서 바로 보고 (추가 스캔 없음)
+- 컴파일 결과는 템플릿 파일 sha256 으로 캐시 → 같은 프로세스에서 여러 번 렌더해도
+  파일이 바뀌지 않았으면 다시 토큰화하지 않는다
+
+사용:
+    from letter_template import load_template
+    tpl = load_template(TEMPLATE)
+    html, left = tpl.render(ph, ignore={"UNSUB_URL"})
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Iterable, Mapping
+
+PLACEHOLDER_RE = re.compile(r"\{\{([A-Z0-9_]+)\}\}")
+
+_COMPILED: dict[str, "CompiledTemplate"] = {}
+
+
+def _key(k: str) -> str:
+    """"{{NAME}}" / "NAME" → "NAME" """
+    return k[2:-2] if k.startswith("{{") and k.endswith("}}") else k
+
+
+class CompiledTemplate:
+    """토큰화된 템플릿. parts[짝수] = 리터럴, parts[홀수] = 플레이스홀더 이름."""
+
+    def __init__(self, parts: list[str], sha256: str = ""):
+        self.parts = parts
+        self.sha256 = sha256
+        self.names = frozenset(parts[1::2])
+
+    @classmethod
+    def compile(cls, text: str, sha256: str = "") -> "CompiledTemplate":
+        # re.split 은 캡처 그룹을 결과에 끼워 넣는다 → 리터럴/이름이 번갈아 나온다
+        return cls(PLACEHOLDER_RE.split(text), sha256)
+
+    def render(self, values: Mapping[str, object],
+               ignore: Iterable[str] = ()) -> tuple[str, list[str]]:
+        """values 의 키는 "{{NAME}}" 또는 "NAME". → (html, 채우지 못한 플레이스홀더 목록)"""
+        vals = {_key(k): str(v) for k, v in values.items()}
+        out = list(self.parts)
+        left = set()
+        for i in range(1, len(out), 2):
+            name = out[i]
+            v = vals.get(name)
+            if v is None:
+                out[i] = "{{" + name + "}}"
+                left.add(name)
+            else:
+                out[i] = v
+        skip = {_key(k) for k in ignore}
+        return "".join(out), sorted("{{" + n + "}}" for n in left - skip)
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def load_template(path: Path) -> CompiledTemplate:
+    """템플릿 파일 → CompiledTemplate (파일 해시가 같으면 컴파일 결과 재사용)"""
+    raw = Path(path).read_bytes()
+    digest = _sha256(raw)
+    tpl = _COMPILED.get(digest)
+    if tpl is None:
+        tpl = _COMPILED[digest] = CompiledTemplate.compile(raw.decode("utf-8"), digest)
+    return tpl
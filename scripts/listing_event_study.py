@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+listing_event_study.py
+──────────────────────
+국내 거래소 상장(공지) 이벤트 스터디 — 이벤트 전후 시간봉으로 수익률 · 거래대금 배수 · 거래소 점유율.
+
+multi_coin_hourly_fetch.py / pieverse_hourly_fetch.py / wif_vvv_fetch.py (코인마다 복사한 스크립트)를
+하나로 합쳤다. 새 스터디 = STUDIES 에 한 줄 (또는 --study 인자).
+
+  (이름, 마켓, 이벤트 시각 KST, 이벤트 전 시간, 이벤트 후 시간)
+
+- 수집: candles.get_candles — 디스크 캐시(out/cache/candles) + 거래소별 요청 한도,
+        (스터디 × 거래소) 작업을 스레드 풀로 동시에 (같은 거래소 요청은 리미터가 줄 세운다)
+- 패널: 이벤트 구간 시간 그리드 × 거래소별 OHLC · 거래대금, t_rel_h = 이벤트 기준 상대 시간
+- 지표 (거래소별, 누적합 배열로 구간 합계를 O(1) 조회):
+    pre_return        구간 시작 시가 → 이벤트 캔들 시가
+    ret_<h>h          이벤트 캔들 시가 → 이벤트 후 h 시간 종가 (1 · 6 · 24 · 72h)
+    post_return       이벤트 캔들 시가 → 구간 마지막 종가
+    peak_return / hours_to_peak / drawdown_from_peak   이벤트 후 최고가 기준
+    vol_x_pre24 / vol_x_<h>h   시간당 거래대금 ÷ 기준선(이벤트 24시간 전보다 앞선 구간 평균)
+    share_pre / share_post24   거래소 간 거래대금 점유율
+- 출력: <out-dir>/<이름>_hourly.csv (거래소 병합 패널), summary.csv, summary.json
+
+사용:
+    python scripts/listing_event_study.py                          # STUDIES 전부
+    python scripts/listing_event_study.py --only SPK,WIF
+    python scripts/listing_event_study.py --study "ABC,KRW-ABC,2026-06-01 10:00,48,72"
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from candles import EXCHANGES, get_candles
+
+# (이름, 마켓, 이벤트 시각 KST, 이벤트 전 시간, 이벤트 후 시간)
+STUDIES = [
+    ("PIEVERSE", "KRW-PIEVERSE", "2026-04-20 12:00", 156, 96),   # 4/14 선펌핑 ~ 상장 급등 · 4/24 붕괴
+    ("SPK",      "KRW-SPK",      "2026-04-23 11:20",  84, 85),   # 업비트 공지 11:20, 선펌핑은 4/22 새벽부터
+    ("IRYS",     "KRW-IRYS",     "2026-05-15 00:00",  96, 96),   # 업비트 상장 5/15, 빗썸 거래량 급증은 공지 3일 전부터
+    ("WIF",      "KRW-WIF",      "2026-05-06 14:00",  38, 34),   # 공지 5/6 14:00
+    ("VVV",      "KRW-VVV",      "2026-05-12 16:00",  40, 20),   # 상장 5/12 16:00
+]
+
+UNIT = 60                       # 시간봉
+RET_HORIZONS = (1, 6, 24, 72)   # 시간
+VOL_HORIZONS = (1, 6, 24)
+BASELINE_GAP_H = 24             # 기준선은 이벤트 24시간 전까지 (선펌핑 구간 제외)
+OUT_DIR = Path("event_study_output")
+
+
+def parse_study(spec: str) -> tuple:
+    name, market, event, pre, post = [x.strip() for x in spec.split(",")]
+    return name, market, event, int(pre), int(post)
+
+def study_window(study: tuple) -> tuple[datetime, datetime, datetime]:
+    """(구간 시작, 이벤트 캔들 시작, 구간 끝) — 전부 시간봉 경계로 내림"""
+    _, _, event, pre, post = study
+    ev = datetime.strptime(event, "%Y-%m-%d %H:%M").replace(minute=0)
+    return ev - timedelta(hours=pre), ev, ev + timedelta(hours=post)
+
+
+# ══════════════════════════════════════════════════════════════
+# 1. 패널 / 지표
+# ══════════════════════════════════════════════════════════════
+
+def build_panel(study: tuple, frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    start, ev, end = study_window(study)
+    grid = pd.date_range(start, end, freq=f"{UNIT}min", name="datetime_kst")
+    panel = pd.DataFrame(index=grid)
+    panel["t_rel_h"] = (grid - pd.Timestamp(ev)) / pd.Timedelta(hours=1)
+    for ex, df in frames.items():
+        d = df.set_index("datetime_kst").reindex(grid) if not df.empty else pd.DataFrame(index=grid)
+        for col in ("open", "high", "low", "close", "trade_value_krw", "trade_volume"):
+            panel[f"{col}_{ex}"] = d[col].astype(float) if col in d else np.nan
+    return panel.reset_index()
+
+def _at(a: np.ndarray, i: int) -> float:
+    return float(a[i]) if 0 <= i < len(a) and np.isfinite(a[i]) else float("nan")
+
+def exchange_metrics(panel: pd.DataFrame, ex: str) -> dict:
+    t = panel["t_rel_h"].to_numpy()
+    o, h = panel[f"open_{ex}"].to_numpy(), panel[f"high_{ex}"].to_numpy()
+    c = panel[f"close_{ex}"].to_numpy()
+    v = np.nan_to_num(panel[f"trade_value_krw_{ex}"].to_numpy())
+    V = np.concatenate([[0.0], np.cumsum(v)])          # 구간 거래대금 = V[b] - V[a]
+    N = np.concatenate([[0], np.cumsum(np.isfinite(c))])   # 구간 캔들 수 (상장 전 시간 제외)
+    n = len(t)
+    ev = int(np.searchsorted(t, 0.0))
+    step = UNIT / 60
+
+    def vmean(a: int, b: int) -> float:
+        a, b = max(a, 0), min(b, n)
+        k = N[b] - N[a] if b > a else 0
+        return (V[b] - V[a]) / k if k else float("nan")
+
+    listed = np.flatnonzero(np.isfinite(c))
+    if not len(listed):
+        return {"candles": 0}
+    p_event = _at(o, ev) if np.isfinite(_at(o, ev)) else _at(c, ev - 1)
+    p_first = _at(o, int(listed[0]))
+    post = slice(ev, n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        peak_i = ev + int(np.nanargmax(h[post])) if np.isfinite(h[post]).any() else -1
+        last_close = float(c[listed[-1]])
+        gap = int(BASELINE_GAP_H / step)
+        base = vmean(0, ev - gap) if ev - gap > 0 else vmean(0, ev)
+        out = {
+            "candles": int(len(listed)),
+            "first_candle": str(panel["datetime_kst"].iloc[listed[0]]),
+            "pre_listed": bool(listed[0] < ev),
+            "price_event": p_event,
+            "pre_return": p_event / p_first - 1 if p_first and listed[0] < ev else None,
+            **{f"ret_{hh}h": _at(c, ev + int(hh / step) - 1) / p_event - 1 for hh in RET_HORIZONS},
+            "post_return": last_close / p_event - 1,
+            "peak_return": _at(h, peak_i) / p_event - 1 if peak_i >= 0 else None,
+            "hours_to_peak": float(t[peak_i]) if peak_i >= 0 else None,
+            "drawdown_from_peak": last_close / _at(h, peak_i) - 1 if peak_i >= 0 else None,
+            "value_pre_krw": float(V[ev] - V[0]),
+            "value_post_krw": float(V[n] - V[ev]),
+            "baseline_value_per_h": base * (1 / step),
+            "vol_x_pre24": vmean(ev - gap, ev) / base if base else None,
+            **{f"vol_x_{hh}h": vmean(ev, ev + int(hh / step)) / base if base else None for hh in VOL_HORIZONS},
+        }
+    return {k: (None if isinstance(x, float) and not np.isfinite(x) else x) for k, x in out.items()}
+
+def study_metrics(study: tuple, panel: pd.DataFrame, exchanges) -> dict:
+    per_ex = {ex: exchange_metrics(panel, ex) for ex in exchanges}
+    t = panel["t_rel_h"].to_numpy()
+    ev = int(np.searchsorted(t, 0.0))
+    post24 = ev + int(24 * 60 / UNIT)
+    vals = {ex: np.nan_to_num(panel[f"trade_value_krw_{ex}"].to_numpy()) for ex in exchanges}
+    pre_tot = sum(v[:ev].sum() for v in vals.values())
+    post_tot = sum(v[ev:post24].sum() for v in vals.values())
+    for ex, v in vals.items():
+        per_ex[ex]["share_pre"] = float(v[:ev].sum() / pre_tot) if pre_tot else None
+        per_ex[ex]["share_post24"] = float(v[ev:post24].sum() / post_tot) if post_tot else None
+    name, market, event, pre, post = study
+    return {"name": name, "market": market, "event_kst": event, "pre_h": pre, "post_h": post,
+            "exchanges": per_ex}
+
+
+# ══════════════════════════════════════════════════════════════
+# 2. 실행
+# ══════════════════════════════════════════════════════════════
+
+def run(studies: list[tuple], exchanges=tuple(EXCHANGES), out_dir: Path = OUT_DIR,
+        use_cache: bool = True, workers: int = 8) -> list[dict]:
+    t0 = time.perf_counter()
+    jobs = [(s, ex) for s in studies for ex in exchanges]
+
+    def fetch(job):
+        (name, market, *_), ex = job
+        start, _, end = study_window(job[0])
+        try:
+            return get_candles(ex, market, start, end, UNIT, use_cache=use_cache, label=f"{name}-{ex}")
+        except Exception as e:
+            print(f"[WARN] {name}-{ex} 수집 실패: {e}", flush=True)
+            return pd.DataFrame()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        frames = dict(zip(((s[0], ex) for s, ex in jobs), pool.map(fetch, jobs)))
+    print(f"INFO: {len(jobs)}개 (스터디 × 거래소) 수집 {time.perf_counter() - t0:.1f}s", flush=True)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    results, rows = [], []
+    for s in studies:
+        panel = build_panel(s, {ex: frames[(s[0], ex)] for ex in exchanges})
+        panel.to_csv(out_dir / f"{s[0].lower()}_hourly.csv", index=False, encoding="utf-8-sig")
+        res = study_metrics(s, panel, exchanges)
+        results.append(res)
+        for ex, m in res["exchanges"].items():
+            rows.append({"study": s[0], "market": s[1], "event_kst": s[2], "exchange": ex, **m})
+        _print_study(res)
+
+    pd.DataFrame(rows).to_csv(out_dir / "summary.csv", index=False, encoding="utf-8-sig")
+    (out_dir / "summary.json").write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n[OK] {len(studies)}개 스터디 → {out_dir}/ ({time.perf_counter() - t0:.1f}s)", flush=True)
+    return results
+
+def _pct(x) -> str:
+    return "-" if x is None else f"{x * 100:+.1f}%"
+
+def _mult(x) -> str:
+    return "-" if x is None else f"{x:.1f}x"
+
+def _print_study(res: dict):
+    print(f"\n=== {res['name']} ({res['market']}) 이벤트 {res['event_kst']} KST "
+          f"[-{res['pre_h']}h, +{res['post_h']}h] ===", flush=True)
+    for ex, m in res["exchanges"].items():
+        if not m.get("candles"):
+            print(f"  {ex:<8} 데이터 없음", flush=True)
+            continue
+        print(f"  {ex:<8} 이전 {_pct(m['pre_return'])} | 1h {_pct(m['ret_1h'])} 24h {_pct(m['ret_24h'])} "
+              f"끝 {_pct(m['post_return'])} | 고점 {_pct(m['peak_return'])} (+{m['hours_to_peak'] or 0:.0f}h) "
+              f"| 거래대금 x 직전24h {_mult(m['vol_x_pre24'])} 이후24h {_mult(m['vol_x_24h'])} "
+              f"| 점유율 {_pct(m['share_pre'])[1:]} → {_pct(m['share_post24'])[1:]}", flush=True)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="국내 거래소 상장 이벤트 스터디")
+    ap.add_argument("--only", default="", help="STUDIES 중 이름 (쉼표 구분)")
+    ap.add_argument("--study", action="append", default=[],
+                    help='추가 스터디 "이름,마켓,YYYY-MM-DD HH:MM,이전시간,이후시간" (여러 번 가능)')
+    ap.add_argument("--exchanges", default=",".join(EXCHANGES))
+    ap.add_argument("--out-dir", default=str(OUT_DIR))
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--no-cache", action="store_true", help="디스크 캐시 무시하고 다시 수집")
+    args = ap.parse_args()
+
+    studies = [parse_study(s) for s in args.study]
+    only = {x.strip().upper() for x in args.only.split(",") if x.strip()}
+    if only or not studies:
+        studies = [s for s in STUDIES if not only or s[0] in only] + studies
+    if not studies:
+        print(f"[WARN] 선택된 스터디 없음 (--only {args.only})")
+        return 1
+    run(studies, tuple(x.strip() for x in args.exchanges.split(",") if x.strip()),
+        Path(args.out_dir), use_cache=not args.no_cache, workers=args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
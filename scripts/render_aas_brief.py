@@ -6,7 +6,7 @@ render_aas_brief.py
 AAS-Bot private repo에서 JSON + CSV + PNG를 읽어
 aas_brief_template.html 의 플레이스홀더를 채워 aas_brief.html 을 생성합니다.
 
-render_letter.py 와 동일한 방식 (순수 string replace, no JS)
+render_letter.py 와 동일한 방식 (letter_template.py 단일 패스 치환, no JS)
 
 Inputs (GitHub raw URL — private repo, AAS_BOT_TOKEN 환경변수 필요)
   reports/daily/{date}/newsletter_aas_top3_{date}.json
@@ -19,7 +19,6 @@ Output
 from __future__ import annotations
 
 import os
-import re
 import json
 import requests
 import pandas as pd
@@ -27,9 +26,12 @@ from io import StringIO
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
+from http_session import SESSION
+from letter_template import load_template
+
 ROOT     = Path(__file__).resolve().parent
 TEMPLATE = ROOT.parent / "aas_brief_template.html"
-OUT      = ROOT.parent / "clm_brief.html"
+OUT      = Path(os.getenv("BM20_DATA_ROOT") or ROOT.parent) / "clm_brief.html"
 
 REPO     = "Blockmedia-DataTeam/AAS-Bot"
 BRANCH   = "main"
@@ -161,7 +163,7 @@ def _find_latest_date() -> str | None:
     now_kst = datetime.now(kst)
 
     try:
-        r = requests.get(f"{BASE_API}/reports/daily", headers=_token_headers(), timeout=10)
+        r = SESSION.get(f"{BASE_API}/reports/daily", headers=_token_headers(), timeout=10)
         r.raise_for_status()
         folders = sorted([i["name"] for i in r.json() if i["type"] == "dir"], reverse=True)
         if not folders:
@@ -186,7 +188,7 @@ def _find_latest_date() -> str | None:
 
 def _fetch_raw(path: str) -> requests.Response | None:
     try:
-        r = requests.get(f"{BASE_RAW}/{path}", headers=_token_headers(), timeout=15)
+        r = SESSION.get(f"{BASE_RAW}/{path}", headers=_token_headers(), timeout=15)
         r.raise_for_status()
         print(f"INFO: fetched {path}")
         return r
@@ -356,7 +358,7 @@ def render() -> None:
                 "https://api.coingecko.com/api/v3/simple/price"
                 "?ids=bitcoin&vs_currencies=usd&include_24hr_change=true"
             )
-            cg_r = requests.get(cg_url, timeout=10)
+            cg_r = SESSION.get(cg_url, timeout=10)
             cg_r.raise_for_status()
             btc_return = float(cg_r.json()["bitcoin"]["usd_24h_change"])
             print(f"INFO: BTC from CoinGecko: {btc_return:.2f}%")
@@ -413,11 +415,7 @@ def render() -> None:
         "{{TOP10_ROWS}}":        top10_rows_html,
     }
 
-    html = TEMPLATE.read_text(encoding="utf-8")
-    for k in sorted(ph.keys(), key=len, reverse=True):
-        html = html.replace(k, str(ph[k]))
-
-    left = sorted(set(re.findall(r"\{\{[A-Z0-9_]+\}\}", html)))
+    html, left = load_template(TEMPLATE).render(ph)
     if left:
         print("WARN: unfilled placeholders:", left)
 
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+render_daemon.py
+────────────────
+뉴스레터/브리프 렌더 상주 서비스 (로컬 HTTP, 기본 127.0.0.1:8765).
+
+render_letter.py / render_letter_en.py / render_aas_brief.py / render_treemap_png.py
+(+ letter_context.py) 를 한 프로세스에 import 해 두고, 요청마다 각 스크립트의 render() 만 호출한다.
+
+- 시작할 때 한 번: pandas / matplotlib import, 템플릿 토큰화(letter_template 의 sha256 캐시),
+  트리맵 폰트 탐색, bm20_store 연결
+- 데몬 수명 동안 유지: 공용 HTTP 세션(http_session.py, 커넥션 풀) + GET 응답 TTL 캐시
+  (--ttl, 기본 300초)
+- context 잡: 뉴스레터 공용 데이터(out/letter_context.json)를 한 번 수집
+  → 뒤이은 letter / letter_en 은 그 파일을 재사용 (외부 호출 없음)
+- 입력 파일(JSON/CSV)은 렌더할 때마다 다시 읽는다 (워크플로우 중간 단계가 파일을 갱신하므로)
+- 렌더는 전용 워커 스레드 하나에서 순서대로 (스크립트 모듈 전역 / SQLite 연결을 공유)
+- 스크립트가 찍는 로그는 데몬 stdout 과 응답의 "log" 양쪽으로 → call 이 그대로 다시 출력
+
+API:
+  GET  /health            잡별 렌더 횟수·마지막 소요 시간, HTTP 캐시 통계
+  POST /render/<job>      job = context | letter | letter_en | aas_brief | treemap
+                          → {"job", "ok", "out", "ms", "log", "error"?} (실패 시 HTTP 500)
+  POST /cache/clear       HTTP 응답 캐시 비우기
+  POST /shutdown
+
+대체 데이터 디렉터리 (--root DIR → BM20_DATA_ROOT):
+  입력·출력 경로가 모두 DIR 기준이 되고 템플릿만 저장소 것을 쓴다.
+  --offline 이면 네트워크 호출은 즉시 실패 → 각 스크립트의 "—" 폴백으로 채운다.
+
+사용:
+  python scripts/render_daemon.py serve [--port 8765] [--ttl 300] [--root DIR] [--offline]
+  python scripts/render_daemon.py call treemap context letter letter_en aas_brief [--wait 30]
+  python scripts/render_daemon.py stop
+  python scripts/render_daemon.py standin /tmp/bm20-standin   # 현재 입력 파일을 복사해 둔다
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import io
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+HOST = "127.0.0.1"
+PORT = 8765
+
+# job → (모듈, 출력 경로 속성)
+JOBS = {
+    "context":   ("letter_context",     "OUT"),
+    "letter":    ("render_letter",      "OUT"),
+    "letter_en": ("render_letter_en",   "OUT_EN"),
+    "aas_brief": ("render_aas_brief",   "OUT"),
+    "treemap":   ("render_treemap_png", "OUT"),
+}
+
+# standin 이 복사하는 입력 (render-letter.yml 의 Sanity check 목록 + 번역 메모리)
+STANDIN_FILES = [
+    "bm20_latest.json",
+    "bm20_daily_data_latest.csv",
+    "nasdaq_series.json",
+    "kospi_series.json",
+    "out/history/krw_24h_latest.json",
+    "out/history/krw_24h_snapshots.json",
+    "out/global/k_xrp_share_24h_latest.json",
+    "data/bm20_history.json",
+    "data/etf_summary.json",
+    "data/translation_memory.json",
+]
+
+
+# ════════════════════════════════════════════════════════════
+# 서버
+# ════════════════════════════════════════════════════════════
+class _Tee(io.TextIOBase):
+    def __init__(self, *streams):
+        self.streams = streams
+
+    def write(self, s):
+        for st in self.streams:
+            st.write(s)
+        return len(s)
+
+    def flush(self):
+        for st in self.streams:
+            st.flush()
+
+
+class RenderService:
+    def __init__(self):
+        self.worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+        self.modules: dict[str, object] = {}
+        self.errors: dict[str, str] = {}
+        self.stats = {job: {"count": 0, "fail": 0, "last_ms": None} for job in JOBS}
+        self.started = time.time()
+
+    def warm(self):
+        """워커 스레드에서 모듈 import + 템플릿/폰트/스토어 준비"""
+        self.worker.submit(self._warm).result()
+
+    def _warm(self):
+        t0 = time.perf_counter()
+        from letter_template import load_template
+        for job, (name, _) in JOBS.items():
+            try:
+                self.modules[job] = mod = importlib.import_module(name)
+            except Exception as e:
+                self.errors[job] = f"{type(e).__name__}: {e}"
+                print(f"WARN: {job} 모듈 import 실패 → 이 잡은 거부: {self.errors[job]}")
+                continue
+            tpl = getattr(mod, "TEMPLATE", None) or getattr(mod, "TEMPLATE_EN", None)
+            if tpl is not None and Path(tpl).exists():
+                load_template(tpl)
+        tm = self.modules.get("treemap")
+        if tm is not None:
+            tm._font_family()
+            importlib.import_module("matplotlib.backends.backend_agg")
+        try:
+            import bm20_store
+            bm20_store.connect()
+        except Exception as e:
+            print(f"WARN: bm20_store 연결 실패: {e}")
+        print(f"INFO: render daemon warm ({', '.join(self.modules)}) in {time.perf_counter() - t0:.2f}s")
+
+    def render(self, job: str) -> dict:
+        return self.worker.submit(self._render, job).result()
+
+    def _render(self, job: str) -> dict:
+        buf = io.StringIO()
+        res = {"job": job, "ok": False, "out": None}
+        t0 = time.perf_counter()
+        try:
+            if job in self.errors:
+                raise RuntimeError(self.errors[job])
+            mod = self.modules[job]
+            with redirect_stdout(_Tee(sys.stdout, buf)):
+                if job == "treemap":
+                    mod.render(mod.load(mod.CSV), mod.OUT)
+                    print("Treemap PNG written:", mod.OUT)
+                elif job == "context":
+                    mod.write_letter_context(mod.collect_letter_context(), mod.OUT)
+                else:
+                    mod.render()
+            res.update(ok=True, out=str(getattr(mod, JOBS[job][1])))
+        except Exception as e:
+            res["error"] = f"{type(e).__name__}: {e}"
+            print(f"ERROR: {job} 렌더 실패: {res['error']}")
+        ms = (time.perf_counter() - t0) * 1000
+        st = self.stats[job]
+        st["count"] += 1
+        st["fail"] += 0 if res["ok"] else 1
+        st["last_ms"] = round(ms, 1)
+        res.update(ms=round(ms, 1), log=buf.getvalue().splitlines())
+        return res
+
+    def health(self) -> dict:
+        from http_session import SESSION
+        return {"ok": True, "pid": os.getpid(), "uptime_s": round(time.time() - self.started, 1),
+                "data_root": os.getenv("BM20_DATA_ROOT") or str(REPO),
+                "jobs": self.stats, "unavailable": self.errors, "http": SESSION.stats()}
+
+
+def make_handler(service: RenderService, server_ref: list):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code: int, body: dict):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, service.health())
+            else:
+                self._send(404, {"ok": False, "error": f"unknown path {self.path}"})
+
+        def do_POST(self):
+            if self.path.startswith("/render/"):
+                job = self.path[len("/render/"):]
+                if job not in JOBS:
+                    self._send(404, {"ok": False, "error": f"unknown job {job!r} (jobs: {', '.join(JOBS)})"})
+                    return
+                res = service.render(job)
+                print(f"[daemon] {job} {'ok' if res['ok'] else 'FAIL'} {res['ms']:.0f}ms")
+                self._send(200 if res["ok"] else 500, res)
+            elif self.path == "/cache/clear":
+                from http_session import SESSION
+                self._send(200, {"ok": True, "cleared": SESSION.clear_cache()})
+            elif self.path == "/shutdown":
+                self._send(200, {"ok": True})
+                threading.Thread(target=server_ref[0].shutdown, daemon=True).start()
+            else:
+                self._send(404, {"ok": False, "error": f"unknown path {self.path}"})
+
+        def log_message(self, fmt, *args):  # 요청마다 stderr 로그는 끈다 (렌더 결과는 위에서 출력)
+            pass
+
+    return Handler
+
+
+def serve(args):
+    if args.root:
+        root = Path(args.root).resolve()
+        if not root.is_dir():
+            raise SystemExit(f"ERROR: --root 디렉터리가 없음: {root}")
+        os.environ["BM20_DATA_ROOT"] = str(root)   # 스크립트 모듈 import 전에 설정해야 한다
+    from http_session import set_cache_ttl, set_offline
+    set_cache_ttl(args.ttl)
+    set_offline(args.offline)
+
+    service = RenderService()
+    service.warm()
+    server_ref: list = []
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service, server_ref))
+    server_ref.append(server)
+    print(f"[OK] render daemon on http://{args.host}:{args.port} "
+          f"(root={os.getenv('BM20_DATA_ROOT') or REPO}, ttl={args.ttl:g}s, offline={args.offline})",
+          flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.worker.shutdown(wait=True)
+    print("INFO: render daemon stopped")
+
+
+# ════════════════════════════════════════════════════════════
+# 클라이언트
+# ════════════════════════════════════════════════════════════
+def _request(url: str, method: str = "GET", timeout: float = 600) -> tuple[int, dict]:
+    req = urllib.request.Request(url, method=method, data=b"" if method == "POST" else None)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as r:
+            return r.status, json.loads(r.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read().decode("utf-8") or "{}")
+
+def _wait_ready(base: str, wait: float) -> dict:
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            return _request(f"{base}/health", timeout=5)[1]
+        except (urllib.error.URLError, ConnectionError, OSError) as e:
+            if time.monotonic() >= deadline:
+                raise SystemExit(f"ERROR: render daemon 응답 없음 ({base}): {e}")
+            time.sleep(0.2)
+
+def call(args) -> int:
+    base = f"http://{args.host}:{args.port}"
+    _wait_ready(base, args.wait)
+    failed = 0
+    for job in args.jobs:
+        code, res = _request(f"{base}/render/{job}", method="POST")
+        for line in res.get("log", []):
+            print(line)
+        if res.get("ok"):
+            print(f"[OK] {job} → {res['out']} ({res['ms']:.0f} ms)")
+        else:
+            failed += 1
+            print(f"ERROR: {job} 실패 (HTTP {code}): {res.get('error')}")
+    return 1 if failed else 0
+
+def stop(args) -> int:
+    try:
+        _request(f"http://{args.host}:{args.port}/shutdown", method="POST", timeout=5)
+        print("[OK] render daemon stop requested")
+    except (urllib.error.URLError, ConnectionError, OSError) as e:
+        print(f"WARN: render daemon 이 떠 있지 않음: {e}")
+    return 0
+
+def standin(args) -> int:
+    dst = Path(args.dir).resolve()
+    copied = 0
+    for rel in STANDIN_FILES:
+        src = REPO / rel
+        if not src.exists():
+            print(f"WARN: 없음 → 건너뜀: {rel}")
+            continue
+        (dst / rel).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(src, dst / rel)
+        copied += 1
+    print(f"[OK] stand-in data dir {dst} ({copied}/{len(STANDIN_FILES)} files)")
+    print(f"     python scripts/render_daemon.py serve --root {dst} --offline")
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="warm render daemon for letters / briefs / treemap")
+    ap.add_argument("--host", default=HOST)
+    ap.add_argument("--port", type=int, default=int(os.getenv("RENDER_DAEMON_PORT", PORT)))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_serve = sub.add_parser("serve")
+    p_serve.add_argument("--ttl", type=float, default=300, help="GET 응답 캐시 TTL 초 (0 이면 캐시 안 함)")
+    p_serve.add_argument("--root", default=None, help="대체 데이터 디렉터리 (BM20_DATA_ROOT)")
+    p_serve.add_argument("--offline", action="store_true", help="네트워크 호출 없이 폴백 값으로 렌더")
+    p_call = sub.add_parser("call")
+    p_call.add_argument("jobs", nargs="+", choices=list(JOBS))
+    p_call.add_argument("--wait", type=float, default=30, help="데몬이 뜰 때까지 기다릴 최대 초")
+    sub.add_parser("stop")
+    p_std = sub.add_parser("standin")
+    p_std.add_argument("dir")
+    args = ap.parse_args()
+
+    if args.cmd == "serve":
+        serve(args)
+        return 0
+    return {"call": call, "stop": stop, "standin": standin}[args.cmd](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,20 +2,20 @@
 # -*- coding: utf-8 -*-
 
 """
-Render letter.html by replacing placeholders in letter_newsletter_template.html.
+Render letter.html by filling placeholders in letter_newsletter_template.html
+(single-pass substitution via letter_template.py).
 
 Design goals
 - Never leave {{PLACEHOLDER}} strings in output: fill with real values or "—"
 - Be resilient to small schema changes (missing keys, renamed columns)
 - Keep templates mail-friendly: pure string replacement, no JS
 
-Inputs (expected in repo)
+Inputs
 - letter_newsletter_template.html
-- bm20_latest.json
-- bm20_daily_data_latest.csv
-- out/history/krw_24h_latest.json
-- data/bm20_history.json        (optional; sentiment)
-- data/etf_summary.json         (optional; ETF)
+- out/letter_context.json      (letter_context.py — 국문/영문판 공용 수집 결과,
+                                 없거나 오래됐으면 여기서 수집해 저장)
+  ← bm20_latest.json, data/bm20_history.json, data/etf_summary.json,
+    BTC / Upbit / 프리미엄 / WP 뉴스 / AAS API
 
 Output
 - letter.html
@@ -23,32 +23,26 @@ Output
 
 from __future__ import annotations
 
-import json
 import os
-import re
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Tuple
 
-import pandas as pd
-import requests
-from datetime import datetime, timezone, timedelta
+from letter_context import (
+    WP_CAT_ID_DIGITAL_ASSET,
+    WP_CAT_ID_FINANCE,
+    WP_CAT_ID_MARKET,
+    load_letter_context,
+    pick_news,
+)
+from letter_template import load_template
 
-ROOT = Path(__file__).resolve().parent.parent
+REPO = Path(__file__).resolve().parent.parent
+ROOT = Path(os.getenv("BM20_DATA_ROOT") or REPO)   # 입력/출력 데이터 루트 (대체 디렉터리로 바꿀 수 있음)
 
-TEMPLATE      = ROOT / "letter_newsletter_template.html"
-BM20_JSON     = ROOT / "bm20_latest.json"
-DAILY_CSV     = ROOT / "bm20_daily_data_latest.csv"
-KRW_JSON      = ROOT / "out/history/krw_24h_latest.json"
-BM20_HISTORY_JSON = ROOT / "data/bm20_history.json"   # optional
-ETF_JSON      = ROOT / "data/etf_summary.json"         # optional
+TEMPLATE      = REPO / "letter_newsletter_template.html"
 OUT           = ROOT / "letter.html"
 
-# 워드프레스 설정
-WP_BASE_URL              = "https://blockmedia.co.kr/wp-json/wp/v2"
-WP_CAT_ID_MARKET         = 10136   # 마켓
-WP_CAT_ID_DIGITAL_ASSET  = 24547   # 디지털 자산
-WP_CAT_ID_FINANCE        = 24548   # 금융·증권
-
 GREEN = "#16a34a"
 RED   = "#dc2626"
 INK   = "#0f172a"
@@ -84,297 +78,119 @@ def colored_change_html(pct_value: float, digits: int = 2, wrap_parens: bool = F
 
 
 # ─────────────────────────────────────────────────────────
-# JSON / CSV 로더
-# ─────────────────────────────────────────────────────────
-
-def load_json(p: Path) -> Any:
-    if not p.exists():
-        raise FileNotFoundError(f"Missing {p}")
-    return json.loads(p.read_text(encoding="utf-8"))
-
-def load_json_optional(p: Path) -> Any | None:
-    if not p.exists():
-        return None
-    return json.loads(p.read_text(encoding="utf-8"))
-
-def load_daily_df() -> pd.DataFrame:
-    if not DAILY_CSV.exists():
-        raise FileNotFoundError(f"Missing {DAILY_CSV}")
-    df = pd.read_csv(DAILY_CSV)
-    if "symbol" not in df.columns:
-        for c in ("ticker", "asset"):
-            if c in df.columns:
-                df = df.rename(columns={c: "symbol"})
-                break
-    if "price_change_pct" not in df.columns:
-        for c in ("change_pct", "pct_change", "return_1d_pct", "return_1d"):
-            if c in df.columns:
-                df = df.rename(columns={c: "price_change_pct"})
-                break
-    df["symbol"] = df["symbol"].astype(str).str.upper()
-    df["price_change_pct"] = pd.to_numeric(df["price_change_pct"], errors="coerce")
-    df = df.dropna(subset=["price_change_pct"])
-    return df
-
-
-# ─────────────────────────────────────────────────────────
-# BTC 가격 + 24h 변동률: CMC → Yahoo API fallback
+# BTC 가격 + 24h 변동률
 # ─────────────────────────────────────────────────────────
 
-def fetch_btc_price_and_change() -> Tuple[str, str]:
+def btc_price_and_change(btc: dict | None) -> Tuple[str, str]:
     """(btc_usd_txt, btc_1d_html) 반환"""
-    cmc_key = os.getenv("CMC_API_KEY", "")
-    if cmc_key:
-        try:
-            r = requests.get(
-                "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest",
-                headers={"X-CMC_PRO_API_KEY": cmc_key},
-                params={"symbol": "BTC", "convert": "USD"},
-                timeout=10,
-            )
-            r.raise_for_status()
-            d = r.json()["data"]["BTC"]["quote"]["USD"]
-            price = float(d["price"])
-            chg   = float(d["percent_change_24h"])
-            print(f"INFO: BTC from CMC — ${price:,.0f} / {chg:+.2f}%")
-            return f"{price:,.0f}", colored_change_html(chg, digits=2)
-        except Exception as e:
-            print(f"WARN: CMC BTC fetch failed: {e} → Yahoo API fallback")
-
-    # Yahoo Finance API fallback
-    try:
-        r2 = requests.get(
-            "https://query1.finance.yahoo.com/v8/finance/chart/BTC-USD",
-            headers={"User-Agent": "Mozilla/5.0"},
-            params={"interval": "1d", "range": "5d"},
-            timeout=10,
-        )
-        r2.raise_for_status()
-        closes = r2.json()["chart"]["result"][0]["indicators"]["quote"][0]["close"]
-        closes = [x for x in closes if x is not None]
-        price  = float(closes[-1])
-        prev   = float(closes[-2])
-        chg    = (price / prev - 1) * 100 if prev else 0.0
-        print(f"INFO: BTC from Yahoo API fallback — ${price:,.0f} / {chg:+.2f}%")
-        return f"{price:,.0f}", colored_change_html(chg, digits=2)
-    except Exception as e2:
-        print(f"WARN: Yahoo API BTC fallback failed: {e2}")
+    if not btc:
         return "—", "—"
+    return f"{btc['price']:,.0f}", colored_change_html(btc["chg_24h"], digits=2)
 
 
 # ─────────────────────────────────────────────────────────
 # 업비트 Top/Bottom 3
 # ─────────────────────────────────────────────────────────
 
-def fetch_upbit_top_bottom(n: int = 3) -> dict[str, str]:
-    FB = {**{f"UPBIT_TOP{i}_SYMBOL": "—" for i in range(1, n+1)},
-          **{f"UPBIT_TOP{i}_CHG":    "—" for i in range(1, n+1)},
-          **{f"UPBIT_BOT{i}_SYMBOL": "—" for i in range(1, n+1)},
-          **{f"UPBIT_BOT{i}_CHG":    "—" for i in range(1, n+1)}}
-    try:
-        mkts = [m["market"] for m in
-                requests.get("https://api.upbit.com/v1/market/all",
-                             params={"isDetails": "false"}, timeout=10).json()
-                if m["market"].startswith("KRW-")]
-        tickers = []
-        for i in range(0, len(mkts), 100):
-            tickers += requests.get("https://api.upbit.com/v1/ticker",
-                                    params={"markets": ",".join(mkts[i:i+100])},
-                                    timeout=10).json()
-        tickers.sort(key=lambda x: x.get("signed_change_rate", 0), reverse=True)
-        result = {}
-        for i, t in enumerate(tickers[:n], 1):
-            sym = t["market"].replace("KRW-", "")
-            pct = float(t.get("signed_change_rate", 0)) * 100
-            result[f"UPBIT_TOP{i}_SYMBOL"] = sym
-            result[f"UPBIT_TOP{i}_CHG"]    = f"+{pct:.1f}%"
-        for i, t in enumerate(reversed(tickers[-n:]), 1):
-            sym = t["market"].replace("KRW-", "")
-            pct = float(t.get("signed_change_rate", 0)) * 100
-            result[f"UPBIT_BOT{i}_SYMBOL"] = sym
-            result[f"UPBIT_BOT{i}_CHG"]    = f"{pct:.1f}%"
-        return result
-    except Exception as e:
-        print(f"WARN: Upbit top/bottom failed: {e}")
-        return FB
+def upbit_top_bottom(upbit: dict | None, n: int = 3) -> dict[str, str]:
+    ph = {**{f"{{{{UPBIT_TOP{i}_SYMBOL}}}}": "—" for i in range(1, n+1)},
+          **{f"{{{{UPBIT_TOP{i}_CHG}}}}":    "—" for i in range(1, n+1)},
+          **{f"{{{{UPBIT_BOT{i}_SYMBOL}}}}": "—" for i in range(1, n+1)},
+          **{f"{{{{UPBIT_BOT{i}_CHG}}}}":    "—" for i in range(1, n+1)}}
+    if not upbit:
+        return ph
+    for i, (sym, pct) in enumerate(upbit["top"][:n], 1):
+        ph[f"{{{{UPBIT_TOP{i}_SYMBOL}}}}"] = sym
+        ph[f"{{{{UPBIT_TOP{i}_CHG}}}}"]    = f"+{pct:.1f}%"
+    for i, (sym, pct) in enumerate(upbit["bottom"][:n], 1):
+        ph[f"{{{{UPBIT_BOT{i}_SYMBOL}}}}"] = sym
+        ph[f"{{{{UPBIT_BOT{i}_CHG}}}}"]    = f"{pct:.1f}%"
+    return ph
 
 
 # ─────────────────────────────────────────────────────────
 # 김치·코인베이스 프리미엄
 # ─────────────────────────────────────────────────────────
 
-def fetch_premium_data(usdkrw: float | None) -> dict[str, str]:
-    FB = {
-        "KIMCHI_PREM_PCT":  "—",
-        "CB_PREMIUM_PCT":   "—",
-        "PREMIUM_COMMENT":  "프리미엄 데이터를 가져올 수 없습니다.",
-        "PREMIUM_ASOF":     "—",
-    }
-    try:
-        upbit_btc_krw = float(
-            requests.get("https://api.upbit.com/v1/ticker",
-                         params={"markets": "KRW-BTC"}, timeout=10).json()[0]["trade_price"])
-        # 글로벌 BTC 기준가: 바이낸스 (김치·코인베이스 프리미엄 공통 기준)
-        binance_usd = None
-        for _base in ["https://api.binance.com", "https://data-api.binance.vision"]:
-            try:
-                _br = requests.get(
-                    f"{_base}/api/v3/ticker/price",
-                    params={"symbol": "BTCUSDT"},
-                    timeout=10,
-                )
-                _br.raise_for_status()
-                binance_usd = float(_br.json()["price"])
-                print(f"INFO: Premium BTC global = ${binance_usd:,.0f} (Binance)")
-                break
-            except Exception as _be:
-                print(f"WARN: Binance {_base} failed: {_be}")
-        if binance_usd is None:
-            raise RuntimeError("바이낸스 BTC 가격 조회 실패")
-        fx = usdkrw if (usdkrw and usdkrw > 100) else 1500.0
-        cb_usd = float(
-            requests.get("https://api.coinbase.com/v2/prices/BTC-USD/spot",
-                         timeout=10).json()["data"]["amount"])
-        upbit_usd  = upbit_btc_krw / fx
-        kimchi_pct = (upbit_usd - binance_usd) / binance_usd * 100   # 한국 vs 바이낸스
-        cb_pct     = (cb_usd   - binance_usd) / binance_usd * 100    # 코인베이스 vs 바이낸스
-
-        def _c(v: float) -> str:
-            color = GREEN if v >= 0 else RED
-            sign  = "+" if v >= 0 else "-"
-            return f'<span style="color:{color};font-weight:900;">{sign}{abs(v):.2f}%</span>'
-
-        if kimchi_pct > 1 and cb_pct > 0:
-            comment = "김치·코인베이스 프리미엄 동시 양전 → 글로벌 대비 국내 수요 강세 신호."
-        elif kimchi_pct > 1 and cb_pct <= 0:
-            comment = "김치 프리미엄 양전, 코인베이스 디스카운트 → 국내 단독 매수세 주의."
-        elif kimchi_pct < -0.5:
-            comment = "김치 역프리미엄 → 국내 매도 압력 또는 원화 약세 영향 가능성."
-        else:
-            comment = f"김치 {kimchi_pct:+.2f}% / 코인베이스 {cb_pct:+.2f}% — 중립 구간."
+def premium_placeholders(prem: dict | None) -> dict[str, str]:
+    if not prem:
+        return {
+            "{{KIMCHI_PREM_PCT}}":  "—",
+            "{{CB_PREMIUM_PCT}}":   "—",
+            "{{PREMIUM_COMMENT}}":  "프리미엄 데이터를 가져올 수 없습니다.",
+            "{{PREMIUM_ASOF}}":     "—",
+        }
+    kimchi_pct = prem["kimchi_pct"]   # 한국 vs 바이낸스
+    cb_pct     = prem["cb_pct"]       # 코인베이스 vs 바이낸스
+
+    def _c(v: float) -> str:
+        color = GREEN if v >= 0 else RED
+        sign  = "+" if v >= 0 else "-"
+        return f'<span style="color:{color};font-weight:900;">{sign}{abs(v):.2f}%</span>'
+
+    if kimchi_pct > 1 and cb_pct > 0:
+        comment = "김치·코인베이스 프리미엄 동시 양전 → 글로벌 대비 국내 수요 강세 신호."
+    elif kimchi_pct > 1 and cb_pct <= 0:
+        comment = "김치 프리미엄 양전, 코인베이스 디스카운트 → 국내 단독 매수세 주의."
+    elif kimchi_pct < -0.5:
+        comment = "김치 역프리미엄 → 국내 매도 압력 또는 원화 약세 영향 가능성."
+    else:
+        comment = f"김치 {kimchi_pct:+.2f}% / 코인베이스 {cb_pct:+.2f}% — 중립 구간."
 
-        kst = datetime.now(timezone(timedelta(hours=9)))
-        asof = (f"{kst.month}월 {kst.day}일 "
-                f"{'오전' if kst.hour < 12 else '오후'} "
-                f"{kst.hour if kst.hour <= 12 else kst.hour - 12}시 {kst.minute:02d}분 기준")
+    kst = datetime.fromisoformat(prem["asof"])
+    asof = (f"{kst.month}월 {kst.day}일 "
+            f"{'오전' if kst.hour < 12 else '오후'} "
+            f"{kst.hour if kst.hour <= 12 else kst.hour - 12}시 {kst.minute:02d}분 기준")
 
-        return {"KIMCHI_PREM_PCT": _c(kimchi_pct), "CB_PREMIUM_PCT": _c(cb_pct),
-                "PREMIUM_COMMENT": comment, "PREMIUM_ASOF": asof}
-    except Exception as e:
-        print(f"WARN: Premium fetch failed: {e}")
-        return FB
+    return {"{{KIMCHI_PREM_PCT}}": _c(kimchi_pct), "{{CB_PREMIUM_PCT}}": _c(cb_pct),
+            "{{PREMIUM_COMMENT}}": comment, "{{PREMIUM_ASOF}}": asof}
 
 
 # ─────────────────────────────────────────────────────────
-# 워드프레스 REST API
+# 워드프레스 뉴스 (헤드라인: 마켓 / 리스트: 디지털자산 → 금융·증권)
 # ─────────────────────────────────────────────────────────
 
-def _strip_html(text: str) -> str:
-    return re.sub(r"<[^>]+>", "", text or "").strip()
-
+CAT_LABELS = {
+    WP_CAT_ID_DIGITAL_ASSET: "디지털자산",
+    WP_CAT_ID_FINANCE:       "금융·증권",
+}
 
-def fetch_wp_newsletter_lead() -> tuple[dict[str, str], int | None]:
-    """마켓 카테고리 최신 1건을 헤드라인으로 가져온다.
-    Returns (placeholders_dict, lead_post_id). lead_post_id는 뉴스 리스트 중복 제거에 사용."""
-    FB = {"NEWS_HEADLINE": "—", "NEWS_ONE_LINER_NOTE": "—"}
+def _clip(text: str, n: int = 150) -> str:
+    return text[:n].rstrip() + "…" if len(text) > n else text
 
-    def _parse(post: dict) -> dict[str, str]:
-        excerpt = _strip_html(post["excerpt"]["rendered"])
-        if len(excerpt) > 150:
-            excerpt = excerpt[:150].rstrip() + "…"
-        return {
-            "NEWS_HEADLINE":       _strip_html(post["title"]["rendered"]),
-            "NEWS_ONE_LINER_NOTE": excerpt,
-        }
-
-    try:
-        res = requests.get(
-            f"{WP_BASE_URL}/posts",
-            params={"categories": WP_CAT_ID_MARKET, "per_page": 1,
-                    "orderby": "date", "order": "desc", "status": "publish",
-                    "_fields": "id,title,excerpt"},
-            timeout=10,
-        )
-        res.raise_for_status()
-        posts = res.json()
-        if posts:
-            print(f"INFO: 헤드라인 — 마켓 카테고리 포스트 사용 (id={posts[0]['id']})")
-            return _parse(posts[0]), posts[0]["id"]
-    except Exception as e:
-        print(f"WARN: 마켓 카테고리 헤드라인 fetch 실패: {e}")
-
-    return FB, None
-
-
-def fetch_wp_newsletter_news(exclude_id: int | None = None) -> list[dict[str, str]]:
-    """디지털자산·금융·증권 카테고리에서 최신순 총 3건 반환.
-    exclude_id: 헤드라인으로 이미 사용된 포스트 ID → 뉴스 리스트에서 제외."""
-    empty = {"title": "—", "excerpt": "", "link": "#", "category": ""}
-    CAT_LABELS = {
-        WP_CAT_ID_DIGITAL_ASSET: "디지털자산",
-        WP_CAT_ID_FINANCE:       "금융·증권",
+def news_placeholders(ctx: dict) -> dict[str, str]:
+    lead, picked = pick_news(ctx, [WP_CAT_ID_MARKET],
+                             [WP_CAT_ID_DIGITAL_ASSET, WP_CAT_ID_FINANCE])
+    ph = {
+        "{{NEWS_HEADLINE}}":       lead["title"] if lead else "—",
+        "{{NEWS_ONE_LINER_NOTE}}": _clip(lead["excerpt"]) if lead else "—",
     }
-
-    def _get_summary(post: dict) -> str:
-        meta = post.get("meta", {}) or {}
-        summary = meta.get("bm_post_summary", "")
-        if summary and summary.strip():
-            s = summary.strip()
-            return s[:150].rstrip() + "…" if len(s) > 150 else s
-        excerpt = _strip_html(post["excerpt"]["rendered"])
-        return excerpt[:150].rstrip() + "…" if len(excerpt) > 150 else excerpt
-
-    def _fetch_from_cat(cat_id: int, per_page: int) -> list[dict[str, str]]:
-        params: dict = {
-            "categories": cat_id, "per_page": per_page,
-            "orderby": "date", "order": "desc", "status": "publish",
-            "_fields": "id,title,excerpt,link,meta",
-        }
-        if exclude_id:
-            params["exclude"] = exclude_id
-        try:
-            res = requests.get(f"{WP_BASE_URL}/posts", params=params, timeout=10)
-            res.raise_for_status()
-            posts = res.json()
-        except Exception as e:
-            print(f"WARN: 카테고리 {cat_id} 뉴스 fetch 실패: {e}")
-            return []
-        result = []
-        for post in posts:
-            result.append({
-                "title":    _strip_html(post["title"]["rendered"]),
-                "excerpt":  _get_summary(post),
-                "link":     post.get("link", "#"),
-                "category": CAT_LABELS[cat_id],
-            })
-        return result
-
-    # 디지털자산 우선 수집 → 부족하면 금융·증권으로 보완
-    collected: list[dict[str, str]] = _fetch_from_cat(WP_CAT_ID_DIGITAL_ASSET, 3)
-    if len(collected) < 3:
-        collected += _fetch_from_cat(WP_CAT_ID_FINANCE, 3 - len(collected))
-    while len(collected) < 3:
-        collected.append(empty)
-    return collected[:3]
+    for i in range(1, 4):
+        if i <= len(picked):
+            cat, post = picked[i - 1]
+            summary = post["summary"].strip()
+            item = {"title": post["title"], "excerpt": _clip(summary or post["excerpt"]),
+                    "link": post["link"], "category": CAT_LABELS[cat]}
+        else:
+            item = {"title": "—", "excerpt": "", "link": "#", "category": ""}
+        ph[f"{{{{TOP_NEWS_{i}}}}}"]     = item["title"]
+        ph[f"{{{{NEWS{i}_EXCERPT}}}}"]  = item["excerpt"]
+        ph[f"{{{{NEWS{i}_LINK}}}}"]     = item["link"]
+        ph[f"{{{{NEWS{i}_CATEGORY}}}}"] = item["category"]
+    return ph
 
 
 # ─────────────────────────────────────────────────────────
 # ETF 요약 (INFLOW + AUM만 — BTC/ETH/SOL)
 # ─────────────────────────────────────────────────────────
 
-def load_etf_summary() -> dict[str, str]:
+def etf_summary(raw: dict | None) -> dict[str, str]:
     FB = {
         "{{ETF_BTC_INFLOW}}": "—", "{{ETF_BTC_AUM}}": "—",
         "{{ETF_ETH_INFLOW}}": "—", "{{ETF_ETH_AUM}}": "—",
         "{{ETF_SOL_INFLOW}}": "—", "{{ETF_SOL_AUM}}": "—",
     }
-    if not ETF_JSON.exists():
-        print(f"WARN: ETF json not found: {ETF_JSON}")
-        return FB
-    try:
-        raw = json.loads(ETF_JSON.read_text(encoding="utf-8"))
-    except Exception as e:
-        print(f"WARN: ETF json parse error: {e}")
+    if not raw:
         return FB
 
     def _fmt_aum(val) -> str:
@@ -454,14 +270,7 @@ def _aas_note_tag(text: str) -> str:
     return f'<span style="{style}">{emoji}{t}</span>'
 
 
-def fetch_aas_data() -> dict[str, str]:
-    """GitHub AAS-Bot에서 Top3 데이터 가져오기. KST 오늘 → 어제 순 시도."""
-    kst_now = datetime.now(timezone(timedelta(hours=9)))
-    date_candidates = [
-        kst_now.strftime("%Y-%m-%d"),
-        (kst_now - timedelta(days=1)).strftime("%Y-%m-%d"),
-    ]
-
+def aas_placeholders(aas: dict | None) -> dict[str, str]:
     # 기본값
     ph: dict[str, str] = {}
     for i in range(1, 4):
@@ -473,28 +282,10 @@ def fetch_aas_data() -> dict[str, str]:
             f"{{{{AAS_NOTE_TAG_{i}}}}}":      _aas_note_tag("—"),
             f"{{{{AAS_BAR_{i}}}}}":           _aas_bar_html(33.3, 33.3, 33.4),
         })
-
-    aas_token = os.environ.get("AAS_BOT_TOKEN", "")
-    headers = {"Authorization": f"token {aas_token}"} if aas_token else {}
-
-    data = None
-    for date_str in date_candidates:
-        url = (f"https://raw.githubusercontent.com/Blockmedia-DataTeam/AAS-Bot"
-               f"/main/reports/daily/{date_str}/newsletter_aas_top3_{date_str}.json")
-        try:
-            r = requests.get(url, timeout=10, headers=headers)
-            r.raise_for_status()
-            data = r.json()
-            print(f"INFO: AAS data fetched for {date_str}")
-            break
-        except Exception as e:
-            print(f"WARN: AAS fetch failed for {date_str}: {e}")
-
-    if data is None:
-        print("WARN: AAS data unavailable. Using defaults.")
+    if not aas:
         return ph
 
-    for i, item in enumerate(data[:3], 1):
+    for i, item in enumerate(aas["items"][:3], 1):
         score     = float(item.get("AAS", 0))
         score_pct = min(100, int((score / 3.0) * 100))
         note_text = item.get("Comment", "—")
@@ -515,12 +306,11 @@ def fetch_aas_data() -> dict[str, str]:
 # 메인 플레이스홀더 빌드
 # ─────────────────────────────────────────────────────────
 
-def build_placeholders() -> dict[str, str]:
-    bm20 = load_json(BM20_JSON)
-    krw  = load_json(KRW_JSON)
+def build_placeholders(ctx: dict[str, Any]) -> dict[str, str]:
+    bm20 = ctx["bm20"]
 
     # BTC
-    btc_usd_txt, btc_1d_html = fetch_btc_price_and_change()
+    btc_usd_txt, btc_1d_html = btc_price_and_change(ctx.get("btc"))
 
     # BM20
     level   = bm20.get("bm20Level", None)
@@ -529,17 +319,11 @@ def build_placeholders() -> dict[str, str]:
     if r1d_raw is not None:
         bm20_1d_html = colored_change_html(pct_to_display(r1d_raw), digits=2)
 
-    # usdkrw (프리미엄 계산용)
-    usdkrw = (bm20.get("kimchi_meta", {}) or {}).get("usdkrw", None)
-    usdkrw_f = float(str(usdkrw).replace(",", "")) if usdkrw else None
-
     # Sentiment
     sentiment_label, sentiment_score = "—", "—"
-    hist_obj = load_json_optional(BM20_HISTORY_JSON)
-    if hist_obj:
+    sent = ctx.get("sentiment")
+    if sent:
         try:
-            latest = hist_obj[-1] if isinstance(hist_obj, list) else hist_obj.get("latest", hist_obj)
-            sent   = latest.get("sentiment", {})
             sentiment_label = str(sent.get("status") or sent.get("sentiment_label") or "—")
             score  = sent.get("value") or sent.get("sentiment_score")
             if score is not None:
@@ -547,13 +331,8 @@ def build_placeholders() -> dict[str, str]:
         except Exception:
             pass
 
-    # 뉴스
-    wp_lead, lead_id = fetch_wp_newsletter_lead()
-    news3            = fetch_wp_newsletter_news(exclude_id=lead_id)
-    top1, top2, top3 = news3[0], news3[1], news3[2]
-
     ph: dict[str, str] = {
-        "{{LETTER_DATE}}":         datetime.now(timezone(timedelta(hours=9))).strftime("%Y-%m-%d"),
+        "{{LETTER_DATE}}":         ctx["letter_date"],
         # BTC / BM20 / Sentiment
         "{{BTC_USD}}":             btc_usd_txt,
         "{{BTC_1D}}":              btc_1d_html,
@@ -561,53 +340,15 @@ def build_placeholders() -> dict[str, str]:
         "{{BM20_1D}}":             bm20_1d_html,
         "{{SENTIMENT_LABEL}}":     sentiment_label,
         "{{SENTIMENT_SCORE}}":     sentiment_score,
-        # 뉴스
-        "{{NEWS_HEADLINE}}":       wp_lead["NEWS_HEADLINE"],
-        "{{NEWS_ONE_LINER_NOTE}}": wp_lead["NEWS_ONE_LINER_NOTE"],
-        "{{TOP_NEWS_1}}":          top1["title"],
-        "{{TOP_NEWS_2}}":          top2["title"],
-        "{{TOP_NEWS_3}}":          top3["title"],
-        "{{NEWS1_EXCERPT}}":       top1["excerpt"],
-        "{{NEWS2_EXCERPT}}":       top2["excerpt"],
-        "{{NEWS3_EXCERPT}}":       top3["excerpt"],
-        "{{NEWS1_LINK}}":          top1["link"],
-        "{{NEWS2_LINK}}":          top2["link"],
-        "{{NEWS3_LINK}}":          top3["link"],
-        "{{NEWS1_CATEGORY}}":      top1["category"],
-        "{{NEWS2_CATEGORY}}":      top2["category"],
-        "{{NEWS3_CATEGORY}}":      top3["category"],
         # 수신거부 (Stibee 발송 시 자동 치환)
         "{{UNSUB_URL}}":           "{{UNSUB_URL}}",
     }
 
-    # 업비트 Top/Bottom
-    upbit = fetch_upbit_top_bottom(n=3)
-    ph["{{UPBIT_TOP1_SYMBOL}}"] = upbit.get("UPBIT_TOP1_SYMBOL", "—")
-    ph["{{UPBIT_TOP2_SYMBOL}}"] = upbit.get("UPBIT_TOP2_SYMBOL", "—")
-    ph["{{UPBIT_TOP3_SYMBOL}}"] = upbit.get("UPBIT_TOP3_SYMBOL", "—")
-    ph["{{UPBIT_TOP1_CHG}}"]    = upbit.get("UPBIT_TOP1_CHG", "—")
-    ph["{{UPBIT_TOP2_CHG}}"]    = upbit.get("UPBIT_TOP2_CHG", "—")
-    ph["{{UPBIT_TOP3_CHG}}"]    = upbit.get("UPBIT_TOP3_CHG", "—")
-    ph["{{UPBIT_BOT1_SYMBOL}}"] = upbit.get("UPBIT_BOT1_SYMBOL", "—")
-    ph["{{UPBIT_BOT2_SYMBOL}}"] = upbit.get("UPBIT_BOT2_SYMBOL", "—")
-    ph["{{UPBIT_BOT3_SYMBOL}}"] = upbit.get("UPBIT_BOT3_SYMBOL", "—")
-    ph["{{UPBIT_BOT1_CHG}}"]    = upbit.get("UPBIT_BOT1_CHG", "—")
-    ph["{{UPBIT_BOT2_CHG}}"]    = upbit.get("UPBIT_BOT2_CHG", "—")
-    ph["{{UPBIT_BOT3_CHG}}"]    = upbit.get("UPBIT_BOT3_CHG", "—")
-
-    # 프리미엄
-    prem = fetch_premium_data(usdkrw_f)
-    ph["{{KIMCHI_PREM_PCT}}"]  = prem.get("KIMCHI_PREM_PCT", "—")
-    ph["{{CB_PREMIUM_PCT}}"]   = prem.get("CB_PREMIUM_PCT", "—")
-    ph["{{PREMIUM_COMMENT}}"]  = prem.get("PREMIUM_COMMENT", "—")
-    ph["{{PREMIUM_ASOF}}"]     = prem.get("PREMIUM_ASOF", "—")
-
-    # ETF
-    ph.update(load_etf_summary())
-
-    # AAS
-    ph.update(fetch_aas_data())
-
+    ph.update(news_placeholders(ctx))                    # 뉴스
+    ph.update(upbit_top_bottom(ctx.get("upbit")))        # 업비트 Top/Bottom
+    ph.update(premium_placeholders(ctx.get("premium")))  # 프리미엄
+    ph.update(etf_summary(ctx.get("etf")))               # ETF
+    ph.update(aas_placeholders(ctx.get("aas")))          # AAS
     return ph
 
 
@@ -615,17 +356,13 @@ def build_placeholders() -> dict[str, str]:
 # 렌더
 # ─────────────────────────────────────────────────────────
 
-def render() -> None:
+def render(ctx: dict | None = None) -> None:
     if not TEMPLATE.exists():
         raise FileNotFoundError(f"Missing {TEMPLATE}")
-    html = TEMPLATE.read_text(encoding="utf-8")
-    ph   = build_placeholders()
-    for k in sorted(ph.keys(), key=len, reverse=True):
-        html = html.replace(k, str(ph[k]))
-
-    left = sorted(set(re.findall(r"\{\{[A-Z0-9_]+\}\}", html)))
+    tpl  = load_template(TEMPLATE)
+    ph   = build_placeholders(ctx if ctx is not None else load_letter_context())
     # UNSUB_URL는 Stibee가 치환하므로 경고 제외
-    left = [v for v in left if v != "{{UNSUB_URL}}"]
+    html, left = tpl.render(ph, ignore={"UNSUB_URL"})
     if left:
         print("WARN: Unfilled placeholders:", left)
 
@@ -4,21 +4,17 @@
 render_letter_en.py
 ────────────────────
 영문 뉴스레터 letter_en.html 생성.
-기존 render_letter.py 가 먼저 실행된 후 사용되는 JSON 파일들을 공유.
+render_letter.py 와 같은 out/letter_context.json (letter_context.py) 을 포맷한다
+→ BTC·프리미엄·업비트 등락·AAS 숫자가 국문판과 항상 같다.
 
-Inputs (JSON, render_letter.py 실행 후 생성):
-  bm20_latest.json
-  nasdaq_series.json
-  out/history/krw_24h_snapshots.json
-  data/bm20_history.json     (optional)
-  data/etf_summary.json      (optional)
+Inputs:
+  out/letter_context.json    (없거나 오래됐으면 여기서 수집해 저장)
+    ← bm20_latest.json, nasdaq_series.json, out/history/krw_24h_snapshots.json (bm20_store),
+      data/bm20_history.json, data/etf_summary.json,
+      Upbit / Binance / Coinbase / WordPress REST API / AAS-Bot GitHub
 
 API 호출:
-  Upbit (Top/Bottom 3)
-  Binance / Coinbase (프리미엄)
-  WordPress REST API (뉴스)
-  AAS-Bot GitHub (CLM 데이터)
-  DeepL (번역, optional)
+  DeepL (번역, optional — translation_memory.py 배치 + 번역 메모리)
 
 Output:
   letter_en.html
@@ -26,52 +22,34 @@ Output:
 
 from __future__ import annotations
 
-import json
 import os
-import re
+from datetime import datetime
 from pathlib import Path
-from typing import Any
-from datetime import datetime, timezone, timedelta
 
-import requests
+from letter_context import (
+    WP_CAT_ID_GLOBAL_POLICY,
+    WP_CAT_ID_NATIONAL_POLICY,
+    load_letter_context,
+    pick_news,
+)
+from letter_template import load_template
+from translation_memory import translate_batch
 
-ROOT = Path(__file__).resolve().parent.parent
+REPO = Path(__file__).resolve().parent.parent
+ROOT = Path(os.getenv("BM20_DATA_ROOT") or REPO)   # 입력/출력 데이터 루트 (대체 디렉터리로 바꿀 수 있음)
 
-TEMPLATE_EN    = ROOT / "letter_newsletter_template_EN.html"
+TEMPLATE_EN    = REPO / "letter_newsletter_template_EN.html"
 OUT_EN         = ROOT / "letter_en.html"
-BM20_JSON      = ROOT / "bm20_latest.json"
-NASDAQ_JSON    = ROOT / "nasdaq_series.json"
-SNAPSHOTS_JSON = ROOT / "out/history/krw_24h_snapshots.json"
-BM20_HIST_JSON = ROOT / "data/bm20_history.json"
-ETF_JSON       = ROOT / "data/etf_summary.json"
-
-WP_BASE_URL                  = "https://blockmedia.co.kr/wp-json/wp/v2"
-WP_CAT_ID_NATIONAL_POLICY   = 78598   # 국내 정책
-WP_CAT_ID_GLOBAL_POLICY     = 16604   # 해외 정책
-
-DEEPL_API_KEY = os.getenv("DEEPL_API_KEY", "")
-AAS_BOT_TOKEN = os.getenv("AAS_BOT_TOKEN", "")
 
 GREEN = "#16a34a"
 RED   = "#dc2626"
 INK   = "#0f172a"
-KST   = timezone(timedelta(hours=9))
 
 
 # ─────────────────────────────────────────────────────────
 # 헬퍼
 # ─────────────────────────────────────────────────────────
 
-def load_json(p: Path) -> Any:
-    if not p.exists():
-        raise FileNotFoundError(f"Missing {p}")
-    return json.loads(p.read_text(encoding="utf-8"))
-
-def load_json_optional(p: Path) -> Any | None:
-    if not p.exists():
-        return None
-    return json.loads(p.read_text(encoding="utf-8"))
-
 def colored_change_html(pct: float, digits: int = 2) -> str:
     v = float(pct)
     arrow, color = ("▲", GREEN) if v > 0 else (("▼", RED) if v < 0 else ("", INK))
@@ -92,123 +70,50 @@ def fmt_usd_vol(val_krw: float, usdkrw: float) -> str:
     m = val_usd / 1_000_000
     return f"${m:.0f}M"
 
-def strip_html(text: str) -> str:
-    return re.sub(r"<[^>]+>", "", text or "").strip()
-
 def pct_display(x: float) -> float:
     x = float(x)
     return x * 100 if abs(x) <= 1.5 else x
 
 
 # ─────────────────────────────────────────────────────────
-# DeepL 번역
-# ─────────────────────────────────────────────────────────
-
-def translate(text: str) -> str:
-    if not text or text == "—" or not DEEPL_API_KEY:
-        return text
-    try:
-        r = requests.post(
-            "https://api-free.deepl.com/v2/translate",
-            headers={"Authorization": f"DeepL-Auth-Key {DEEPL_API_KEY}"},
-            json={"text": [text], "source_lang": "KO", "target_lang": "EN"},
-            timeout=10,
-        )
-        r.raise_for_status()
-        return r.json()["translations"][0]["text"]
-    except Exception as e:
-        print(f"WARN: DeepL failed: {e}")
-        return text
-
-
-# ─────────────────────────────────────────────────────────
-# BTC + BM20 (bm20_latest.json)
+# BTC + BM20
 # ─────────────────────────────────────────────────────────
 
-def load_bm20() -> dict:
-    bm20 = load_json(BM20_JSON)
-    r1d  = (bm20.get("returns", {}) or {}).get("1D", None)
+def bm20_placeholders(ctx: dict) -> dict:
+    bm20  = ctx["bm20"]
+    r1d   = (bm20.get("returns", {}) or {}).get("1D", None)
     level = bm20.get("bm20Level", None)
-    usdkrw = (bm20.get("kimchi_meta", {}) or {}).get("usdkrw", None)
-    usdkrw_f = float(str(usdkrw).replace(",", "")) if usdkrw else None
-
-    # BTC 가격 (CMC 또는 Yahoo fallback)
-    btc_usd, btc_1d = fetch_btc()
-
+    btc   = ctx.get("btc")
     return {
-        "{{BTC_USD}}":   btc_usd,
-        "{{BTC_1D}}":    btc_1d,
+        "{{BTC_USD}}":   f"{btc['price']:,.0f}" if btc else "—",
+        "{{BTC_1D}}":    colored_change_html(btc["chg_24h"]) if btc else "—",
         "{{BM20_LEVEL}}": f"{float(level):,.2f}" if level else "—",
         "{{BM20_1D}}":   colored_change_html(pct_display(r1d)) if r1d is not None else "—",
-        "_usdkrw":       usdkrw_f,
     }
 
-def fetch_btc() -> tuple[str, str]:
-    cmc_key = os.getenv("CMC_API_KEY", "")
-    if cmc_key:
-        try:
-            r = requests.get(
-                "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest",
-                headers={"X-CMC_PRO_API_KEY": cmc_key},
-                params={"symbol": "BTC", "convert": "USD"},
-                timeout=10,
-            )
-            r.raise_for_status()
-            d = r.json()["data"]["BTC"]["quote"]["USD"]
-            price = float(d["price"])
-            chg   = float(d["percent_change_24h"])
-            return f"{price:,.0f}", colored_change_html(chg)
-        except Exception as e:
-            print(f"WARN: CMC BTC failed: {e}")
-    try:
-        r2 = requests.get(
-            "https://query1.finance.yahoo.com/v8/finance/chart/BTC-USD",
-            headers={"User-Agent": "Mozilla/5.0"},
-            params={"interval": "1d", "range": "5d"},
-            timeout=10,
-        )
-        r2.raise_for_status()
-        closes = [x for x in r2.json()["chart"]["result"][0]["indicators"]["quote"][0]["close"] if x]
-        price  = float(closes[-1])
-        chg    = (price / float(closes[-2]) - 1) * 100 if len(closes) >= 2 else 0.0
-        return f"{price:,.0f}", colored_change_html(chg)
-    except Exception as e:
-        print(f"WARN: Yahoo BTC failed: {e}")
-        return "—", "—"
-
 
 # ─────────────────────────────────────────────────────────
-# NASDAQ (nasdaq_series.json)
+# NASDAQ
 # ─────────────────────────────────────────────────────────
 
-def load_nasdaq() -> dict:
-    try:
-        data = load_json(NASDAQ_JSON)
-        if len(data) < 2:
-            return {"{{NASDAQ_1D}}": "—", "{{NASDAQ_PRICE}}": "—"}
-        price = float(data[-1]["price"])
-        prev  = float(data[-2]["price"])
-        chg   = (price / prev - 1) * 100
-        return {
-            "{{NASDAQ_1D}}":    colored_change_html(chg),
-            "{{NASDAQ_PRICE}}": f"{price:,.0f}",
-        }
-    except Exception as e:
-        print(f"WARN: NASDAQ load failed: {e}")
+def nasdaq_placeholders(nasdaq: dict | None) -> dict:
+    if not nasdaq:
         return {"{{NASDAQ_1D}}": "—", "{{NASDAQ_PRICE}}": "—"}
+    price, prev = nasdaq["price"], nasdaq["prev"]
+    return {
+        "{{NASDAQ_1D}}":    colored_change_html((price / prev - 1) * 100) if prev else "—",
+        "{{NASDAQ_PRICE}}": f"{price:,.0f}",
+    }
 
 
 # ─────────────────────────────────────────────────────────
-# Sentiment (bm20_history.json)
+# Sentiment
 # ─────────────────────────────────────────────────────────
 
-def load_sentiment() -> dict:
-    hist = load_json_optional(BM20_HIST_JSON)
-    if not hist:
+def sentiment_placeholders(sent: dict | None) -> dict:
+    if not sent:
         return {"{{SENTIMENT_LABEL}}": "—", "{{SENTIMENT_SCORE}}": "—"}
     try:
-        latest = hist[-1] if isinstance(hist, list) else hist.get("latest", hist)
-        sent   = latest.get("sentiment", {})
         label  = str(sent.get("status") or sent.get("sentiment_label") or "—")
         score  = sent.get("value") or sent.get("sentiment_score")
         return {
@@ -220,21 +125,22 @@ def load_sentiment() -> dict:
 
 
 # ─────────────────────────────────────────────────────────
-# KRW 거래량 (krw_24h_snapshots.json)
+# KRW 거래량 (krw_24h 스냅샷)
 # ─────────────────────────────────────────────────────────
 
-def load_krw_volume(usdkrw: float = 1450.0) -> dict:
+def krw_volume(krw: dict | None, usdkrw: float) -> dict:
     FB = {
         "{{KRW_TOTAL_VOL}}":       "—",
         "{{KRW_UPBIT_VOL}}":       "—",
         "{{KRW_BITHUMB_VOL}}":     "—",
         "{{KRW_UPBIT_TOP5_ROWS}}": "—",
     }
+    if not krw:
+        print("WARN: KRW volume unavailable (no krw_24h snapshot)")
+        return FB
     try:
-        data   = load_json(SNAPSHOTS_JSON)
-        latest = data[-1]
-        totals = latest.get("totals", {})
-        top5   = latest.get("by_exchange_top", {}).get("upbit_top5", [])
+        totals = krw.get("totals", {})
+        top5   = krw.get("upbit_top5", [])
 
         rows_html = ""
         for i, item in enumerate(top5[:5]):
@@ -266,112 +172,72 @@ def load_krw_volume(usdkrw: float = 1450.0) -> dict:
 # 업비트 Top/Bottom 3
 # ─────────────────────────────────────────────────────────
 
-def fetch_upbit_top_bottom(n: int = 3) -> dict:
-    FB = {**{f"{{{{UPBIT_TOP{i}_SYMBOL}}}}": "—" for i in range(1, n+1)},
+def upbit_top_bottom(upbit: dict | None, n: int = 3) -> dict:
+    ph = {**{f"{{{{UPBIT_TOP{i}_SYMBOL}}}}": "—" for i in range(1, n+1)},
           **{f"{{{{UPBIT_TOP{i}_CHG}}}}":    "—" for i in range(1, n+1)},
           **{f"{{{{UPBIT_BOT{i}_SYMBOL}}}}": "—" for i in range(1, n+1)},
           **{f"{{{{UPBIT_BOT{i}_CHG}}}}":    "—" for i in range(1, n+1)}}
-    try:
-        mkts = [m["market"] for m in
-                requests.get("https://api.upbit.com/v1/market/all",
-                             params={"isDetails": "false"}, timeout=10).json()
-                if m["market"].startswith("KRW-")]
-        tickers = []
-        for i in range(0, len(mkts), 100):
-            tickers += requests.get("https://api.upbit.com/v1/ticker",
-                                    params={"markets": ",".join(mkts[i:i+100])},
-                                    timeout=10).json()
-        tickers.sort(key=lambda x: x.get("signed_change_rate", 0), reverse=True)
-        result = {}
-        for i, t in enumerate(tickers[:n], 1):
-            sym = t["market"].replace("KRW-", "")
-            pct = float(t.get("signed_change_rate", 0)) * 100
-            result[f"{{{{UPBIT_TOP{i}_SYMBOL}}}}"] = sym
-            result[f"{{{{UPBIT_TOP{i}_CHG}}}}"]    = f"+{pct:.1f}%"
-        for i, t in enumerate(reversed(tickers[-n:]), 1):
-            sym = t["market"].replace("KRW-", "")
-            pct = float(t.get("signed_change_rate", 0)) * 100
-            result[f"{{{{UPBIT_BOT{i}_SYMBOL}}}}"] = sym
-            result[f"{{{{UPBIT_BOT{i}_CHG}}}}"]    = f"{pct:.1f}%"
-        return result
-    except Exception as e:
-        print(f"WARN: Upbit top/bottom failed: {e}")
-        return FB
+    if not upbit:
+        return ph
+    for i, (sym, pct) in enumerate(upbit["top"][:n], 1):
+        ph[f"{{{{UPBIT_TOP{i}_SYMBOL}}}}"] = sym
+        ph[f"{{{{UPBIT_TOP{i}_CHG}}}}"]    = f"+{pct:.1f}%"
+    for i, (sym, pct) in enumerate(upbit["bottom"][:n], 1):
+        ph[f"{{{{UPBIT_BOT{i}_SYMBOL}}}}"] = sym
+        ph[f"{{{{UPBIT_BOT{i}_CHG}}}}"]    = f"{pct:.1f}%"
+    return ph
 
 
 # ─────────────────────────────────────────────────────────
 # 김치·코인베이스 프리미엄
 # ─────────────────────────────────────────────────────────
 
-def fetch_premium(usdkrw: float | None) -> dict:
-    FB = {
-        "{{KIMCHI_PREM_PCT}}": "—",
-        "{{CB_PREMIUM_PCT}}":  "—",
-        "{{PREMIUM_COMMENT}}": "Premium data unavailable.",
-        "{{PREMIUM_ASOF}}":    "—",
-    }
+def premium_placeholders(prem: dict | None) -> dict:
+    if not prem:
+        return {
+            "{{KIMCHI_PREM_PCT}}": "—",
+            "{{CB_PREMIUM_PCT}}":  "—",
+            "{{PREMIUM_COMMENT}}": "Premium data unavailable.",
+            "{{PREMIUM_ASOF}}":    "—",
+        }
     def _c(v: float) -> str:
         color = GREEN if v >= 0 else RED
         sign  = "+" if v >= 0 else "-"
         return f'<span style="color:{color};font-weight:900;">{sign}{abs(v):.2f}%</span>'
-    try:
-        upbit_krw  = float(requests.get("https://api.upbit.com/v1/ticker",
-                                         params={"markets": "KRW-BTC"}, timeout=10).json()[0]["trade_price"])
-        binance_usd = None
-        for base in ["https://api.binance.com", "https://data-api.binance.vision"]:
-            try:
-                br = requests.get(f"{base}/api/v3/ticker/price",
-                                   params={"symbol": "BTCUSDT"}, timeout=10)
-                br.raise_for_status()
-                binance_usd = float(br.json()["price"])
-                break
-            except Exception:
-                continue
-        if binance_usd is None:
-            raise RuntimeError("Binance BTC price unavailable")
-        fx     = usdkrw if (usdkrw and usdkrw > 100) else 1450.0
-        cb_usd = float(requests.get("https://api.coinbase.com/v2/prices/BTC-USD/spot",
-                                     timeout=10).json()["data"]["amount"])
-        kimchi_pct = (upbit_krw / fx - binance_usd) / binance_usd * 100
-        cb_pct     = (cb_usd - binance_usd) / binance_usd * 100
-
-        if kimchi_pct > 1 and cb_pct > 0:
-            comment = "Both Kimchi and Coinbase premiums positive → strong domestic demand vs. global markets."
-        elif kimchi_pct > 1 and cb_pct <= 0:
-            comment = "Kimchi premium positive but Coinbase at discount → isolated Korean buying pressure, caution advised."
-        elif kimchi_pct < -0.5:
-            comment = "Kimchi discount → possible selling pressure in Korea or KRW weakness."
-        else:
-            comment = f"Kimchi {kimchi_pct:+.2f}% / Coinbase {cb_pct:+.2f}% — neutral range."
-
-        kst_now = datetime.now(KST)
-        asof    = kst_now.strftime("As of %b %-d, %I:%M %p KST")
 
-        return {
-            "{{KIMCHI_PREM_PCT}}": _c(kimchi_pct),
-            "{{CB_PREMIUM_PCT}}":  _c(cb_pct),
-            "{{PREMIUM_COMMENT}}": comment,
-            "{{PREMIUM_ASOF}}":    asof,
-        }
-    except Exception as e:
-        print(f"WARN: Premium fetch failed: {e}")
-        return FB
+    kimchi_pct = prem["kimchi_pct"]
+    cb_pct     = prem["cb_pct"]
+    if kimchi_pct > 1 and cb_pct > 0:
+        comment = "Both Kimchi and Coinbase premiums positive → strong domestic demand vs. global markets."
+    elif kimchi_pct > 1 and cb_pct <= 0:
+        comment = "Kimchi premium positive but Coinbase at discount → isolated Korean buying pressure, caution advised."
+    elif kimchi_pct < -0.5:
+        comment = "Kimchi discount → possible selling pressure in Korea or KRW weakness."
+    else:
+        comment = f"Kimchi {kimchi_pct:+.2f}% / Coinbase {cb_pct:+.2f}% — neutral range."
+
+    asof = datetime.fromisoformat(prem["asof"]).strftime("As of %b %-d, %I:%M %p KST")
+    return {
+        "{{KIMCHI_PREM_PCT}}": _c(kimchi_pct),
+        "{{CB_PREMIUM_PCT}}":  _c(cb_pct),
+        "{{PREMIUM_COMMENT}}": comment,
+        "{{PREMIUM_ASOF}}":    asof,
+    }
 
 
 # ─────────────────────────────────────────────────────────
 # ETF
 # ─────────────────────────────────────────────────────────
 
-def load_etf() -> dict:
+def etf_placeholders(raw: dict | None) -> dict:
     FB = {
         "{{ETF_BTC_INFLOW}}": "—", "{{ETF_BTC_AUM}}": "—",
         "{{ETF_ETH_INFLOW}}": "—", "{{ETF_ETH_AUM}}": "—",
         "{{ETF_SOL_INFLOW}}": "—", "{{ETF_SOL_AUM}}": "—",
     }
-    if not ETF_JSON.exists():
+    if not raw:
         return FB
     try:
-        raw = json.loads(ETF_JSON.read_text(encoding="utf-8"))
         def _aum(v) -> str:
             return f"${float(v)/1_000_000_000:.1f}B" if v else "—"
         def _inflow(v) -> str:
@@ -393,93 +259,36 @@ def load_etf() -> dict:
 
 
 # ─────────────────────────────────────────────────────────
-# 워드프레스 뉴스
+# 워드프레스 뉴스 (국내정책 우선, 부족하면 해외정책)
 # ─────────────────────────────────────────────────────────
 
-def fetch_news_lead() -> tuple[dict, int | None]:
-    """국내정책 우선, 없으면 해외정책에서 최신 1건을 헤드라인으로.
-    Returns (placeholders_dict, lead_post_id). lead_post_id는 뉴스 리스트 중복 제거에 사용."""
-    FB = {"{{NEWS_HEADLINE}}": "—", "{{NEWS_ONE_LINER_NOTE}}": "—"}
-    def _parse(post: dict) -> dict:
-        excerpt = strip_html(post["excerpt"]["rendered"])
-        if len(excerpt) > 150:
-            excerpt = excerpt[:150].rstrip() + "…"
-        return {
-            "{{NEWS_HEADLINE}}":       strip_html(post["title"]["rendered"]),
-            "{{NEWS_ONE_LINER_NOTE}}": excerpt,
-        }
-    for cat_id in [WP_CAT_ID_NATIONAL_POLICY, WP_CAT_ID_GLOBAL_POLICY]:
-        try:
-            res = requests.get(f"{WP_BASE_URL}/posts",
-                               params={"categories": cat_id, "per_page": 1,
-                                       "orderby": "date", "order": "desc",
-                                       "status": "publish",
-                                       "_fields": "id,title,excerpt"},
-                               timeout=10)
-            res.raise_for_status()
-            posts = res.json()
-            if posts:
-                print(f"INFO: news lead from category {cat_id}")
-                return _parse(posts[0]), posts[0]["id"]
-        except Exception as e:
-            print(f"WARN: WP lead fetch failed (category {cat_id}): {e}")
-    return FB, None
-
-def fetch_news_list(exclude_id: int | None = None) -> list[dict]:
-    """국내정책 우선으로 최신순 수집, 부족하면 해외정책으로 보완해 총 3건 반환.
-    exclude_id: 헤드라인으로 이미 사용된 포스트 ID → 뉴스 리스트에서 제외."""
-    empty = {"title": "—", "excerpt": "", "link": "#", "category": ""}
-    CAT_LABELS = {
-        WP_CAT_ID_NATIONAL_POLICY: "National Policy",
-        WP_CAT_ID_GLOBAL_POLICY:   "Global Policy",
-    }
-
-    def _fetch_from_cat(cat_id: int, per_page: int) -> list[dict]:
-        params: dict = {"categories": cat_id, "per_page": per_page,
-                        "orderby": "date", "order": "desc",
-                        "status": "publish",
-                        "_fields": "id,title,excerpt,link,meta"}
-        if exclude_id:
-            params["exclude"] = exclude_id
-        try:
-            res = requests.get(f"{WP_BASE_URL}/posts",
-                               params=params,
-                               timeout=10)
-            res.raise_for_status()
-            posts = res.json()
-        except Exception as e:
-            print(f"WARN: WP news fetch failed (category {cat_id}): {e}")
-            return []
-
-        result = []
-        for post in posts:
-            meta    = post.get("meta", {}) or {}
-            summary = meta.get("bm_post_summary", "")
-            if not summary:
-                summary = strip_html(post["excerpt"]["rendered"])
-            if len(summary) > 150:
-                summary = summary[:150].rstrip() + "…"
-            result.append({
-                "title":    strip_html(post["title"]["rendered"]),
-                "excerpt":  summary,
-                "link":     post.get("link", "#"),
-                "category": CAT_LABELS[cat_id],
-            })
-        return result
-
-    # 국내정책 우선 수집
-    collected: list[dict] = _fetch_from_cat(WP_CAT_ID_NATIONAL_POLICY, 3)
-
-    # 부족하면 해외정책으로 보완
-    if len(collected) < 3:
-        needed = 3 - len(collected)
-        collected += _fetch_from_cat(WP_CAT_ID_GLOBAL_POLICY, needed)
+CAT_LABELS = {
+    WP_CAT_ID_NATIONAL_POLICY: "National Policy",
+    WP_CAT_ID_GLOBAL_POLICY:   "Global Policy",
+}
 
-    # 여전히 3건 미만이면 빈 슬롯으로 채움
-    while len(collected) < 3:
-        collected.append(empty)
+def _clip(text: str, n: int = 150) -> str:
+    return text[:n].rstrip() + "…" if len(text) > n else text
 
-    return collected[:3]
+def news_placeholders(ctx: dict) -> dict:
+    policy = [WP_CAT_ID_NATIONAL_POLICY, WP_CAT_ID_GLOBAL_POLICY]
+    lead, picked = pick_news(ctx, policy, policy)
+    ph = {
+        "{{NEWS_HEADLINE}}":       lead["title"] if lead else "—",
+        "{{NEWS_ONE_LINER_NOTE}}": _clip(lead["excerpt"]) if lead else "—",
+    }
+    for i in range(1, 4):
+        if i <= len(picked):
+            cat, post = picked[i - 1]
+            n = {"title": post["title"], "excerpt": _clip(post["summary"] or post["excerpt"]),
+                 "link": post["link"], "category": CAT_LABELS[cat]}
+        else:
+            n = {"title": "—", "excerpt": "", "link": "#", "category": ""}
+        ph[f"{{{{TOP_NEWS_{i}}}}}"]     = n["title"]
+        ph[f"{{{{NEWS{i}_EXCERPT}}}}"]  = n["excerpt"]
+        ph[f"{{{{NEWS{i}_LINK}}}}"]     = n["link"]
+        ph[f"{{{{NEWS{i}_CATEGORY}}}}"] = n["category"]
+    return ph
 
 
 # ─────────────────────────────────────────────────────────
@@ -503,7 +312,7 @@ def _aas_note_tag(text: str) -> str:
     style = "font-family:'Segoe UI',Arial,sans-serif;font-size:12px;font-weight:bold;color:#1d4ed8;"
     return f'<span style="{style}">{t}</span>'
 
-def fetch_aas() -> dict:
+def aas_placeholders(aas: dict | None) -> dict:
     ph: dict = {}
     for i in range(1, 4):
         ph.update({
@@ -511,36 +320,24 @@ def fetch_aas() -> dict:
             f"{{{{AAS_SCORE_{i}}}}}":         "0.00",
             f"{{{{AAS_SCORE_PERCENT_{i}}}}}":  "0",
             f"{{{{AAS_CHG_{i}}}}}":           "0.00",
-            f"{{{{AAS_NOTE_TAG_{i}}}}}":      _aas_note_tag("—"),
+            f"{{{{AAS_NOTE_TAG_{i}}}}}":      "—",   # 원문 코멘트 → render() 에서 번역 후 태그
             f"{{{{AAS_BAR_{i}}}}}":           _aas_bar_html(33.3, 33.3, 33.4),
         })
-    headers = {"Authorization": f"token {AAS_BOT_TOKEN}"} if AAS_BOT_TOKEN else {}
-    kst_now = datetime.now(KST)
-    for date_str in [kst_now.strftime("%Y-%m-%d"),
-                     (kst_now - timedelta(days=1)).strftime("%Y-%m-%d")]:
-        url = (f"https://raw.githubusercontent.com/Blockmedia-DataTeam/AAS-Bot"
-               f"/main/reports/daily/{date_str}/newsletter_aas_top3_{date_str}.json")
-        try:
-            r = requests.get(url, timeout=10, headers=headers)
-            r.raise_for_status()
-            data = r.json()
-            print(f"INFO: AAS data fetched for {date_str}")
-            for i, item in enumerate(data[:3], 1):
-                score     = float(item.get("AAS", 0))
-                score_pct = min(100, int((score / 3.0) * 100))
-                ph[f"{{{{AAS_COIN_{i}}}}}"]          = item.get("Symbol", "—")
-                ph[f"{{{{AAS_SCORE_{i}}}}}"]         = f"{score:.2f}"
-                ph[f"{{{{AAS_SCORE_PERCENT_{i}}}}}"] = str(score_pct)
-                ph[f"{{{{AAS_CHG_{i}}}}}"]           = f"{float(item.get('24H(%)', 0)):+.2f}"
-                ph[f"{{{{AAS_NOTE_TAG_{i}}}}}"]      = _aas_note_tag(item.get("Comment", "—"))
-                ph[f"{{{{AAS_BAR_{i}}}}}"]           = _aas_bar_html(
-                    float(item.get("Onchain", 33.3)),
-                    float(item.get("Social", 33.3)),
-                    float(item.get("Momentum", 33.4)),
-                )
-            return ph
-        except Exception as e:
-            print(f"WARN: AAS fetch failed for {date_str}: {e}")
+    if not aas:
+        return ph
+    for i, item in enumerate(aas["items"][:3], 1):
+        score     = float(item.get("AAS", 0))
+        score_pct = min(100, int((score / 3.0) * 100))
+        ph[f"{{{{AAS_COIN_{i}}}}}"]          = item.get("Symbol", "—")
+        ph[f"{{{{AAS_SCORE_{i}}}}}"]         = f"{score:.2f}"
+        ph[f"{{{{AAS_SCORE_PERCENT_{i}}}}}"] = str(score_pct)
+        ph[f"{{{{AAS_CHG_{i}}}}}"]           = f"{float(item.get('24H(%)', 0)):+.2f}"
+        ph[f"{{{{AAS_NOTE_TAG_{i}}}}}"]      = item.get("Comment", "—")
+        ph[f"{{{{AAS_BAR_{i}}}}}"]           = _aas_bar_html(
+            float(item.get("Onchain", 33.3)),
+            float(item.get("Social", 33.3)),
+            float(item.get("Momentum", 33.4)),
+        )
     return ph
 
 
@@ -548,62 +345,46 @@ def fetch_aas() -> dict:
 # 메인
 # ─────────────────────────────────────────────────────────
 
-def build_placeholders() -> dict:
-    # BM20 + BTC
-    bm20_data = load_bm20()
-    usdkrw    = bm20_data.pop("_usdkrw", None)
-
+def build_placeholders(ctx: dict) -> dict:
     ph: dict = {}
-    ph["{{LETTER_DATE}}"] = datetime.now(KST).strftime("%Y-%m-%d")
-    ph.update(bm20_data)
-    ph.update(load_nasdaq())
-    ph.update(load_sentiment())
-    ph.update(load_krw_volume(usdkrw or 1450.0))
-    ph.update(fetch_upbit_top_bottom())
-    ph.update(fetch_premium(usdkrw))
-    ph.update(load_etf())
-    ph.update(fetch_aas())
-
-    # 뉴스
-    lead, lead_id = fetch_news_lead()
-    news = fetch_news_list(exclude_id=lead_id)
-    ph["{{NEWS_HEADLINE}}"]       = lead["{{NEWS_HEADLINE}}"]
-    ph["{{NEWS_ONE_LINER_NOTE}}"] = lead["{{NEWS_ONE_LINER_NOTE}}"]
-    for i, n in enumerate(news[:3], 1):
-        ph[f"{{{{TOP_NEWS_{i}}}}}"]     = n["title"]
-        ph[f"{{{{NEWS{i}_EXCERPT}}}}"]  = n["excerpt"]
-        ph[f"{{{{NEWS{i}_LINK}}}}"]     = n["link"]
-        ph[f"{{{{NEWS{i}_CATEGORY}}}}"] = n["category"]
-
+    ph["{{LETTER_DATE}}"] = ctx["letter_date"]
+    ph.update(bm20_placeholders(ctx))
+    ph.update(nasdaq_placeholders(ctx.get("nasdaq")))
+    ph.update(sentiment_placeholders(ctx.get("sentiment")))
+    ph.update(krw_volume(ctx.get("krw_24h"), ctx["usdkrw"]))
+    ph.update(upbit_top_bottom(ctx.get("upbit")))
+    ph.update(premium_placeholders(ctx.get("premium")))
+    ph.update(etf_placeholders(ctx.get("etf")))
+    ph.update(aas_placeholders(ctx.get("aas")))
+    ph.update(news_placeholders(ctx))
     ph["{{UNSUB_URL}}"] = "{{UNSUB_URL}}"
     return ph
 
 
-def render() -> None:
+def render(ctx: dict | None = None) -> None:
     if not TEMPLATE_EN.exists():
         raise FileNotFoundError(f"Missing {TEMPLATE_EN}")
 
-    ph   = build_placeholders()
-    html = TEMPLATE_EN.read_text(encoding="utf-8")
+    ph   = build_placeholders(ctx if ctx is not None else load_letter_context())
+    tpl  = load_template(TEMPLATE_EN)
 
-    # DeepL 번역 (뉴스 텍스트)
+    # DeepL 번역 (뉴스 텍스트 + AAS 코멘트): 번역 메모리에 없는 것만 한 번에 요청
     news_keys = [
         "{{NEWS_HEADLINE}}", "{{NEWS_ONE_LINER_NOTE}}",
         "{{TOP_NEWS_1}}", "{{TOP_NEWS_2}}", "{{TOP_NEWS_3}}",
         "{{NEWS1_EXCERPT}}", "{{NEWS2_EXCERPT}}", "{{NEWS3_EXCERPT}}",
         "{{NEWS1_CATEGORY}}", "{{NEWS2_CATEGORY}}", "{{NEWS3_CATEGORY}}",
     ]
-    if DEEPL_API_KEY:
-        print("INFO: Translating news via DeepL...")
-        for k in news_keys:
-            if k in ph and ph[k] and ph[k] != "—":
-                ph[k] = translate(ph[k])
-
-    for k in sorted(ph.keys(), key=len, reverse=True):
-        html = html.replace(k, str(ph[k]))
-
-    left = [v for v in sorted(set(re.findall(r"\{\{[A-Z0-9_]+\}\}", html)))
-            if v != "{{UNSUB_URL}}"]
+    note_keys = [f"{{{{AAS_NOTE_TAG_{i}}}}}" for i in range(1, 4)]
+    keys = [k for k in news_keys + note_keys if ph.get(k) and ph[k] != "—"]
+    if keys:
+        print(f"INFO: Translating {len(keys)} texts (DeepL + translation memory)...")
+        for k, text in zip(keys, translate_batch([ph[k] for k in keys])):
+            ph[k] = text
+    for k in note_keys:
+        ph[k] = _aas_note_tag(str(ph.get(k, "—")))
+
+    html, left = tpl.render(ph, ignore={"UNSUB_URL"})
     if left:
         print("WARN: Unfilled placeholders:", left)
 
@@ -4,29 +4,210 @@
 """Render BM20 treemap as a PNG (email-safe asset).
 
 - Size (area): weight_ratio
-- Color: price_change_pct (1D)
+- Color: price_change_pct (1D), RdYlGn centered at 0
 - Label inside each tile: SYMBOL + 1D change (e.g., BTC\n-0.23%)
 
+Plotly/Kaleido(headless Chromium) 없이 squarified 레이아웃을 직접 계산하고
+matplotlib Agg 로 그린다. 레이아웃/색/여백/라벨 규칙은 기존 px.treemap 출력
+(900×520 @2x)에 맞춤:
+- 타일 배치: d3 treemapSquarify (plotly tiling.squarifyratio=1 과 같은 알고리즘)
+- 색: RdYlGn, cmin/cmax = ∓max|1D %| (color_continuous_midpoint=0)
+- 라벨: 좌상단 18px, 배경 밝기에 따라 #444 / white, 타일보다 크면 축소
+- 오른쪽 컬러바 (title "1D %")
+
 Input:
 - bm20_daily_data_latest.csv
 
 Output:
 - assets/topcoins_treemap_latest.png
+
+Usage:
+    python scripts/render_treemap_png.py
+    python scripts/render_treemap_png.py --csv some.csv --out /tmp/treemap.png
 """
 
+import argparse
+import os
+from functools import lru_cache
 from pathlib import Path
+
+import numpy as np
 import pandas as pd
-import plotly.express as px
 
-ROOT = Path(__file__).resolve().parent.parent
+ROOT = Path(os.getenv("BM20_DATA_ROOT") or Path(__file__).resolve().parent.parent)
 CSV = ROOT / "bm20_daily_data_latest.csv"
 OUT = ROOT / "assets/topcoins_treemap_latest.png"
 
-def main():
-    if not CSV.exists():
-        raise FileNotFoundError(f"Missing {CSV}")
-
-    df = pd.read_csv(CSV)
+# ── 캔버스 (1x 픽셀 기준, 저장 시 SCALE 배) ──────────────────────────
+WIDTH, HEIGHT, SCALE = 900, 520, 2
+FRAME = (10.5, 10.5, 802.5, 509.5)      # 루트 프레임 x0, y0, x1, y1 (plotly plot area)
+FRAME_PAD = (8, 35, 8, 8)               # 프레임 안쪽 여백 l, t, r, b (상단은 pathbar 띠)
+TILE_GAP = 1.0                          # 타일 사이 어두운 틈 (양쪽 합 2px)
+CBAR = (829, 41, 859, 500)              # 컬러바 x0, y0, x1, y1
+
+FRAME_COLOR = "#444444"
+DARK_TEXT, LIGHT_TEXT = "#444444", "#ffffff"
+AXIS_TEXT = "#2a3f5f"
+FONT_PX, CBAR_FONT_PX, CBAR_TITLE_PX = 18, 12, 14
+LINE_SPACING = 1.1
+LABEL_PAD = 3                           # 라벨 좌/상 여백
+MIN_FONT_PX = 6                         # 이보다 작아지면 라벨 생략
+FONT_CANDIDATES = ["Open Sans", "Arial", "Liberation Sans", "Helvetica", "DejaVu Sans"]
+
+
+# ════════════════════════════════════════════════════════════
+# Squarified layout (d3-hierarchy treemapSquarify, ratio=1)
+# ════════════════════════════════════════════════════════════
+def squarify(values, x0, y0, x1, y1, ratio=1.0):
+    """values(내림차순) → [(x0, y0, x1, y1)] (입력 순서 유지, 면적 ∝ value)"""
+    n = len(values)
+    rects = [None] * n
+    total = float(sum(values))
+    i0 = i1 = 0
+    while i0 < n:
+        dx, dy = x1 - x0, y1 - y0
+        # 다음 0 이 아닌 노드
+        while True:
+            sum_v = values[i1]
+            i1 += 1
+            if sum_v or i1 >= n:
+                break
+        min_v = max_v = sum_v
+        alpha = max(dy / dx, dx / dy) / (total * ratio) if total and dx and dy else 0.0
+        beta = sum_v * sum_v * alpha
+        min_ratio = max(max_v / beta, beta / min_v) if beta and min_v else float("inf")
+        # 가로세로비가 나빠지지 않는 동안 행에 추가
+        while i1 < n:
+            v = values[i1]
+            sum_v += v
+            min_v, max_v = min(min_v, v), max(max_v, v)
+            beta = sum_v * sum_v * alpha
+            new_ratio = max(max_v / beta, beta / min_v) if beta and min_v else float("inf")
+            if new_ratio > min_ratio:
+                sum_v -= v
+                break
+            min_ratio = new_ratio
+            i1 += 1
+
+        row = range(i0, i1)
+        if dx < dy:     # dice: 위쪽 가로 띠에 좌→우로
+            ry1 = y0 + dy * sum_v / total if total else y1
+            k = (x1 - x0) / sum_v if sum_v else 0.0
+            x = x0
+            for i in row:
+                rects[i] = (x, y0, x + values[i] * k, ry1)
+                x += values[i] * k
+            y0 = ry1
+        else:           # slice: 왼쪽 세로 띠에 위→아래로
+            rx1 = x0 + dx * sum_v / total if total else x1
+            k = (y1 - y0) / sum_v if sum_v else 0.0
+            y = y0
+            for i in row:
+                rects[i] = (x0, y, rx1, y + values[i] * k)
+                y += values[i] * k
+            x0 = rx1
+        total -= sum_v
+        i0 = i1
+    return rects
+
+
+# ════════════════════════════════════════════════════════════
+# Render
+# ════════════════════════════════════════════════════════════
+@lru_cache(maxsize=None)
+def _font_family():
+    from matplotlib import font_manager as fm
+    installed = {f.name for f in fm.fontManager.ttflist}
+    return next((f for f in FONT_CANDIDATES if f in installed), "DejaVu Sans")
+
+def _pt(px):
+    # 1x 1px = 1/100 inch = 0.72pt (figure dpi = 100*SCALE)
+    return px * 0.72
+
+def _text_color(rgba):
+    # plotly Color.contrast 와 같은 기준 (tinycolor isLight: brightness >= 128)
+    r, g, b = (c * 255 for c in rgba[:3])
+    return DARK_TEXT if (r * 299 + g * 587 + b * 114) / 1000 >= 128 else LIGHT_TEXT
+
+def _fmt_tick(v):
+    s = f"{v:g}"
+    return s.replace("-", "−")
+
+def render(df: pd.DataFrame, out: Path):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.colors import Normalize
+    from matplotlib.figure import Figure
+    from matplotlib.font_manager import FontProperties
+    from matplotlib.patches import Rectangle
+    from matplotlib.ticker import MaxNLocator
+    import matplotlib
+
+    family = _font_family()
+    cmap = matplotlib.colormaps["RdYlGn"]
+    pct = df["price_change_pct"].to_numpy(float)
+    m = float(np.abs(pct).max()) if len(pct) else 0.0
+    norm = Normalize(-(m or 1.0), (m or 1.0))
+
+    fig = Figure(figsize=(WIDTH / 100, HEIGHT / 100), dpi=100 * SCALE, facecolor="white")
+    canvas = FigureCanvasAgg(fig)
+    renderer = canvas.get_renderer()
+    ax = fig.add_axes((0, 0, 1, 1))
+    ax.set_xlim(0, WIDTH)
+    ax.set_ylim(HEIGHT, 0)          # y 아래로 (픽셀 좌표)
+    ax.set_axis_off()
+
+    fx0, fy0, fx1, fy1 = FRAME
+    ax.add_patch(Rectangle((fx0, fy0), fx1 - fx0, fy1 - fy0, facecolor=FRAME_COLOR, edgecolor="none"))
+
+    pl, pt, pr, pb = FRAME_PAD
+    rects = squarify(df["weight_ratio"].tolist(), fx0 + pl, fy0 + pt, fx1 - pr, fy1 - pb)
+
+    label_fp = FontProperties(family=family, size=_pt(FONT_PX))
+    for (x0, y0, x1, y1), sym, chg in zip(rects, df["symbol"], pct):
+        x0, y0, x1, y1 = x0 + TILE_GAP, y0 + TILE_GAP, x1 - TILE_GAP, y1 - TILE_GAP
+        if x1 <= x0 or y1 <= y0:
+            continue
+        rgba = cmap(norm(chg))
+        ax.add_patch(Rectangle((x0, y0), x1 - x0, y1 - y0, facecolor=rgba,
+                               edgecolor="white", linewidth=_pt(1)))
+
+        # 라벨: 18px 로 재서 타일보다 크면 비율대로 축소
+        lines = (sym, f"{chg:+.2f}%")
+        tw = max(renderer.get_text_width_height_descent(t, label_fp, ismath=False)[0] for t in lines) / SCALE
+        th = FONT_PX * LINE_SPACING * len(lines)
+        room_w, room_h = (x1 - x0) - 2 * LABEL_PAD, (y1 - y0) - 2 * LABEL_PAD
+        shrink = min(1.0, room_w / tw if tw else 1.0, room_h / th if th else 1.0)
+        if FONT_PX * shrink < MIN_FONT_PX:
+            continue
+        ax.text(x0 + LABEL_PAD + 1, y0 + LABEL_PAD + 1, "\n".join(lines), ha="left", va="top",
+                fontsize=_pt(FONT_PX * shrink), family=family, color=_text_color(rgba),
+                linespacing=LINE_SPACING)
+
+    # ── 컬러바 ──
+    cx0, cy0, cx1, cy1 = CBAR
+    grad = np.linspace(norm.vmax, norm.vmin, 256)[:, None]
+    ax.imshow(grad, extent=(cx0, cx1, cy1, cy0), cmap=cmap, norm=norm,
+              aspect="auto", interpolation="bilinear")
+    ax.set_xlim(0, WIDTH)
+    ax.set_ylim(HEIGHT, 0)
+    ax.text(cx0, cy0 - 8, "1D %", ha="left", va="bottom",
+            fontsize=_pt(CBAR_TITLE_PX), family=family, color=AXIS_TEXT)
+    for v in MaxNLocator(nbins=8, steps=[1, 2, 2.5, 5, 10]).tick_values(norm.vmin, norm.vmax):
+        if not norm.vmin <= v <= norm.vmax:
+            continue
+        y = cy1 - (v - norm.vmin) / (norm.vmax - norm.vmin) * (cy1 - cy0)
+        ax.text(cx1 + 6, y, _fmt_tick(v), ha="left", va="center",
+                fontsize=_pt(CBAR_FONT_PX), family=family, color=AXIS_TEXT)
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(str(out), dpi=100 * SCALE, facecolor="white")
+
+
+def load(csv: Path) -> pd.DataFrame:
+    if not csv.exists():
+        raise FileNotFoundError(f"Missing {csv}")
+
+    df = pd.read_csv(csv)
 
     required = {"symbol", "weight_ratio", "price_change_pct"}
     missing = [c for c in required if c not in df.columns]
@@ -37,38 +218,18 @@ def main():
     df["weight_ratio"] = pd.to_numeric(df["weight_ratio"], errors="coerce").fillna(0.0)
     df["price_change_pct"] = pd.to_numeric(df["price_change_pct"], errors="coerce").fillna(0.0)
 
-    # Top 20 by weight
-    df = df.sort_values("weight_ratio", ascending=False).head(20).copy()
-
-    # Build label text to avoid Plotly showing rgb(...) strings
-    df["label_text"] = df.apply(lambda r: f"{r['symbol']}<br>{r['price_change_pct']:+.2f}%", axis=1)
-
-    fig = px.treemap(
-        df,
-        path=["symbol"],
-        values="weight_ratio",
-        color="price_change_pct",
-        color_continuous_scale="RdYlGn",
-        color_continuous_midpoint=0,
-    )
-
-    # Force our own labels inside tiles
-    fig.update_traces(
-        text=df["label_text"],
-        textinfo="text",
-        textfont_size=18,
-        hovertemplate="<b>%{label}</b><br>1D: %{color:+.2f}%<extra></extra>",
-    )
-
-    fig.update_layout(
-        margin=dict(l=10, r=10, t=10, b=10),
-        paper_bgcolor="white",
-        coloraxis_colorbar_title="1D %",
-    )
-
-    OUT.parent.mkdir(parents=True, exist_ok=True)
-    fig.write_image(str(OUT), width=900, height=520, scale=2)  # kaleido required
-    print("Treemap PNG written:", OUT)
+    # Top 20 by weight (squarify 는 내림차순 입력 전제, 동률은 CSV 순서 유지)
+    df = df[df["weight_ratio"] > 0]
+    return df.sort_values("weight_ratio", ascending=False, kind="mergesort").head(20).reset_index(drop=True)
+
+def main():
+    ap = argparse.ArgumentParser(description="BM20 treemap PNG")
+    ap.add_argument("--csv", type=Path, default=CSV)
+    ap.add_argument("--out", type=Path, default=OUT)
+    args = ap.parse_args()
+
+    render(load(args.csv), args.out)
+    print("Treemap PNG written:", args.out)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+series_index.py
+───────────────
+날짜 정렬된 레벨 시리즈(SSOT: backfill_current_basket.csv / bm20_series.json 등)에 대한
+bisect 조회 + 다기간 수익률.
+
+  idx = SeriesIndex.from_rows(rows)            # rows = [{"date": "YYYY-MM-DD", "level": float}, ...]
+  idx.level_on_or_before("2026-10-01")         # 해당일 이전(포함) 마지막 레벨, 없으면 None
+  idx.returns()                                # {"1D": ratio, "7D": ..., "SI": ...} (기준: 마지막 날짜·레벨)
+  idx.returns(["7D", "YTD"], asof="2026-10-19", level=bm20_now)
+
+시리즈는 한 번만 정렬해 날짜(1970-01-01 기준 일수, datetime64[D]) 배열 + 레벨 배열로 들고 있고,
+기준일 조회는 np.searchsorted 한 번으로 모든 기간을 같이 처리한다 (기간당 전체 스캔 없음).
+
+기간 표기 (기준일 = asof 에서 거슬러 올라간 날, 그날 이전(포함) 마지막 레벨이 base):
+  ND   N일 전 (1D, 7D, 30D, 90D ...)
+  NY   N×365일 전 (1Y, 3Y ...)
+  MTD  이번 달 1일      QTD  이번 분기 첫날      YTD  올해 1월 1일
+  SI   시리즈 첫 레벨 (since inception)
+수익률은 비율(0.0123 = +1.23%). base 가 없거나 0 이면 None.
+같은 날짜가 여러 번 있으면 마지막 값이 이긴다 (기존 candidates[-1] 규칙과 동일).
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from datetime import date
+from typing import Iterable, Sequence
+
+import numpy as np
+
+HORIZONS = ("1D", "7D", "30D", "MTD", "QTD", "90D", "YTD", "1Y", "3Y", "SI")
+
+_SPAN = re.compile(r"^(\d+)([DY])$")
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def _day(d) -> int:
+    """date / 'YYYY-MM-DD...' → 1970-01-01 기준 일수"""
+    if isinstance(d, date):
+        return d.toordinal() - _EPOCH
+    return date.fromisoformat(str(d)[:10]).toordinal() - _EPOCH
+
+
+def _days(dates: Iterable) -> np.ndarray:
+    """날짜 여러 개를 한 번에 (문자열은 numpy datetime64 파싱)"""
+    vals = [d.isoformat() if isinstance(d, date) else str(d)[:10] for d in dates]
+    return np.array(vals, dtype="datetime64[D]").astype(np.int64)
+
+
+def ref_day(horizon: str, asof: date) -> int | None:
+    """기간 → 기준일 (1970-01-01 기준 일수). SI 는 None (시리즈 첫 값 사용)."""
+    h = horizon.upper()
+    if h == "SI":
+        return None
+    if h == "MTD":
+        return _day(asof.replace(day=1))
+    if h == "QTD":
+        return _day(asof.replace(month=(asof.month - 1) // 3 * 3 + 1, day=1))
+    if h == "YTD":
+        return _day(asof.replace(month=1, day=1))
+    m = _SPAN.match(h)
+    if not m:
+        raise ValueError(f"unknown horizon: {horizon!r}")
+    n = int(m.group(1))
+    return _day(asof) - (n if m.group(2) == "D" else n * 365)
+
+
+class SeriesIndex:
+    """정렬된 (날짜, 레벨) 배열 + bisect / searchsorted 조회"""
+
+    __slots__ = ("days", "levels", "_days_list")
+
+    def __init__(self, dates: Iterable, levels: Iterable[float]):
+        days = _days(dates)
+        lv = np.asarray(list(levels), dtype=np.float64)
+        if len(days) != len(lv):
+            raise ValueError(f"dates/levels length mismatch: {len(days)} != {len(lv)}")
+        order = np.argsort(days, kind="stable")   # 안정 정렬 → 같은 날짜는 입력 순서 유지
+        self.days = days[order]
+        self.levels = lv[order]
+        self._days_list = self.days.tolist()
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[dict], date_key: str = "date", level_key: str = "level") -> "SeriesIndex":
+        rows = [r for r in (rows or []) if r.get(date_key) and r.get(level_key) is not None]
+        return cls((r[date_key] for r in rows), (r[level_key] for r in rows))
+
+    @classmethod
+    def from_frame(cls, df, date_col: str = "date", level_col: str = "index") -> "SeriesIndex":
+        df = df.dropna(subset=[date_col, level_col])
+        return cls((d.date() if hasattr(d, "date") else d for d in df[date_col]), df[level_col])
+
+    def __len__(self) -> int:
+        return len(self._days_list)
+
+    @property
+    def last_date(self) -> date | None:
+        return date.fromordinal(self._days_list[-1] + _EPOCH) if self._days_list else None
+
+    @property
+    def last_level(self) -> float | None:
+        return float(self.levels[-1]) if len(self) else None
+
+    def level_on_or_before(self, d) -> float | None:
+        i = bisect_right(self._days_list, _day(d)) - 1
+        return float(self.levels[i]) if i >= 0 else None
+
+    def returns(self, horizons: Sequence[str] = HORIZONS, asof=None,
+                level: float | None = None) -> dict[str, float | None]:
+        """asof(기본: 마지막 날짜) 기준 레벨(기본: 마지막 레벨) 대비 기간별 수익률(비율)."""
+        out: dict[str, float | None] = {h: None for h in horizons}
+        if not len(self):
+            return out
+        asof_d = date.fromordinal(_day(asof) + _EPOCH) if asof is not None else self.last_date
+        cur = float(level) if level is not None else self.level_on_or_before(asof_d)
+        if not cur:
+            return out
+
+        refs = [ref_day(h, asof_d) for h in horizons]
+        probe = np.array([self._days_list[0] if r is None else r for r in refs], dtype=np.int64)
+        pos = np.searchsorted(self.days, probe, side="right") - 1
+        base = np.where(pos >= 0, self.levels[np.clip(pos, 0, None)], np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ret = cur / base - 1.0
+        for h, v in zip(horizons, ret.tolist()):
+            out[h] = v if np.isfinite(v) else None
+        return out
@@ -31,6 +31,8 @@ from typing import Dict, Any, List, Optional
 
 import requests
 
+import bm20_store
+
 KST = timezone(timedelta(hours=9))
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -94,8 +96,13 @@ def safe_read_json(path: Path):
         return None
 
 
-def write_json(path: Path, obj):
-    path.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+def write_json(path: Path, obj, compact: bool = False):
+    # 30분마다 통째로 다시 쓰는 누적 파일은 compact 로 → 커밋당 git blob 크기 감소
+    if compact:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(obj, ensure_ascii=False, indent=2)
+    path.write_text(text, encoding="utf-8")
 
 
 def usdkrw_rate() -> float:
@@ -326,7 +333,8 @@ def run():
     history = history[-MAX_SNAPSHOTS:]
 
     write_json(KIMCHI_LATEST_JSON, latest)
-    write_json(KIMCHI_SNAPSHOTS_JSON, history)
+    write_json(KIMCHI_SNAPSHOTS_JSON, history, compact=True)
+    bm20_store.sync_table("snapshots:kimchi")
 
     # One-line summary for logs
     top_driver = max(
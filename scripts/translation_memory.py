@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+translation_memory.py
+─────────────────────
+DeepL 배치 번역 + 영속 번역 메모리(TM). render_letter_en.py 에서 사용.
+
+- 키: sha256(glossary 버전 | 언어쌍 | 원문) → 같은 원문은 DeepL 을 다시 부르지 않는다
+  (glossary 가 바뀌면 버전이 바뀌어 자동으로 새로 번역)
+- TM 에 없는 원문만 모아 한 번의 POST (text 리스트, 요청당 최대 50건)로 번역
+- 번역 실패 시 원문을 그대로 돌려주고 TM 에는 저장하지 않는다 (기존 translate() 와 동일)
+- 저장 파일: data/translation_memory.json (워크플로우가 커밋 → 다음 실행에서 재사용)
+  마지막 사용 후 TM_TTL_DAYS 일 지난 항목은 저장 시 정리
+  사용일(used)은 TM_TOUCH_DAYS 일 넘게 지났을 때만 갱신 → 번역이 안 바뀐 날은 파일도 안 바뀐다
+
+환경변수:
+  DEEPL_API_KEY        없으면 번역하지 않고 원문 반환
+  DEEPL_API_URL        기본 https://api-free.deepl.com/v2/translate
+  DEEPL_GLOSSARY_ID    (선택) DeepL glossary id. TM 키의 glossary 버전으로도 사용
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from http_session import SESSION
+
+ROOT = Path(os.getenv("BM20_DATA_ROOT") or Path(__file__).resolve().parent.parent)
+TM_JSON = Path(os.getenv("TRANSLATION_MEMORY", str(ROOT / "data" / "translation_memory.json")))
+
+DEEPL_API_KEY     = os.getenv("DEEPL_API_KEY", "")
+DEEPL_API_URL     = os.getenv("DEEPL_API_URL", "https://api-free.deepl.com/v2/translate")
+DEEPL_GLOSSARY_ID = os.getenv("DEEPL_GLOSSARY_ID", "")
+GLOSSARY_VERSION  = DEEPL_GLOSSARY_ID or "none"
+
+BATCH_MAX   = 50    # DeepL: 요청당 text 최대 50개
+TM_TTL_DAYS = 90
+TM_TOUCH_DAYS = 7   # used 갱신 간격 (TTL 대비 충분히 작게)
+KST = timezone(timedelta(hours=9))
+
+
+def tm_key(text: str, source_lang: str, target_lang: str, glossary: str = GLOSSARY_VERSION) -> str:
+    raw = f"{glossary}\x00{source_lang}>{target_lang}\x00{text}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    def __init__(self, path: Path = TM_JSON):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self.dirty = False
+        self.hits = self.misses = 0
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            self.entries = data.get("entries", {}) if isinstance(data, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def get(self, key: str) -> str | None:
+        e = self.entries.get(key)
+        if e is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        now = datetime.now(KST)
+        if e.get("used", "") < (now - timedelta(days=TM_TOUCH_DAYS)).strftime("%Y-%m-%d"):
+            e["used"] = now.strftime("%Y-%m-%d")
+            self.dirty = True
+        return e["text"]
+
+    def put(self, key: str, translated: str):
+        self.entries[key] = {"text": translated, "used": datetime.now(KST).strftime("%Y-%m-%d")}
+        self.dirty = True
+
+    def save(self):
+        cutoff = (datetime.now(KST) - timedelta(days=TM_TTL_DAYS)).strftime("%Y-%m-%d")
+        stale = [k for k, e in self.entries.items() if e.get("used", "") < cutoff]
+        for k in stale:
+            del self.entries[k]
+        if not (self.dirty or stale) and self.path.exists():
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        body = {"glossary": GLOSSARY_VERSION, "entries": dict(sorted(self.entries.items()))}
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(json.dumps(body, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def _deepl(texts: list[str], source_lang: str, target_lang: str) -> list[str]:
+    payload = {"text": texts, "source_lang": source_lang, "target_lang": target_lang}
+    if DEEPL_GLOSSARY_ID:
+        payload["glossary_id"] = DEEPL_GLOSSARY_ID
+    r = SESSION.post(
+        DEEPL_API_URL,
+        headers={"Authorization": f"DeepL-Auth-Key {DEEPL_API_KEY}"},
+        json=payload,
+        timeout=20,
+    )
+    r.raise_for_status()
+    out = [t["text"] for t in r.json()["translations"]]
+    if len(out) != len(texts):
+        raise ValueError(f"DeepL returned {len(out)} translations for {len(texts)} texts")
+    return out
+
+
+def translate_batch(texts: list[str], source_lang: str = "KO", target_lang: str = "EN",
+                    tm: TranslationMemory | None = None) -> list[str]:
+    """texts 와 같은 순서의 번역 리스트. 빈 문자열/"—" 은 그대로."""
+    own_tm = tm is None
+    tm = tm or TranslationMemory()
+    result = list(texts)
+    pending: dict[str, list[int]] = {}   # 원문 → 결과 인덱스들 (중복 원문은 한 번만 요청)
+    for i, t in enumerate(texts):
+        if not t or t == "—":
+            continue
+        hit = tm.get(tm_key(t, source_lang, target_lang))
+        if hit is not None:
+            result[i] = hit
+        else:
+            pending.setdefault(t, []).append(i)
+
+    if pending and DEEPL_API_KEY:
+        src = list(pending)
+        for s in range(0, len(src), BATCH_MAX):
+            chunk = src[s:s + BATCH_MAX]
+            try:
+                translated = _deepl(chunk, source_lang, target_lang)
+            except Exception as e:
+                print(f"WARN: DeepL failed: {e}")
+                continue
+            for t, tr in zip(chunk, translated):
+                tm.put(tm_key(t, source_lang, target_lang), tr)
+                for i in pending[t]:
+                    result[i] = tr
+    print(f"INFO: translation memory hit={tm.hits} miss={tm.misses} "
+          f"(requested={len(pending) if DEEPL_API_KEY else 0})")
+    if own_tm:
+        tm.save()
+    return result
+
+
+def translate(text: str, source_lang: str = "KO", target_lang: str = "EN") -> str:
+    return translate_batch([text], source_lang, target_lang)[0]
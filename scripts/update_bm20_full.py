@@ -5,6 +5,8 @@ from datetime import datetime, timezone, timedelta
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
+import k_share
+
 
 # ---- 환율: 실시간 우선 + 실패 시 fallback ----
 def get_usdkrw_live():
@@ -81,85 +83,6 @@ def get_k_share(api_key, krw_total_24h, usdkrw):
         return {"global_vol_usd": 0, "krw_vol_usd": round(my_vol_usd, 2), "k_share_percent": 0, "global_volume_field": None}
 
 
-def get_upbit_xrp_krw_24h():
-    r = requests.get("https://api.upbit.com/v1/ticker", params={"markets": "KRW-XRP"}, timeout=15)
-    r.raise_for_status()
-    return float(r.json()[0].get("acc_trade_price_24h", 0.0))
-
-
-def get_bithumb_xrp_krw_24h():
-    r = requests.get("https://api.bithumb.com/public/ticker/ALL_KRW", timeout=15)
-    r.raise_for_status()
-    xrp = (r.json().get("data") or {}).get("XRP") or {}
-    return float(xrp.get("acc_trade_value_24H", 0.0))
-
-
-def get_coinone_xrp_krw_24h():
-    r = requests.get("https://api.coinone.co.kr/public/v2/ticker_new/KRW/XRP", timeout=15)
-    r.raise_for_status()
-    tickers = r.json().get("tickers") or []
-    return float(tickers[0].get("quote_volume", 0.0)) if tickers else 0.0
-
-
-def get_cmc_global_xrp_usd_24h(api_key):
-    if not api_key:
-        raise ValueError("CMC_API_KEY missing")
-    r = requests.get(
-        "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest",
-        headers={'X-CMC_PRO_API_KEY': api_key},
-        params={"symbol": "XRP", "convert": "USD"},
-        timeout=15,
-    )
-    r.raise_for_status()
-    quote = ((r.json().get("data") or {}).get("XRP") or {}).get("quote", {}).get("USD", {}) or {}
-    return float(quote.get("volume_24h", 0.0))
-
-
-def get_xrp_share(api_key, usdkrw):
-    errors = []
-    try:
-        upbit_krw = get_upbit_xrp_krw_24h()
-    except Exception as e:
-        upbit_krw = 0.0; errors.append(f"upbit:{e}")
-    try:
-        bithumb_krw = get_bithumb_xrp_krw_24h()
-    except Exception as e:
-        bithumb_krw = 0.0; errors.append(f"bithumb:{e}")
-    try:
-        coinone_krw = get_coinone_xrp_krw_24h()
-    except Exception as e:
-        coinone_krw = 0.0; errors.append(f"coinone:{e}")
-
-    korea_krw = upbit_krw + bithumb_krw + coinone_krw
-    korea_usd = korea_krw / usdkrw if usdkrw > 0 else 0.0
-
-    try:
-        global_usd = get_cmc_global_xrp_usd_24h(api_key)
-    except Exception as e:
-        global_usd = 0.0; errors.append(f"cmc:{e}")
-
-    share = (korea_usd / global_usd) * 100 if global_usd > 0 else 0.0
-    return {
-        "as_of": None,
-        "symbol": "XRP",
-        "usdkrw": usdkrw,
-        "korea": {
-            "upbit_krw_24h": round(upbit_krw, 2),
-            "bithumb_krw_24h": round(bithumb_krw, 2),
-            "coinone_krw_24h": round(coinone_krw, 2),
-            "total_krw_24h": round(korea_krw, 2),
-            "total_usd_24h": round(korea_usd, 2),
-        },
-        "global": {"cmc_xrp_volume_usd_24h": round(global_usd, 2)},
-        "k_xrp_share_pct_24h": round(share, 4),
-        "errors": errors,
-        "notes": [
-            "Korea: Upbit+Bithumb+Coinone XRP/KRW spot traded value(24h) converted to USD",
-            "Global: CMC XRP volume_24h (USD)",
-        ]
-    }
-
-
 def _today_kst() -> str:
     kst = timezone(timedelta(hours=9))
     return datetime.now(kst).strftime("%Y-%m-%d")
@@ -205,10 +128,12 @@ def main():
 
     sentiment = get_fear_and_greed()
     k_market = get_k_share(CMC_API_KEY, krw_total_24h, usdkrw)
-    xrp_market = get_xrp_share(CMC_API_KEY, usdkrw)
+    # 구성종목 전체 K-share: krw_rolling24h_8h.py 의 KRW 맵 + CMC 1회 → XRP 는 그중 한 행
+    share_table = k_share.build_k_share(CMC_API_KEY, usdkrw)
+    k_share.write_k_share({**share_table, "fx_source": fx_source})
+    xrp_market = k_share.xrp_record(share_table, "XRP")
 
-    now_iso = datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds")
-    xrp_market["as_of"] = now_iso
+    now_iso = share_table["as_of"]
 
     new_entry = {
         "timestamp": now_iso,
@@ -231,7 +156,8 @@ def main():
     )
 
     print(f"[FINAL] BM20 업데이트 완료 - K-Share: {k_market['k_share_percent']}%")
-    print(f"[FINAL] XRP 저장 완료(out/global) - K-XRP Share(24H): {xrp_market['k_xrp_share_pct_24h']}%")
+    print(f"[FINAL] K-share 저장 완료(out/global) - 구성종목 합계: {share_table['total']['k_share_pct']}%, "
+          f"XRP: {xrp_market['k_xrp_share_pct_24h']}%")
     print(f"[INFO] USDKRW={usdkrw} ({fx_source})")
 
 
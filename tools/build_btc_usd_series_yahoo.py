@@ -5,7 +5,10 @@ from pathlib import Path
 import pandas as pd
 import yfinance as yf
 
-OUT = Path("btc_usd_series.json")
+# YF_TICKER / OUT_PATH 로 다른 코인도 같은 포맷으로 (예: ETH-USD → eth_usd_series.json)
+TICKER = os.getenv("YF_TICKER", "BTC-USD").strip() or "BTC-USD"
+OUT = Path(os.getenv("OUT_PATH", "btc_usd_series.json"))
+TAG = TICKER.split("-")[0].lower()
 
 def _extract_close_series(df: pd.DataFrame) -> pd.Series:
     """Return a 1D Series of close prices from yfinance download output.
@@ -60,10 +63,10 @@ def _extract_close_series(df: pd.DataFrame) -> pd.Series:
 def main():
     start = os.getenv("START_DATE", "2018-01-01").strip() or "2018-01-01"
 
-    # Download daily BTC-USD OHLCV from Yahoo Finance via yfinance
+    # Download daily OHLCV (default BTC-USD) from Yahoo Finance via yfinance
     # NOTE: yfinance output column structure can vary; handle robustly.
     df = yf.download(
-        "BTC-USD",
+        TICKER,
         start=start,
         interval="1d",
         auto_adjust=False,
@@ -75,19 +78,19 @@ def main():
     close = _extract_close_series(df).dropna()
     if close.empty:
         # Print diagnostics for debugging in Actions logs
-        print("[btc] No Close series extracted.")
+        print(f"[{TAG}] No Close series extracted.")
         try:
-            print("[btc] df.columns:", df.columns)
-            print("[btc] df.head():\n", df.head())
+            print(f"[{TAG}] df.columns:", df.columns)
+            print(f"[{TAG}] df.head():\n", df.head())
         except Exception:
             pass
-        raise SystemExit("No data returned (or unexpected columns) for BTC-USD")
+        raise SystemExit(f"No data returned (or unexpected columns) for {TICKER}")
 
     series = [{"date": idx.strftime("%Y-%m-%d"), "price": float(v)} for idx, v in close.items()]
     series.sort(key=lambda x: x["date"])
 
     OUT.write_text(json.dumps(series, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(f"[btc] wrote {OUT} ({len(series)} points) from {series[0]['date']} to {series[-1]['date']}")
+    print(f"[{TAG}] wrote {OUT} ({len(series)} points) from {series[0]['date']} to {series[-1]['date']}")
 
 if __name__ == "__main__":
     main()
@@ -1,22 +1,23 @@
 #!/usr/bin/env python3
 import json, sys, os, pandas as pd
-from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from series_index import SeriesIndex
 
 def compute_stats(df: pd.DataFrame):
     df["date"] = pd.to_datetime(df["date"])
     df = df.sort_values("date")
     today = df["date"].max()
-    ytd_start = pd.Timestamp(year=today.year, month=1, day=1)
-    mtd_start = pd.Timestamp(year=today.year, month=today.month, day=1)
+    # SeriesIndex: 기간별 기준일을 bisect 로 (MTD/YTD = 그달·그해 첫날 이전(포함) 마지막 레벨 기준)
+    rets = SeriesIndex.from_frame(df, "date", "index").returns()
 
-    def total_return(s):
-        if len(s) <= 1: return 0.0
-        return float((s["index"].iloc[-1] / s["index"].iloc[0]) - 1.0)
+    def r6(v):
+        return 0.0 if v is None else round(v, 6)
 
-    ytd = total_return(df[df["date"] >= ytd_start]) if (df["date"]>=ytd_start).any() else 0.0
-    mtd = total_return(df[df["date"] >= mtd_start]) if (df["date"]>=mtd_start).any() else 0.0
     d1  = float(df["ret"].iloc[-1])
-    return {"date": str(today.date()), "mtd": round(mtd,6), "ytd": round(ytd,6), "d1": round(d1,6)}
+    return {"date": str(today.date()), "mtd": r6(rets["MTD"]), "ytd": r6(rets["YTD"]), "d1": round(d1,6),
+            "returns": {h: (None if v is None else round(v, 6)) for h, v in rets.items()}}
 
 def main(index_csv, out_dir="site"):
     os.makedirs(out_dir, exist_ok=True)